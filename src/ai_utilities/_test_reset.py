@@ -18,6 +18,12 @@ def _reset_usage_tracker_state():
         # Clear shared locks that accumulate across tests
         if hasattr(ThreadSafeUsageTracker, '_shared_locks'):
             ThreadSafeUsageTracker._shared_locks.clear()
+        
+        # Drop pending usage so it is not flushed into another test's files
+        if hasattr(ThreadSafeUsageTracker, '_shared_buffers'):
+            for buffer in ThreadSafeUsageTracker._shared_buffers.values():
+                buffer.clear()
+            ThreadSafeUsageTracker._shared_buffers.clear()
             
         # Remove the module from sys.modules to ensure fresh import
         # This fixes enum contamination issues
@@ -50,6 +56,10 @@ def reset_global_state_for_tests() -> None:
     - Metrics registry
     - ContextVar state
     - Audio processor global state
+    - Default request scheduler
+    - Shared rate limiters
+    - Shared usage stores
+    - Loaded BPE tokenizers and the tokenizer directory
     - Any module-level global state
     """
     try:
@@ -114,6 +124,34 @@ def reset_global_state_for_tests() -> None:
     except Exception:
         # Ignore errors - this is a safety mechanism
         pass
+    
+    try:
+        # Remove the process-wide request scheduler
+        _reset_default_scheduler()
+    except Exception:
+        # Ignore errors - this is a safety mechanism
+        pass
+    
+    try:
+        # Drop shared token-bucket rate limiters
+        _reset_shared_rate_limiters()
+    except Exception:
+        # Ignore errors - this is a safety mechanism
+        pass
+    
+    try:
+        # Close shared usage log stores
+        _reset_shared_usage_stores()
+    except Exception:
+        # Ignore errors - this is a safety mechanism
+        pass
+
+    try:
+        # Forget loaded tokenizers and the configured rank file directory
+        _reset_tokenizers()
+    except Exception:
+        # Ignore errors - this is a safety mechanism
+        pass
 
 
 def _clear_environment_variables() -> None:
@@ -190,6 +228,53 @@ def _reset_contextvar_state() -> None:
         pass
 
 
+def _reset_default_scheduler() -> None:
+    """Remove any scheduler installed with set_default_scheduler."""
+    try:
+        from ai_utilities.scheduling import set_default_scheduler
+        set_default_scheduler(None)
+    except (ImportError, Exception):
+        # Handle any exception gracefully
+        pass
+
+
+def _reset_shared_rate_limiters() -> None:
+    """Drop the per-model limiters and server quotas created by shared_rate_limiter."""
+    try:
+        from ai_utilities.rate_limiter import _server_quotas, _shared_limiters, _sqlite_stores
+        _shared_limiters.clear()
+        _server_quotas.clear()
+        for store in _sqlite_stores.values():
+            store.close()
+        _sqlite_stores.clear()
+    except (ImportError, Exception):
+        # Handle any exception gracefully
+        pass
+
+
+def _reset_shared_usage_stores() -> None:
+    """Close the usage stores created by shared_usage_store."""
+    try:
+        from ai_utilities.usage_store import _stores
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
+    except (ImportError, Exception):
+        # Handle any exception gracefully
+        pass
+
+
+def _reset_tokenizers() -> None:
+    """Clear the tokenizers loaded by get_tokenizer and unset set_tokenizer_dir."""
+    try:
+        from ai_utilities.tokenizer import _tokenizers, set_tokenizer_dir
+        _tokenizers.clear()
+        set_tokenizer_dir(None)
+    except (ImportError, Exception):
+        # Handle any exception gracefully
+        pass
+
+
 def _reset_audio_processor_state() -> None:
     """Reset audio processor global state."""
     try:
@@ -0,0 +1,47 @@
+"""
+Waiters shared by the slot-based limiters (scheduler, adaptive concurrency).
+
+A limiter hands a freed slot to a queued waiter under its own lock by
+setting ``granted`` and calling ``wake()``. Threads block on an event;
+coroutines await a future resolved on their own event loop, so a slot freed
+from any thread wakes them safely.
+"""
+
+import asyncio
+import threading
+from typing import Union
+
+
+class SyncWaiter:
+    """A blocked thread, woken by setting its event."""
+
+    __slots__ = ("event", "granted")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.granted = False
+
+    def wake(self) -> None:
+        self.event.set()
+
+
+class AsyncWaiter:
+    """A waiting coroutine, woken by resolving its future on its own loop."""
+
+    __slots__ = ("future", "granted", "loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.future: asyncio.Future[None] = loop.create_future()
+        self.granted = False
+
+    def wake(self) -> None:
+        self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+Waiter = Union[SyncWaiter, AsyncWaiter]
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
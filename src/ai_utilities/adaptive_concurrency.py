@@ -0,0 +1,193 @@
+"""
+Adaptive (AIMD) concurrency limiting for batch execution.
+
+The limiter starts at a modest number of in-flight requests and raises it
+additively while requests succeed within the latency target. A rate-limit
+(HTTP 429) or timeout error cuts it multiplicatively, the way TCP congestion
+control backs off on packet loss. A single limiter can be shared by the sync
+and async ``ask_many`` and by several clients drawing on the same quota.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from ._waiters import AsyncWaiter, SyncWaiter, Waiter
+from .metrics import MetricsRegistry
+from .providers.provider_exceptions import error_name_matches, error_status_code
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Return True if ``error`` signals an overloaded provider (429 or timeout)."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    if error_status_code(error) == 429:
+        return True
+    # SDK errors such as openai.RateLimitError / openai.APITimeoutError
+    return error_name_matches(error, "RateLimit", "Timeout")
+
+
+class AdaptiveConcurrencyLimiter:
+    """Thread-safe AIMD limiter for in-flight requests.
+
+    Every successful request whose latency is within ``latency_target_s``
+    grows the limit by ``increase / limit``, i.e. by ``increase`` per full
+    window of requests. An overload error multiplies the limit by
+    ``decrease_factor``; errors from requests that started before the last
+    cut are ignored so one burst of 429s only backs off once. Other errors
+    leave the limit unchanged. The current limit is published as the
+    ``concurrency_limit`` gauge through ``MetricsRegistry``.
+
+    Example:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=32)
+        results = client.ask_many(prompts, limiter=limiter)
+        print(limiter.limit)
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_target_s: Optional[float] = None,
+        name: str = "default",
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial_limit: Number of requests allowed in flight at first
+            min_limit: Lower bound for the limit (must be >= 1)
+            max_limit: Upper bound for the limit
+            increase: Additive growth per window of healthy requests
+            decrease_factor: Multiplier applied on overload (0 < factor < 1)
+            latency_target_s: Successes slower than this do not grow the limit
+                (None disables the latency check)
+            name: Value of the ``limiter`` label on the exported gauge
+
+        Raises:
+            ValueError: If the bounds or factors are inconsistent
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if increase <= 0:
+            raise ValueError("increase must be > 0")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target_s = latency_target_s
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[Waiter] = deque()
+        self._last_decrease = float("-inf")
+        self._publish(initial_limit)
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take a slot, waiting for one to free up if ``blocking``.
+
+        Returns:
+            True if a slot was taken, False if none was free and not blocking
+        """
+        with self._lock:
+            if self._has_capacity():
+                self._in_flight += 1
+                return True
+            if not blocking:
+                return False
+            waiter = SyncWaiter()
+            self._waiters.append(waiter)
+        try:
+            waiter.event.wait()
+        except BaseException:
+            # e.g. KeyboardInterrupt; a slot granted meanwhile must be given back
+            self._abandon(waiter)
+            raise
+        return True
+
+    async def acquire_async(self) -> None:
+        """Take a slot, awaiting one without blocking the event loop."""
+        with self._lock:
+            if self._has_capacity():
+                self._in_flight += 1
+                return
+            waiter = AsyncWaiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: Waiter) -> None:
+        """Withdraw a waiter whose caller stopped waiting."""
+        with self._lock:
+            if waiter.granted:
+                # The slot was handed over just before the interruption
+                self._in_flight -= 1
+                self._wake_waiters()
+            else:
+                self._waiters.remove(waiter)
+
+    def release(self, latency_s: float, error: Optional[BaseException] = None) -> None:
+        """Give a slot back and adjust the limit from the request's outcome.
+
+        Args:
+            latency_s: How long the request took
+            error: The exception it raised, or None on success
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if error is None:
+                self._on_success(latency_s)
+            elif is_overload_error(error):
+                self._on_overload(latency_s)
+            self._wake_waiters()
+            limit = self.limit
+        self._publish(limit)
+
+    def _has_capacity(self) -> bool:
+        # Queued waiters go first so sync and async callers are served FIFO
+        return self._in_flight < int(self._limit) and not self._waiters
+
+    def _on_success(self, latency_s: float) -> None:
+        if self.latency_target_s is not None and latency_s > self.latency_target_s:
+            return
+        self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+
+    def _on_overload(self, latency_s: float) -> None:
+        now = time.monotonic()
+        if now - latency_s < self._last_decrease:
+            return
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._last_decrease = now
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            waiter.granted = True
+            waiter.wake()
+
+    def _publish(self, limit: int) -> None:
+        MetricsRegistry().set_concurrency_limit(self.name, limit)
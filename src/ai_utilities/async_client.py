@@ -3,86 +3,40 @@
 import asyncio
 import secrets
 import time
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from typing import Callable, List, Literal, Optional, Union
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
 
-from .client import AiSettings
+from .adaptive_concurrency import AdaptiveConcurrencyLimiter
+from .cache import CacheBackend
+from .client import (
+    AiClient,
+    AiSettings,
+    _create_cache_backend,
+    _fan_out_results,
+    _fold_duplicate_prompts,
+    _metered_deltas_async,
+    _metered_request,
+    _recorded_request,
+    _unreserved_tokens,
+    _usage_store_for,
+)
+from .error_codes import ERROR_RATE_LIMIT_EXCEEDED
+from .exceptions import RateLimitExceededError
 from .file_models import UploadedFile
+from .hedging import RequestHedger
 from .models import AskResult
+from .providers.async_openai_provider import AsyncOpenAIProvider  # noqa: F401 - re-exported for backwards compatibility
 from .providers.base import AsyncProvider
 from .providers.provider_exceptions import FileTransferError, ProviderCapabilityError
-
-
-class AsyncOpenAIProvider(AsyncProvider):
-    """Async OpenAI provider implementation."""
-    
-    def __init__(self, settings: AiSettings):
-        self.settings = settings
-        # Lazy import OpenAIProvider to avoid dependency issues
-        from .providers.openai_provider import OpenAIProvider
-        self._sync_provider = OpenAIProvider(settings)
-    
-    async def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, dict, list]:
-        """Async ask implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.ask,
-            prompt,
-            return_format=return_format,
-            **kwargs
-        )
-    
-    async def ask_many(self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs) -> List[Union[str, dict, list]]:
-        """Async ask_many implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.ask_many,
-            prompts,
-            return_format=return_format,
-            **kwargs
-        )
-    
-    async def upload_file(
-        self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
-    ) -> UploadedFile:
-        """Async upload_file implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.upload_file,
-            path,
-            purpose=purpose,
-            filename=filename,
-            mime_type=mime_type
-        )
-    
-    async def download_file(self, file_id: str) -> bytes:
-        """Async download_file implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.download_file,
-            file_id
-        )
-    
-    async def list_files(self, *, purpose: Optional[str] = None) -> List[UploadedFile]:
-        """Async list_files implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.list_files,
-            purpose=purpose
-        )
-    
-    async def delete_file(self, file_id: str) -> bool:
-        """Async delete_file implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.delete_file,
-            file_id
-        )
-    
-    async def generate_image(
-        self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024", 
-        quality: Literal["standard", "hd"] = "standard", n: int = 1
-    ) -> List[str]:
-        """Async image generation implementation using asyncio.to_thread."""
-        return await asyncio.to_thread(
-            self._sync_provider.generate_image,
-            prompt, size=size, quality=quality, n=n
-        )
+from .providers.provider_factory import create_async_provider
+from .rate_limiter import RateLimitObserver, ServerQuota
+from .scheduling import RequestScheduler, get_default_scheduler
+from .single_flight import AsyncSingleFlight
+from .token_counter import TokenCounter
+from .token_usage import TokenUsage, capture_usage
+from .usage_tracker import UsageScope, UsageStats, create_usage_tracker
 
 
 class AsyncAiClient:
@@ -133,46 +87,315 @@ class AsyncAiClient:
         provider: Union[AsyncProvider, None] = None,
         track_usage: bool = False,
         usage_file: Union[str, None] = None,
-        show_progress: bool = True
+        show_progress: bool = True,
+        cache: Optional[CacheBackend] = None,
+        hedger: Optional[RequestHedger] = None,
+        hedge_settings: Optional[AiSettings] = None,
+        hedge_provider: Optional[AsyncProvider] = None,
+        scheduler: Optional[RequestScheduler] = None,
     ):
         """Initialize async AI client.
         
         Args:
             settings: AI settings containing api_key, model, etc.
-            provider: Custom async AI provider (defaults to OpenAI)
+            provider: Custom async AI provider (defaults to a native async
+                provider resolved from settings via ``create_async_provider``)
             track_usage: Whether to track usage statistics
             usage_file: Custom file for usage tracking
             show_progress: Whether to show progress indicator during requests
+            cache: Optional cache backend to override settings-based cache configuration
+            hedger: Optional RequestHedger; slow requests are then duplicated,
+                the first answer wins and the other request is cancelled
+            hedge_settings: Settings for a secondary provider that receives the
+                duplicates (built with ``create_async_provider``)
+            hedge_provider: Explicit secondary async provider for the duplicates
+            scheduler: Optional RequestScheduler that provider calls wait on;
+                defaults to the process-wide one from ``set_default_scheduler``
         """
         if settings is None:
             settings = AiSettings()
         
         self.settings = settings
-        self.provider = provider or AsyncOpenAIProvider(settings)
+        self.provider = create_async_provider(settings, provider)
+        
+        # Hedged duplicates go to a secondary provider if one is configured
+        self.hedger = hedger
+        self._hedge_settings = hedge_settings
+        if hedge_settings is not None or hedge_provider is not None:
+            self._hedge_provider = create_async_provider(hedge_settings or settings, hedge_provider)
+        else:
+            self._hedge_provider = self.provider
+        
+        self.scheduler = scheduler
+        
+        if track_usage:
+            self.usage_tracker = create_usage_tracker(
+                scope=UsageScope(settings.usage_scope),
+                stats_file=Path(usage_file) if usage_file else None,
+                client_id=settings.usage_client_id,
+                store=_usage_store_for(settings),
+            )
+        else:
+            self.usage_tracker = None
+        
+        self.cache = _create_cache_backend(settings, cache)
+        self._single_flight = AsyncSingleFlight()
         self.show_progress = show_progress
     
-    async def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, dict, list]:
+    # Cache policy and key derivation are shared with the sync client
+    _should_use_cache = AiClient._should_use_cache
+    _is_deterministic = AiClient._is_deterministic
+    _build_cache_key = AiClient._build_cache_key
+    _rate_limiter_for = AiClient._rate_limiter_for
+    _server_quota_for = AiClient._server_quota_for
+    
+    def _cache_key_for(self, prompt: str, return_format: str, overrides: Dict[str, Any]) -> Optional[str]:
+        """Return the cache key for a request, or None if it should not be cached."""
+        request_params = {
+            key: value
+            for key, value in (
+                ("model", self.settings.model),
+                ("temperature", self.settings.temperature),
+                ("max_tokens", self.settings.max_tokens),
+            )
+            if value is not None
+        }
+        request_params.update(overrides)
+        if not self._should_use_cache(request_params):
+            return None
+        return self._build_cache_key(
+            "ask", prompt=prompt, request_params=request_params, return_format=return_format
+        )
+    
+    def _record_usage(
+        self,
+        response: Any,
+        kwargs: Optional[Dict[str, Any]] = None,
+        reported: Sequence[TokenUsage] = (),
+    ) -> Optional[TokenUsage]:
+        """Record token usage for a response if tracking is enabled; see ``AiClient._record_usage``."""
+        usage = TokenUsage.combine(reported)
+        if self.usage_tracker:
+            model = (kwargs or {}).get("model") or self.settings.model
+            tokens = usage.total_tokens if usage is not None else len(str(response)) // 4
+            self.usage_tracker.record_usage(tokens, model=model)
+        return usage
+    
+    def get_usage_stats(self) -> Optional[UsageStats]:
+        """Get current usage statistics if tracking is enabled.
+        
+        Returns:
+            UsageStats object if tracking enabled, None otherwise
+        """
+        if self.usage_tracker:
+            return self.usage_tracker.get_stats()
+        return None
+    
+    async def ask(
+        self,
+        prompt: str,
+        *,
+        return_format: Literal["text", "json"] = "text",
+        priority: str = "interactive",
+        **kwargs,
+    ) -> Union[str, dict, list]:
         """Ask a single question asynchronously.
         
         Args:
             prompt: The prompt to send
             return_format: Format for response ("text" or "json")
+            priority: Scheduler priority class ("interactive" or "batch");
+                only used when a RequestScheduler applies
             **kwargs: Additional parameters
             
         Returns:
             Response as string or dict
         """
-        start_time = time.time()
+        cache_key = self._cache_key_for(prompt, return_format, kwargs)
+        if cache_key is not None:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                self._record_usage(cached_response, kwargs)
+                return cached_response
+        
+        with capture_usage() as reported:
+            if cache_key is None:
+                response = await self._send(prompt, return_format, kwargs, priority)
+            else:
+                # Identical in-flight requests share a single provider call
+                response = await self._single_flight.do(
+                    cache_key,
+                    lambda: self._ask_and_cache(prompt, return_format, kwargs, cache_key, priority),
+                )
+        
+        self._record_usage(response, kwargs, reported)
+        return response
+    
+    async def _ask_and_cache(
+        self,
+        prompt: str,
+        return_format: str,
+        overrides: Dict[str, Any],
+        cache_key: str,
+        priority: str = "interactive",
+    ) -> Any:
+        """Call the provider and fill the cache before the single-flight key is released."""
+        response = await self._send(prompt, return_format, overrides, priority)
+        self.cache.set(cache_key, response, ttl_s=self.settings.cache_ttl_s)
+        return response
+    
+    async def _send(
+        self,
+        prompt: str,
+        return_format: str,
+        overrides: Dict[str, Any],
+        priority: str = "interactive",
+    ) -> Any:
+        """Send one request to the provider, hedged when a hedger is configured.
+        
+        With rate limiting enabled, the call first waits for RPM/TPM/TPD
+        capacity, and in any case for the provider's reported quota to reset
+        once it is used up; when a scheduler applies, it then waits for a
+        slot in its ``priority`` class.
+        """
+        limiter, charged = await self._wait_for_rate_limit(prompt, overrides)
+        model = overrides.get("model", self.settings.model)
+        if self.hedger is None:
+            async with self._scheduler_slot(priority, model):
+                return await self._send_metered(
+                    self.provider, prompt, return_format, overrides, limiter, charged
+                )
+        
+        # Admitted before the race, so local waiting never counts as provider latency
+        async with AsyncExitStack() as slot:
+            await slot.enter_async_context(self._scheduler_slot(priority, model))
+            
+            async def send_primary() -> Any:
+                try:
+                    return await self._send_metered(
+                        self.provider, prompt, return_format, overrides, limiter, charged
+                    )
+                finally:
+                    # A hedge still waiting for a slot can take this one
+                    await slot.aclose()
+            
+            return await self.hedger.do_async(
+                send_primary, lambda: self._send_hedge(prompt, return_format, overrides, priority)
+            )
+    
+    async def _send_hedge(
+        self, prompt: str, return_format: str, overrides: Dict[str, Any], priority: str
+    ) -> Any:
+        """Send the duplicate of a slow request; see ``AiClient._send_hedge``."""
+        if self._hedge_settings is not None:
+            overrides = dict(overrides, model=self._hedge_settings.model)
+        limiter, charged = await self._wait_for_rate_limit(prompt, overrides)
+        model = overrides.get("model", self.settings.model)
+        async with self._scheduler_slot(priority, model):
+            return await self._send_metered(
+                self._hedge_provider, prompt, return_format, overrides, limiter, charged
+            )
+    
+    async def _send_metered(
+        self,
+        provider: AsyncProvider,
+        prompt: str,
+        return_format: str,
+        overrides: Dict[str, Any],
+        limiter: RateLimitObserver,
+        charged: int,
+    ) -> Any:
+        """Make one provider call, recorded with MetricsRegistry and ``limiter``."""
+        model = overrides.get("model", self.settings.model)
+        with _metered_request(model, limiter) as reported:
+            response = await provider.ask(prompt, return_format=return_format, **overrides)
         
+        # Response tokens are only known now; later requests wait for them
+        limiter.record(_unreserved_tokens(reported, [response], charged))
+        return response
+    
+    @asynccontextmanager
+    async def _scheduler_slot(self, priority: str, model: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold a scheduler slot of class ``priority`` for the block; see ``AiClient._scheduler_slot``."""
+        scheduler = self.scheduler or get_default_scheduler()
+        if scheduler is None:
+            yield
+            return
+        async with scheduler.slot_async(
+            priority, self.settings.usage_client_id, self._server_quota_for(model)
+        ):
+            yield
+    
+    async def _wait_for_rate_limit(
+        self, prompt: str, overrides: Dict[str, Any]
+    ) -> Tuple[RateLimitObserver, int]:
+        """Await rate limit capacity for ``prompt``; see ``AiClient._wait_for_rate_limit``."""
+        model = overrides.get("model", self.settings.model)
+        limiter: RateLimitObserver = self._rate_limiter_for(model) or self._server_quota_for(model)
+        if isinstance(limiter, ServerQuota) and not limiter.reported():
+            return limiter, 0
+        tokens = TokenCounter.count_tokens_for_model(prompt, model or "")
+        max_wait_s = self.settings.rate_limit_max_wait_s
+        if not await limiter.acquire_async(tokens, timeout=max_wait_s):
+            raise RateLimitExceededError(
+                f"{ERROR_RATE_LIMIT_EXCEEDED} No capacity for model {model!r} within {max_wait_s}s"
+            )
+        return limiter, tokens
+    
+    async def ask_stream(self, prompt: str, *, priority: str = "interactive", **kwargs) -> AsyncIterator[str]:
+        """Stream a text answer asynchronously as it is generated.
+        
+        Once the stream has been fully consumed the assembled answer is written
+        to the cache and recorded with the usage tracker. Providers without an
+        ``ask_stream`` method yield their complete ``ask()`` answer as one chunk.
+        When a scheduler applies, the stream holds one of its slots until it is
+        consumed or closed.
+        
+        Args:
+            prompt: The prompt to send
+            priority: Scheduler priority class ("interactive" or "batch");
+                only used when a RequestScheduler applies
+            **kwargs: Additional parameters
+            
+        Yields:
+            Text deltas in the order they are produced
+        """
+        cache_key = self._cache_key_for(prompt, "text", kwargs)
+        if cache_key is not None:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                self._record_usage(cached_response, kwargs)
+                yield str(cached_response)
+                return
+        
+        limiter, charged = await self._wait_for_rate_limit(prompt, kwargs)
+        model = kwargs.get("model", self.settings.model)
+        chunks: List[str] = []
+        reported: List[TokenUsage] = []
         try:
-            response = await self.provider.ask(prompt, return_format=return_format, **kwargs)
-            # Calculate duration (currently not used but kept for potential future metrics)
-            time.time() - start_time
-            return response
-        except Exception:
-            # Calculate duration even for exceptions (though not currently used)
-            time.time() - start_time
-            raise
+            async with self._scheduler_slot(priority, model):
+                with _recorded_request(model, reported):
+                    stream = self._provider_stream(prompt, kwargs)
+                    async for delta in _metered_deltas_async(stream, limiter, reported):
+                        chunks.append(delta)
+                        yield delta
+        finally:
+            # The final chunk carries the usage; a closed stream is charged what it produced
+            limiter.record(_unreserved_tokens(reported, ["".join(chunks)], charged))
+        
+        # Only a fully consumed stream is cached and counted
+        response = "".join(chunks)
+        if cache_key is not None:
+            self.cache.set(cache_key, response, ttl_s=self.settings.cache_ttl_s)
+        self._record_usage(response, kwargs, reported)
+    
+    async def _provider_stream(self, prompt: str, overrides: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream from the provider, or yield its whole ``ask()`` answer when it cannot stream."""
+        if hasattr(self.provider, "ask_stream"):
+            async for delta in self.provider.ask_stream(prompt, **overrides):
+                yield delta
+        else:
+            yield str(await self.provider.ask(prompt, return_format="text", **overrides))
     
     async def ask_many(
         self,
@@ -182,16 +405,30 @@ class AsyncAiClient:
         return_format: Literal["text", "json"] = "text",
         fail_fast: bool = False,
         on_progress: Union[Callable[[int, int], None], None] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: str = "batch",
+        deduplicate: bool = True,
         **kwargs
     ) -> List[AskResult]:
         """Ask multiple questions asynchronously with concurrency control.
         
+        Prompts that are identical after normalization are sent once and
+        share the answer, unless the temperature makes the requests
+        non-deterministic.
+        
         Args:
             prompts: List of prompts to process
             concurrency: Maximum number of concurrent requests
             return_format: Format for responses ("text" or "json")
             fail_fast: If True, cancel remaining requests on first failure
             on_progress: Progress callback (completed, total)
+            limiter: Optional adaptive concurrency limiter that replaces the
+                fixed ``concurrency``; it grows the in-flight limit while
+                requests succeed and cuts it on 429s and timeouts
+            priority: Scheduler priority class of the prompts (default
+                "batch"); only used when a RequestScheduler applies
+            deduplicate: If True (default), send each distinct prompt once and
+                copy its result (marked ``deduplicated``) to the duplicates
             **kwargs: Additional parameters
             
         Returns:
@@ -203,12 +440,30 @@ class AsyncAiClient:
         semaphore = asyncio.Semaphore(concurrency)
         results = [None] * len(prompts)
         
+        indices = list(range(len(prompts)))
+        followers = {}
+        if deduplicate and self._is_deterministic(kwargs):
+            indices, followers = _fold_duplicate_prompts(prompts, indices)
+        
+        completed = 0
+        
+        def report_progress(index: int) -> None:
+            # A folded prompt's duplicates are answered along with it
+            nonlocal completed
+            completed += 1 + len(followers.get(index, ()))
+            try:
+                on_progress(completed, len(prompts))
+            except (TypeError, ValueError, RuntimeError):
+                # Don't let progress callback errors break processing
+                pass
+        
         # Create tasks directly without inner function to avoid closure issues
         tasks = []
-        for i, prompt in enumerate(prompts):
+        for i in indices:
             task = asyncio.create_task(
                 self._process_prompt_with_semaphore(
-                    i, prompt, semaphore, return_format, on_progress, len(prompts), **kwargs
+                    i, prompts[i], semaphore, return_format, report_progress if on_progress else None,
+                    limiter=limiter, priority=priority, **kwargs
                 )
             )
             tasks.append(task)
@@ -218,7 +473,7 @@ class AsyncAiClient:
             completed_tasks = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results in original order
-            for i, completed_task in enumerate(completed_tasks):
+            for i, completed_task in zip(indices, completed_tasks):
                 if isinstance(completed_task, Exception):
                     # Handle exception case
                     if isinstance(completed_task, asyncio.CancelledError):
@@ -300,6 +555,8 @@ class AsyncAiClient:
             # Re-raise the exception
             raise
         
+        _fan_out_results(prompts, results, followers)
+        
         # Fill in any None results (shouldn't happen)
         for i, result in enumerate(results):
             if result is None:
@@ -320,17 +577,32 @@ class AsyncAiClient:
         prompt: str,
         semaphore: asyncio.Semaphore,
         return_format: str,
-        on_progress: callable,
-        total_prompts: int,
+        on_done: Optional[Callable[[int], None]],
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: str = "batch",
         **kwargs
     ) -> AskResult:
-        """Process a single prompt with semaphore control."""
+        """Process a single prompt with semaphore (or adaptive limiter) control.
+
+        ``on_done`` is called with the prompt's index once it has a result.
+        """
         start_time = time.time()
         
-        async with semaphore:
+        if limiter is None:
+            await semaphore.acquire()
+        else:
+            await limiter.acquire_async()
+        request_start = time.time()
+        error: Optional[BaseException] = None
+        
+        try:
             try:
-                response = await self.provider.ask(prompt, return_format=return_format, **kwargs)
+                with capture_usage() as reported:
+                    response = await self.ask(
+                        prompt, return_format=return_format, priority=priority, **kwargs
+                    )
                 duration = time.time() - start_time
+                usage = TokenUsage.combine(reported)
                 
                 result = AskResult(
                     prompt=prompt,
@@ -338,10 +610,12 @@ class AsyncAiClient:
                     error=None,
                     duration_s=duration,
                     model=self.settings.model,
-                    tokens_used=None
+                    tokens_used=usage.total_tokens if usage is not None else None,
+                    usage=usage,
                 )
                 
             except Exception as e:
+                error = e
                 duration = time.time() - start_time
                 result = AskResult(
                     prompt=prompt,
@@ -351,16 +625,20 @@ class AsyncAiClient:
                     model=self.settings.model,
                     tokens_used=None
                 )
+            except BaseException as e:
+                # Cancellation: release the slot without judging the provider
+                error = e
+                raise
             
-            # Update progress if callback provided
-            if on_progress:
-                try:
-                    on_progress(index + 1, total_prompts)
-                except (TypeError, ValueError, RuntimeError):
-                    # Don't let progress callback errors break processing
-                    pass
+            if on_done is not None:
+                on_done(index)
             
             return result
+        finally:
+            if limiter is None:
+                semaphore.release()
+            else:
+                limiter.release(time.time() - request_start, error)
     
     async def ask_many_with_retry(
         self,
@@ -0,0 +1,235 @@
+"""
+Offline Batch API jobs for large workloads.
+
+A batch job sends every prompt as one line of a JSONL file, lets the provider
+process them asynchronously (typically within 24 hours, at a discount and
+outside the per-minute rate limits), and maps the output file back to
+``AskResult`` objects in prompt order.
+
+Example:
+    job = client.submit_batch(prompts)
+    saved_id = job.job_id               # persist to resume later
+
+    job = client.resume_batch(saved_id)
+    results = job.wait(poll_interval_s=60).results()
+"""
+
+import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from .models import AskResult
+
+if TYPE_CHECKING:
+    from .client import AiClient
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+RETURN_FORMAT_METADATA_KEY = "ai_utilities_return_format"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+# Request params the chat providers put in the completion body; ``ask`` drops
+# every other setting or keyword argument, so batch lines do the same.
+BATCH_BODY_PARAMS = ("model", "temperature", "max_tokens")
+
+
+def _custom_id(index: int) -> str:
+    return f"request-{index}"
+
+
+def _index_from_custom_id(custom_id: str) -> Optional[int]:
+    prefix, _, number = custom_id.rpartition("-")
+    if prefix != "request" or not number.isdigit():
+        return None
+    return int(number)
+
+
+def build_batch_input(prompts: Sequence[str], body_params: Dict[str, Any]) -> bytes:
+    """Build the JSONL input file for a chat completions batch.
+
+    Args:
+        prompts: Prompts in order; line ``i`` gets custom_id ``request-i``
+        body_params: Chat completion parameters shared by every request
+
+    Returns:
+        JSONL file content
+    """
+    lines = []
+    for index, prompt in enumerate(prompts):
+        body = dict(body_params)
+        body["messages"] = [{"role": "user", "content": prompt}]
+        lines.append(json.dumps({
+            "custom_id": _custom_id(index),
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body,
+        }))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _parse_jsonl(content: bytes) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip()]
+
+
+class BatchJob:
+    """Handle for a provider batch job created by ``AiClient.submit_batch``.
+
+    The job is identified by ``job_id`` alone, so it can be resumed from a
+    saved id in another process with ``AiClient.resume_batch``.
+    """
+
+    def __init__(
+        self,
+        client: "AiClient",
+        job_id: str,
+        *,
+        prompts: Optional[Sequence[str]] = None,
+        info: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize a batch job handle.
+
+        Args:
+            client: Client whose provider owns the job
+            job_id: Provider batch job ID
+            prompts: Prompts in submission order (recovered from the input
+                file when resuming without them)
+            info: Last known job info from the provider
+        """
+        self.client = client
+        self.job_id = job_id
+        self._prompts = list(prompts) if prompts is not None else None
+        self.info: Dict[str, Any] = dict(info or {})
+
+    @property
+    def status(self) -> Optional[str]:
+        """Last known job status (e.g. "validating", "in_progress", "completed")."""
+        return self.info.get("status")
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has reached a terminal status."""
+        return self.status in TERMINAL_STATUSES
+
+    @property
+    def return_format(self) -> str:
+        """Return format recorded in the job metadata at submission."""
+        return self.info.get("metadata", {}).get(RETURN_FORMAT_METADATA_KEY, "text")
+
+    def refresh(self) -> Dict[str, Any]:
+        """Fetch the current job info from the provider.
+
+        Returns:
+            Updated job info
+        """
+        self.info = self.client.provider.retrieve_batch(self.job_id)
+        return self.info
+
+    def wait(self, *, poll_interval_s: float = 30.0, timeout_s: Optional[float] = None) -> "BatchJob":
+        """Poll until the job reaches a terminal status.
+
+        Args:
+            poll_interval_s: Seconds between status checks
+            timeout_s: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            This job, for chaining with ``results()``
+
+        Raises:
+            TimeoutError: If the job is still running after ``timeout_s``
+        """
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        self.refresh()
+        while not self.done:
+            if deadline is not None and time.monotonic() + poll_interval_s > deadline:
+                raise TimeoutError(
+                    f"Batch {self.job_id} still '{self.status}' after {timeout_s}s"
+                )
+            time.sleep(poll_interval_s)
+            self.refresh()
+        return self
+
+    def cancel(self) -> Dict[str, Any]:
+        """Request cancellation; completed requests remain retrievable.
+
+        Returns:
+            Job info after the cancellation request
+        """
+        self.info = self.client.provider.cancel_batch(self.job_id)
+        return self.info
+
+    def results(self) -> List[AskResult]:
+        """Download the output and map it back to prompts in order.
+
+        Requests that failed, or that a cancelled/expired job never ran, are
+        returned as AskResults with ``error`` set.
+
+        Returns:
+            One AskResult per submitted prompt, in submission order
+
+        Raises:
+            ValueError: If the job has not finished yet
+        """
+        if not self.done:
+            self.refresh()
+        if not self.done:
+            raise ValueError(f"Batch {self.job_id} has not finished (status: {self.status})")
+
+        prompts = self._load_prompts()
+        entries: Dict[int, Dict[str, Any]] = {}
+        for file_key in ("output_file_id", "error_file_id"):
+            file_id = self.info.get(file_key)
+            if not file_id:
+                continue
+            for entry in _parse_jsonl(self.client.provider.download_file(file_id)):
+                index = _index_from_custom_id(str(entry.get("custom_id", "")))
+                if index is not None and index < len(prompts):
+                    entries.setdefault(index, entry)
+
+        missing_error = f"No result returned (batch status: {self.status})"
+        return [
+            self._to_ask_result(prompt, entries.get(index), missing_error)
+            for index, prompt in enumerate(prompts)
+        ]
+
+    def _load_prompts(self) -> List[str]:
+        if self._prompts is None:
+            input_lines = _parse_jsonl(
+                self.client.provider.download_file(self.info["input_file_id"])
+            )
+            prompts: Dict[int, str] = {}
+            for line in input_lines:
+                index = _index_from_custom_id(str(line.get("custom_id", "")))
+                if index is not None:
+                    prompts[index] = line["body"]["messages"][-1]["content"]
+            self._prompts = [prompts.get(i, "") for i in range(max(prompts, default=-1) + 1)]
+        return self._prompts
+
+    def _to_ask_result(
+        self, prompt: str, entry: Optional[Dict[str, Any]], missing_error: str
+    ) -> AskResult:
+        if entry is None:
+            return AskResult(prompt=prompt, response=None, error=missing_error, duration_s=0.0)
+
+        response = entry.get("response") or {}
+        body = response.get("body") or {}
+        error = entry.get("error")
+        if error is None and response.get("status_code") != 200:
+            error = body.get("error") or {"message": f"HTTP {response.get('status_code')}"}
+        if error is not None:
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            return AskResult(
+                prompt=prompt, response=None, error=message, duration_s=0.0, model=body.get("model")
+            )
+
+        content = body["choices"][0]["message"].get("content") or ""
+        if self.return_format == "json":
+            try:
+                content = json.loads(content)
+            except json.JSONDecodeError:
+                content = {"response": content}
+        return AskResult(
+            prompt=prompt,
+            response=content,
+            error=None,
+            duration_s=0.0,
+            tokens_used=(body.get("usage") or {}).get("total_tokens"),
+            model=body.get("model"),
+        )
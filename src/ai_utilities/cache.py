@@ -5,16 +5,34 @@ Provides cache backends and utilities for deterministic, safe caching
 of AI responses with configurable TTL and opt-in behavior.
 """
 
+import atexit
 import hashlib
 import json
+import logging
+import math
+import os
 import re
 import sqlite3
+import struct
+import sys
 import threading
 import time
+import weakref
+import zlib
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+try:
+    import zstandard as _zstandard
+except ImportError:
+    _zstandard = None
+
+logger = logging.getLogger(__name__)
 
 
 class CacheBackend(ABC):
@@ -46,6 +64,26 @@ class CacheBackend(ABC):
     def clear(self) -> None:
         """Clear all cached values. Optional but useful for tests."""
         pass
+    
+    def get_with_expiry(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Get value from cache together with its expiry time.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            The value (None if not found/expired) and its expiry as a
+            ``time.time()`` timestamp, or None if it does not expire or the
+            backend does not know
+        """
+        return self.get(key), None
+    
+    def touch(self, key: str) -> None:
+        """Count a hit on ``key`` that a cache in front of this one served.
+        
+        Backends that evict by recency override this; the default ignores it.
+        """
+        pass
 
 
 class NullCache(CacheBackend):
@@ -64,37 +102,93 @@ class NullCache(CacheBackend):
         pass
 
 
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a MemoryCache since it was created."""
+    
+    hits: int
+    misses: int
+    evictions: int  # Entries dropped to stay within max_entries / max_bytes
+    expirations: int  # Entries dropped because their TTL passed
+    entries: int
+    bytes: int  # Approximate size of the cached keys and values
+
+
+def _approximate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached key or value in bytes."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _approximate_size(k) + _approximate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+# Fewest writes between two sweeps of a MemoryCache for expired entries
+_MIN_SWEEP_INTERVAL = 16
+
+
 class MemoryCache(CacheBackend):
-    """Thread-safe in-memory cache with optional TTL support."""
+    """Thread-safe in-memory cache with optional TTL support and size bounds.
+    
+    With ``max_entries`` or ``max_bytes`` set, the least recently used entries
+    are evicted to stay within them, in O(1) per entry. Expired entries are
+    dropped when read, and swept in bulk once the cache has taken as many
+    writes as it held entries after the previous sweep, so expiry costs
+    amortized O(1) per write.
+    """
     
-    def __init__(self, default_ttl_s: Optional[int] = None):
+    def __init__(
+        self,
+        default_ttl_s: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
         """Initialize memory cache.
         
         Args:
             default_ttl_s: Default TTL in seconds for entries without explicit TTL
+            max_entries: Maximum number of entries (None for no limit)
+            max_bytes: Maximum approximate size of keys and values (None for no limit)
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # Least recently used first
         self._lock = threading.RLock()
         self._default_ttl_s = default_ttl_s
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._writes_since_sweep = 0
+        self._sweep_after = _MIN_SWEEP_INTERVAL
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache, respecting TTL."""
         with self._lock:
-            if key not in self._cache:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
                 return None
             
-            entry = self._cache[key]
             expires_at = entry.get("expires_at")
             
             # Check if expired
             if expires_at is not None and time.time() > expires_at:
-                del self._cache[key]
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
                 return None
             
+            self._cache.move_to_end(key)
+            self._hits += 1
             return entry["value"]
     
     def set(self, key: str, value: Any, ttl_s: Optional[int] = None) -> None:
-        """Set value in cache with TTL."""
+        """Set value in cache with TTL, evicting least recently used entries if over a limit."""
+        size = _approximate_size(key) + _approximate_size(value)
         with self._lock:
             # Use provided TTL or default
             actual_ttl = ttl_s if ttl_s is not None else self._default_ttl_s
@@ -103,16 +197,37 @@ class MemoryCache(CacheBackend):
             if actual_ttl is not None:
                 expires_at = time.time() + actual_ttl
             
+            if key in self._cache:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Could never fit; admitting it would only flush everything else
+                self._evictions += 1
+                return
+            
             self._cache[key] = {
                 "value": value,
                 "expires_at": expires_at,
                 "created_at": time.time(),
+                "size": size,
             }
+            self._bytes += size
+            
+            self._writes_since_sweep += 1
+            if self._writes_since_sweep >= self._sweep_after:
+                self._clean_expired()
+            
+            while (self.max_entries is not None and len(self._cache) > self.max_entries) or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= evicted["size"]
+                self._evictions += 1
     
     def clear(self) -> None:
         """Clear all cached values."""
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
     
     def size(self) -> int:
         """Get number of cached entries."""
@@ -121,15 +236,34 @@ class MemoryCache(CacheBackend):
             self._clean_expired()
             return len(self._cache)
     
+    def stats(self) -> CacheStats:
+        """Return hit, miss, eviction and expiration counts and the current size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._cache),
+                bytes=self._bytes,
+            )
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry. Must be called with lock held."""
+        self._bytes -= self._cache.pop(key)["size"]
+    
     def _clean_expired(self) -> None:
         """Remove expired entries. Must be called with lock held."""
+        self._writes_since_sweep = 0
         current_time = time.time()
         expired_keys = [
             key for key, entry in self._cache.items()
             if entry.get("expires_at") is not None and current_time > entry["expires_at"]
         ]
         for key in expired_keys:
-            del self._cache[key]
+            self._remove(key)
+        self._expirations += len(expired_keys)
+        self._sweep_after = max(len(self._cache), _MIN_SWEEP_INTERVAL)
 
 
 def stable_hash(data: Any) -> str:
@@ -164,6 +298,19 @@ class SqliteCache(CacheBackend):
     """SQLite-based persistent cache backend with namespace support.
     
     Provides thread-safe, persistent caching with TTL, LRU eviction, and namespace isolation.
+    Connections are pooled: each thread reads through its own connection and
+    all writes go through one serialized connection. Call ``close()`` to
+    release them.
+    
+    A cache hit is a pure read: access statistics are buffered in memory and
+    written in batches by a background flusher (and before LRU pruning, and
+    at exit), so readers never contend for the write lock.
+    
+    Values are stored as JSON text by default. With ``compress_min_bytes``,
+    larger values are stored as a compressed BLOB (zstd if ``zstandard`` is
+    installed, zlib otherwise); with ``float32_vectors``, float vectors and
+    matrices such as embeddings are stored as packed float32. Rows of either
+    kind are readable whatever the options of the cache reading them.
     """
     
     def __init__(
@@ -176,6 +323,10 @@ class SqliteCache(CacheBackend):
         default_ttl_s: Optional[int] = None,
         max_entries: Optional[int] = None,
         prune_batch: int = 200,
+        access_flush_interval_s: float = 5.0,
+        access_flush_threshold: int = 1000,
+        compress_min_bytes: Optional[int] = None,
+        float32_vectors: bool = False,
     ):
         """Initialize SQLite cache.
         
@@ -188,6 +339,12 @@ class SqliteCache(CacheBackend):
             default_ttl_s: Default TTL for entries (None for no expiration)
             max_entries: Maximum entries per namespace (LRU eviction)
             prune_batch: Batch size for LRU pruning operations
+            access_flush_interval_s: Seconds between background writes of buffered access statistics
+            access_flush_threshold: Number of buffered keys that triggers an early write
+            compress_min_bytes: Compress values whose JSON is at least this many
+                bytes (None to store all values as JSON text)
+            float32_vectors: Store lists of floats, and lists of equally long
+                float lists, as packed float32 (lossy beyond float32 precision)
         """
         self.db_path = db_path
         self.table = self._validate_table_name(table)
@@ -197,6 +354,43 @@ class SqliteCache(CacheBackend):
         self.default_ttl_s = default_ttl_s
         self.max_entries = max_entries
         self.prune_batch = prune_batch
+        self.access_flush_interval_s = access_flush_interval_s
+        self.access_flush_threshold = access_flush_threshold
+        self.compress_min_bytes = compress_min_bytes
+        self.float32_vectors = float32_vectors
+        
+        # Statements of the hot paths, built once so SQLite's per-connection
+        # statement cache reuses their prepared form
+        self._select_sql = (
+            f"SELECT value_json, expires_at, value_blob, value_codec FROM {self.table} "  # nosec: B608 - table name validated
+            "WHERE namespace = ? AND key = ?"
+        )
+        self._delete_sql = f"DELETE FROM {self.table} WHERE namespace = ? AND key = ?"  # nosec: B608 - table name validated
+        self._touch_sql = (
+            f"UPDATE {self.table} SET access_count = access_count + ?, "  # nosec: B608 - table name validated
+            "last_access_at = MAX(last_access_at, ?) WHERE namespace = ? AND key = ?"
+        )
+        self._insert_sql = (
+            f"INSERT OR REPLACE INTO {self.table} "  # nosec: B608 - table name validated
+            "(namespace, key, value_json, value_blob, value_codec, created_at, expires_at, "
+            "access_count, last_access_at) VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)"
+        )
+        
+        # Connection pool: one read connection per thread and a single
+        # write connection that callers take turns on
+        self._local = threading.local()
+        self._readers: Dict[int, sqlite3.Connection] = {}
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._generation = 0  # Bumped by close() to retire thread-local readers
+        self._pid = os.getpid()
+        
+        # Hits not yet written to the table: key -> [count, last access time]
+        self._touches: Dict[str, List[float]] = {}
+        self._touch_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
         
         # Create database and tables
         self._init_database()
@@ -241,23 +435,15 @@ class SqliteCache(CacheBackend):
         # Ensure parent directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with sqlite3.connect(
-            self.db_path,
-            check_same_thread=False,
-            timeout=self.busy_timeout_ms / 1000.0
-        ) as conn:
-            # Set pragmas
-            if self.wal:
-                conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
-            
+        with self._writing() as conn:
             # Create table with namespace-aware primary key
             conn.execute(f"""
                 CREATE TABLE IF NOT EXISTS {self.table} (
                     namespace TEXT NOT NULL,
                     key TEXT NOT NULL,
                     value_json TEXT NOT NULL,
+                    value_blob BLOB NULL,
+                    value_codec TEXT NULL,
                     created_at REAL NOT NULL,
                     expires_at REAL NULL,
                     access_count INTEGER NOT NULL DEFAULT 0,
@@ -266,6 +452,12 @@ class SqliteCache(CacheBackend):
                 )
             """)  # nosec: B608 - table name validated
             
+            # Tables created before values could be stored as BLOBs
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+            for column, column_type in (("value_blob", "BLOB"), ("value_codec", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {column} {column_type} NULL")  # nosec: B608 - table name validated
+            
             # Create indexes for performance
             conn.execute(f"""
                 CREATE INDEX IF NOT EXISTS idx_{self.table}_expires 
@@ -276,8 +468,91 @@ class SqliteCache(CacheBackend):
                 CREATE INDEX IF NOT EXISTS idx_{self.table}_access 
                 ON {self.table} (namespace, last_access_at)
             """)  # nosec: B608 - table name validated
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a pooled connection with the cache's pragmas applied.
+        
+        Connections run in autocommit mode, so a reader never holds a
+        snapshot (or, without WAL, a shared lock) between calls.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000.0,
+            isolation_level=None,
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def _check_pid(self) -> None:
+        """Forget connections inherited across fork(); the child must not use them."""
+        # Called with self._pool_lock held
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._readers = {}
+            self._writer = None
+            self._generation += 1
+    
+    def _reader(self) -> sqlite3.Connection:
+        """Return the calling thread's read connection, opening it on first use."""
+        local = self._local
+        if getattr(local, "generation", None) == self._generation and self._pid == os.getpid():
+            return local.conn
+        
+        with self._pool_lock:
+            self._check_pid()
+            # Threads that have exited no longer need their connections
+            alive = {thread.ident for thread in threading.enumerate()}
+            for ident in [ident for ident in self._readers if ident not in alive]:
+                self._readers.pop(ident).close()
             
-            conn.commit()
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            stale = self._readers.get(threading.get_ident())
+            if stale is not None:
+                stale.close()
+            self._readers[threading.get_ident()] = conn
+            local.conn = conn
+            local.generation = self._generation
+            return conn
+    
+    @contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        """Run the block as one transaction on the single, serialized write connection."""
+        with self._write_lock:
+            with self._pool_lock:
+                self._check_pid()
+                if self._writer is None:
+                    self._writer = self._connect()
+                    if self.wal:
+                        self._writer.execute("PRAGMA journal_mode=WAL")
+                conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """Write buffered access statistics and close every pooled connection.
+        
+        The cache stays usable; the next call opens new connections.
+        """
+        self.flush()
+        with self._write_lock, self._pool_lock:
+            connections = list(self._readers.values())
+            if self._writer is not None:
+                connections.append(self._writer)
+            self._readers = {}
+            self._writer = None
+            self._generation += 1
+            # Connections inherited across fork() belong to the parent
+            if self._pid == os.getpid():
+                for conn in connections:
+                    conn.close()
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache.
@@ -288,53 +563,108 @@ class SqliteCache(CacheBackend):
         Returns:
             Cached value or None if not found/expired
         """
-        with sqlite3.connect(
-            self.db_path,
-            check_same_thread=False,
-            timeout=self.busy_timeout_ms / 1000.0
-        ) as conn:
-            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
-            
-            cursor = conn.execute(f"""
-                SELECT value_json, expires_at FROM {self.table}
-                WHERE namespace = ? AND key = ?
-            """, (self.namespace, key))  # nosec: B608 - table name validated
-            
-            row = cursor.fetchone()
-            if row is None:
-                return None
-            
-            value_json, expires_at = row
-            
-            # Check expiration
-            if expires_at is not None and time.time() > expires_at:
-                # Delete expired entry
-                conn.execute(f"""
-                    DELETE FROM {self.table}
-                    WHERE namespace = ? AND key = ?
-                """, (self.namespace, key))  # nosec: B608 - table name validated
-                conn.commit()
-                return None
-            
-            # Update access statistics
-            conn.execute(f"""
-                UPDATE {self.table}
-                SET access_count = access_count + 1, last_access_at = ?
-                WHERE namespace = ? AND key = ?
-            """, (time.time(), self.namespace, key))  # nosec: B608 - table name validated
-            conn.commit()
-            
-            # Deserialize and return value
+        return self.get_with_expiry(key)[0]
+    
+    def get_with_expiry(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Get value from cache together with its ``expires_at`` timestamp."""
+        # fetchall() finishes the statement, so no read lock outlives the call
+        rows = self._reader().execute(self._select_sql, (self.namespace, key)).fetchall()
+        if not rows:
+            return None, None
+        
+        value_json, expires_at, value_blob, value_codec = rows[0]
+        
+        # Check expiration
+        if expires_at is not None and time.time() > expires_at:
+            # Delete expired entry
+            with self._writing() as conn:
+                conn.execute(self._delete_sql, (self.namespace, key))
+            return None, None
+        
+        # Deserialize value
+        try:
+            value = _decode_value(value_json, value_blob, value_codec)
+        except _CodecUnavailable:
+            # Written by a process with zstandard installed; leave it for those
+            return None, None
+        except (json.JSONDecodeError, ValueError, zlib.error, struct.error):
+            # Remove corrupted entry
+            with self._writing() as conn:
+                conn.execute(self._delete_sql, (self.namespace, key))
+            return None, None
+        
+        self.touch(key)
+        return value, expires_at
+    
+    def touch(self, key: str) -> None:
+        """Buffer one hit on ``key`` for the background flusher."""
+        with self._touch_lock:
+            touch = self._touches.get(key)
+            if touch is None:
+                self._touches[key] = [1, time.time()]
+                if len(self._touches) >= self.access_flush_threshold:
+                    self._flush_requested.set()
+            else:
+                touch[0] += 1
+                touch[1] = time.time()
+            # A flusher inherited across fork() is not running in this process
+            if self._flusher is None or not self._flusher.is_alive():
+                _caches_with_touches.add(self)
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="ai_utilities-cache-flush", daemon=True
+                )
+                self._flusher.start()
+    
+    def _take_touches(self) -> Dict[str, List[float]]:
+        with self._touch_lock:
+            touches, self._touches = self._touches, {}
+            return touches
+    
+    def _write_touches(self, conn: sqlite3.Connection, touches: Dict[str, List[float]]) -> None:
+        if touches:
+            conn.executemany(self._touch_sql, [
+                (count, last_access_at, self.namespace, key)
+                for key, (count, last_access_at) in touches.items()
+            ])
+    
+    def flush(self) -> None:
+        """Write buffered access statistics to the table.
+        
+        Called by the background flusher, before LRU pruning, by ``close()``
+        and at interpreter exit.
+        """
+        touches = self._take_touches()
+        if not touches:
+            return
+        try:
+            with self._writing() as conn:
+                self._write_touches(conn, touches)
+        except BaseException:
+            # Keep the hits for the next attempt, merged with any recorded since
+            with self._touch_lock:
+                for key, (count, last_access_at) in touches.items():
+                    touch = self._touches.setdefault(key, [0, last_access_at])
+                    touch[0] += count
+                    touch[1] = max(touch[1], last_access_at)
+            raise
+    
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_requested.wait(self.access_flush_interval_s)
+            self._flush_requested.clear()
             try:
-                return json.loads(value_json)
-            except (json.JSONDecodeError, ValueError):
-                # Remove corrupted entry
-                conn.execute(f"""
-                    DELETE FROM {self.table}
-                    WHERE namespace = ? AND key = ?
-                """, (self.namespace, key))  # nosec: B608 - table name validated
-                conn.commit()
-                return None
+                self.flush()
+            except Exception as e:
+                # The hits stay buffered; the next cache hit starts a new flusher
+                logger.warning("Failed to write cache access statistics to %s: %s", self.db_path, e)
+                with self._touch_lock:
+                    self._flusher = None
+                return
+            with self._touch_lock:
+                if not self._touches:
+                    # Idle: exit rather than keep a thread per cache alive
+                    self._flusher = None
+                    return
     
     def set(self, key: str, value: Any, ttl_s: Optional[int] = None) -> None:
         """Set value in cache.
@@ -345,10 +675,21 @@ class SqliteCache(CacheBackend):
             ttl_s: TTL in seconds (overrides default)
         """
         # Serialize value
-        try:
-            value_json = json.dumps(value, sort_keys=True, separators=(",", ":"))
-        except (TypeError, ValueError) as e:
-            raise ValueError(f"Value must be JSON-serializable: {e}")
+        value_blob = _pack_float32(value) if self.float32_vectors else None
+        if value_blob is not None:
+            value_json, value_codec = "", _CODEC_FLOAT32
+        else:
+            try:
+                value_json = json.dumps(value, sort_keys=True, separators=(",", ":"))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Value must be JSON-serializable: {e}")
+            value_codec = None
+            if self.compress_min_bytes is not None:
+                # The threshold is in bytes; the same bytes are what gets compressed
+                value_bytes = value_json.encode("utf-8")
+                if len(value_bytes) >= self.compress_min_bytes:
+                    value_blob, value_codec = _compress(value_bytes)
+                    value_json = ""
         
         # Calculate expiration
         ttl = ttl_s if ttl_s is not None else self.default_ttl_s
@@ -356,41 +697,30 @@ class SqliteCache(CacheBackend):
         
         current_time = time.time()
         
-        with sqlite3.connect(
-            self.db_path,
-            check_same_thread=False,
-            timeout=self.busy_timeout_ms / 1000.0
-        ) as conn:
-            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
-            
+        with self._touch_lock:
+            # Hits on the value being replaced must not count for the new one
+            self._touches.pop(key, None)
+        
+        with self._writing() as conn:
             # Insert or replace entry
-            conn.execute(f"""
-                INSERT OR REPLACE INTO {self.table}
-                (namespace, key, value_json, created_at, expires_at, access_count, last_access_at)
-                VALUES (?, ?, ?, ?, ?, 1, ?)
-            """, (
-                self.namespace, key, value_json, current_time, expires_at, current_time
-            ))  # nosec: B608 - table name validated
+            conn.execute(self._insert_sql, (
+                self.namespace, key, value_json, value_blob, value_codec,
+                current_time, expires_at, current_time
+            ))
             
-            # Prune if necessary
+            # Prune if necessary, by access times that include buffered hits
             if self.max_entries is not None:
+                self._write_touches(conn, self._take_touches())
                 self._prune_namespace(conn)
-            
-            conn.commit()
     
     def clear(self) -> None:
         """Clear all entries in current namespace."""
-        with sqlite3.connect(
-            self.db_path,
-            check_same_thread=False,
-            timeout=self.busy_timeout_ms / 1000.0
-        ) as conn:
-            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        self._take_touches()
+        with self._writing() as conn:
             conn.execute(f"""
                 DELETE FROM {self.table}
                 WHERE namespace = ?
             """, (self.namespace,))  # nosec: B608 - table name validated
-            conn.commit()
     
     def _prune_namespace(self, conn: sqlite3.Connection) -> None:
         """Prune entries in current namespace to stay within max_entries.
@@ -421,15 +751,180 @@ class SqliteCache(CacheBackend):
     
     def clear_all_namespaces(self) -> None:
         """Clear all entries in all namespaces (for internal/dev use)."""
-        with sqlite3.connect(
-            self.db_path,
-            check_same_thread=False,
-            timeout=self.busy_timeout_ms / 1000.0
-        ) as conn:
-            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        self._take_touches()
+        with self._writing() as conn:
             conn.execute(f"DELETE FROM {self.table}")  # nosec: B608 - table name validated
-            conn.commit()
+
+
+# Encodings of the value_blob column (value_codec); NULL means value_json holds the value
+_CODEC_ZLIB = "zlib"
+_CODEC_ZSTD = "zstd"
+_CODEC_FLOAT32 = "f32"
+
+# Float lists shorter than this are left as JSON: too small to be worth packing
+_MIN_PACKED_FLOATS = 64
+_FLOAT32_MAX = 3.4028234663852886e38
+
+
+class _CodecUnavailable(Exception):
+    """A stored value needs a codec that is not installed."""
+
+
+def _compress(data: bytes) -> "tuple[bytes, str]":
+    """Compress JSON bytes with zstd if available, otherwise zlib."""
+    if _zstandard is not None:
+        return _zstandard.ZstdCompressor(level=3).compress(data), _CODEC_ZSTD
+    return zlib.compress(data, 6), _CODEC_ZLIB
+
+
+def _pack_float32(value: Any) -> Optional[bytes]:
+    """Pack a list of floats, or a list of equally long float lists, as little-endian float32.
+    
+    The blob starts with the number of rows (0 for a flat list). Returns None
+    for any other value, short lists, and floats outside the float32 range.
+    """
+    if not isinstance(value, list) or not value:
+        return None
+    if isinstance(value[0], list):
+        width = len(value[0])
+        if not width or any(not isinstance(row, list) or len(row) != width for row in value):
+            return None
+        rows, flat = len(value), [x for row in value for x in row]
+    else:
+        rows, flat = 0, value
+    if len(flat) < _MIN_PACKED_FLOATS:
+        return None
+    # NaN and infinities survive float32; only finite overflow would not
+    if not all(type(x) is float and (abs(x) <= _FLOAT32_MAX or not math.isfinite(x)) for x in flat):
+        return None
+    packed = array("f", flat)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return struct.pack("<I", rows) + packed.tobytes()
+
+
+def _unpack_float32(blob: bytes) -> List[Any]:
+    (rows,) = struct.unpack_from("<I", blob)
+    packed = array("f")
+    packed.frombytes(blob[4:])
+    if sys.byteorder == "big":
+        packed.byteswap()
+    flat = packed.tolist()
+    if not rows:
+        return flat
+    width = len(flat) // rows
+    return [flat[i * width:(i + 1) * width] for i in range(rows)]
+
+
+def _decode_value(value_json: str, value_blob: Optional[bytes], value_codec: Optional[str]) -> Any:
+    """Decode a stored value from whichever column and encoding it was written with."""
+    if value_codec is None:
+        return json.loads(value_json)
+    if value_blob is None:
+        # Treated like any other corrupted entry by SqliteCache.get
+        raise ValueError(f"Corrupted cache entry: codec {value_codec!r} but no value_blob")
+    if value_codec == _CODEC_FLOAT32:
+        return _unpack_float32(value_blob)
+    if value_codec == _CODEC_ZLIB:
+        return json.loads(zlib.decompress(value_blob))
+    if value_codec == _CODEC_ZSTD:
+        if _zstandard is None:
+            raise _CodecUnavailable(value_codec)
+        return json.loads(_zstandard.ZstdDecompressor().decompress(value_blob))
+    raise ValueError(f"Unknown cache value codec {value_codec!r}")
+
+
+# How long TieredCache keeps an L1 copy by default, bounding how stale it can get
+_DEFAULT_L1_TTL_S = 300
+
+
+class TieredCache(CacheBackend):
+    """Bounded in-process MemoryCache (L1) in front of a persistent backend (L2).
+    
+    Reads are served from L1 when possible and otherwise read through to L2,
+    copying hits into L1. Writes go to both tiers. L2 keeps entries across
+    restarts and shares them between processes; L1 only saves the L2 read and
+    decode for hot keys. An L1 copy never outlives the L2 entry, and can lag
+    a change another process makes in L2 by at most ``l1_ttl_s``. L1 hits
+    are passed on to L2, so its LRU eviction still sees the hot keys.
+    """
+    
+    def __init__(
+        self,
+        l2: CacheBackend,
+        l1: Optional[MemoryCache] = None,
+        l1_ttl_s: Optional[int] = _DEFAULT_L1_TTL_S,
+        l1_max_entries: Optional[int] = 1024,
+        l1_max_bytes: Optional[int] = None,
+    ):
+        """Initialize tiered cache.
+        
+        Args:
+            l2: Persistent backend, e.g. a SqliteCache
+            l1: In-memory tier (default: a MemoryCache built from the ``l1_*`` options)
+            l1_ttl_s: Longest time an entry stays in L1 (None for no limit beyond
+                the entry's TTL, which lets L1 serve changes other processes
+                made in L2 late for as long as the entry lives)
+            l1_max_entries: Maximum entries in the default L1
+            l1_max_bytes: Maximum approximate size of the default L1
+        """
+        self.l2 = l2
+        self.l1 = l1 if l1 is not None else MemoryCache(
+            default_ttl_s=l1_ttl_s, max_entries=l1_max_entries, max_bytes=l1_max_bytes
+        )
+        self.l1_ttl_s = l1_ttl_s
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from L1, or from L2 (then kept in L1 until the L2 entry expires at the latest)."""
+        value = self.l1.get(key)
+        if value is not None:
+            self.l2.touch(key)
+            return value
+        value, expires_at = self.l2.get_with_expiry(key)
+        if value is not None:
+            ttl_s = self.l1_ttl_s
+            if expires_at is not None:
+                remaining_s = max(1, math.ceil(expires_at - time.time()))
+                ttl_s = remaining_s if ttl_s is None else min(ttl_s, remaining_s)
+            self.l1.set(key, value, ttl_s=ttl_s)
+        return value
+    
+    def set(self, key: str, value: Any, ttl_s: Optional[int] = None) -> None:
+        """Set value in both tiers; L1 keeps it for the shorter of ``ttl_s`` and ``l1_ttl_s``."""
+        self.l2.set(key, value, ttl_s=ttl_s)
+        if ttl_s is None or self.l1_ttl_s is None:
+            l1_ttl_s = ttl_s if ttl_s is not None else self.l1_ttl_s
+        else:
+            l1_ttl_s = min(ttl_s, self.l1_ttl_s)
+        self.l1.set(key, value, ttl_s=l1_ttl_s)
+    
+    def clear(self) -> None:
+        """Clear both tiers."""
+        self.l1.clear()
+        self.l2.clear()
+    
+    def close(self) -> None:
+        """Close L2 if it holds resources (e.g. SqliteCache connections)."""
+        close = getattr(self.l2, "close", None)
+        if callable(close):
+            close()
+
+
+_caches_with_touches: "weakref.WeakSet[SqliteCache]" = weakref.WeakSet()
+
+
+def _flush_access_stats() -> None:
+    """Write the buffered access statistics of every SqliteCache in this process."""
+    for cache in list(_caches_with_touches):
+        try:
+            cache.flush()
+        except Exception as e:
+            logger.warning("Failed to write cache access statistics to %s: %s", cache.db_path, e)
+
+
+# Buffered hits should still reach the LRU order after a normal interpreter exit
+atexit.register(_flush_access_stats)
 
 
 # Type alias for cache backends
-CacheBackendType = Union[NullCache, MemoryCache, SqliteCache]
+CacheBackendType = Union[NullCache, MemoryCache, SqliteCache, TieredCache]
@@ -5,12 +5,19 @@ This module provides the main AiClient class for explicit configuration
 without import-time side effects.
 """
 
+import contextvars
 import os
 import sys
+import tempfile
+import threading
 import time
-from collections.abc import Sequence
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Literal, Optional, TypeVar, Union
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Literal, Mapping, Optional, Tuple, TypeVar, Union
 
 # OpenAI imports for embeddings functionality - lazy import to avoid import-time side effects
 # import openai
@@ -20,19 +27,108 @@ from pydantic import BaseModel
 
 from pydantic import ValidationError
 
-from .cache import CacheBackend, MemoryCache, NullCache, SqliteCache, stable_hash
-from .config_models import AiSettings
+from .adaptive_concurrency import AdaptiveConcurrencyLimiter
+from .batch import (
+    BATCH_BODY_PARAMS,
+    BATCH_ENDPOINT,
+    RETURN_FORMAT_METADATA_KEY,
+    BatchJob,
+    build_batch_input,
+)
+from .cache import (
+    CacheBackend,
+    MemoryCache,
+    NullCache,
+    SqliteCache,
+    TieredCache,
+    normalize_prompt,
+    stable_hash,
+)
+from .config_models import AiSettings, ModelConfig
+from .error_codes import ERROR_RATE_LIMIT_EXCEEDED
+from .exceptions import RateLimitExceededError
 from .file_models import UploadedFile
+from .hedging import HedgeCancelled, RequestHedger
 from .json_parsing import JsonParseError, create_repair_prompt, parse_json_from_text
+from .metrics import MetricsRegistry
 from .models import AskResult
 from .progress_indicator import ProgressIndicator
+from .rate_limiter import (
+    RateLimitObserver,
+    ServerQuota,
+    TokenBucketRateLimiter,
+    observing,
+    shared_rate_limiter,
+    shared_server_quota,
+)
 from .providers.base_provider import BaseProvider
 from .providers.provider_exceptions import FileTransferError, ProviderCapabilityError, MissingOptionalDependencyError
+from .scheduling import RequestScheduler, get_default_scheduler
+from .single_flight import SingleFlight
+from .token_counter import TokenCounter
+from .token_usage import TokenUsage, capture_usage, report_usage
+from .usage_store import SqliteUsageStore, shared_usage_store
 from .usage_tracker import UsageScope, UsageStats, create_usage_tracker
 
 # Generic type for typed responses
 T = TypeVar("T", bound=BaseModel)
 
+# Settings fields that configure caching rather than the provider request
+_CACHE_SETTINGS = frozenset({
+    "cache_enabled",
+    "cache_backend",
+    "cache_ttl_s",
+    "cache_max_temperature",
+    "cache_memory_max_entries",
+    "cache_memory_max_bytes",
+    "cache_memory_ttl_s",
+    "cache_sqlite_path",
+    "cache_sqlite_table",
+    "cache_sqlite_wal",
+    "cache_sqlite_busy_timeout_ms",
+    "cache_sqlite_max_entries",
+    "cache_sqlite_prune_batch",
+    "cache_sqlite_compress_min_bytes",
+    "cache_sqlite_float32_vectors",
+    "cache_namespace",
+})
+
+# Settings fields left out of provider request params, per request type
+_ASK_MANY_EXCLUDED_SETTINGS = _CACHE_SETTINGS | {
+    "api_key",  # Providers already have this from initialization
+    "usage_scope",  # Internal usage tracking field
+    "usage_client_id",  # Internal usage tracking field
+    "usage_store_path",  # Internal usage tracking field
+    "update_check_days",  # Internal configuration field
+    "provider_pool",  # Provider pool configuration
+    "provider_pool_strategy",  # Provider pool configuration
+    "provider_pool_cooldown_s",  # Provider pool configuration
+    "rate_limit_enabled",  # Client-side rate limiting
+    "rate_limit_max_wait_s",  # Client-side rate limiting
+    "model_rate_limits",  # Client-side rate limiting
+    "rate_limit_sqlite_path",  # Client-side rate limiting
+}
+_JSON_EXCLUDED_SETTINGS = _ASK_MANY_EXCLUDED_SETTINGS | {
+    "provider",  # Not a per-request param
+    "base_url",  # Not a per-request param
+    "timeout",  # Provider init config, not a per-request param
+    "request_timeout_s",  # Provider init config, not a per-request param
+    "extra_headers",  # Provider init config, not a per-request param
+}
+_ASK_EXCLUDED_SETTINGS = _JSON_EXCLUDED_SETTINGS | {
+    "openai_api_key",  # Alias for api_key
+    # Knowledge-related settings (not supported by OpenAI API)
+    "knowledge_enabled",
+    "knowledge_db_path",
+    "knowledge_roots",
+    "knowledge_chunk_size",
+    "knowledge_chunk_overlap",
+    "knowledge_min_chunk_size",
+    "knowledge_max_file_size",
+    "knowledge_use_sqlite_extension",
+    "embedding_model",
+}
+
 
 def _sanitize_namespace(ns: str) -> str:
     """Sanitize namespace string to be safe for database use.
@@ -91,6 +187,234 @@ def _running_under_pytest() -> bool:
     return "PYTEST_CURRENT_TEST" in os.environ or "pytest" in sys.modules
 
 
+def _usage_store_for(settings: AiSettings) -> Optional[SqliteUsageStore]:
+    """Return the shared usage log store configured by ``usage_store_path``, if any."""
+    path = getattr(settings, "usage_store_path", None)
+    if not isinstance(path, (str, Path)):
+        return None
+    return shared_usage_store(path)
+
+
+@contextmanager
+def _metered_request(
+    model: Optional[str], limiter: Optional[RateLimitObserver] = None
+) -> Iterator[list[TokenUsage]]:
+    """Capture the usage reported inside the block and record the request with MetricsRegistry.
+
+    Rate limit headers of the responses received inside the block go to ``limiter``.
+    """
+    with capture_usage() as reported, observing(limiter), _recorded_request(model, reported):
+        yield reported
+
+
+@contextmanager
+def _recorded_request(model: Optional[str], reported: Sequence[TokenUsage]) -> Iterator[None]:
+    """Record the request made inside the block with MetricsRegistry, with the usage in ``reported``."""
+    start = time.time()
+    success = False
+    try:
+        yield
+        success = True
+    finally:
+        usage = TokenUsage.combine(reported)
+        MetricsRegistry().record_request(
+            success,
+            time.time() - start,
+            usage.total_tokens if usage is not None else 0,
+            # Strict check: a stand-in model from duck-typed settings must not become a label
+            model if isinstance(model, str) else "",
+            usage=usage,
+        )
+
+
+# Marks the end of a provider stream in _metered_deltas
+_STREAM_END = object()
+
+
+def _metered_deltas(
+    stream: Iterator[str], limiter: Optional[RateLimitObserver], reported: list[TokenUsage]
+) -> Iterator[str]:
+    """Yield the deltas of a provider stream, collecting the usage it reports into ``reported``.
+
+    Usage capture and rate limit observation are active only while the provider
+    produces a delta, so nothing the consumer does between deltas is counted.
+    """
+    while True:
+        with capture_usage() as step, observing(limiter):
+            delta = next(stream, _STREAM_END)
+        reported.extend(step)
+        if delta is _STREAM_END:
+            return
+        yield delta
+
+
+async def _metered_deltas_async(
+    stream: AsyncIterator[str], limiter: Optional[RateLimitObserver], reported: list[TokenUsage]
+) -> AsyncIterator[str]:
+    """Async version of ``_metered_deltas``."""
+    while True:
+        with capture_usage() as step, observing(limiter):
+            try:
+                delta = await stream.__anext__()
+            except StopAsyncIteration:
+                delta = _STREAM_END
+        reported.extend(step)
+        if delta is _STREAM_END:
+            return
+        yield delta
+
+
+def _unreserved_tokens(reported: list[TokenUsage], responses: Sequence[Any], charged: int) -> int:
+    """Tokens to charge a rate limiter once responses are in, beyond the ``charged`` prompt estimate.
+
+    Reported usage replaces the estimate (a negative result returns an
+    over-estimate); without it, response tokens are estimated from length.
+    """
+    usage = TokenUsage.combine(reported)
+    if usage is not None:
+        return usage.total_tokens - charged
+    return sum(len(str(response)) // 4 for response in responses)
+
+
+def _fold_duplicate_prompts(
+    prompts: Sequence[str], indices: Iterable[int]
+) -> Tuple[list[int], dict[int, list[int]]]:
+    """Group the prompts at ``indices`` that are identical once normalized.
+
+    All prompts of one batch share its request parameters, so equal
+    normalized prompts are equal requests.
+
+    Returns:
+        The first index of each distinct prompt, and for each of those the
+        later indices that can share its answer
+    """
+    leaders: list[int] = []
+    followers: dict[int, list[int]] = {}
+    first_index: dict[str, int] = {}
+    for index in indices:
+        prompt = prompts[index]
+        key = normalize_prompt(prompt) if isinstance(prompt, str) else None
+        if key is None or key not in first_index:
+            if key is not None:
+                first_index[key] = index
+            leaders.append(index)
+        else:
+            followers.setdefault(first_index[key], []).append(index)
+    return leaders, followers
+
+
+def _fan_out_results(
+    prompts: Sequence[str], results: list[Optional[AskResult]], followers: Mapping[int, list[int]]
+) -> None:
+    """Copy each answered prompt's result to the duplicates folded into it.
+
+    The copies are marked ``deduplicated`` and carry no token usage, since
+    only the original was sent to the provider.
+    """
+    for leader, indices in followers.items():
+        result = results[leader]
+        if result is None:
+            continue
+        for index in indices:
+            results[index] = result.model_copy(
+                update={"prompt": prompts[index], "tokens_used": None, "usage": None, "deduplicated": True}
+            )
+
+
+def _create_cache_backend(
+    settings: "AiSettings", cache: Optional[CacheBackend] = None
+) -> CacheBackend:
+    """Select the cache backend configured by settings.
+
+    Args:
+        settings: AI settings with cache_* configuration
+        cache: Optional explicit cache backend, used as-is when given
+
+    Returns:
+        Cache backend instance
+    """
+    if cache is not None:
+        # Explicit cache backend takes precedence
+        return cache
+    elif not settings.cache_enabled:
+        # Caching disabled
+        return NullCache()
+    elif settings.cache_backend == "memory":
+        # Use memory cache with configured TTL, bounded only if limits are set
+        return MemoryCache(default_ttl_s=settings.cache_ttl_s, **_memory_cache_limits(settings))
+    elif settings.cache_backend == "sqlite":
+        return _sqlite_cache_backend(settings)
+    elif settings.cache_backend == "tiered":
+        # Bounded memory tier in front of the SQLite cache; copies never outlive the SQLite entry
+        l1_options = {f"l1_{option}": value for option, value in _memory_cache_limits(settings).items()}
+        l1_ttl_s = _typed_setting(settings, "cache_memory_ttl_s", int)
+        if l1_ttl_s is not None:
+            l1_options["l1_ttl_s"] = l1_ttl_s
+        return TieredCache(_sqlite_cache_backend(settings), **l1_options)
+    else:
+        # Default to null cache
+        return NullCache()
+
+
+def _typed_setting(settings: "AiSettings", name: str, kind: type, default: Any = None) -> Any:
+    """Return ``settings.<name>`` if it is a ``kind``, otherwise ``default``.
+
+    Clients accept duck-typed settings (e.g. mocks in tests), so the switches
+    of optional features are read strictly: a stand-in attribute must not
+    enable a feature or become a limit.
+    """
+    value = getattr(settings, name, default)
+    return value if isinstance(value, kind) else default
+
+
+def _memory_cache_limits(settings: "AiSettings") -> dict[str, int]:
+    """Return the memory cache limits that settings set; unset limits keep the cache's defaults."""
+    limits = {
+        "max_entries": _typed_setting(settings, "cache_memory_max_entries", int),
+        "max_bytes": _typed_setting(settings, "cache_memory_max_bytes", int),
+    }
+    return {option: value for option, value in limits.items() if value is not None}
+
+
+def _sqlite_cache_backend(settings: "AiSettings") -> CacheBackend:
+    """Build the SQLite cache that settings configure."""
+    # SQLite cache with isolation rules for pytest
+    if _running_under_pytest() and settings.cache_sqlite_path is None:
+        # Strict isolation: disable SQLite cache in pytest unless explicit path
+        return NullCache()
+
+    # Determine database path
+    if settings.cache_sqlite_path is not None:
+        db_path = settings.cache_sqlite_path
+    else:
+        # Default to user home directory
+        db_path = Path.home() / ".ai_utilities" / "cache.sqlite"
+
+    # Determine namespace
+    if settings.cache_namespace is not None:
+        namespace = _sanitize_namespace(settings.cache_namespace)
+    else:
+        # Use pytest namespace when under pytest, otherwise default
+        if _running_under_pytest():
+            namespace = "pytest"
+        else:
+            namespace = _default_namespace()
+
+    # Create SQLite cache
+    return SqliteCache(
+        db_path=db_path,
+        table=settings.cache_sqlite_table,
+        namespace=namespace,
+        wal=settings.cache_sqlite_wal,
+        busy_timeout_ms=settings.cache_sqlite_busy_timeout_ms,
+        default_ttl_s=settings.cache_ttl_s,
+        max_entries=settings.cache_sqlite_max_entries,
+        prune_batch=settings.cache_sqlite_prune_batch,
+        compress_min_bytes=_typed_setting(settings, "cache_sqlite_compress_min_bytes", int),
+        float32_vectors=_typed_setting(settings, "cache_sqlite_float32_vectors", bool, False),
+    )
+
+
 class AiClient:
     """
     Main AI client for making requests to AI models.
@@ -136,6 +460,10 @@ class AiClient:
         usage_file: Optional[Path] = None,
         show_progress: bool = True,
         cache: Optional[CacheBackend] = None,
+        hedger: Optional[RequestHedger] = None,
+        hedge_settings: Optional["AiSettings"] = None,
+        hedge_provider: Optional[BaseProvider] = None,
+        scheduler: Optional[RequestScheduler] = None,
     ):
         """Initialize AI client with explicit settings.
 
@@ -146,6 +474,13 @@ class AiClient:
             usage_file: Custom file for usage tracking
             show_progress: Whether to show progress indicator during requests
             cache: Optional cache backend to override settings-based cache configuration
+            hedger: Optional RequestHedger; slow requests are then duplicated and
+                the first answer wins
+            hedge_settings: Settings for a secondary provider that receives the
+                duplicates (built with ``create_provider``); defaults to the primary
+            hedge_provider: Explicit secondary provider for the duplicates
+            scheduler: Optional RequestScheduler that provider calls wait on;
+                defaults to the process-wide one from ``set_default_scheduler``
 
         Note:
             The interactive setup has been moved to the CLI. Use 'ai-utilities setup'
@@ -170,62 +505,37 @@ class AiClient:
 
         self.provider = create_provider(settings, provider)
 
+        # Hedged duplicates go to a secondary provider if one is configured
+        self.hedger = hedger
+        self._hedge_settings = hedge_settings
+        if hedge_settings is not None or hedge_provider is not None:
+            self._hedge_provider = create_provider(hedge_settings or settings, hedge_provider)
+        else:
+            self._hedge_provider = self.provider
+
+        self.scheduler = scheduler
+
         # Initialize thread-safe usage tracker with configurable scope
         if track_usage:
             scope = UsageScope(settings.usage_scope)
             self.usage_tracker = create_usage_tracker(
-                scope=scope, stats_file=usage_file, client_id=settings.usage_client_id
+                scope=scope,
+                stats_file=usage_file,
+                client_id=settings.usage_client_id,
+                store=_usage_store_for(settings),
             )
         else:
             self.usage_tracker = None
 
         # Initialize cache backend
-        if cache is not None:
-            # Explicit cache backend takes precedence
-            self.cache = cache
-        elif not settings.cache_enabled:
-            # Caching disabled
-            self.cache = NullCache()
-        elif settings.cache_backend == "memory":
-            # Use memory cache with configured TTL
-            self.cache = MemoryCache(default_ttl_s=settings.cache_ttl_s)
-        elif settings.cache_backend == "sqlite":
-            # SQLite cache with isolation rules for pytest
-            if _running_under_pytest() and settings.cache_sqlite_path is None:
-                # Strict isolation: disable SQLite cache in pytest unless explicit path
-                self.cache = NullCache()
-            else:
-                # Determine database path
-                if settings.cache_sqlite_path is not None:
-                    db_path = settings.cache_sqlite_path
-                else:
-                    # Default to user home directory
-                    db_path = Path.home() / ".ai_utilities" / "cache.sqlite"
+        self.cache = _create_cache_backend(settings, cache)
 
-                # Determine namespace
-                if settings.cache_namespace is not None:
-                    namespace = _sanitize_namespace(settings.cache_namespace)
-                else:
-                    # Use pytest namespace when under pytest, otherwise default
-                    if _running_under_pytest():
-                        namespace = "pytest"
-                    else:
-                        namespace = _default_namespace()
-
-                # Create SQLite cache
-                self.cache = SqliteCache(
-                    db_path=db_path,
-                    table=settings.cache_sqlite_table,
-                    namespace=namespace,
-                    wal=settings.cache_sqlite_wal,
-                    busy_timeout_ms=settings.cache_sqlite_busy_timeout_ms,
-                    default_ttl_s=settings.cache_ttl_s,
-                    max_entries=settings.cache_sqlite_max_entries,
-                    prune_batch=settings.cache_sqlite_prune_batch,
-                )
-        else:
-            # Default to null cache
-            self.cache = NullCache()
+        # Coalesces concurrent identical cacheable requests into one provider call
+        self._single_flight = SingleFlight()
+
+        # Request-param templates built from the current settings, see _request_template
+        self._templates_source: Optional[tuple[Any, dict[str, Any]]] = None
+        self._templates: dict[frozenset[str], Mapping[str, Any]] = {}
 
         self.show_progress = show_progress
 
@@ -240,8 +550,20 @@ class AiClient:
         """
         if not self.settings.cache_enabled:
             return False
+        return self._is_deterministic(request_params)
+
+    def _is_deterministic(self, request_params: Mapping[str, Any]) -> bool:
+        """Check if identical requests may share one answer.
+
+        Requests sampled above ``cache_max_temperature`` are non-deterministic
+        and are neither cached nor folded together.
+
+        Args:
+            request_params: Request parameters dictionary
 
-        # Don't cache if temperature is too high (non-deterministic)
+        Returns:
+            True if the temperature is low enough
+        """
         temperature = request_params.get("temperature", self.settings.temperature)
         cache_max_temperature = self.settings.cache_max_temperature
 
@@ -309,6 +631,245 @@ class AiClient:
 
         return stable_hash(key_data)
 
+    def _ask_provider(
+        self,
+        prompt: str,
+        return_format: Literal["text", "json"],
+        request_params: dict[str, Any],
+        cache_key: Optional[str],
+        priority: str = "interactive",
+    ) -> Any:
+        """Call the provider and cache the response.
+
+        Cacheable requests (``cache_key`` set) go through the single-flight
+        layer: while one caller is waiting on the provider, concurrent callers
+        with the same key wait for that response instead of sending their own.
+
+        Args:
+            prompt: Prompt to send
+            return_format: Format for response ("text" or "json")
+            request_params: Provider request parameters
+            cache_key: Key from _build_cache_key, or None if not cacheable
+            priority: Scheduler priority class of the request
+
+        Returns:
+            Provider response
+        """
+        if cache_key is None:
+            return self._send(prompt, return_format, request_params, priority)
+
+        def fetch() -> Any:
+            response = self._send(prompt, return_format, request_params, priority)
+            # Fill the cache before the key is released so later callers hit it
+            self.cache.set(cache_key, response, ttl_s=self.settings.cache_ttl_s)
+            return response
+
+        return self._single_flight.do(cache_key, fetch)
+
+    def _send(
+        self,
+        prompt: str,
+        return_format: Literal["text", "json"],
+        request_params: dict[str, Any],
+        priority: str = "interactive",
+    ) -> Any:
+        """Send one request to the provider, hedged when a hedger is configured.
+
+        With rate limiting enabled, the call first waits for RPM/TPM/TPD
+        capacity, and in any case for the provider's reported quota to reset
+        once it is used up; when a scheduler applies, it then waits for a
+        slot in its ``priority`` class. The quota the provider reports in its
+        response headers is what later calls wait for.
+        """
+        return self._send_call(
+            lambda provider, params: provider.ask(prompt, return_format=return_format, **params),
+            prompt,
+            request_params,
+            priority,
+        )
+
+    def _send_text(self, prompt: str, request_params: dict[str, Any], priority: str = "interactive") -> str:
+        """Like ``_send``, through the provider's ``ask_text`` (used by ``ask_json``)."""
+        return self._send_call(
+            lambda provider, params: provider.ask_text(prompt, **params), prompt, request_params, priority
+        )
+
+    def _send_call(
+        self,
+        call: Callable[[BaseProvider, dict[str, Any]], Any],
+        prompt: str,
+        request_params: dict[str, Any],
+        priority: str,
+    ) -> Any:
+        """Run ``call(provider, request_params)`` for ``prompt``; see ``_send``.
+
+        With a hedger, the request is admitted by the rate limiter and the
+        scheduler before the race starts, so local waiting never counts as
+        provider latency. The primary keeps its slot until its own call
+        returns; a hedge is admitted on its own, see ``_send_hedge``.
+        """
+        limiter, charged = self._wait_for_rate_limit([prompt], request_params)
+        model = request_params.get("model", self.settings.model)
+        if self.hedger is None:
+            with self._scheduler_slot(priority, model):
+                return self._send_metered(call, self.provider, request_params, limiter, charged)
+
+        with ExitStack() as stack:
+            stack.enter_context(self._scheduler_slot(priority, model))
+            slot = stack.pop_all()
+        answered = threading.Event()
+
+        def send_primary() -> Any:
+            with slot:
+                response = self._send_metered(call, self.provider, request_params, limiter, charged)
+                # Set before the slot is freed, so a hedge waiting for it gives up
+                answered.set()
+                return response
+
+        return self.hedger.do(
+            send_primary,
+            lambda: self._send_hedge(call, prompt, request_params, priority, answered),
+        )
+
+    def _send_hedge(
+        self,
+        call: Callable[[BaseProvider, dict[str, Any]], Any],
+        prompt: str,
+        request_params: dict[str, Any],
+        priority: str,
+        answered: threading.Event,
+    ) -> Any:
+        """Send the duplicate of a slow request to the hedge provider.
+
+        The duplicate is charged to the rate limiter and holds a scheduler
+        slot like any other request, so hedging cannot push the client past
+        its configured limits. It gives up before reaching the provider once
+        ``answered`` is set, i.e. the primary answered while it waited.
+        """
+        if self._hedge_settings is not None:
+            request_params = dict(request_params, model=self._hedge_settings.model)
+        limiter, charged = self._wait_for_rate_limit([prompt], request_params)
+        model = request_params.get("model", self.settings.model)
+        with self._scheduler_slot(priority, model):
+            if answered.is_set():
+                raise HedgeCancelled()
+            return self._send_metered(call, self._hedge_provider, request_params, limiter, charged)
+
+    def _send_metered(
+        self,
+        call: Callable[[BaseProvider, dict[str, Any]], Any],
+        provider: BaseProvider,
+        request_params: dict[str, Any],
+        limiter: RateLimitObserver,
+        charged: int,
+    ) -> Any:
+        """Make one provider call, recorded with MetricsRegistry and ``limiter``."""
+        model = request_params.get("model", self.settings.model)
+        with _metered_request(model, limiter) as reported:
+            response = call(provider, request_params)
+
+        # Response tokens are only known now; later requests wait for them
+        limiter.record(_unreserved_tokens(reported, [response], charged))
+        return response
+
+    def _rate_limiter_for(self, model: Optional[str]) -> Optional[TokenBucketRateLimiter]:
+        """Return the shared rate limiter for ``model``, or None if rate limiting is off."""
+        if not _typed_setting(self.settings, "rate_limit_enabled", bool, False):
+            return None
+        model = model or "default"
+        config = self.settings.model_rate_limits.get(model) or ModelConfig()
+        return shared_rate_limiter(
+            f"{self.settings.provider}:{model}", config, self.settings.rate_limit_sqlite_path
+        )
+
+    def _server_quota_for(self, model: Optional[str]) -> ServerQuota:
+        """Return the quota the provider reports for ``model``, shared by all clients."""
+        return shared_server_quota(f"{self.settings.provider}:{model or 'default'}")
+
+    def _wait_for_rate_limit(
+        self, prompts: list[str], request_params: dict[str, Any]
+    ) -> Tuple[RateLimitObserver, int]:
+        """Wait until ``prompts`` fit the model's rate limits.
+
+        With rate limiting off, this still waits for the reset once the
+        provider reports its quota used up.
+
+        Returns:
+            The limiter the request was charged to (the model's server quota
+            if rate limiting is off), which also observes the responses' rate
+            limit headers, and the prompt tokens it was charged
+
+        Raises:
+            RateLimitExceededError: If the wait would exceed ``rate_limit_max_wait_s``
+        """
+        model = request_params.get("model", self.settings.model)
+        limiter: RateLimitObserver = self._rate_limiter_for(model) or self._server_quota_for(model)
+        if isinstance(limiter, ServerQuota) and not limiter.reported():
+            # Nothing to wait for; skip counting the prompt tokens
+            return limiter, 0
+        tokens = sum(TokenCounter.count_tokens_for_model(prompt, model or "") for prompt in prompts)
+        max_wait_s = self.settings.rate_limit_max_wait_s
+        if not limiter.acquire(tokens, timeout=max_wait_s, requests=len(prompts)):
+            raise RateLimitExceededError(
+                f"{ERROR_RATE_LIMIT_EXCEEDED} No capacity for model {model!r} within {max_wait_s}s"
+            )
+        return limiter, tokens
+
+    def _get_scheduler(self) -> Optional[RequestScheduler]:
+        """Return the scheduler provider calls go through, if any."""
+        return self.scheduler or get_default_scheduler()
+
+    def _scheduler_slot(self, priority: str, model: Optional[str] = None) -> AbstractContextManager[None]:
+        """Return a context holding a scheduler slot of class ``priority`` (a no-op without a scheduler).
+
+        The scheduler holds the slot back while the provider reports the
+        quota of ``model`` used up.
+        """
+        scheduler = self._get_scheduler()
+        if scheduler is None:
+            return nullcontext()
+        return scheduler.slot(priority, self.settings.usage_client_id, self._server_quota_for(model))
+
+    def _request_template(self, exclude: frozenset[str]) -> Mapping[str, Any]:
+        """Return the read-only provider params derived from the current settings.
+
+        The settings dump is built once per settings instance and exclusion
+        set, and rebuilt only when ``self.settings`` is replaced or one of its
+        fields is assigned.
+
+        Args:
+            exclude: Settings fields that are not provider request params
+
+        Returns:
+            Immutable mapping of request params; copy it before merging kwargs
+        """
+        settings = self.settings
+        source = self._templates_source
+        if source is None or source[0] is not settings or source[1] != vars(settings):
+            self._templates = {}
+            self._templates_source = (settings, dict(vars(settings)))
+
+        template = self._templates.get(exclude)
+        if template is None:
+            template = MappingProxyType(
+                settings.model_dump(exclude_none=True, exclude=set(exclude))
+            )
+            self._templates[exclude] = template
+        return template
+
+    def _ask_request_params(self, overrides: dict[str, Any]) -> dict[str, Any]:
+        """Merge per-call overrides with settings for chat requests.
+
+        Args:
+            overrides: Per-call keyword arguments, taking priority over settings
+
+        Returns:
+            Request parameters passed to the provider
+        """
+        request_params = dict(self._request_template(_ASK_EXCLUDED_SETTINGS))
+        request_params.update(overrides)
+        return request_params
+
     def check_for_updates(self, force_check: bool = False) -> dict[str, Any]:
         """Manually check for OpenAI model updates with detailed information.
 
@@ -347,6 +908,7 @@ class AiClient:
         prompt: Union[str, list[str]],
         *,
         return_format: Literal["text", "json"] = "text",
+        priority: str = "interactive",
         **kwargs,
     ) -> Union[str, list[str]]:
         """
@@ -357,10 +919,13 @@ class AiClient:
 
         Args:
             prompt: Single prompt string or list of prompts. If a list is provided,
-                   returns a list of responses in the same order.
+                   returns a list of responses in the same order; cached prompts
+                   are answered from the cache and only the rest are sent.
             return_format: Format for response:
                           - "text": Returns plain text responses (default)
                           - "json": Returns parsed JSON as dict/list
+            priority: Scheduler priority class ("interactive" or "batch");
+                     only used when a RequestScheduler applies
             **kwargs: Additional parameters to override settings:
                      - model: Override the default model
                      - temperature: Override response temperature
@@ -388,54 +953,15 @@ class AiClient:
             # With custom parameters
             response = client.ask("Explain AI", temperature=0.3, model="gpt-4")
         """
-        # Merge kwargs with settings, excluding internal fields
-        request_params = self.settings.model_dump(
-            exclude_none=True,
-            exclude={
-                "api_key",  # Providers already have this from initialization
-                "openai_api_key",  # Alias for api_key
-                "provider",  # Not a per-request param
-                "base_url",  # Not a per-request param
-                "timeout",  # Provider init config, not a per-request param
-                "request_timeout_s",  # Provider init config, not a per-request param
-                "extra_headers",  # Provider init config, not a per-request param
-                "usage_scope",  # Internal usage tracking field
-                "usage_client_id",  # Internal usage tracking field
-                "update_check_days",  # Internal configuration field
-                # Knowledge-related settings (not supported by OpenAI API)
-                "knowledge_enabled",
-                "knowledge_db_path",
-                "knowledge_roots",
-                "knowledge_chunk_size",
-                "knowledge_chunk_overlap",
-                "knowledge_min_chunk_size",
-                "knowledge_max_file_size",
-                "knowledge_use_sqlite_extension",
-                "embedding_model",
-                # Cache settings, not provider params
-                "cache_enabled",
-                "cache_backend",
-                "cache_ttl_s",
-                "cache_max_temperature",
-                "cache_sqlite_path",
-                "cache_sqlite_table",
-                "cache_sqlite_wal",
-                "cache_sqlite_busy_timeout_ms",
-                "cache_sqlite_max_entries",
-                "cache_sqlite_prune_batch",
-                "cache_namespace",
-            },
-        )
-        request_params.update(kwargs)
+        request_params = self._ask_request_params(kwargs)
 
         # Show progress indicator if enabled
         progress = ProgressIndicator(show=self.show_progress)
 
-        with progress:
+        with progress, capture_usage() as reported:
             if isinstance(prompt, list):
-                # Phase 1: Don't cache list prompts
-                response = self.provider.ask_many(
-                    prompt, return_format=return_format, **request_params
+                response = self._ask_prompt_list(
+                    prompt, return_format, request_params, priority
                 )
             else:
                 # Check cache for single prompt
@@ -452,28 +978,171 @@ class AiClient:
                         # Track usage for cached responses too
                         if self.usage_tracker:
                             estimated_tokens = len(str(cached_response)) // 4
-                            self.usage_tracker.record_usage(estimated_tokens)
+                            self.usage_tracker.record_usage(
+                                estimated_tokens, model=request_params.get("model")
+                            )
                         return cached_response
 
-                # Make actual provider call
-                response = self.provider.ask(
-                    prompt, return_format=return_format, **request_params
+                # Make actual provider call (identical in-flight requests share it)
+                response = self._ask_provider(
+                    prompt, return_format, request_params, cache_key, priority
                 )
 
-                # Cache successful response
-                if cache_key is not None:
-                    self.cache.set(cache_key, response, ttl_s=self.settings.cache_ttl_s)
+        self._record_usage(response, request_params, reported)
+        return response
 
-        # Track usage if enabled (basic estimation - provider could return
-        # actual counts)
+    def _record_usage(
+        self, response: Any, request_params: Mapping[str, Any], reported: Sequence[TokenUsage] = ()
+    ) -> Optional[TokenUsage]:
+        """Record a request with the usage tracker.
+
+        The tokens the provider reported are recorded when there are any;
+        otherwise (cache hits, requests answered by another caller's
+        in-flight call, providers without usage) they are estimated from the
+        response length.
+
+        Returns:
+            The reported usage, or None if nothing was reported
+        """
+        usage = TokenUsage.combine(reported)
         if self.usage_tracker:
-            # This is a rough estimate - actual token counting would need
-            # provider support
-            estimated_tokens = len(str(response)) // 4  # Rough estimate
-            self.usage_tracker.record_usage(estimated_tokens)
+            tokens = usage.total_tokens if usage is not None else len(str(response)) // 4
+            self.usage_tracker.record_usage(tokens, model=request_params.get("model"))
+        return usage
 
+    def _send_text_recorded(
+        self, prompt: str, request_params: dict[str, Any], priority: str = "interactive"
+    ) -> str:
+        """Send a text request and record it with the usage tracker, like ``ask()``.
+
+        Usage the provider reported is recorded even if the call fails.
+        """
+        with capture_usage() as reported:
+            try:
+                response = self._send_text(prompt, request_params, priority)
+            except BaseException:
+                if reported:
+                    self._record_usage(None, request_params, reported)
+                raise
+        self._record_usage(response, request_params, reported)
         return response
 
+    def _ask_prompt_list(
+        self,
+        prompts: list[str],
+        return_format: Literal["text", "json"],
+        request_params: dict[str, Any],
+        priority: str = "interactive",
+    ) -> list[Any]:
+        """Answer a list of prompts, sending only cache misses to the provider.
+
+        Each prompt is looked up individually before dispatch; the misses go
+        to the provider in one ``ask_many`` call, which holds a single
+        scheduler slot, and are cached one by one.
+        """
+        if not self._should_use_cache(request_params):
+            return self._provider_ask_many(prompts, return_format, request_params, priority)
+
+        cache_keys = [
+            self._build_cache_key(
+                "ask",
+                prompt=prompt,
+                request_params=request_params,
+                return_format=return_format,
+            )
+            for prompt in prompts
+        ]
+        responses = [self.cache.get(cache_key) for cache_key in cache_keys]
+        misses = [index for index, response in enumerate(responses) if response is None]
+        if misses:
+            fresh = self._provider_ask_many(
+                [prompts[index] for index in misses], return_format, request_params, priority
+            )
+            for index, response in zip(misses, fresh):
+                responses[index] = response
+                self.cache.set(cache_keys[index], response, ttl_s=self.settings.cache_ttl_s)
+        return responses
+
+    def _provider_ask_many(
+        self,
+        prompts: list[str],
+        return_format: Literal["text", "json"],
+        request_params: dict[str, Any],
+        priority: str,
+    ) -> list[Any]:
+        """Send a list of prompts in one provider call, scheduled as one request."""
+        limiter, charged = self._wait_for_rate_limit(prompts, request_params)
+        model = request_params.get("model", self.settings.model)
+        with self._scheduler_slot(priority, model), _metered_request(model, limiter) as reported:
+            responses = self.provider.ask_many(prompts, return_format=return_format, **request_params)
+
+        limiter.record(_unreserved_tokens(reported, responses, charged))
+        return responses
+
+    def ask_stream(self, prompt: str, *, priority: str = "interactive", **kwargs) -> Iterator[str]:
+        """
+        Stream a text answer as it is generated.
+
+        Text deltas are yielded as soon as the provider produces them. Once the
+        stream has been fully consumed, the assembled answer is written to the
+        cache and recorded with the usage tracker, exactly like ``ask()``. A
+        cached answer is yielded as a single chunk without calling the provider.
+        When a scheduler applies, the stream holds one of its slots until it is
+        consumed or closed.
+
+        Args:
+            prompt: Single prompt string
+            priority: Scheduler priority class ("interactive" or "batch");
+                     only used when a RequestScheduler applies
+            **kwargs: Additional parameters to override settings (model,
+                     temperature, max_tokens, ...)
+
+        Yields:
+            Text deltas in the order they are produced
+
+        Example:
+            for delta in client.ask_stream("Tell me a story"):
+                print(delta, end="", flush=True)
+        """
+        request_params = self._ask_request_params(kwargs)
+
+        cache_key = None
+        if self._should_use_cache(request_params):
+            cache_key = self._build_cache_key(
+                "ask",
+                prompt=prompt,
+                request_params=request_params,
+                return_format="text",
+            )
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                if self.usage_tracker:
+                    self.usage_tracker.record_usage(
+                        len(str(cached_response)) // 4, model=request_params.get("model")
+                    )
+                yield str(cached_response)
+                return
+
+        limiter, charged = self._wait_for_rate_limit([prompt], request_params)
+        model = request_params.get("model", self.settings.model)
+        chunks: list[str] = []
+        reported: list[TokenUsage] = []
+        try:
+            with self._scheduler_slot(priority, model), _recorded_request(model, reported):
+                stream = self.provider.ask_stream(prompt, **request_params)
+                for delta in _metered_deltas(stream, limiter, reported):
+                    chunks.append(delta)
+                    yield delta
+        finally:
+            # The final chunk carries the usage; a closed stream is charged what it produced
+            limiter.record(_unreserved_tokens(reported, ["".join(chunks)], charged))
+
+        # Only a fully consumed stream is cached and counted
+        response = "".join(chunks)
+        if cache_key is not None:
+            self.cache.set(cache_key, response, ttl_s=self.settings.cache_ttl_s)
+        self._record_usage(response, request_params, reported)
+
     def get_usage_stats(self) -> Optional[UsageStats]:
         """Get current usage statistics if tracking is enabled.
 
@@ -498,6 +1167,9 @@ class AiClient:
         return_format: Literal["text", "json"] = "text",
         concurrency: int = 1,
         fail_fast: bool = False,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: str = "batch",
+        deduplicate: bool = True,
         **kwargs,
     ) -> list[AskResult]:
         """
@@ -505,16 +1177,37 @@ class AiClient:
 
         Processes multiple prompts efficiently with support for concurrent execution
         and detailed result information including timing and error handling.
+        When caching applies, every prompt is looked up before dispatch and only
+        the cache misses are sent to the provider. Prompts that are identical
+        after normalization are sent once and share the answer, unless the
+        temperature makes the requests non-deterministic.
 
         Args:
             prompts: List of prompts to process
             return_format: Format for responses:
                           - "text": Returns plain text responses (default)
                           - "json": Returns parsed JSON as dict/list
-            concurrency: Number of concurrent requests (must be >= 1).
+            concurrency: Maximum number of provider calls in flight at once
+                        (must be >= 1). Values above 1 run prompts on a bounded
+                        thread pool; results are still returned in input order.
                         Higher values can improve performance but use more API quota.
-            fail_fast: If True, stops processing after first failure.
+            fail_fast: If True, stops dispatching prompts after the first failure.
+                      Prompts not yet started are returned as cancelled; requests
+                      already in flight are allowed to finish.
                       If False, continues processing all prompts.
+            limiter: Optional adaptive concurrency limiter. When given, it decides
+                    how many provider calls are in flight (up to its ``max_limit``)
+                    and ``concurrency`` is ignored; it grows the limit while calls
+                    succeed and cuts it on 429s and timeouts. One limiter can be
+                    shared across calls, threads and ``AsyncAiClient``.
+            priority: Scheduler priority class of the prompts (default "batch",
+                     so interactive ``ask`` calls go first); only used when a
+                     RequestScheduler applies
+            deduplicate: If True (default), send each distinct prompt once and
+                        copy its result to the duplicates. Requests sampled
+                        above ``cache_max_temperature`` are never folded; set
+                        to False to sample the same prompt several times at
+                        any temperature.
             **kwargs: Additional parameters to override settings for all requests
 
         Returns:
@@ -523,6 +1216,8 @@ class AiClient:
                            - error: Error message if request failed (or None)
                            - duration_s: Request duration in seconds
                            - prompt: Original prompt (for reference)
+                           - deduplicated: True if the answer was copied from
+                             an identical prompt earlier in the batch
 
         Example:
             client = AiClient()
@@ -544,99 +1239,213 @@ class AiClient:
 
             # Fail fast on first error
             results = client.ask_many(prompts, fail_fast=True)
-        """
-        from .models import AskResult
 
+            # Let the in-flight limit adapt to the provider's capacity
+            limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=32)
+            results = client.ask_many(prompts, limiter=limiter)
+        """
         # Validate concurrency
         if concurrency <= 0:
             raise ValueError("concurrency must be >= 1")
 
-        results = []
+        if not prompts:
+            return []
 
-        # Show progress indicator if enabled
-        progress = ProgressIndicator(show=self.show_progress)
+        # Merge kwargs with settings once for the whole batch
+        request_params = dict(self._request_template(_ASK_MANY_EXCLUDED_SETTINGS))
+        request_params.update(kwargs)
 
-        with progress:
-            for i, prompt in enumerate(prompts):
-                start_time = time.time()
+        results: list[Optional[AskResult]] = [None] * len(prompts)
 
-                try:
-                    # Merge kwargs with settings, excluding internal fields
-                    # (same as ask method)
-                    request_params = self.settings.model_dump(
-                        exclude_none=True,
-                        exclude={
-                            "api_key",  # Providers already have this from
-                            # initialization
-                            "usage_scope",  # Internal usage tracking field
-                            "usage_client_id",  # Internal usage tracking field
-                            "update_check_days",  # Internal configuration field
-                            "cache_enabled",  # Cache settings, not provider params
-                            "cache_backend",  # Cache settings, not
-                            # provider params
-                            "cache_ttl_s",  # Cache settings, not provider params
-                            "cache_max_temperature",  # Cache settings, not
-                            # provider params
-                            "cache_sqlite_path",  # Cache settings, not provider params
-                            "cache_sqlite_table",  # Cache settings, not provider params
-                            "cache_sqlite_wal",  # Cache settings, not provider params
-                            "cache_sqlite_busy_timeout_ms",  # Cache settings,
-                            # not provider params
-                            "cache_sqlite_max_entries",  # Cache settings,
-                            # not provider params
-                            "cache_sqlite_prune_batch",  # Cache settings,
-                            # not provider params
-                            "cache_namespace",  # Cache settings, not provider params
-                        },
+        # Resolve cache hits up front so only the misses are dispatched
+        cache_keys: list[Optional[str]] = [None] * len(prompts)
+        if self._should_use_cache(request_params):
+            for index, prompt in enumerate(prompts):
+                start_time = time.time()
+                cache_key = self._build_cache_key(
+                    "ask",
+                    prompt=prompt,
+                    request_params=request_params,
+                    return_format=return_format,
+                )
+                cached_response = self.cache.get(cache_key)
+                if cached_response is None:
+                    cache_keys[index] = cache_key
+                    continue
+                if self.usage_tracker:
+                    self.usage_tracker.record_usage(
+                        len(str(cached_response)) // 4, model=request_params.get("model")
                     )
-                    request_params.update(kwargs)
+                results[index] = AskResult(
+                    prompt=prompt,
+                    response=cached_response,
+                    error=None,
+                    duration_s=time.time() - start_time,
+                    model=self.settings.model,
+                    tokens_used=None,
+                )
 
-                    response = self.provider.ask(
-                        prompt, return_format=return_format, **request_params
-                    )
-                    duration = time.time() - start_time
+        misses = [index for index, result in enumerate(results) if result is None]
+        followers: dict[int, list[int]] = {}
+        if deduplicate and self._is_deterministic(request_params):
+            misses, followers = _fold_duplicate_prompts(prompts, misses)
+        workers = min(limiter.max_limit if limiter else concurrency, len(misses))
 
-                    result = AskResult(
-                        prompt=prompt,
-                        response=response,
-                        error=None,
-                        duration_s=duration,
-                        model=self.settings.model,
-                        tokens_used=None,  # Would need provider support
+        # Show progress indicator if enabled
+        progress = ProgressIndicator(show=self.show_progress)
+
+        with progress:
+            if workers == 1 and limiter is None:
+                # Sequential path: no pool overhead, stop at the first failure
+                for index in misses:
+                    results[index] = self._ask_many_item(
+                        prompts[index],
+                        return_format,
+                        request_params,
+                        cache_keys[index],
+                        priority=priority,
                     )
+                    if fail_fast and results[index].error is not None:
+                        break
+            elif workers:
+                self._run_ask_many_pool(
+                    prompts,
+                    misses,
+                    cache_keys,
+                    results,
+                    workers,
+                    return_format,
+                    request_params,
+                    fail_fast,
+                    limiter,
+                    priority,
+                )
 
-                    results.append(result)
+        _fan_out_results(prompts, results, followers)
+
+        # Anything that was never dispatched was cancelled by fail_fast
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = AskResult(
+                    prompt=prompts[index],
+                    response=None,
+                    error="Cancelled due to fail_fast mode",
+                    duration_s=0.0,
+                    model=self.settings.model,
+                    tokens_used=None,
+                )
 
-                except Exception as e:
-                    duration = time.time() - start_time
+        return results
 
-                    result = AskResult(
-                        prompt=prompt,
-                        response=None,
-                        error=str(e),
-                        duration_s=duration,
-                        model=self.settings.model,
-                        tokens_used=None,
+    def _run_ask_many_pool(
+        self,
+        prompts: Sequence[str],
+        indices: list[int],
+        cache_keys: list[Optional[str]],
+        results: list[Optional[AskResult]],
+        workers: int,
+        return_format: Literal["text", "json"],
+        request_params: dict[str, Any],
+        fail_fast: bool,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: str = "batch",
+    ) -> None:
+        """Run the prompts at ``indices`` on a bounded thread pool, filling ``results`` in place.
+
+        At most ``workers`` provider calls are in flight at any time, fewer if
+        ``limiter`` currently allows fewer. Prompts are only submitted when a
+        slot frees up, so with ``fail_fast`` the queued remainder is simply never
+        dispatched once a failure has been observed. Requests that are already
+        in flight are allowed to finish.
+        """
+        pending: dict[Future, int] = {}
+        queue = deque(indices)
+        stop = False
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ai_utilities-ask_many"
+        ) as executor:
+
+            def submit_until_full() -> None:
+                while not stop and queue and len(pending) < workers:
+                    # Only block on the limiter when nothing is in flight to wait for
+                    if limiter is not None and not limiter.acquire(blocking=not pending):
+                        return
+                    index = queue.popleft()
+                    # Copy the caller's context so contextvar-based env
+                    # overrides are visible inside worker threads
+                    ctx = contextvars.copy_context()
+                    future = executor.submit(
+                        ctx.run,
+                        self._ask_many_item,
+                        prompts[index],
+                        return_format,
+                        request_params,
+                        cache_keys[index],
+                        limiter,
+                        priority,
                     )
+                    pending[future] = index
+
+            submit_until_full()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    results[index] = future.result()
+                    if fail_fast and results[index].error is not None:
+                        stop = True
+                submit_until_full()
+
+    def _ask_many_item(
+        self,
+        prompt: str,
+        return_format: Literal["text", "json"],
+        request_params: dict[str, Any],
+        cache_key: Optional[str],
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: str = "batch",
+    ) -> AskResult:
+        """Process one cache-miss batch prompt: provider call, cache write, usage.
+
+        Never raises; provider errors are captured in the returned AskResult.
+        The caller holds a ``limiter`` slot, which is released here with the
+        outcome of the call.
+        """
+        start_time = time.time()
+        error: Optional[Exception] = None
 
-                    results.append(result)  # Add the failed result first
-
-                    # If fail_fast is enabled, mark remaining prompts as failed
-                    if fail_fast:
-                        # Mark remaining prompts as cancelled/failed
-                        for remaining_prompt in prompts[i + 1 :]:
-                            cancelled_result = AskResult(
-                                prompt=remaining_prompt,
-                                response=None,
-                                error="Cancelled due to fail_fast mode",
-                                duration_s=0.0,
-                                model=self.settings.model,
-                                tokens_used=None,
-                            )
-                            results.append(cancelled_result)
-                        break
+        try:
+            with capture_usage() as reported:
+                response = self._ask_provider(
+                    prompt, return_format, request_params, cache_key, priority
+                )
+            usage = self._record_usage(response, request_params, reported)
 
-        return results
+            return AskResult(
+                prompt=prompt,
+                response=response,
+                error=None,
+                duration_s=time.time() - start_time,
+                model=self.settings.model,
+                tokens_used=usage.total_tokens if usage is not None else None,
+                usage=usage,
+            )
+
+        except Exception as e:
+            error = e
+            return AskResult(
+                prompt=prompt,
+                response=None,
+                error=str(e),
+                duration_s=time.time() - start_time,
+                model=self.settings.model,
+                tokens_used=None,
+            )
+
+        finally:
+            if limiter is not None:
+                limiter.release(time.time() - start_time, error)
 
     def ask_many_with_retry(
         self,
@@ -645,6 +1454,7 @@ class AiClient:
         return_format: Literal["text", "json"] = "text",
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        priority: str = "batch",
         **kwargs,
     ) -> list[AskResult]:
         """Ask multiple questions with retry logic.
@@ -654,6 +1464,8 @@ class AiClient:
             return_format: Format for responses ("text" or "json")
             max_retries: Maximum number of retries per prompt
             retry_delay: Delay between retries in seconds
+            priority: Scheduler priority class of each attempt (default
+                     "batch"); only used when a RequestScheduler applies
             **kwargs: Additional parameters
 
         Returns:
@@ -673,9 +1485,7 @@ class AiClient:
 
             for attempt in range(max_retries + 1):  # +1 for initial attempt
                 try:
-                    response = self.provider.ask(
-                        prompt, return_format=return_format, **kwargs
-                    )
+                    response = self._send(prompt, return_format, kwargs, priority)
                     duration = time.time() - start_time
 
                     result = AskResult(
@@ -709,8 +1519,88 @@ class AiClient:
 
         return results
 
+    def submit_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        return_format: Literal["text", "json"] = "text",
+        completion_window: str = "24h",
+        metadata: Optional[dict[str, str]] = None,
+        **kwargs,
+    ) -> BatchJob:
+        """
+        Submit prompts as an offline Batch API job.
+
+        Intended for large workloads that do not need low latency: all prompts
+        are written to one JSONL file, uploaded with ``upload_file`` and
+        processed by the provider outside the per-minute rate limits. Save
+        ``job.job_id`` to resume the job later with ``resume_batch``.
+
+        Args:
+            prompts: Prompts to process
+            return_format: Format for responses ("text" or "json")
+            completion_window: Time window for the job to complete
+            metadata: Optional string metadata stored with the job
+            **kwargs: Parameters to override settings. As with ``ask``, only
+                     model, temperature and max_tokens reach the request
+                     body; other settings and keyword arguments are not sent
+
+        Returns:
+            BatchJob handle; call ``job.wait().results()`` for AskResults
+
+        Raises:
+            ValueError: If prompts is empty
+            FileTransferError: If uploading or creating the job fails
+            ProviderCapabilityError: If the provider doesn't support batch jobs
+
+        Example:
+            job = client.submit_batch(prompts)
+            results = job.wait(poll_interval_s=60).results()
+        """
+        if not prompts:
+            raise ValueError("prompts cannot be empty")
+
+        request_params = self._ask_request_params(kwargs)
+        body_params = {
+            key: request_params[key]
+            for key in BATCH_BODY_PARAMS
+            if request_params.get(key) is not None
+        }
+        if return_format == "json":
+            body_params["response_format"] = {"type": "json_object"}
+
+        with tempfile.TemporaryDirectory(prefix="ai_utilities-batch-") as tmp_dir:
+            input_path = Path(tmp_dir) / "batch_input.jsonl"
+            input_path.write_bytes(build_batch_input(prompts, body_params))
+            input_file = self.upload_file(
+                input_path, purpose="batch", mime_type="application/jsonl"
+            )
+
+        job_metadata = dict(metadata or {})
+        job_metadata[RETURN_FORMAT_METADATA_KEY] = return_format
+        info = self.provider.create_batch(
+            input_file.file_id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=completion_window,
+            metadata=job_metadata,
+        )
+        return BatchJob(self, info["id"], prompts=prompts, info=info)
+
+    def resume_batch(self, job_id: str) -> BatchJob:
+        """Resume a batch job submitted earlier, e.g. from another process.
+
+        Args:
+            job_id: ID from ``BatchJob.job_id``
+
+        Returns:
+            BatchJob handle with current job info
+        """
+        job = BatchJob(self, job_id)
+        job.refresh()
+        return job
+
     def ask_json(
-        self, prompt: str, *, max_repairs: int = 1, **kwargs
+        self, prompt: str, *, max_repairs: int = 1, priority: str = "interactive", **kwargs
     ) -> Union[dict, list]:
         """
         Ask a question and return JSON format response with robust parsing.
@@ -723,6 +1613,8 @@ class AiClient:
             prompt: Prompt to process. Should ask for structured/JSON data.
             max_repairs: Maximum number of repair attempts if JSON parsing fails
                          (default: 1)
+            priority: Scheduler priority class ("interactive" or "batch") of
+                     each attempt; only used when a RequestScheduler applies
             **kwargs: Additional parameters to override settings:
                      - model: Override the default model
                      - temperature: Override response temperature
@@ -757,31 +1649,7 @@ class AiClient:
             )
         """
         # Get request params (excluding internal fields)
-        request_params = self.settings.model_dump(
-            exclude_none=True,
-            exclude={
-                "api_key",
-                "provider",
-                "base_url",
-                "timeout",
-                "request_timeout_s",
-                "extra_headers",
-                "usage_scope",
-                "usage_client_id",
-                "update_check_days",
-                "cache_enabled",  # Caching configuration field
-                "cache_backend",  # Caching configuration field
-                "cache_ttl_s",  # Caching configuration field
-                "cache_max_temperature",  # Caching configuration field
-                "cache_sqlite_path",  # Cache settings, not provider params
-                "cache_sqlite_table",  # Cache settings, not provider params
-                "cache_sqlite_wal",  # Cache settings, not provider params
-                "cache_sqlite_busy_timeout_ms",  # Cache settings, not provider params
-                "cache_sqlite_max_entries",  # Cache settings, not provider params
-                "cache_sqlite_prune_batch",  # Cache settings, not provider params
-                "cache_namespace",  # Cache settings, not provider params
-            },
-        )
+        request_params = dict(self._request_template(_JSON_EXCLUDED_SETTINGS))
         request_params.update(kwargs)
 
         # Show progress indicator if enabled
@@ -803,11 +1671,13 @@ class AiClient:
                     # Track usage for cached responses too
                     if self.usage_tracker:
                         estimated_tokens = len(str(cached_result)) // 4
-                        self.usage_tracker.record_usage(estimated_tokens)
+                        self.usage_tracker.record_usage(
+                            estimated_tokens, model=request_params.get("model")
+                        )
                     return cached_result
 
             try:
-                response_text = self.provider.ask_text(prompt, **request_params)
+                response_text = self._send_text_recorded(prompt, request_params, priority)
                 parsed_result = parse_json_from_text(response_text)
 
                 # Cache successful parsed result
@@ -829,9 +1699,7 @@ class AiClient:
                         repair_prompt = create_repair_prompt(
                             prompt, last_response, last_error
                         )
-                        response_text = self.provider.ask_text(
-                            repair_prompt, **request_params
-                        )
+                        response_text = self._send_text_recorded(repair_prompt, request_params, priority)
                         parsed_result = parse_json_from_text(response_text)
 
                         # Cache successful parsed result after repairs
@@ -948,31 +1816,7 @@ class AiClient:
             )
         """
         # Get request params (excluding internal fields)
-        request_params = self.settings.model_dump(
-            exclude_none=True,
-            exclude={
-                "api_key",
-                "provider",
-                "base_url",
-                "timeout",
-                "request_timeout_s",
-                "extra_headers",
-                "usage_scope",
-                "usage_client_id",
-                "update_check_days",
-                "cache_enabled",  # Caching configuration field
-                "cache_backend",  # Caching configuration field
-                "cache_ttl_s",  # Caching configuration field
-                "cache_max_temperature",  # Caching configuration field
-                "cache_sqlite_path",  # Cache settings, not provider params
-                "cache_sqlite_table",  # Cache settings, not provider params
-                "cache_sqlite_wal",  # Cache settings, not provider params
-                "cache_sqlite_busy_timeout_ms",  # Cache settings, not provider params
-                "cache_sqlite_max_entries",  # Cache settings, not provider params
-                "cache_sqlite_prune_batch",  # Cache settings, not provider params
-                "cache_namespace",  # Cache settings, not provider params
-            },
-        )
+        request_params = dict(self._request_template(_JSON_EXCLUDED_SETTINGS))
         request_params.update(kwargs)
 
         # Use specified model or default embedding model
@@ -998,7 +1842,7 @@ class AiClient:
                     estimated_tokens = sum(
                         len(text) for text in texts
                     )  # Rough estimate
-                    self.usage_tracker.record_usage(estimated_tokens)
+                    self.usage_tracker.record_usage(estimated_tokens, model=embedding_model)
                 return cached_embeddings
 
         # Show progress indicator if enabled
@@ -1028,7 +1872,10 @@ class AiClient:
             openai_kwargs: dict[str, Any] = {"model": embedding_model, "input": texts}
             if dimensions is not None:
                 openai_kwargs["dimensions"] = dimensions
-            response = openai_client.embeddings.create(**openai_kwargs)
+            with _metered_request(embedding_model):
+                response = openai_client.embeddings.create(**openai_kwargs)
+                usage = TokenUsage.from_response(response)
+                report_usage(usage)
 
             # Extract embeddings
             embeddings = [item.embedding for item in response.data]
@@ -1037,10 +1884,10 @@ class AiClient:
             if cache_key is not None:
                 self.cache.set(cache_key, embeddings, ttl_s=self.settings.cache_ttl_s)
 
-        # Track usage if enabled
+        # Track usage if enabled, estimated if the response reported none
         if self.usage_tracker:
-            estimated_tokens = sum(len(text) for text in texts)  # Rough estimate
-            self.usage_tracker.record_usage(estimated_tokens)
+            tokens = usage.total_tokens if usage is not None else sum(len(text) for text in texts)
+            self.usage_tracker.record_usage(tokens, model=embedding_model)
 
         return embeddings
 
@@ -396,6 +396,14 @@ class AiSettings(BaseSettings):
         AI_UPDATE_CHECK_DAYS: Days between update checks (default: 30)
         AI_USAGE_SCOPE: Usage tracking scope (default: "per_client")
         AI_USAGE_CLIENT_ID: Custom client ID for usage tracking (optional)
+        AI_USAGE_STORE_PATH: SQLite usage log that tracked usage is appended to and aggregated from (optional)
+        AI_PROVIDER_POOL: Providers to load balance over, e.g. "openai:3,groq:1" (optional)
+        AI_PROVIDER_POOL_STRATEGY: Pool routing strategy (default: "weighted")
+        AI_PROVIDER_POOL_COOLDOWN_S: Seconds a failed pool member is skipped (default: 30)
+        AI_RATE_LIMIT_ENABLED: Wait for client-side RPM/TPM/TPD limits before requests (default: false)
+        AI_RATE_LIMIT_MAX_WAIT_S: Longest wait before raising RateLimitExceededError (optional)
+        AI_MODEL_RATE_LIMITS: Per-model limits as JSON, e.g. '{"gpt-4": {"requests_per_minute": 500}}' (optional)
+        AI_RATE_LIMIT_SQLITE_PATH: SQLite file that shares rate limits across processes (optional)
     
     Example:
         # Using environment variables (OpenAI default)
@@ -479,12 +487,26 @@ class AiSettings(BaseSettings):
     request_timeout_s: Optional[float] = Field(default=None, ge=0.1, description="Request timeout in seconds (float, overrides timeout)")
     extra_headers: Optional[Dict[str, str]] = Field(default=None, description="Extra headers for requests")
     
+    # Provider pool settings (see providers.provider_pool.ProviderPool)
+    provider_pool: Optional[str] = Field(default=None, description="Comma-separated providers with optional weights, e.g. 'openai:3,groq:1,ollama'")
+    provider_pool_strategy: Literal["weighted", "least_outstanding", "latency"] = Field(default="weighted", description="How the provider pool routes requests")
+    provider_pool_cooldown_s: float = Field(default=30.0, ge=0.0, description="Seconds a failed pool member is skipped before it is retried")
+    
+    # Client-side rate limiting (see rate_limiter.TokenBucketRateLimiter). Opt-in: the
+    # ModelConfig defaults are generic placeholders, not the account's real quota, and
+    # enforcing them silently would cap heavy users and make requests block indefinitely
+    rate_limit_enabled: bool = Field(default=False, description="Wait for per-model RPM/TPM/TPD limits before sending requests (opt-in: set model_rate_limits to the account's real quota)")
+    rate_limit_max_wait_s: Optional[float] = Field(default=None, ge=0.0, description="Longest wait for rate limit capacity before RateLimitExceededError (None waits as long as needed)")
+    model_rate_limits: Dict[str, ModelConfig] = Field(default_factory=dict, description="Per-model rate limits; models not listed use the ModelConfig defaults")
+    rate_limit_sqlite_path: Optional[Path] = Field(default=None, description="SQLite file holding the rate limit buckets, shared by all processes using it (None keeps them in process memory)")
+    
     # Legacy settings
     update_check_days: int = Field(default=30, ge=1, description="Days between update checks")
     
     # Usage tracking settings
     usage_scope: str = Field(default="per_client", description="Usage tracking scope: per_client, per_process, global")
     usage_client_id: Optional[str] = Field(default=None, description="Custom client ID for usage tracking")
+    usage_store_path: Optional[Path] = Field(default=None, description="SQLite file of the append-only usage log, compacted into one indexed table for aggregation (None keeps only the per-tracker stats files)")
     
     # Knowledge settings
     knowledge_enabled: bool = Field(default=False, description="Whether knowledge indexing and search is enabled")
@@ -499,10 +521,15 @@ class AiSettings(BaseSettings):
     
     # Caching settings (opt-in)
     cache_enabled: bool = Field(default=False, description="Enable response caching")
-    cache_backend: Literal["null", "memory", "sqlite"] = Field(default="null", description="Cache backend to use")
+    cache_backend: Literal["null", "memory", "sqlite", "tiered"] = Field(default="null", description="Cache backend to use (\"tiered\": memory in front of SQLite)")
     cache_ttl_s: Optional[int] = Field(default=None, ge=1, description="Cache TTL in seconds (None for no expiration)")
     cache_max_temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="Maximum temperature for caching (only cache when temp <= this)")
     
+    # Memory cache settings
+    cache_memory_max_entries: Optional[int] = Field(default=None, ge=1, description="Maximum entries in the memory cache (LRU eviction)")
+    cache_memory_max_bytes: Optional[int] = Field(default=None, ge=1, description="Maximum approximate size of the memory cache in bytes (LRU eviction)")
+    cache_memory_ttl_s: Optional[int] = Field(default=None, ge=1, description="TTL of the memory tier of the tiered cache (None for 300 s); copies never outlive the SQLite entry")
+    
     # SQLite cache settings
     cache_sqlite_path: Optional[Path] = Field(default=None, description="Path to SQLite cache database file")
     cache_sqlite_table: str = Field(default="ai_cache", description="SQLite table name for cache")
@@ -510,6 +537,8 @@ class AiSettings(BaseSettings):
     cache_sqlite_busy_timeout_ms: int = Field(default=3000, ge=100, description="SQLite busy timeout in milliseconds")
     cache_sqlite_max_entries: Optional[int] = Field(default=None, ge=1, description="Maximum entries per namespace (LRU eviction)")
     cache_sqlite_prune_batch: int = Field(default=200, ge=1, description="Batch size for LRU pruning")
+    cache_sqlite_compress_min_bytes: Optional[int] = Field(default=None, ge=0, description="Compress values of at least this many JSON bytes (None to disable)")
+    cache_sqlite_float32_vectors: bool = Field(default=False, description="Store float vectors (e.g. embeddings) as packed float32 (lossy)")
     
     # Cache namespace
     cache_namespace: Optional[str] = Field(default=None, description="Cache namespace for isolation (None for auto-detection)")
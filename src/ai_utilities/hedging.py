@@ -0,0 +1,277 @@
+"""
+Hedged requests to cut tail latency.
+
+A hedged request sends a duplicate when the original has not finished after
+a delay, and uses whichever answer arrives first. The delay is either fixed
+or learned as a percentile of recent latencies, so only the slowest few
+percent of requests are duplicated. A budget caps the fraction of requests
+that may be hedged, which bounds the extra provider cost.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+
+class HedgeCancelled(Exception):
+    """Raised by a hedge that gave up because its request was already answered."""
+
+
+class RequestHedger:
+    """Thread-safe hedging for sync and asyncio callers.
+
+    Until ``min_samples`` latencies have been observed, a hedger without a
+    fixed ``delay_s`` does not hedge. A hedge is only sent while hedged
+    requests stay within ``max_hedge_fraction`` of the last ``window``
+    requests. Call ``close()`` (or use the hedger as a context manager) to
+    stop its worker threads.
+
+    Example:
+        hedger = RequestHedger(percentile=95.0, max_hedge_fraction=0.05)
+        client = AiClient(settings, hedger=hedger)
+        answer = client.ask("...")  # duplicated if slower than the p95
+    """
+
+    def __init__(
+        self,
+        delay_s: Optional[float] = None,
+        *,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_hedge_fraction: float = 0.1,
+        max_workers: int = 32,
+    ) -> None:
+        """Initialize the hedger.
+
+        Args:
+            delay_s: Fixed hedge delay in seconds; None learns it from latencies
+            percentile: Latency percentile used as the learned delay (0-100)
+            min_samples: Latencies needed before the learned delay is used
+            window: Number of recent latencies kept, and of recent requests
+                the hedge budget applies to
+            max_hedge_fraction: Upper bound on hedged / recent requests
+            max_workers: Worker threads for sync hedges
+
+        Raises:
+            ValueError: If a parameter is out of range
+        """
+        if delay_s is not None and delay_s < 0:
+            raise ValueError("delay_s must be >= 0")
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be in (0, 100]")
+        if not 0 <= max_hedge_fraction <= 1:
+            raise ValueError("max_hedge_fraction must be between 0 and 1")
+        if min_samples < 1 or window < min_samples:
+            raise ValueError("window must be >= min_samples >= 1")
+
+        self.delay_s = delay_s
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_hedge_fraction = max_hedge_fraction
+        self.max_workers = max_workers
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._requests = 0
+        self._hedges = 0
+        # Request counts at which the hedges among the last ``window`` requests were sent
+        self._recent_hedges: Deque[int] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    @property
+    def requests(self) -> int:
+        """Number of requests seen."""
+        return self._requests
+
+    @property
+    def hedges(self) -> int:
+        """Number of duplicates sent."""
+        return self._hedges
+
+    def current_delay(self) -> Optional[float]:
+        """Return the hedge delay in seconds, or None if hedging is not ready."""
+        if self.delay_s is not None:
+            return self.delay_s
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        rank = max(0, int(len(ordered) * self.percentile / 100.0 + 0.5) - 1)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def do(self, primary: Callable[[], Any], hedge: Callable[[], Any]) -> Any:
+        """Run ``primary``, racing it against ``hedge`` if it is slow.
+
+        Once a hedge delay applies, ``primary`` starts at once on a thread of
+        its own, so it never queues behind other requests and the delay
+        measures provider latency only. If it is still running after the
+        delay, ``hedge`` is submitted to the hedger's worker pool. When the
+        primary answers first, a hedge still queued in the pool is dropped.
+        A sync provider call cannot be interrupted, so a hedge already
+        running should check whether it is still needed before it calls the
+        provider (``AiClient`` does, raising ``HedgeCancelled``); otherwise
+        its result is discarded. Both run with the caller's context.
+
+        Args:
+            primary: Zero-argument callable performing the request
+            hedge: Zero-argument callable performing the duplicate
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The primary's error if every attempt failed
+        """
+        delay = self._start_request()
+        start = time.monotonic()
+        if delay is None:
+            return self._finish(start, primary())
+
+        first = self._start_primary(primary)
+        done, _ = wait([first], timeout=delay)
+        executor = None if done else self._claim_hedge()
+        if executor is None:
+            return self._finish(start, first.result())
+
+        try:
+            second = executor.submit(contextvars.copy_context().run, hedge)
+        except RuntimeError:
+            # Closed since the hedge was claimed
+            return self._finish(start, first.result())
+        try:
+            pending = {first, second}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return self._finish(start, future.result())
+            return first.result()
+        finally:
+            second.cancel()
+
+    async def do_async(
+        self,
+        primary: Callable[[], Awaitable[Any]],
+        hedge: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Await ``primary()``, racing it against ``hedge()`` if it is slow.
+
+        The losing request is cancelled as soon as a winner is known, and both
+        are cancelled if the caller is.
+
+        Args:
+            primary: Zero-argument callable returning the request awaitable
+            hedge: Zero-argument callable returning the duplicate awaitable
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The primary's error if every attempt failed
+        """
+        delay = self._start_request()
+        start = time.monotonic()
+        if delay is None:
+            return self._finish(start, await primary())
+
+        first = asyncio.ensure_future(primary())
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait([first], timeout=delay)
+            if done or not self._claim_hedge():
+                return self._finish(start, await first)
+
+            tasks.append(asyncio.ensure_future(hedge()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return self._finish(start, task.result())
+            return await first
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            for task in tasks:
+                # Mark errors of the losing attempt as retrieved
+                if task.done() and not task.cancelled():
+                    task.exception()
+
+    def close(self) -> None:
+        """Shut down the worker pool; queued hedges are dropped.
+
+        Requests made after ``close()`` are no longer hedged on the sync path.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "RequestHedger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _start_request(self) -> Optional[float]:
+        with self._lock:
+            self._requests += 1
+        return self.current_delay()
+
+    def _claim_hedge(self) -> Optional[ThreadPoolExecutor]:
+        """Count a hedge if the hedges among the last ``window`` requests allow it.
+
+        A long quiet stretch therefore cannot bank an allowance that an
+        outage would later spend on duplicating most requests.
+
+        Returns:
+            The pool to run the hedge on, or None if no hedge may be sent
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            oldest = self._requests - self.window
+            while self._recent_hedges and self._recent_hedges[0] <= oldest:
+                self._recent_hedges.popleft()
+            recent_requests = min(self._requests, self.window)
+            if len(self._recent_hedges) + 1 > self.max_hedge_fraction * recent_requests:
+                return None
+            self._recent_hedges.append(self._requests)
+            self._hedges += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ai_utilities-hedge"
+                )
+            return self._executor
+
+    @staticmethod
+    def _start_primary(primary: Callable[[], Any]) -> Future[Any]:
+        future: Future[Any] = Future()
+        context = contextvars.copy_context()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = context.run(primary)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=run, name="ai_utilities-hedge-primary", daemon=True).start()
+        return future
+
+    def _finish(self, start: float, result: Any) -> Any:
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return result
@@ -6,13 +6,16 @@ in production environments with support for Prometheus, OpenTelemetry, and custo
 
 import time
 import json
-from typing import Dict, Any, Optional, List, Union
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 from collections import defaultdict, deque
 import threading
 import logging
 
+if TYPE_CHECKING:
+    from .token_usage import TokenUsage
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,6 +84,9 @@ class MetricsCollector:
         
         # Usage metrics
         self.create_counter("tokens_used_total", "Total tokens used", {"model": ""})
+        self.create_counter("prompt_tokens_total", "Prompt tokens reported by providers", {"model": ""})
+        self.create_counter("completion_tokens_total", "Completion tokens reported by providers", {"model": ""})
+        self.create_counter("cached_tokens_total", "Prompt tokens served from provider prompt caches", {"model": ""})
         self.create_gauge("active_clients", "Number of active clients")
         
         # System metrics
@@ -424,8 +430,10 @@ class MetricsRegistry:
             self.json_exporter = JSONExporter(self.collector)
             self.initialized = True
     
-    def record_request(self, success: bool, duration: float, tokens: int, model: str = ""):
-        """Record an AI request."""
+    def record_request(
+        self, success: bool, duration: float, tokens: int, model: str = "", usage: Optional["TokenUsage"] = None
+    ):
+        """Record an AI request, with its provider-reported token usage if there is any."""
         self.collector.increment_counter("ai_requests_total")
         if success:
             self.collector.increment_counter("ai_requests_successful")
@@ -437,6 +445,11 @@ class MetricsRegistry:
         
         if model:
             self.collector.increment_counter("tokens_used_total", tokens, {"model": model})
+        if usage is not None:
+            labels = {"model": model} if model else None
+            self.collector.increment_counter("prompt_tokens_total", usage.prompt_tokens, labels)
+            self.collector.increment_counter("completion_tokens_total", usage.completion_tokens, labels)
+            self.collector.increment_counter("cached_tokens_total", usage.cached_tokens, labels)
     
     def record_cache_hit(self):
         """Record a cache hit."""
@@ -462,6 +475,10 @@ class MetricsRegistry:
         """Set number of active clients."""
         self.collector.set_gauge("active_clients", count)
     
+    def set_concurrency_limit(self, limiter: str, limit: int):
+        """Set the current limit of an adaptive concurrency limiter."""
+        self.collector.set_gauge("concurrency_limit", limit, {"limiter": limiter})
+    
     def record_rate_limit_hit(self):
         """Record a rate limit hit."""
         self.collector.increment_counter("rate_limit_hits_total")
@@ -4,6 +4,8 @@ from typing import Any, Dict, Optional, Union
 
 from pydantic import BaseModel
 
+from .token_usage import TokenUsage
+
 
 class AskResult(BaseModel):
     """Result of a single AI request."""
@@ -17,3 +19,5 @@ class AskResult(BaseModel):
     # Optional fields
     tokens_used: Optional[int] = None
     model: Optional[str] = None
+    usage: Optional[TokenUsage] = None  # As reported by the provider
+    deduplicated: bool = False  # Answer copied from an identical prompt in the same batch
@@ -5,8 +5,9 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from .base_provider import BaseProvider
-from .provider_factory import create_provider
+from .provider_factory import create_async_provider, create_provider
 from .provider_capabilities import ProviderCapabilities
+from .provider_pool import AsyncProviderPool, ProviderPool
 from .provider_exceptions import ProviderCapabilityError, ProviderConfigurationError, FileTransferError, MissingOptionalDependencyError
 
 # Re-export modules for direct access
@@ -17,12 +18,20 @@ from . import openai_compatible_provider as openai_compatible_provider
 if TYPE_CHECKING:
     from .openai_provider import OpenAIProvider
     from .openai_compatible_provider import OpenAICompatibleProvider
+    from .async_openai_provider import AsyncOpenAIProvider
+    from .async_openai_compatible_provider import AsyncOpenAICompatibleProvider
 
 # Lazy import for provider classes to preserve import-safety
 def __getattr__(name: str) -> Any:
     """Lazy import provider classes only when requested."""
     # Handle module-level attribute access
-    if name in ("openai_provider", "openai_compatible_provider", "base_provider"):
+    if name in (
+        "openai_provider",
+        "openai_compatible_provider",
+        "async_openai_provider",
+        "async_openai_compatible_provider",
+        "base_provider",
+    ):
         import importlib
         try:
             return importlib.import_module(f".{name}", __name__)
@@ -56,6 +65,14 @@ def __getattr__(name: str) -> Any:
                     ) from _openai_compatible_import_error
             return _MissingOpenAICompatibleProvider
     
+    elif name == "AsyncOpenAIProvider":
+        from .async_openai_provider import AsyncOpenAIProvider
+        return AsyncOpenAIProvider
+    
+    elif name == "AsyncOpenAICompatibleProvider":
+        from .async_openai_compatible_provider import AsyncOpenAICompatibleProvider
+        return AsyncOpenAICompatibleProvider
+    
     else:
         raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
@@ -67,7 +84,12 @@ __all__ = [
     "BaseProvider", 
     "OpenAIProvider", 
     "OpenAICompatibleProvider",
+    "AsyncOpenAIProvider",
+    "AsyncOpenAICompatibleProvider",
     "create_provider",
+    "create_async_provider",
+    "ProviderPool",
+    "AsyncProviderPool",
     "provider_factory",
     "openai_compatible_provider",
     "ProviderCapabilities",
@@ -0,0 +1,135 @@
+"""Native async provider for OpenAI-compatible endpoints built on ``openai.AsyncOpenAI``."""
+
+import logging
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from ..file_models import UploadedFile
+from ..token_usage import TokenUsage, report_usage
+from . import async_openai_provider
+from .base import AsyncProvider
+from .openai_compatible_provider import OpenAICompatibleMixin
+from .provider_exceptions import ProviderCapabilityError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOpenAICompatibleProvider(OpenAICompatibleMixin, AsyncProvider):
+    """Async provider for OpenAI-compatible endpoints (local servers, gateways, etc.)."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: int = 30,
+        extra_headers: Optional[Dict[str, str]] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ):
+        """Initialize async OpenAI-compatible provider.
+
+        Args:
+            api_key: API key (can be dummy for local servers)
+            base_url: Base URL for the OpenAI-compatible endpoint (required)
+            timeout: Request timeout in seconds
+            extra_headers: Additional headers to send with requests
+            model: Model name to use (optional)
+            **kwargs: Additional initialization parameters
+
+        Raises:
+            ProviderConfigurationError: If base_url is not provided
+        """
+        client_kwargs = self._configure(api_key, base_url, timeout, extra_headers, model)
+
+        # Share the AsyncOpenAI client boundary with the native OpenAI provider
+        self.client = async_openai_provider._create_async_openai_sdk_client(**client_kwargs)
+
+        logger.info(f"Initialized async OpenAI-compatible provider with base_url: {self.base_url}")
+
+    async def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
+        """Ask a single question to the AI.
+
+        Args:
+            prompt: Single prompt string
+            return_format: Format for response ("text" or "json")
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            Response string for text format, dict for json format
+
+        Raises:
+            ProviderCapabilityError: If JSON mode is requested but not supported
+        """
+        request = self._build_chat_request(prompt, return_format, **kwargs)
+
+        try:
+            response = await self.client.chat.completions.create(**request)
+            report_usage(TokenUsage.from_response(response))
+            content = response.choices[0].message.content or ""
+            return self._parse_chat_content(content, return_format)
+        except Exception as e:
+            logger.error(f"Error in openai_compatible provider ask: {e}")
+            raise
+
+    async def ask_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream a text answer from the server as it is generated.
+
+        Args:
+            prompt: Single prompt string
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Text deltas in the order they are produced
+        """
+        request = self._build_chat_request(prompt, "text", **kwargs)
+
+        try:
+            stream = await self.client.chat.completions.create(stream=True, **request)
+            async for chunk in stream:
+                # Servers that support it send the usage on the final chunk
+                report_usage(TokenUsage.from_response(chunk))
+                delta = self._stream_delta(chunk)
+                if delta:
+                    yield delta
+        except Exception as e:
+            logger.error(f"Error in openai_compatible provider ask_stream: {e}")
+            raise
+
+    async def ask_many(self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs) -> List[Union[str, Dict[str, Any]]]:
+        """Ask multiple questions to the AI, one after another.
+
+        Args:
+            prompts: Sequence of prompt strings
+            return_format: Format for response ("text" or "json")
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            List of responses
+        """
+        return [await self.ask(prompt, return_format=return_format, **kwargs) for prompt in prompts]
+
+    async def upload_file(
+        self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
+    ) -> UploadedFile:
+        """Raise ProviderCapabilityError - OpenAI-compatible providers don't support Files API."""
+        raise ProviderCapabilityError("Files API (upload)", "openai_compatible")
+
+    async def download_file(self, file_id: str) -> bytes:
+        """Raise ProviderCapabilityError - OpenAI-compatible providers don't support Files API."""
+        raise ProviderCapabilityError("Files API (download)", "openai_compatible")
+
+    async def list_files(self, *, purpose: Optional[str] = None) -> List[UploadedFile]:
+        """Raise ProviderCapabilityError - OpenAI-compatible providers don't support Files API."""
+        raise ProviderCapabilityError("Files API (list)", "openai_compatible")
+
+    async def delete_file(self, file_id: str) -> bool:
+        """Raise ProviderCapabilityError - OpenAI-compatible providers don't support Files API."""
+        raise ProviderCapabilityError("Files API (delete)", "openai_compatible")
+
+    async def generate_image(
+        self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024",
+        quality: Literal["standard", "hd"] = "standard", n: int = 1
+    ) -> List[str]:
+        """Raise ProviderCapabilityError - OpenAI-compatible providers don't support image generation."""
+        raise ProviderCapabilityError("Image generation", "openai_compatible")
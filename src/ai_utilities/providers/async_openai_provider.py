@@ -0,0 +1,270 @@
+"""Native async OpenAI provider implementation built on ``openai.AsyncOpenAI``."""
+
+import mimetypes
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from ..file_models import UploadedFile
+from ..token_usage import TokenUsage, report_usage
+from .base import AsyncProvider
+from .openai_provider import (
+    OpenAIChatMixin,
+    _uploaded_file_from_response,
+    _with_rate_limit_observer,
+)
+from .provider_exceptions import FileTransferError, MissingOptionalDependencyError
+
+# AsyncOpenAI import - lazy loaded to avoid import-time dependencies
+AsyncOpenAI = None
+
+
+def _create_async_openai_sdk_client(**client_kwargs: Any) -> Any:
+    """
+    Create and return an AsyncOpenAI SDK client instance.
+
+    This is the single boundary for async SDK client creation, making it
+    the correct target for test patching.
+
+    Args:
+        **client_kwargs: Arguments to pass to AsyncOpenAI constructor
+
+    Returns:
+        AsyncOpenAI SDK client instance
+
+    Raises:
+        MissingOptionalDependencyError: If OpenAI package is not available
+    """
+    global AsyncOpenAI
+    if AsyncOpenAI is None:
+        try:
+            from openai import AsyncOpenAI as _AsyncOpenAI
+        except ImportError as e:
+            raise MissingOptionalDependencyError(
+                dependency="OpenAI package is required for OpenAI provider. Install it with: pip install 'ai-utilities[openai]'"
+            ) from e
+        AsyncOpenAI = _AsyncOpenAI
+    openai_module: Optional[ModuleType]
+    try:
+        import openai as openai_module
+    except ImportError:
+        # AsyncOpenAI was provided without the SDK installed
+        openai_module = None
+    return AsyncOpenAI(**_with_rate_limit_observer(openai_module, client_kwargs, asynchronous=True))
+
+
+class AsyncOpenAIProvider(OpenAIChatMixin, AsyncProvider):
+    """Async OpenAI provider that awaits the SDK directly (no worker threads)."""
+
+    def __init__(self, settings, client=None):
+        """Initialize async OpenAI provider.
+
+        Args:
+            settings: AI settings containing api_key, model, temperature, etc.
+            client: Optional AsyncOpenAI client instance (for testing)
+        """
+        self.settings = settings
+        if client is not None:
+            self.client = client
+        else:
+            self.client = _create_async_openai_sdk_client(
+                api_key=settings.api_key,
+                base_url=settings.base_url,
+                timeout=settings.timeout
+            )
+
+    @property
+    def provider_name(self) -> str:
+        """Get the provider name."""
+        return "openai"
+
+    async def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
+        """Ask a single question to OpenAI.
+
+        Args:
+            prompt: Single prompt string
+            return_format: Format for response ("text" or "json")
+            **kwargs: Additional parameters (model, temperature, etc.)
+
+        Returns:
+            Response string for text format, dict for json format
+        """
+        params = self._build_chat_params(return_format, **kwargs)
+        response = await self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            **params
+        )
+        report_usage(TokenUsage.from_response(response))
+        result = response.choices[0].message.content or ""
+        return self._parse_chat_content(result, return_format, params)
+
+    async def ask_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream a text answer from OpenAI as it is generated.
+
+        Args:
+            prompt: Single prompt string
+            **kwargs: Additional parameters (model, temperature, etc.)
+
+        Yields:
+            Text deltas in the order they are produced
+        """
+        params = self._build_chat_params("text", **kwargs)
+        stream = await self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            # The final chunk then carries the usage of the whole stream
+            stream_options={"include_usage": True},
+            **params
+        )
+        async for chunk in stream:
+            report_usage(TokenUsage.from_response(chunk))
+            delta = self._stream_delta(chunk)
+            if delta:
+                yield delta
+
+    async def ask_many(self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs) -> List[Union[str, Dict[str, Any]]]:
+        """Ask multiple questions to OpenAI, one after another.
+
+        Concurrency is controlled by ``AsyncAiClient.ask_many``.
+
+        Args:
+            prompts: Sequence of prompt strings
+            return_format: Format for response ("text" or "json")
+            **kwargs: Additional parameters (model, temperature, etc.)
+
+        Returns:
+            List of response strings or dicts based on return_format
+        """
+        return [await self.ask(prompt, return_format=return_format, **kwargs) for prompt in prompts]
+
+    async def upload_file(
+        self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
+    ) -> UploadedFile:
+        """Upload a file to OpenAI.
+
+        Args:
+            path: Path to the file to upload
+            purpose: Purpose of the upload (e.g., "assistants", "fine-tune")
+            filename: Optional custom filename (defaults to path.name)
+            mime_type: Optional MIME type (auto-detected if None)
+
+        Returns:
+            UploadedFile with metadata about the uploaded file
+
+        Raises:
+            FileTransferError: If upload fails
+        """
+        if not path.exists():
+            raise ValueError(f"File does not exist: {path}")
+        if not path.is_file():
+            raise ValueError(f"Path is not a file: {path}")
+
+        try:
+            upload_filename = filename or path.name
+            upload_mime_type = (
+                mime_type or mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+            )
+            response = await self.client.files.create(
+                file=(upload_filename, path.read_bytes(), upload_mime_type),
+                purpose=purpose
+            )
+            return _uploaded_file_from_response(response)
+        except Exception as e:
+            raise FileTransferError("upload", "openai", e) from e
+
+    async def download_file(self, file_id: str) -> bytes:
+        """Download file content from OpenAI.
+
+        Args:
+            file_id: ID of the file to download
+
+        Returns:
+            File content as bytes
+
+        Raises:
+            FileTransferError: If download fails
+        """
+        if not file_id:
+            raise ValueError("file_id cannot be empty")
+
+        try:
+            response = await self.client.files.content(file_id)
+            return response.content
+        except Exception as e:
+            raise FileTransferError("download", "openai", e) from e
+
+    async def list_files(self, *, purpose: Optional[str] = None) -> List[UploadedFile]:
+        """List all uploaded files from OpenAI.
+
+        Args:
+            purpose: Optional filter by purpose (e.g., "assistants", "fine-tune")
+
+        Returns:
+            List of UploadedFile objects
+
+        Raises:
+            FileTransferError: If listing fails
+        """
+        try:
+            response = await self.client.files.list(purpose=purpose)
+            return [_uploaded_file_from_response(file_obj) for file_obj in response.data]
+        except Exception as e:
+            raise FileTransferError("list", "openai", e) from e
+
+    async def delete_file(self, file_id: str) -> bool:
+        """Delete a uploaded file from OpenAI.
+
+        Args:
+            file_id: ID of the file to delete
+
+        Returns:
+            True if deletion was successful
+
+        Raises:
+            ValueError: If file_id is invalid
+            FileTransferError: If deletion fails
+        """
+        if not file_id:
+            raise ValueError("file_id cannot be empty")
+
+        try:
+            response = await self.client.files.delete(file_id)
+            return getattr(response, 'deleted', False)
+        except Exception as e:
+            raise FileTransferError("delete", "openai", e) from e
+
+    async def generate_image(
+        self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024",
+        quality: Literal["standard", "hd"] = "standard", n: int = 1
+    ) -> List[str]:
+        """Generate images using OpenAI's DALL-E.
+
+        Args:
+            prompt: Description of the image to generate
+            size: Image size (e.g., "1024x1024", "1792x1024", "1024x1792")
+            quality: Image quality ("standard" or "hd")
+            n: Number of images to generate (1-10)
+
+        Returns:
+            List of image URLs
+
+        Raises:
+            FileTransferError: If image generation fails
+        """
+        if not prompt:
+            raise ValueError("prompt cannot be empty")
+        if n < 1 or n > 10:
+            raise ValueError("n must be between 1 and 10")
+
+        try:
+            response = await self.client.images.generate(
+                model="dall-e-3",
+                prompt=prompt,
+                size=size,
+                quality=quality,
+                n=n
+            )
+            return [image.url for image in response.data]
+        except Exception as e:
+            raise FileTransferError("image generation", "openai", e) from e
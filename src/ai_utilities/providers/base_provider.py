@@ -1,11 +1,12 @@
 """Base provider interface for AI models."""
 
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
-from typing import Any, List, Literal, Optional, Sequence, Union
+from typing import Any, Dict, List, Literal, Optional, Sequence, Union
 
 from ..file_models import UploadedFile
+from .provider_exceptions import ProviderCapabilityError
 
 
 class BaseProvider(ABC):
@@ -100,6 +101,74 @@ class BaseProvider(ABC):
             # Provider returned dict despite asking for text, convert to string
             return str(response)
     
+    def create_batch(
+        self,
+        input_file_id: str,
+        *,
+        endpoint: str = "/v1/chat/completions",
+        completion_window: str = "24h",
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Create an offline batch job from an uploaded JSONL input file.
+        
+        Args:
+            input_file_id: ID of the uploaded JSONL file (purpose "batch")
+            endpoint: API endpoint every request line targets
+            completion_window: Time window for the job to complete
+            metadata: Optional string metadata stored with the job
+            
+        Returns:
+            Batch job info (see retrieve_batch)
+            
+        Raises:
+            ProviderCapabilityError: If provider doesn't support batch jobs
+        """
+        raise ProviderCapabilityError("Batch API", getattr(self, "provider_name", type(self).__name__))
+    
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get the current state of a batch job.
+        
+        Args:
+            batch_id: ID of the batch job
+            
+        Returns:
+            Dict with id, status, input_file_id, output_file_id, error_file_id,
+            metadata and request_counts
+            
+        Raises:
+            ProviderCapabilityError: If provider doesn't support batch jobs
+        """
+        raise ProviderCapabilityError("Batch API", getattr(self, "provider_name", type(self).__name__))
+    
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Request cancellation of a batch job.
+        
+        Args:
+            batch_id: ID of the batch job
+            
+        Returns:
+            Batch job info after the cancellation request
+            
+        Raises:
+            ProviderCapabilityError: If provider doesn't support batch jobs
+        """
+        raise ProviderCapabilityError("Batch API", getattr(self, "provider_name", type(self).__name__))
+    
+    def ask_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream a text answer as it is generated.
+        
+        Default implementation yields the complete ask_text() response as a
+        single chunk. Providers with native streaming support override this.
+        
+        Args:
+            prompt: Single prompt string
+            **kwargs: Additional provider-specific parameters
+            
+        Yields:
+            Text deltas in the order they are produced
+        """
+        yield self.ask_text(prompt, **kwargs)
+    
     @abstractmethod
     def generate_image(
         self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024", 
@@ -2,7 +2,7 @@
 
 import json
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Union
 
@@ -50,10 +50,12 @@ def _create_openai_sdk_client(**client_kwargs: Any) -> Any:
             "OpenAI package is required for OpenAI-compatible providers. "
             "Install it with: pip install 'ai-utilities[openai]'"
         )
-    return OpenAI(**client_kwargs)
+    return OpenAI(**_with_rate_limit_observer(_openai, client_kwargs))
 
 from ..file_models import UploadedFile
+from ..token_usage import TokenUsage, report_usage
 from .base_provider import BaseProvider
+from .openai_provider import _with_rate_limit_observer
 from .provider_capabilities import ProviderCapabilities
 from .provider_exceptions import (
     ProviderCapabilityError,
@@ -64,28 +66,20 @@ from .provider_exceptions import (
 logger = logging.getLogger(__name__)
 
 
-class OpenAICompatibleProvider(BaseProvider):
-    """Provider for OpenAI-compatible endpoints (local servers, gateways, etc.)."""
+class OpenAICompatibleMixin:
+    """Configuration, parameter filtering and parsing shared by sync and async
+    OpenAI-compatible providers."""
     
-    def __init__(
+    def _configure(
         self,
-        api_key: Optional[str] = None,
-        base_url: Optional[str] = None,
-        timeout: int = 30,
-        extra_headers: Optional[Dict[str, str]] = None,
-        model: Optional[str] = None,
-        **kwargs
-    ):
-        """Initialize OpenAI-compatible provider.
+        api_key: Optional[str],
+        base_url: Optional[str],
+        timeout: int,
+        extra_headers: Optional[Dict[str, str]],
+        model: Optional[str],
+    ) -> Dict[str, Any]:
+        """Store provider configuration and return SDK client keyword arguments.
         
-        Args:
-            api_key: API key (can be dummy for local servers)
-            base_url: Base URL for the OpenAI-compatible endpoint (required)
-            timeout: Request timeout in seconds
-            extra_headers: Additional headers to send with requests
-            model: Model name to use (optional)
-            **kwargs: Additional initialization parameters
-            
         Raises:
             ProviderConfigurationError: If base_url is not provided
         """
@@ -109,7 +103,9 @@ class OpenAICompatibleProvider(BaseProvider):
             'model': model  # Use the provided model parameter
         })()
         
-        # Initialize OpenAI client using the stable boundary
+        # Initialize warning tracking
+        self._shown_warnings = set()
+        
         client_kwargs = {
             "api_key": api_key or "dummy-key",  # OpenAI SDK requires API key
             "base_url": self.base_url,
@@ -119,19 +115,24 @@ class OpenAICompatibleProvider(BaseProvider):
         # Add extra headers if provided
         if self.extra_headers:
             client_kwargs["default_headers"] = self.extra_headers
-            
-        self.client = _create_openai_sdk_client(**client_kwargs)
         
-        # Initialize warning tracking
-        self._shown_warnings = set()
-        
-        logger.info(f"Initialized OpenAI-compatible provider with base_url: {self.base_url}")
+        return client_kwargs
     
     @property
     def provider_name(self) -> str:
         """Get the provider name."""
         return "openai_compatible"
     
+    @property
+    def capabilities(self) -> ProviderCapabilities:
+        """Get the provider's capabilities."""
+        return self._capabilities
+    
+    @capabilities.setter
+    def capabilities(self, value: ProviderCapabilities) -> None:
+        """Set the provider's capabilities."""
+        self._capabilities = value
+    
     def _check_capability(self, capability: str) -> None:
         """Check if the provider supports a capability.
         
@@ -213,17 +214,9 @@ class OpenAICompatibleProvider(BaseProvider):
         
         return params
     
-    def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
-        """Ask a single question to the AI.
+    def _build_chat_request(self, prompt: str, return_format: Literal["text", "json"], **kwargs) -> Dict[str, Any]:
+        """Build chat completion arguments for a single prompt.
         
-        Args:
-            prompt: Single prompt string
-            return_format: Format for response ("text" or "json")
-            **kwargs: Additional provider-specific parameters
-            
-        Returns:
-            Response string for text format, dict for json format
-            
         Raises:
             ProviderCapabilityError: If JSON mode is requested but not supported
         """
@@ -238,32 +231,117 @@ class OpenAICompatibleProvider(BaseProvider):
         # Prepare request parameters
         request_params = self._filter_parameters(**kwargs)
         
+        return {
+            "model": request_params.get("model", "gpt-3.5-turbo"),  # Default model
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": request_params.get("temperature", 0.7),
+            "max_tokens": request_params.get("max_tokens"),
+            **({} if return_format == "text" else {"response_format": {"type": "json_object"}})
+        }
+    
+    @staticmethod
+    def _stream_delta(chunk: Any) -> str:
+        """Return the text delta carried by a streamed chat completion chunk."""
+        if not chunk.choices:
+            return ""
+        return chunk.choices[0].delta.content or ""
+    
+    def _parse_chat_content(self, content: str, return_format: Literal["text", "json"]) -> Union[str, Dict[str, Any]]:
+        """Convert completion text into the requested return format."""
+        if return_format == "json" and content:
+            try:
+                return json.loads(content)
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.error(f"Failed to parse JSON response: {e}")
+                # Return raw text if JSON parsing fails
+                return content
+        return content
+
+
+class OpenAICompatibleProvider(OpenAICompatibleMixin, BaseProvider):
+    """Provider for OpenAI-compatible endpoints (local servers, gateways, etc.)."""
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: int = 30,
+        extra_headers: Optional[Dict[str, str]] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ):
+        """Initialize OpenAI-compatible provider.
+        
+        Args:
+            api_key: API key (can be dummy for local servers)
+            base_url: Base URL for the OpenAI-compatible endpoint (required)
+            timeout: Request timeout in seconds
+            extra_headers: Additional headers to send with requests
+            model: Model name to use (optional)
+            **kwargs: Additional initialization parameters
+            
+        Raises:
+            ProviderConfigurationError: If base_url is not provided
+        """
+        client_kwargs = self._configure(api_key, base_url, timeout, extra_headers, model)
+        
+        # Initialize OpenAI client using the stable boundary
+        self.client = _create_openai_sdk_client(**client_kwargs)
+        
+        logger.info(f"Initialized OpenAI-compatible provider with base_url: {self.base_url}")
+    
+    def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
+        """Ask a single question to the AI.
+        
+        Args:
+            prompt: Single prompt string
+            return_format: Format for response ("text" or "json")
+            **kwargs: Additional provider-specific parameters
+            
+        Returns:
+            Response string for text format, dict for json format
+            
+        Raises:
+            ProviderCapabilityError: If JSON mode is requested but not supported
+        """
+        request = self._build_chat_request(prompt, return_format, **kwargs)
+        
         try:
             # Make the request
-            response = self.client.chat.completions.create(
-                model=request_params.get("model", "gpt-3.5-turbo"),  # Default model
-                messages=[{"role": "user", "content": prompt}],
-                temperature=request_params.get("temperature", 0.7),
-                max_tokens=request_params.get("max_tokens"),
-                **({} if return_format == "text" else {"response_format": {"type": "json_object"}})
-            )
+            response = self.client.chat.completions.create(**request)
+            report_usage(TokenUsage.from_response(response))
             
             content = response.choices[0].message.content or ""
-            
-            if return_format == "json" and content:
-                try:
-                    return json.loads(content)
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.error(f"Failed to parse JSON response: {e}")
-                    # Return raw text if JSON parsing fails
-                    return content
-            else:
-                return content
+            return self._parse_chat_content(content, return_format)
                 
         except Exception as e:
             logger.error(f"Error in openai_compatible provider ask: {e}")
             raise
     
+    def ask_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream a text answer from the server as it is generated.
+        
+        Args:
+            prompt: Single prompt string
+            **kwargs: Additional provider-specific parameters
+            
+        Yields:
+            Text deltas in the order they are produced
+        """
+        request = self._build_chat_request(prompt, "text", **kwargs)
+        
+        try:
+            stream = self.client.chat.completions.create(stream=True, **request)
+            for chunk in stream:
+                # Servers that support it send the usage on the final chunk
+                report_usage(TokenUsage.from_response(chunk))
+                delta = self._stream_delta(chunk)
+                if delta:
+                    yield delta
+        except Exception as e:
+            logger.error(f"Error in openai_compatible provider ask_stream: {e}")
+            raise
+    
     def ask_many(self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs) -> List[Union[str, Dict[str, Any]]]:
         """Ask multiple questions to the AI.
         
@@ -281,16 +359,6 @@ class OpenAICompatibleProvider(BaseProvider):
             responses.append(response)
         return responses
     
-    @property
-    def capabilities(self) -> ProviderCapabilities:
-        """Get the provider's capabilities."""
-        return self._capabilities
-    
-    @capabilities.setter
-    def capabilities(self, value: ProviderCapabilities) -> None:
-        """Set the provider's capabilities."""
-        self._capabilities = value
-    
     def upload_file(
         self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
     ) -> UploadedFile:
@@ -3,11 +3,17 @@
 import json
 import mimetypes
 import re
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Union
 
+from ..file_models import UploadedFile
+from ..rate_limiter import observe_rate_limit_headers
+from ..token_usage import TokenUsage, report_usage
+from .base_provider import BaseProvider
+from .provider_exceptions import FileTransferError
+
 # OpenAI imports - lazy loaded to avoid import-time dependencies
 _openai = None
 ChatCompletion = None
@@ -59,14 +65,141 @@ def _create_openai_sdk_client(**client_kwargs: Any) -> Any:
         raise MissingOptionalDependencyError(
             dependency="OpenAI package is required for OpenAI provider. Install it with: pip install 'ai-utilities[openai]'"
         )
-    return OpenAI(**client_kwargs)
+    return OpenAI(**_with_rate_limit_observer(_openai, client_kwargs))
 
-from ..file_models import UploadedFile
-from .base_provider import BaseProvider
-from .provider_exceptions import FileTransferError
+
+def _report_rate_limit_headers(response: Any) -> None:
+    observe_rate_limit_headers(response.headers)
+
+
+async def _report_rate_limit_headers_async(response: Any) -> None:
+    observe_rate_limit_headers(response.headers)
+
+
+def _with_rate_limit_observer(
+    openai_module: Any, client_kwargs: Dict[str, Any], asynchronous: bool = False
+) -> Dict[str, Any]:
+    """
+    Give the SDK client an HTTP client that reports every response's rate limit headers.
+
+    Callers passing their own ``http_client`` keep it; SDKs too old to provide the
+    default HTTP clients are left as they are.
+    """
+    factory = getattr(openai_module, "DefaultAsyncHttpxClient" if asynchronous else "DefaultHttpxClient", None)
+    if factory is None or "http_client" in client_kwargs:
+        return client_kwargs
+    hook = _report_rate_limit_headers_async if asynchronous else _report_rate_limit_headers
+    return {**client_kwargs, "http_client": factory(event_hooks={"response": [hook]})}
+
+
+def _uploaded_file_from_response(file_obj: Any) -> UploadedFile:
+    """Convert an OpenAI file object into our UploadedFile model."""
+    return UploadedFile(
+        file_id=file_obj.id,
+        filename=file_obj.filename,
+        bytes=file_obj.bytes,
+        provider="openai",
+        purpose=file_obj.purpose,
+        created_at=(
+            datetime.fromisoformat(file_obj.created_at.replace("Z", "+00:00"))
+            if isinstance(file_obj.created_at, str) and file_obj.created_at
+            else datetime.fromtimestamp(file_obj.created_at)
+            if isinstance(file_obj.created_at, (int, float)) and file_obj.created_at
+            else None
+        )
+    )
+
+
+def _batch_info_from_response(batch: Any) -> Dict[str, Any]:
+    """Convert an OpenAI batch object into a plain dict."""
+    counts = getattr(batch, "request_counts", None)
+    return {
+        "id": batch.id,
+        "status": batch.status,
+        "input_file_id": getattr(batch, "input_file_id", None),
+        "output_file_id": getattr(batch, "output_file_id", None),
+        "error_file_id": getattr(batch, "error_file_id", None),
+        "metadata": dict(getattr(batch, "metadata", None) or {}),
+        "request_counts": {
+            "total": counts.total,
+            "completed": counts.completed,
+            "failed": counts.failed,
+        } if counts is not None else {},
+    }
+
+
+class OpenAIChatMixin:
+    """Request building and response parsing shared by sync and async OpenAI providers.
+    
+    Expects ``self.settings`` and ``self.provider_name`` on the host class.
+    """
+    
+    def _build_chat_params(self, return_format: Literal["text", "json"] = "text", **kwargs) -> Dict[str, Any]:
+        """Build chat completion parameters, giving priority to kwargs over settings."""
+        params: Dict[str, Any] = {
+            "model": kwargs.get("model", self.settings.model),
+            "temperature": kwargs.get("temperature", self.settings.temperature),
+            "max_tokens": kwargs.get("max_tokens", self.settings.max_tokens),
+        }
+        
+        # Add response format for JSON mode if requested and model supports it
+        model = params["model"]
+        
+        # JSON mode is supported by recent GPT models and most OpenAI-compatible models
+        # Use model name patterns to detect JSON capability
+        supports_json_mode = (
+            model.startswith("gpt-4") or 
+            model.startswith("gpt-3.5-turbo") or
+            "json" in model.lower() or
+            model.startswith("claude-3") or
+            model in ["o1-preview", "o1-mini"] or
+            # For OpenAI-compatible providers, assume JSON support unless explicitly disabled
+            self.provider_name != "openai"
+        )
+        
+        if return_format == "json" and supports_json_mode:
+            params["response_format"] = {"type": "json_object"}
+        
+        return params
+    
+    def _parse_chat_content(self, result: str, return_format: Literal["text", "json"], params: Dict[str, Any]) -> Union[str, Dict[str, Any]]:
+        """Convert completion text into the requested return format."""
+        # For JSON mode with native support, the result should already be valid JSON
+        if return_format == "json" and params.get("response_format"):
+            try:
+                return json.loads(result)
+            except json.JSONDecodeError:
+                # If parsing fails, return the raw string wrapped in a dict
+                return {"response": result}
+        
+        # For JSON requests without native support, extract JSON from text
+        if return_format == "json":
+            return self._extract_json(result)
+        
+        return result
+    
+    @staticmethod
+    def _stream_delta(chunk: Any) -> str:
+        """Return the text delta carried by a streamed chat completion chunk."""
+        if not chunk.choices:
+            return ""
+        return chunk.choices[0].delta.content or ""
+    
+    def _extract_json(self, text: str) -> Dict[str, Any]:
+        """Extract JSON from response text."""
+        # Try to find JSON in the response (non-greedy to get first valid JSON)
+        for json_match in re.finditer(r'\{.*?\}', text, re.DOTALL):
+            try:
+                # Validate it's valid JSON and return as dict
+                return json.loads(json_match.group())
+            except json.JSONDecodeError:
+                continue
+        
+        # If no valid JSON found, return original text wrapped in a dict
+        return {"response": text}
 
 
-class OpenAIProvider(BaseProvider):
+class OpenAIProvider(OpenAIChatMixin, BaseProvider):
     """OpenAI provider for AI requests."""
     
     def __init__(self, settings, client=None):
@@ -117,55 +250,43 @@ class OpenAIProvider(BaseProvider):
         """
         return [self._ask_single(prompt, return_format, **kwargs) for prompt in prompts]
     
-    def _ask_single(self, prompt: str, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
-        """Ask a single question to OpenAI."""
-        # Merge settings with kwargs, giving priority to kwargs
-        params: Dict[str, Any] = {
-            "model": kwargs.get("model", self.settings.model),
-            "temperature": kwargs.get("temperature", self.settings.temperature),
-            "max_tokens": kwargs.get("max_tokens", self.settings.max_tokens),
-        }
+    def ask_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream a text answer from OpenAI as it is generated.
         
-        # Add response format for JSON mode if requested and model supports it
-        model = params["model"]
-        
-        # JSON mode is supported by recent GPT models and most OpenAI-compatible models
-        # Use model name patterns to detect JSON capability
-        supports_json_mode = (
-            model.startswith("gpt-4") or 
-            model.startswith("gpt-3.5-turbo") or
-            "json" in model.lower() or
-            model.startswith("claude-3") or
-            model in ["o1-preview", "o1-mini"] or
-            # For OpenAI-compatible providers, assume JSON support unless explicitly disabled
-            self.provider_name != "openai"
+        Args:
+            prompt: Single prompt string
+            **kwargs: Additional parameters (model, temperature, etc.)
+            
+        Yields:
+            Text deltas in the order they are produced
+        """
+        params = self._build_chat_params("text", **kwargs)
+        stream = self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            # The final chunk then carries the usage of the whole stream
+            stream_options={"include_usage": True},
+            **params
         )
-        
-        if return_format == "json" and supports_json_mode:
-            params["response_format"] = {"type": "json_object"}
-        
+        for chunk in stream:
+            report_usage(TokenUsage.from_response(chunk))
+            delta = self._stream_delta(chunk)
+            if delta:
+                yield delta
+    
+    def _ask_single(self, prompt: str, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
+        """Ask a single question to OpenAI."""
+        params = self._build_chat_params(return_format, **kwargs)
         messages = [{"role": "user", "content": prompt}]
         
         response: ChatCompletion = self.client.chat.completions.create(
             messages=messages,
             **params
         )
+        report_usage(TokenUsage.from_response(response))
         
         result = response.choices[0].message.content or ""
-        
-        # For JSON mode with native support, the result should already be valid JSON
-        if return_format == "json" and params.get("response_format"):
-            try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                # If parsing fails, return the raw string wrapped in a dict
-                return {"response": result}
-        
-        # For JSON requests without native support, extract JSON from text
-        if return_format == "json":
-            return self._extract_json(result)
-        
-        return result
+        return self._parse_chat_content(result, return_format, params)
     
     def _ask_batch(self, prompts: List[str], return_format: Literal["text", "json"] = "text", **kwargs) -> List[str]:
         """Ask multiple questions to OpenAI."""
@@ -175,19 +296,6 @@ class OpenAIProvider(BaseProvider):
             results.append(result)
         return results
     
-    def _extract_json(self, text: str) -> Dict[str, Any]:
-        """Extract JSON from response text."""
-        # Try to find JSON in the response (non-greedy to get first valid JSON)
-        for json_match in re.finditer(r'\{.*?\}', text, re.DOTALL):
-            try:
-                # Validate it's valid JSON and return as dict
-                return json.loads(json_match.group())
-            except json.JSONDecodeError:
-                continue
-        
-        # If no valid JSON found, return original text wrapped in a dict
-        return {"response": text}
-    
     def upload_file(
         self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
     ) -> UploadedFile:
@@ -226,20 +334,7 @@ class OpenAIProvider(BaseProvider):
                 )
             
             # Convert to our UploadedFile model
-            return UploadedFile(
-                file_id=response.id,
-                filename=response.filename,
-                bytes=response.bytes,
-                provider="openai",
-                purpose=response.purpose,
-                created_at=(
-                    datetime.fromisoformat(response.created_at.replace("Z", "+00:00"))
-                    if isinstance(response.created_at, str) and response.created_at
-                    else datetime.fromtimestamp(response.created_at)
-                    if isinstance(response.created_at, (int, float)) and response.created_at
-                    else None
-                )
-            )
+            return _uploaded_file_from_response(response)
             
         except (Exception) as e:
             # Don't wrap validation errors - let them propagate
@@ -294,20 +389,7 @@ class OpenAIProvider(BaseProvider):
             # Convert to our UploadedFile model
             files = []
             for file_obj in response.data:
-                files.append(UploadedFile(
-                    file_id=file_obj.id,
-                    filename=file_obj.filename,
-                    bytes=file_obj.bytes,
-                    provider="openai",
-                    purpose=file_obj.purpose,
-                    created_at=(
-                        datetime.fromisoformat(file_obj.created_at.replace("Z", "+00:00"))
-                        if isinstance(file_obj.created_at, str) and file_obj.created_at
-                        else datetime.fromtimestamp(file_obj.created_at)
-                        if isinstance(file_obj.created_at, (int, float)) and file_obj.created_at
-                        else None
-                    )
-                ))
+                files.append(_uploaded_file_from_response(file_obj))
             
             return files
             
@@ -343,6 +425,73 @@ class OpenAIProvider(BaseProvider):
                 raise
             raise FileTransferError("delete", "openai", e) from e
 
+    def create_batch(
+        self,
+        input_file_id: str,
+        *,
+        endpoint: str = "/v1/chat/completions",
+        completion_window: str = "24h",
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Create a Batch API job from an uploaded JSONL input file.
+        
+        Args:
+            input_file_id: ID of the uploaded JSONL file (purpose "batch")
+            endpoint: API endpoint every request line targets
+            completion_window: Time window for the job to complete
+            metadata: Optional string metadata stored with the job
+            
+        Returns:
+            Batch job info
+            
+        Raises:
+            FileTransferError: If the job cannot be created
+        """
+        try:
+            batch = self.client.batches.create(
+                input_file_id=input_file_id,
+                endpoint=endpoint,
+                completion_window=completion_window,
+                metadata=metadata,
+            )
+            return _batch_info_from_response(batch)
+        except Exception as e:
+            raise FileTransferError("batch create", "openai", e) from e
+    
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get the current state of a Batch API job.
+        
+        Args:
+            batch_id: ID of the batch job
+            
+        Returns:
+            Batch job info
+            
+        Raises:
+            FileTransferError: If the job cannot be retrieved
+        """
+        try:
+            return _batch_info_from_response(self.client.batches.retrieve(batch_id))
+        except Exception as e:
+            raise FileTransferError("batch retrieve", "openai", e) from e
+    
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Request cancellation of a Batch API job.
+        
+        Args:
+            batch_id: ID of the batch job
+            
+        Returns:
+            Batch job info after the cancellation request
+            
+        Raises:
+            FileTransferError: If the job cannot be cancelled
+        """
+        try:
+            return _batch_info_from_response(self.client.batches.cancel(batch_id))
+        except Exception as e:
+            raise FileTransferError("batch cancel", "openai", e) from e
+
     def generate_image(
         self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024", 
         quality: Literal["standard", "hd"] = "standard", n: int = 1
@@ -6,6 +6,22 @@ from dataclasses import dataclass
 from typing import Optional
 
 
+def error_status_code(error: BaseException) -> Optional[int]:
+    """Return the HTTP status code carried by an SDK error, if any."""
+    status_code = getattr(error, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def error_name_matches(error: BaseException, *fragments: str) -> bool:
+    """Return True if the class name of ``error`` contains one of ``fragments``.
+
+    Recognizes SDK errors such as ``openai.RateLimitError`` without importing
+    the SDK.
+    """
+    name = type(error).__name__
+    return any(fragment in name for fragment in fragments)
+
+
 @dataclass
 class ProviderConfigurationError(Exception):
     """Raised when provider configuration is invalid."""
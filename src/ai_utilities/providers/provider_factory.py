@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING, List
+from typing import Any, Optional, TYPE_CHECKING, List, Type, Union
 
 from .base_provider import BaseProvider
 from .provider_exceptions import ProviderConfigurationError, MissingOptionalDependencyError
@@ -10,6 +10,7 @@ from ..config_resolver import resolve_request_config, MissingApiKeyError, Unknow
 
 if TYPE_CHECKING:
     from ..client import AiSettings
+    from .base import AsyncProvider
 
 
 def _coerce_timeout_seconds(value: object, default: int) -> int:
@@ -55,7 +56,8 @@ def create_provider(settings: "AiSettings", provider: Optional[BaseProvider] = N
         provider: Optional explicit provider to use (overrides settings)
         
     Returns:
-        Configured AI provider instance
+        Configured AI provider instance, or a ProviderPool when
+        ``settings.provider_pool`` is set
     
     Raises:
         ProviderConfigurationError: If provider configuration is invalid
@@ -64,6 +66,43 @@ def create_provider(settings: "AiSettings", provider: Optional[BaseProvider] = N
     if provider is not None:
         return provider
     
+    if getattr(settings, "provider_pool", None):
+        from .provider_pool import ProviderPool
+        return ProviderPool.from_settings(settings)
+    
+    return _create_configured_provider(settings, asynchronous=False)
+
+
+def create_async_provider(settings: "AiSettings", provider: Optional["AsyncProvider"] = None) -> "AsyncProvider":
+    """Create a native async AI provider based on settings.
+    
+    Uses the same configuration resolution as :func:`create_provider`, but
+    returns providers built on ``openai.AsyncOpenAI`` that await requests
+    on the event loop instead of offloading them to worker threads.
+    
+    Args:
+        settings: AI settings containing provider configuration
+        provider: Optional explicit async provider to use (overrides settings)
+        
+    Returns:
+        Configured async AI provider instance, or an AsyncProviderPool when
+        ``settings.provider_pool`` is set
+    
+    Raises:
+        ProviderConfigurationError: If provider configuration is invalid
+    """
+    if provider is not None:
+        return provider
+    
+    if getattr(settings, "provider_pool", None):
+        from .provider_pool import AsyncProviderPool
+        return AsyncProviderPool.from_settings(settings)
+    
+    return _create_configured_provider(settings, asynchronous=True)
+
+
+def _create_configured_provider(settings: "AiSettings", *, asynchronous: bool) -> Any:
+    """Resolve settings and build the matching sync or async provider."""
     # Check if settings is None
     if settings is None:
         raise ProviderConfigurationError("Settings cannot be None", "unknown")
@@ -85,19 +124,32 @@ def create_provider(settings: "AiSettings", provider: Optional[BaseProvider] = N
         # Create provider based on resolved provider
         if config.provider == "openai":
             # Lazy import to avoid dependency issues
+            provider_class: Union[Type[BaseProvider], Type[AsyncProvider]]
             try:
-                from .openai_provider import OpenAIProvider
+                if asynchronous:
+                    from .async_openai_provider import AsyncOpenAIProvider
+                    provider_class = AsyncOpenAIProvider
+                else:
+                    from .openai_provider import OpenAIProvider
+                    provider_class = OpenAIProvider
             except ImportError as e:
                 raise MissingOptionalDependencyError(
                     "OpenAI provider requires extra 'openai'. Install with: pip install ai-utilities[openai]"
                 ) from e
-            return OpenAIProvider(provider_settings)
+            return provider_class(provider_settings)
 
-        elif config.provider in ["groq", "together", "openrouter"]:
-            # These are all OpenAI-compatible with different base URLs
+        compatible_class: Union[Type[BaseProvider], Type[AsyncProvider]]
+        if asynchronous:
+            from .async_openai_compatible_provider import AsyncOpenAICompatibleProvider
+            compatible_class = AsyncOpenAICompatibleProvider
+        else:
             from .openai_compatible_provider import OpenAICompatibleProvider
+            compatible_class = OpenAICompatibleProvider
+
+        if config.provider in ["groq", "together", "openrouter"]:
+            # These are all OpenAI-compatible with different base URLs
             extra_headers = getattr(settings, 'extra_headers', None) if hasattr(settings, 'extra_headers') else None
-            return OpenAICompatibleProvider(
+            return compatible_class(
                 api_key=config.api_key,
                 base_url=config.base_url,
                 timeout=_coerce_timeout_seconds(getattr(settings, "timeout", None), 30),
@@ -107,9 +159,8 @@ def create_provider(settings: "AiSettings", provider: Optional[BaseProvider] = N
 
         elif config.provider in ["ollama", "lmstudio", "text-generation-webui", "fastchat", "openai_compatible"]:
             # Local providers
-            from .openai_compatible_provider import OpenAICompatibleProvider
             extra_headers = getattr(settings, 'extra_headers', None) if hasattr(settings, 'extra_headers') else None
-            return OpenAICompatibleProvider(
+            return compatible_class(
                 api_key=config.api_key,
                 base_url=config.base_url,
                 timeout=_coerce_timeout_seconds(getattr(config, "timeout", None), 30),
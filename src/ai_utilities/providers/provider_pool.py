@@ -0,0 +1,519 @@
+"""Provider pool with weighted load balancing and failover."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..file_models import UploadedFile
+from .base_provider import BaseProvider
+from .provider_exceptions import (
+    ProviderConfigurationError,
+    error_name_matches,
+    error_status_code,
+)
+
+if TYPE_CHECKING:
+    from ..config_models import AiSettings
+    from .base import AsyncProvider
+
+PoolStrategy = Literal["weighted", "least_outstanding", "latency"]
+
+# Smoothing factor for the per-provider latency moving average
+_LATENCY_ALPHA = 0.3
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """Return True if ``error`` means the provider is unavailable (connection error or 5xx)."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    status_code = error_status_code(error)
+    if status_code is not None and status_code >= 500:
+        return True
+    # SDK errors such as openai.APIConnectionError / openai.APITimeoutError
+    return error_name_matches(error, "Connection", "Timeout")
+
+
+def parse_pool_spec(spec: str) -> List[Tuple[str, float]]:
+    """Parse a pool spec such as ``"openai:3,groq:1,ollama"`` into (name, weight) pairs.
+
+    Args:
+        spec: Comma-separated provider names with optional ``:weight`` suffixes
+
+    Returns:
+        List of (provider name, weight) tuples; the weight defaults to 1
+
+    Raises:
+        ProviderConfigurationError: If an entry is empty or has an invalid weight
+    """
+    members = []
+    for entry in spec.split(","):
+        name, _, weight = entry.strip().partition(":")
+        name = name.strip()
+        if not name:
+            raise ProviderConfigurationError(f"Invalid provider pool entry: {entry!r}", "pool")
+        try:
+            value = float(weight) if weight.strip() else 1.0
+        except ValueError as e:
+            raise ProviderConfigurationError(f"Invalid weight in provider pool entry: {entry!r}", name) from e
+        if value <= 0:
+            raise ProviderConfigurationError(f"Weight must be > 0 in provider pool entry: {entry!r}", name)
+        members.append((name, value))
+    return members
+
+
+class _Member:
+    """A provider in the pool together with its routing and health state."""
+
+    def __init__(self, provider: Any, name: str, weight: float, model: Optional[str]):
+        self.provider = provider
+        self.name = name
+        self.weight = weight
+        self.model = model
+        self.in_flight = 0
+        self.latency_s: Optional[float] = None
+        self.failures = 0
+        self.unhealthy_until = 0.0
+        self.current_weight = 0.0  # Smooth weighted round-robin state
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+
+class _PoolRouting(ABC):
+    """Provider selection and health tracking shared by the sync and async pools."""
+
+    def __init__(
+        self,
+        providers: Sequence[Any],
+        weights: Optional[Sequence[float]] = None,
+        *,
+        strategy: PoolStrategy = "weighted",
+        cooldown_s: float = 30.0,
+        names: Optional[Sequence[str]] = None,
+        models: Optional[Sequence[Optional[str]]] = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            providers: Providers to balance over; the first also serves file operations
+            weights: Relative weights for the ``"weighted"`` strategy (default 1 each)
+            strategy: Routing strategy
+            cooldown_s: How long a failed provider is skipped
+            names: Display names used in ``health()`` (default: provider_name)
+            models: Per-provider model pinned onto every request sent to it
+                (None leaves the request's model unchanged)
+
+        Raises:
+            ProviderConfigurationError: If the pool is empty or inconsistent
+        """
+        if not providers:
+            raise ProviderConfigurationError("Provider pool needs at least one provider", "pool")
+        if strategy not in ("weighted", "least_outstanding", "latency"):
+            raise ProviderConfigurationError(f"Unknown provider pool strategy: {strategy}", "pool")
+        count = len(providers)
+        weights = list(weights) if weights is not None else [1.0] * count
+        names = list(names) if names is not None else [
+            getattr(p, "provider_name", type(p).__name__) for p in providers
+        ]
+        models = list(models) if models is not None else [None] * count
+        if not len(weights) == len(names) == len(models) == count:
+            raise ProviderConfigurationError("Provider pool weights, names and models must match providers", "pool")
+        if any(w <= 0 for w in weights):
+            raise ProviderConfigurationError("Provider pool weights must be > 0", "pool")
+
+        self.strategy = strategy
+        self.cooldown_s = cooldown_s
+        self._members = [_Member(*fields) for fields in zip(providers, names, weights, models)]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: "AiSettings") -> Any:
+        """Build a pool from ``settings.provider_pool``.
+
+        Each member is created with ``create_provider`` (``create_async_provider``
+        for an ``AsyncProviderPool``) from a copy of the
+        settings with ``provider`` set to the member. Its base URL, API key
+        and model come from the vendor-specific settings (e.g. ``groq_base_url``,
+        ``GROQ_API_KEY``, ``GROQ_MODEL``); a vendor model is pinned onto every
+        request routed to that member.
+
+        Args:
+            settings: Settings with ``provider_pool`` (e.g. ``"openai:3,groq:1"``)
+
+        Returns:
+            Configured provider pool
+
+        Raises:
+            ProviderConfigurationError: If the pool spec or a member is invalid
+        """
+        if not settings.provider_pool:
+            raise ProviderConfigurationError("provider_pool is not configured", "pool")
+
+        providers, names, weights, models = [], [], [], []
+        for name, weight in parse_pool_spec(settings.provider_pool):
+            prefix = name.replace("-", "_")
+            vendor_model = getattr(settings, f"{prefix}_model", None)
+            update = {
+                "provider": name,
+                "provider_pool": None,
+                "base_url": getattr(settings, f"{prefix}_base_url", None),
+                "model": vendor_model or settings.model,
+            }
+            vendor_key = getattr(settings, f"{prefix}_api_key", None)
+            if vendor_key:
+                update["api_key"] = vendor_key
+            elif name != "openai":
+                # Local and vendor backends must not reuse the shared (OpenAI) key
+                update["api_key"] = None
+            providers.append(cls._create_member(settings.model_copy(update=update)))
+            names.append(name)
+            weights.append(weight)
+            models.append(vendor_model)
+
+        return cls(
+            providers,
+            weights,
+            strategy=settings.provider_pool_strategy,
+            cooldown_s=settings.provider_pool_cooldown_s,
+            names=names,
+            models=models,
+        )
+
+    @staticmethod
+    @abstractmethod
+    def _create_member(settings: "AiSettings") -> Any:
+        """Create the provider of one pool member from its settings."""
+
+    @property
+    def provider_name(self) -> str:
+        """Name of the pool, listing its members."""
+        return "pool(" + ",".join(member.name for member in self._members) + ")"
+
+    @property
+    def providers(self) -> List[BaseProvider]:
+        """Providers in the pool, in configuration order."""
+        return [member.provider for member in self._members]
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Return per-provider health and routing statistics.
+
+        Returns:
+            One dict per provider with name, healthy, in_flight, latency_s and failures
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": member.name,
+                    "healthy": member.healthy(now),
+                    "in_flight": member.in_flight,
+                    "latency_s": member.latency_s,
+                    "failures": member.failures,
+                }
+                for member in self._members
+            ]
+
+    @staticmethod
+    def _params(member: _Member, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if member.model is None:
+            return kwargs
+        return {**kwargs, "model": member.model}
+
+    def _ranked(self) -> List[_Member]:
+        """Return members in the order to try them: the strategy's pick first,
+        then the other healthy members, then unhealthy ones as a last resort."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [m for m in self._members if m.healthy(now)]
+            unhealthy = sorted(
+                (m for m in self._members if not m.healthy(now)), key=lambda m: m.unhealthy_until
+            )
+            if not healthy:
+                return unhealthy
+
+            if self.strategy == "least_outstanding":
+                healthy.sort(key=lambda m: (m.in_flight, -m.weight))
+            elif self.strategy == "latency":
+                healthy.sort(key=lambda m: (m.latency_s is not None, m.latency_s or 0.0))
+            else:
+                # Smooth weighted round-robin: deterministic, proportional, interleaved
+                total = sum(m.weight for m in healthy)
+                for m in healthy:
+                    m.current_weight += m.weight
+                chosen = max(healthy, key=lambda m: m.current_weight)
+                chosen.current_weight -= total
+                healthy.sort(key=lambda m: (m is not chosen, -m.weight))
+            return healthy + unhealthy
+
+    @staticmethod
+    def _exhausted(last_error: Optional[BaseException]) -> BaseException:
+        """Return the error to raise once every member has failed over."""
+        if last_error is not None:
+            return last_error
+        return ProviderConfigurationError("Provider pool has no provider to try", "pool")
+
+    def _begin(self, member: _Member) -> float:
+        with self._lock:
+            member.in_flight += 1
+        return time.monotonic()
+
+    def _end(self, member: _Member, start: float, error: Optional[BaseException], record: bool = True) -> None:
+        latency = time.monotonic() - start
+        with self._lock:
+            member.in_flight -= 1
+            if not record:
+                return
+            if error is None:
+                member.failures = 0
+                member.unhealthy_until = 0.0
+                member.latency_s = (
+                    latency if member.latency_s is None
+                    else _LATENCY_ALPHA * latency + (1 - _LATENCY_ALPHA) * member.latency_s
+                )
+            elif is_failover_error(error):
+                member.failures += 1
+                member.unhealthy_until = time.monotonic() + self.cooldown_s
+
+
+class ProviderPool(_PoolRouting, BaseProvider):
+    """Spread requests over several providers and fail over between them.
+
+    Each call is routed to one healthy provider, chosen by ``strategy``:
+
+    - ``"weighted"``: smooth weighted round-robin over the weights
+    - ``"least_outstanding"``: the provider with the fewest requests in flight
+    - ``"latency"``: the provider with the lowest observed latency (untried first)
+
+    If the call fails with a connection error or a 5xx response, the provider
+    is marked unhealthy for ``cooldown_s`` and the call is retried on the next
+    provider. Other errors are raised immediately. File, batch and image
+    operations are not load balanced: their IDs are provider-specific, so they
+    always go to the first provider.
+
+    Example:
+        settings = AiSettings(provider_pool="openai:3,groq:1,ollama:1")
+        client = AiClient(settings, provider=ProviderPool.from_settings(settings))
+    """
+
+    @staticmethod
+    def _create_member(settings: "AiSettings") -> BaseProvider:
+        from .provider_factory import create_provider
+
+        return create_provider(settings)
+
+    def ask(
+        self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs
+    ) -> Union[str, Dict[str, Any]]:
+        """Ask a single question on the selected provider, failing over if it is down."""
+        return self._call(lambda provider, params: provider.ask(prompt, return_format=return_format, **params), kwargs)
+
+    def ask_many(
+        self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs
+    ) -> List[Union[str, Dict[str, Any]]]:
+        """Ask multiple questions, routing each prompt independently."""
+        return [self.ask(prompt, return_format=return_format, **kwargs) for prompt in prompts]
+
+    def ask_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream an answer from the selected provider.
+
+        Fails over only while no text has been yielded yet; an error in the
+        middle of a stream is raised to the caller.
+        """
+        last_error: Optional[BaseException] = None
+        for member in self._ranked():
+            started = False
+            start = self._begin(member)
+            try:
+                for delta in member.provider.ask_stream(prompt, **self._params(member, kwargs)):
+                    started = True
+                    yield delta
+            except Exception as e:
+                self._end(member, start, e)
+                if started or not is_failover_error(e):
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                # Closed or interrupted by the consumer; not a provider failure
+                self._end(member, start, None, record=False)
+                raise
+            self._end(member, start, None)
+            return
+        raise self._exhausted(last_error)
+
+    def upload_file(
+        self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
+    ) -> UploadedFile:
+        """Upload a file to the first provider."""
+        return self._members[0].provider.upload_file(path, purpose=purpose, filename=filename, mime_type=mime_type)
+
+    def download_file(self, file_id: str) -> bytes:
+        """Download a file from the first provider."""
+        return self._members[0].provider.download_file(file_id)
+
+    def list_files(self, *, purpose: Optional[str] = None) -> List[UploadedFile]:
+        """List files on the first provider."""
+        return self._members[0].provider.list_files(purpose=purpose)
+
+    def delete_file(self, file_id: str) -> bool:
+        """Delete a file on the first provider."""
+        return self._members[0].provider.delete_file(file_id)
+
+    def create_batch(self, input_file_id: str, **kwargs) -> Dict[str, Any]:
+        """Create a batch job on the first provider."""
+        return self._members[0].provider.create_batch(input_file_id, **kwargs)
+
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get a batch job from the first provider."""
+        return self._members[0].provider.retrieve_batch(batch_id)
+
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Cancel a batch job on the first provider."""
+        return self._members[0].provider.cancel_batch(batch_id)
+
+    def generate_image(
+        self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024",
+        quality: Literal["standard", "hd"] = "standard", n: int = 1
+    ) -> List[str]:
+        """Generate images on the first provider."""
+        return self._members[0].provider.generate_image(prompt, size=size, quality=quality, n=n)
+
+    def _call(self, send: Callable[[BaseProvider, Dict[str, Any]], Any], kwargs: Dict[str, Any]) -> Any:
+        """Run ``send`` on providers in routing order until one does not fail over."""
+        last_error: Optional[BaseException] = None
+        for member in self._ranked():
+            start = self._begin(member)
+            try:
+                response = send(member.provider, self._params(member, kwargs))
+            except Exception as e:
+                self._end(member, start, e)
+                if not is_failover_error(e):
+                    raise
+                last_error = e
+                continue
+            self._end(member, start, None)
+            return response
+        raise self._exhausted(last_error)
+
+
+class AsyncProviderPool(_PoolRouting):
+    """``ProviderPool`` for async providers, as built by ``create_async_provider``.
+
+    Routing, failover and health tracking are the same as ``ProviderPool``'s;
+    calls are awaited on the selected provider instead of blocking.
+
+    Example:
+        settings = AiSettings(provider_pool="openai:3,groq:1")
+        client = AsyncAiClient(settings)  # uses AsyncProviderPool.from_settings(settings)
+    """
+
+    @staticmethod
+    def _create_member(settings: "AiSettings") -> "AsyncProvider":
+        from .provider_factory import create_async_provider
+
+        return create_async_provider(settings)
+
+    async def ask(
+        self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs
+    ) -> Union[str, Dict[str, Any]]:
+        """Ask a single question on the selected provider, failing over if it is down."""
+        return await self._call(
+            lambda provider, params: provider.ask(prompt, return_format=return_format, **params), kwargs
+        )
+
+    async def ask_many(
+        self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs
+    ) -> List[Union[str, Dict[str, Any]]]:
+        """Ask multiple questions, routing each prompt independently."""
+        return [await self.ask(prompt, return_format=return_format, **kwargs) for prompt in prompts]
+
+    async def ask_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream an answer from the selected provider; see ``ProviderPool.ask_stream``.
+
+        Members without ``ask_stream`` yield their complete answer as one chunk.
+        """
+        last_error: Optional[BaseException] = None
+        for member in self._ranked():
+            started = False
+            start = self._begin(member)
+            params = self._params(member, kwargs)
+            try:
+                if hasattr(member.provider, "ask_stream"):
+                    async for delta in member.provider.ask_stream(prompt, **params):
+                        started = True
+                        yield delta
+                else:
+                    response = await member.provider.ask(prompt, return_format="text", **params)
+                    started = True
+                    yield str(response)
+            except Exception as e:
+                self._end(member, start, e)
+                if started or not is_failover_error(e):
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                # Closed, cancelled or interrupted by the consumer; not a provider failure
+                self._end(member, start, None, record=False)
+                raise
+            self._end(member, start, None)
+            return
+        raise self._exhausted(last_error)
+
+    async def upload_file(
+        self, path: Path, *, purpose: str = "assistants", filename: Optional[str] = None, mime_type: Optional[str] = None
+    ) -> UploadedFile:
+        """Upload a file to the first provider."""
+        return await self._members[0].provider.upload_file(path, purpose=purpose, filename=filename, mime_type=mime_type)
+
+    async def download_file(self, file_id: str) -> bytes:
+        """Download a file from the first provider."""
+        return await self._members[0].provider.download_file(file_id)
+
+    async def list_files(self, *, purpose: Optional[str] = None) -> List[UploadedFile]:
+        """List files on the first provider."""
+        return await self._members[0].provider.list_files(purpose=purpose)
+
+    async def delete_file(self, file_id: str) -> bool:
+        """Delete a file on the first provider."""
+        return await self._members[0].provider.delete_file(file_id)
+
+    async def generate_image(
+        self, prompt: str, *, size: Literal["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"] = "1024x1024",
+        quality: Literal["standard", "hd"] = "standard", n: int = 1
+    ) -> List[str]:
+        """Generate images on the first provider."""
+        return await self._members[0].provider.generate_image(prompt, size=size, quality=quality, n=n)
+
+    async def _call(self, send: Callable[[Any, Dict[str, Any]], Awaitable[Any]], kwargs: Dict[str, Any]) -> Any:
+        """Await ``send`` on providers in routing order until one does not fail over."""
+        last_error: Optional[BaseException] = None
+        for member in self._ranked():
+            start = self._begin(member)
+            try:
+                response = await send(member.provider, self._params(member, kwargs))
+            except Exception as e:
+                self._end(member, start, e)
+                if not is_failover_error(e):
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                self._end(member, start, None, record=False)
+                raise
+            self._end(member, start, None)
+            return response
+        raise self._exhausted(last_error)
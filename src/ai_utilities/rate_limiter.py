@@ -10,7 +10,8 @@ Key functionalities include:
 - Enforcing rate limits for requests and token usage based on predefined settings.
 - Providing thread-safe access to shared resources to prevent race conditions.
 - Automatically resetting daily and per-minute limits for API usage.
-- Recording usage and saving statistics to a file to persist limits across sessions.
+- Recording usage in memory and flushing statistics to a file in the background, so limits
+  persist across sessions without disk I/O on every request.
 - Supporting background timers for periodic resets of the per-minute counters.
 
 Example usage:
@@ -30,14 +31,51 @@ else:
 
 # Start the background thread to reset the per-minute counters
 rate_limiter.start_reset_timer()
+
+The `TokenBucketRateLimiter` class enforces the same three limits without a reset thread:
+each limit is a token bucket that refills continuously, and `acquire()` waits exactly as
+long as the buckets need instead of refusing the request. `AiClient` and `AsyncAiClient`
+use it when `AiSettings.rate_limit_enabled` is set:
+
+limiter = TokenBucketRateLimiter(rpm=60, tpm=10000, tpd=1000000)
+limiter.acquire(500)            # blocks until a request and 500 tokens are available
+await limiter.acquire_async(500)
+
+Bucket levels live in a `RateLimitStore`. The default keeps them in process memory;
+`SqliteRateLimitStore` keeps them in a SQLite file and updates them in one transaction,
+so every process on a host (e.g. gunicorn workers) draws from a single budget:
+
+store = SqliteRateLimitStore("/var/run/myapp/rate_limits.sqlite")
+limiter = TokenBucketRateLimiter(rpm=500, tpm=200000, tpd=5000000, store=store, key="openai:gpt-4o")
+
+Providers report the quota left on the server through `x-ratelimit-remaining-*` and
+`x-ratelimit-reset-*` response headers. Inside `observing(quota_or_limiter)`,
+`observe_rate_limit_headers()` feeds them to a `ServerQuota`, a live model of what is left
+until each window resets, and lowers a limiter's buckets to match. Limiters, clients and the
+`RequestScheduler` hold requests back until the reset once the server reports a window used
+up, so callers start waiting before a 429 rather than after one, even when other hosts or
+keys draw on the same quota. Clients do this for every request, with or without
+`rate_limit_enabled`.
 """
 # Standard Library Imports
+import asyncio
+import atexit
 import json
 import os
+import re
+import sqlite3
 import threading
 import time
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from .config_models import ModelConfig
 
 
 class RateLimiter:
@@ -59,10 +97,13 @@ class RateLimiter:
         tokens_used_today (int): Counter for the number of tokens used today.
         last_reset (datetime): The last time the daily usage was reset.
         lock (threading.Lock): A lock to ensure thread-safe access to shared resources.
+        flush_interval_s (float): Seconds between background flushes of recorded usage.
+        flush_threshold (int): Number of unflushed records that triggers an early flush.
     """
 
     def __init__(self, module_name: str, rpm: int, tpm: int, tpd: int,
-                 config_path: str, ask_ai_statistics_file_name: str = "ai_statistics.json") -> None:
+                 config_path: str, ask_ai_statistics_file_name: str = "ai_statistics.json",
+                 flush_interval_s: float = 5.0, flush_threshold: int = 100) -> None:
         """
         Initializes the RateLimiter with specified limits and loads the current usage statistics
         from the provided stats file. The class ensures that rate limits on requests and tokens
@@ -75,6 +116,10 @@ class RateLimiter:
             tpd (int): The maximum number of tokens allowed per day.
             ask_ai_statistics_file_name (str, optional): Path to the file where usage statistics are stored.
                                            Defaults to "ai_statistics.json".
+            flush_interval_s (float, optional): Seconds between background flushes of recorded usage.
+                                           Defaults to 5.0.
+            flush_threshold (int, optional): Number of unflushed records that triggers an early flush.
+                                           Defaults to 100.
         """
         self.module_name = module_name
         self.rpm = rpm
@@ -93,9 +138,21 @@ class RateLimiter:
         # Lock for synchronizing access to shared resources
         self.lock = threading.Lock()
 
+        # Recorded usage is written by a background flusher, never by record_usage itself
+        self.flush_interval_s = flush_interval_s
+        self.flush_threshold = flush_threshold
+        self._unflushed = 0
+        self._flush_requested = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
         # Load or initialize stats
         self.load_stats()
 
+        # Recorded usage must survive a normal interpreter exit
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
     def load_stats(self) -> None:
         """
         Loads the current usage statistics from the stats file. If the file does not exist,
@@ -121,22 +178,73 @@ class RateLimiter:
         """
         Saves the current usage statistics to the stats file.
 
+        The file is written to a temporary name and renamed over the old one, so readers
+        and a crash mid-write never see a truncated file.
+
         Args:
             data (Optional[dict]): The data to be saved to the stats file. If None, current stats will be saved.
         """
         if data is None:
-            data = {
-                "tokens_used_today": self.tokens_used_today,
-                "last_reset": self.last_reset.isoformat(),
-                "module_name": self.module_name,
-                "max_limits": {"tpd": self.tpd}
-            }
+            data = self._stats_snapshot()
+        temp_file = f"{self.ai_stats_file}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with open(self.ai_stats_file, "w") as file:
+            with open(temp_file, "w") as file:
                 json.dump(data, file)
+            os.replace(temp_file, self.ai_stats_file)
         except (PermissionError, OSError):
             # Silently handle file permission errors - stats are not critical
-            pass
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+    def flush(self) -> None:
+        """
+        Writes usage recorded since the last flush to the stats file.
+
+        Called periodically by the background flusher, early once `flush_threshold` records
+        are pending, and at interpreter exit. Safe to call from any thread.
+        """
+        with self._flush_lock:
+            with self.lock:
+                if not self._unflushed:
+                    return
+                self._unflushed = 0
+                data = self._stats_snapshot()
+            self.save_stats(data)
+
+    def close(self) -> None:
+        """
+        Stops the background flusher and writes any pending usage.
+        """
+        self._closed = True
+        self._flush_requested.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        self.flush()
+
+    def _stats_snapshot(self) -> dict:
+        return {
+            "tokens_used_today": self.tokens_used_today,
+            "last_reset": self.last_reset.isoformat(),
+            "module_name": self.module_name,
+            "max_limits": {"tpd": self.tpd}
+        }
+
+    def _ensure_flusher(self) -> None:
+        # Called with self.lock held
+        if self._flusher is None and not self._closed:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="ai_utilities-rate-limiter-flush", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval_s)
+            self._flush_requested.clear()
+            self.flush()
 
     def reset_daily_usage(self) -> None:
         """
@@ -171,6 +279,9 @@ class RateLimiter:
         Records the usage of a request, updating the request and token counters. It ensures thread-safety
         by using a lock to prevent race conditions.
 
+        Only the in-memory counters are updated; the background flusher persists them within
+        `flush_interval_s`, or sooner once `flush_threshold` records are pending.
+
         Args:
             tokens (int): The number of tokens used by the current request.
         """
@@ -178,7 +289,10 @@ class RateLimiter:
             self.requests_made += 1
             self.tokens_used += tokens
             self.tokens_used_today += tokens
-            self.save_stats()
+            self._unflushed += 1
+            if self._unflushed >= self.flush_threshold:
+                self._flush_requested.set()
+            self._ensure_flusher()
 
     def check_reset(self) -> None:
         """
@@ -216,3 +330,580 @@ class RateLimiter:
         thread = threading.Thread(target=reset)
         thread.daemon = True
         thread.start()
+
+
+def _flush_at_exit(limiter_ref: "weakref.ref[RateLimiter]") -> None:
+    limiter = limiter_ref()
+    if limiter is not None:
+        limiter.flush()
+
+
+# (capacity, refill period in seconds) of each bucket
+BucketLimits = Tuple[Tuple[float, float], ...]
+
+
+# Upper bound per bucket on its level, or None to leave that bucket alone
+BucketCeilings = Sequence[Optional[float]]
+
+
+def _update_buckets(
+    state: List[List[float]],
+    limits: BucketLimits,
+    costs: Sequence[float],
+    now: float,
+    timeout: Optional[float],
+    ceilings: Optional[BucketCeilings] = None,
+) -> Optional[float]:
+    """
+    Refills `state` ([level, updated] per bucket) to `now` and charges `costs` to it.
+
+    Returns:
+        Optional[float]: Seconds until the charged buckets are back to zero, or None if that
+        exceeds `timeout`, in which case nothing is charged. A cost above a bucket's capacity
+        is clamped so it waits for a full bucket instead of forever; negative costs refund.
+        Refilled levels above `ceilings` are lowered to them first, even if nothing is charged.
+    """
+    wait = 0.0
+    for index, (bucket, (capacity, period_s), cost) in enumerate(zip(state, limits, costs)):
+        bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * capacity / period_s)
+        bucket[1] = now
+        ceiling = ceilings[index] if ceilings is not None else None
+        if ceiling is not None:
+            bucket[0] = min(bucket[0], ceiling)
+        deficit = min(cost, capacity) - bucket[0]
+        wait = max(wait, deficit * period_s / capacity)
+    if timeout is not None and wait > timeout:
+        return None
+    for bucket, (capacity, _), cost in zip(state, limits, costs):
+        bucket[0] = min(capacity, bucket[0] - min(cost, capacity))
+    return wait
+
+
+class RateLimitStore(ABC):
+    """Where token-bucket levels are kept. Each update of a key must be atomic."""
+
+    @abstractmethod
+    def update(
+        self,
+        key: str,
+        limits: BucketLimits,
+        costs: Sequence[float],
+        timeout: Optional[float],
+        ceilings: Optional[BucketCeilings] = None,
+    ) -> Optional[float]:
+        """
+        Refills the buckets of `key` and charges `costs` if the resulting wait fits `timeout`.
+
+        Args:
+            key (str): Identifies the budget, e.g. "openai:gpt-4o".
+            limits (BucketLimits): (capacity, period_s) of each bucket; new keys start full.
+            costs (Sequence[float]): Amount to take from each bucket (negative to give back).
+            timeout (Optional[float]): Maximum acceptable wait; None charges unconditionally.
+            ceilings (Optional[BucketCeilings]): Levels to lower the refilled buckets to.
+
+        Returns:
+            Optional[float]: Seconds the caller must wait, or None if nothing was charged.
+        """
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Keeps bucket levels in process memory; the default store."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: Dict[str, List[List[float]]] = {}
+
+    def update(
+        self,
+        key: str,
+        limits: BucketLimits,
+        costs: Sequence[float],
+        timeout: Optional[float],
+        ceilings: Optional[BucketCeilings] = None,
+    ) -> Optional[float]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._state.get(key)
+            if state is None or len(state) != len(limits):
+                state = self._state[key] = [[capacity, now] for capacity, _ in limits]
+            return _update_buckets(state, limits, costs, now, timeout, ceilings)
+
+
+class SqliteRateLimitStore(RateLimitStore):
+    """
+    Keeps bucket levels in a SQLite file shared by every process that opens it.
+
+    Each update runs in a `BEGIN IMMEDIATE` transaction, which serializes writers across
+    processes; with WAL journaling an update typically takes well under a millisecond.
+    Timestamps are wall-clock so all processes on the host agree on them.
+    """
+
+    def __init__(self, db_path: Union[str, Path], busy_timeout_ms: int = 3000) -> None:
+        """
+        Opens (and if needed creates) the store.
+
+        Args:
+            db_path (Union[str, Path]): Path of the SQLite database file.
+            busy_timeout_ms (int): How long to wait for another process's transaction.
+        """
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._connection()
+
+    def update(
+        self,
+        key: str,
+        limits: BucketLimits,
+        costs: Sequence[float],
+        timeout: Optional[float],
+        ceilings: Optional[BucketCeilings] = None,
+    ) -> Optional[float]:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT state FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                state = json.loads(row[0]) if row else None
+                if state is None or len(state) != len(limits):
+                    state = [[capacity, now] for capacity, _ in limits]
+                wait = _update_buckets(state, limits, costs, now, timeout, ceilings)
+                if wait is not None or ceilings is not None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rate_limit_buckets (key, state) VALUES (?, ?)",
+                        (key, json.dumps(state)),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def close(self) -> None:
+        """Closes this process's connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection inherited across fork() must not be used by the child
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                str(self.db_path), isolation_level=None, check_same_thread=False
+            )
+            # Set first: switching to WAL needs a lock another process may hold
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, state TEXT NOT NULL)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+
+# Assumed reset window when a provider reports a remaining quota without its reset time
+_DEFAULT_QUOTA_WINDOW_S = 60.0
+
+
+class ServerQuota:
+    """
+    Live model of the quota a provider reports as left for one budget, e.g. "openai:gpt-4o".
+
+    Each `x-ratelimit-*` report sets the requests and tokens left in the current window and
+    when that window resets. Until then, `acquire()` counts requests sent since the report
+    against what was left and waits for the reset once a window is used up; the next report
+    replaces the local count. A window past its reset time is forgotten, so a quota nobody
+    has reported on never holds a request back.
+
+    Attributes:
+        key (str): The budget the reports describe.
+    """
+
+    def __init__(self, key: str = "default") -> None:
+        self.key = key
+        self._lock = threading.Lock()
+        # "requests" / "tokens" -> [remaining, monotonic reset time]
+        self._windows: Dict[str, List[float]] = {}
+
+    def observe(
+        self,
+        remaining_requests: Optional[int] = None,
+        remaining_tokens: Optional[int] = None,
+        *,
+        reset_requests_s: Optional[float] = None,
+        reset_tokens_s: Optional[float] = None,
+    ) -> None:
+        """
+        Records what the provider reports as left and how long until each window resets.
+
+        Args:
+            remaining_requests (Optional[int]): Requests left, or None if not reported.
+            remaining_tokens (Optional[int]): Tokens left, or None if not reported.
+            reset_requests_s (Optional[float]): Seconds until the requests window resets.
+            reset_tokens_s (Optional[float]): Seconds until the tokens window resets.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for name, remaining, reset_s in (
+                ("requests", remaining_requests, reset_requests_s),
+                ("tokens", remaining_tokens, reset_tokens_s),
+            ):
+                if remaining is not None:
+                    window_s = reset_s if reset_s is not None else _DEFAULT_QUOTA_WINDOW_S
+                    self._windows[name] = [float(remaining), now + window_s]
+
+    def reported(self) -> bool:
+        """Whether a report is in effect, i.e. one of its windows has not reset yet."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return bool(self._windows)
+
+    def blocked_for(self) -> float:
+        """Seconds until the reported quota has a request and a token left again (0 if it has)."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            return max(
+                (reset_at - now for remaining, reset_at in self._windows.values() if remaining <= 0),
+                default=0.0,
+            )
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None, *, requests: int = 1) -> bool:
+        """
+        Waits until `requests` requests using `tokens` tokens fit the reported quota.
+
+        Returns:
+            bool: True once they fit, False if that would take longer than `timeout`.
+        """
+        wait = self._reserve(tokens, requests, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens: int = 0, timeout: Optional[float] = None, *, requests: int = 1) -> bool:
+        """Like `acquire()`, but awaits without blocking the event loop."""
+        wait = self._reserve(tokens, requests, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def record(self, tokens: int) -> None:
+        """
+        Does nothing: the report that comes with a response already counts its tokens.
+
+        Present so a `ServerQuota` can stand in for a `TokenBucketRateLimiter`.
+        """
+
+    def _reserve(self, tokens: int, requests: int, timeout: Optional[float]) -> Optional[float]:
+        """Counts the request against the reported quota and returns the seconds to wait first.
+
+        A request that does not fit waits for the reset, after which the window is unknown
+        until the next report, so nothing is counted. Returns None if over `timeout`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            wait = 0.0
+            for name, cost in (("requests", requests), ("tokens", tokens)):
+                window = self._windows.get(name)
+                if window is not None and (window[0] <= 0 or window[0] < cost):
+                    wait = max(wait, window[1] - now)
+            if timeout is not None and wait > timeout:
+                return None
+            if wait == 0:
+                for name, cost in (("requests", requests), ("tokens", tokens)):
+                    if name in self._windows:
+                        self._windows[name][0] -= cost
+            return wait
+
+    def _expire(self, now: float) -> None:
+        for name in [name for name, (_, reset_at) in self._windows.items() if reset_at <= now]:
+            del self._windows[name]
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe RPM / TPM / TPD limiter that waits instead of failing.
+
+    Each limit is a token bucket that starts full and refills continuously, so
+    short bursts up to the limit go through immediately and sustained traffic
+    is smoothed to the configured rate. `acquire()` reserves the request and its
+    tokens up front and then sleeps for the time the buckets need to cover the
+    reservation, which serves concurrent callers in arrival order without polling.
+    It also waits for the provider's reported quota (see `ServerQuota`) to reset once
+    that is used up.
+
+    Attributes:
+        rpm (int): The maximum number of requests allowed per minute.
+        tpm (int): The maximum number of tokens allowed per minute.
+        tpd (int): The maximum number of tokens allowed per day.
+        store (RateLimitStore): Where the bucket levels are kept.
+        key (str): The budget this limiter draws from within the store.
+        quota (ServerQuota): What the provider reports as left for this budget.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        tpd: int,
+        *,
+        store: Optional[RateLimitStore] = None,
+        key: str = "default",
+        quota: Optional[ServerQuota] = None,
+    ) -> None:
+        """
+        Initializes the limiter; a budget not yet in the store starts with full buckets.
+
+        Args:
+            rpm (int): The maximum number of requests allowed per minute.
+            tpm (int): The maximum number of tokens allowed per minute.
+            tpd (int): The maximum number of tokens allowed per day.
+            store (Optional[RateLimitStore]): Shared bucket storage; defaults to a private
+                `MemoryRateLimitStore`.
+            key (str): The budget to draw from; limiters with the same store and key share it.
+            quota (Optional[ServerQuota]): The provider-reported quota to respect; defaults to
+                a private `ServerQuota`.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if min(rpm, tpm, tpd) < 1:
+            raise ValueError("rpm, tpm and tpd must be >= 1")
+        self.rpm = rpm
+        self.tpm = tpm
+        self.tpd = tpd
+        self.store = store if store is not None else MemoryRateLimitStore()
+        self.key = key
+        self.quota = quota if quota is not None else ServerQuota(key)
+        self._limits: BucketLimits = ((rpm, 60.0), (tpm, 60.0), (tpd, 86400.0))
+
+    @classmethod
+    def from_model_config(cls, config: "ModelConfig", **kwargs) -> "TokenBucketRateLimiter":
+        """Create a limiter from a `ModelConfig`'s per-model limits."""
+        return cls(
+            rpm=config.requests_per_minute,
+            tpm=config.tokens_per_minute,
+            tpd=config.tokens_per_day,
+            **kwargs,
+        )
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None, *, requests: int = 1) -> bool:
+        """
+        Waits until `requests` requests using `tokens` tokens fit within the limits.
+
+        Args:
+            tokens (int): The number of tokens the request is expected to use.
+            timeout (Optional[float]): Maximum seconds to wait; None waits as long as needed.
+            requests (int): The number of requests to reserve.
+
+        Returns:
+            bool: True once the capacity is reserved, False if it would take longer than `timeout`.
+        """
+        wait = self._reserve(tokens, requests, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens: int = 0, timeout: Optional[float] = None, *, requests: int = 1) -> bool:
+        """
+        Like `acquire()`, but awaits without blocking the event loop.
+
+        A caller cancelled while waiting hands its reservation back.
+        """
+        wait = self._reserve(tokens, requests, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.store.update(self.key, self._limits, (-requests, -tokens, -tokens), None)
+                raise
+        return True
+
+    def record(self, tokens: int) -> None:
+        """
+        Charges tokens that were not known at `acquire()` time, such as the response's.
+
+        The charge is applied without waiting; later callers wait for it instead.
+        A negative value returns tokens that were over-estimated.
+
+        Args:
+            tokens (int): The number of additional tokens used.
+        """
+        self.store.update(self.key, self._limits, (0, tokens, tokens), None)
+
+    def observe(
+        self,
+        remaining_requests: Optional[int] = None,
+        remaining_tokens: Optional[int] = None,
+        *,
+        reset_requests_s: Optional[float] = None,
+        reset_tokens_s: Optional[float] = None,
+    ) -> None:
+        """
+        Records the quota the provider reports as left in `quota` and lowers the buckets to it.
+
+        Buckets already below the reported quota are left alone, so a report that is stale
+        by the time it arrives never grants extra capacity. Until the reported reset, the
+        quota keeps requests waiting once it is used up, even though the buckets refill.
+
+        Args:
+            remaining_requests (Optional[int]): Requests left, or None if not reported.
+            remaining_tokens (Optional[int]): Tokens left, or None if not reported.
+            reset_requests_s (Optional[float]): Seconds until the requests window resets.
+            reset_tokens_s (Optional[float]): Seconds until the tokens window resets.
+        """
+        if remaining_requests is None and remaining_tokens is None:
+            return
+        self.quota.observe(
+            remaining_requests,
+            remaining_tokens,
+            reset_requests_s=reset_requests_s,
+            reset_tokens_s=reset_tokens_s,
+        )
+        self.store.update(
+            self.key, self._limits, (0, 0, 0), None, ceilings=(remaining_requests, remaining_tokens, None)
+        )
+
+    def _reserve(self, tokens: int, requests: int, timeout: Optional[float]) -> Optional[float]:
+        """Reserves capacity and returns the seconds to wait, or None if over `timeout`."""
+        wait = self.store.update(self.key, self._limits, (requests, tokens, tokens), timeout)
+        if wait is None:
+            return None
+        quota_wait = self.quota._reserve(tokens, requests, timeout)
+        if quota_wait is None:
+            self.store.update(self.key, self._limits, (-requests, -tokens, -tokens), None)
+            return None
+        return max(wait, quota_wait)
+
+
+_shared_limiters: Dict[Tuple[str, int, int, int, Optional[Path]], TokenBucketRateLimiter] = {}
+_sqlite_stores: Dict[Path, SqliteRateLimitStore] = {}
+_server_quotas: Dict[str, ServerQuota] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_server_quota(name: str) -> ServerQuota:
+    """Returns the process-wide `ServerQuota` for `name` (e.g. "openai:gpt-4o")."""
+    with _shared_limiters_lock:
+        return _shared_server_quota(name)
+
+
+def _shared_server_quota(name: str) -> ServerQuota:
+    quota = _server_quotas.get(name)
+    if quota is None:
+        quota = _server_quotas[name] = ServerQuota(name)
+    return quota
+
+
+def shared_rate_limiter(
+    name: str, config: "ModelConfig", sqlite_path: Optional[Union[str, Path]] = None
+) -> TokenBucketRateLimiter:
+    """
+    Returns the process-wide limiter for `name` (e.g. "openai:gpt-4o") and `config`'s limits.
+
+    Every client sending to the same provider and model draws on one set of buckets. With
+    `sqlite_path`, the buckets live in that SQLite file, so all processes on the host that
+    use the same path share them too. The limiter respects the `shared_server_quota()` of
+    `name`, which is kept per process.
+    """
+    path = Path(sqlite_path).expanduser().resolve() if sqlite_path is not None else None
+    key = (name, config.requests_per_minute, config.tokens_per_minute, config.tokens_per_day, path)
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            store: Optional[RateLimitStore] = None
+            if path is not None:
+                store = _sqlite_stores.get(path)
+                if store is None:
+                    store = _sqlite_stores[path] = SqliteRateLimitStore(path)
+            limiter = _shared_limiters[key] = TokenBucketRateLimiter.from_model_config(
+                config, store=store, key=name, quota=_shared_server_quota(name)
+            )
+        return limiter
+
+
+# Either keeps the reports: a limiter passes them on to its quota
+RateLimitObserver = Union[TokenBucketRateLimiter, ServerQuota]
+
+_observing: ContextVar[Optional[RateLimitObserver]] = ContextVar("ai_utilities_rate_limiter", default=None)
+
+
+@contextmanager
+def observing(observer: Optional[RateLimitObserver]) -> Iterator[None]:
+    """
+    Sends the rate limit headers of provider responses received inside the block to `observer`.
+
+    Threads and tasks started with a copy of the context (as hedged requests are) report
+    to the same observer. With `observer` None, headers inside the block are ignored.
+    """
+    token = _observing.set(observer)
+    try:
+        yield
+    finally:
+        _observing.reset(token)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# One component of a reset duration such as "6m0s", "1.5s" or "20ms"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNIT_S = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _header_duration(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Parses a reset header, either a duration like "6m0s" or plain seconds, into seconds."""
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNIT_S[unit] for number, unit in parts)
+
+
+def observe_rate_limit_headers(headers: Mapping[str, str]) -> None:
+    """
+    Passes the `x-ratelimit-remaining-*` and `x-ratelimit-reset-*` headers to the observer.
+
+    Providers call this for every HTTP response; headers a provider does not send are ignored,
+    and so are responses received outside `observing()`.
+    """
+    observer = _observing.get()
+    if observer is None:
+        return
+    observer.observe(
+        remaining_requests=_header_int(headers, "x-ratelimit-remaining-requests"),
+        remaining_tokens=_header_int(headers, "x-ratelimit-remaining-tokens"),
+        reset_requests_s=_header_duration(headers, "x-ratelimit-reset-requests"),
+        reset_tokens_s=_header_duration(headers, "x-ratelimit-reset-tokens"),
+    )
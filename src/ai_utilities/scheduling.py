@@ -0,0 +1,349 @@
+"""
+Priority-aware request scheduling shared across clients.
+
+A ``RequestScheduler`` caps the number of provider calls in flight for the
+whole process and decides who goes next when the cap is reached. Requests
+carry a priority class (``"interactive"`` or ``"batch"`` by default); a
+free slot always goes to the highest class with queued requests, and a
+per-class limit can keep slots in reserve for the classes above it. Within
+a class, requests are served by weighted fair queuing on the client id
+(``usage_client_id``), so one tenant's large batch cannot starve another's.
+
+Requests may name the ``ServerQuota`` they draw on. While the provider
+reports that quota used up, its requests stay queued and the slots go to
+other requests; at the reset the queued ones are served in priority and
+fair-share order rather than all at once.
+
+Install a scheduler process-wide with ``set_default_scheduler`` and every
+``AiClient`` and ``AsyncAiClient`` submits through it, or pass one to a
+single client with ``scheduler=``.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ._waiters import AsyncWaiter, SyncWaiter, Waiter
+
+if TYPE_CHECKING:
+    from .rate_limiter import ServerQuota
+
+DEFAULT_PRIORITIES = ("interactive", "batch")
+DEFAULT_CLIENT_ID = "default"
+
+
+class _Ticket:
+    """A queued request and the waiter to wake once it is granted a slot."""
+
+    __slots__ = ("abandoned", "priority", "quota", "start_tag", "waiter")
+
+    def __init__(
+        self,
+        priority: str,
+        start_tag: float,
+        quota: "Optional[ServerQuota]",
+        waiter: Waiter,
+    ) -> None:
+        self.priority = priority
+        self.start_tag = start_tag
+        self.quota = quota
+        self.waiter = waiter
+        self.abandoned = False
+
+
+class _PriorityClass:
+    """Fair queue of one priority class, ordered by virtual finish time."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.queued = 0
+        self.heap: List[Tuple[float, int, _Ticket]] = []
+        self.virtual_time = 0.0
+        self.last_finish: Dict[str, float] = {}
+
+
+class RequestScheduler:
+    """Thread-safe scheduler for provider calls from sync and asyncio callers.
+
+    Example:
+        # At most 8 calls in flight; batch work may use 6 of them, so
+        # interactive requests always find a free slot quickly
+        set_default_scheduler(RequestScheduler(8, class_limits={"batch": 6}))
+
+        client.ask("...")                      # priority="interactive"
+        client.ask_many(prompts)               # priority="batch"
+        client.ask("...", priority="batch")
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        *,
+        priorities: Sequence[str] = DEFAULT_PRIORITIES,
+        class_limits: Optional[Mapping[str, int]] = None,
+        client_weights: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_in_flight: Process-wide cap on concurrent provider calls
+            priorities: Priority class names, highest first
+            class_limits: Optional cap on in-flight calls per class; the
+                remaining slots stay available to the classes above it
+            client_weights: Fair-queuing weight per client id (default 1.0);
+                a client with weight 2 gets twice the share of a busy class
+
+        Raises:
+            ValueError: If a parameter is out of range or names an unknown class
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if not priorities or len(set(priorities)) != len(priorities):
+            raise ValueError("priorities must be a non-empty sequence of unique names")
+        class_limits = dict(class_limits or {})
+        unknown = set(class_limits) - set(priorities)
+        if unknown:
+            raise ValueError(f"class_limits names unknown priorities: {sorted(unknown)}")
+        if any(limit < 1 for limit in class_limits.values()):
+            raise ValueError("class_limits must be >= 1")
+        if client_weights and any(weight <= 0 for weight in client_weights.values()):
+            raise ValueError("client_weights must be > 0")
+
+        self.max_in_flight = max_in_flight
+        self.priorities = tuple(priorities)
+        self.client_weights = dict(client_weights or {})
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._classes = {
+            name: _PriorityClass(min(class_limits.get(name, max_in_flight), max_in_flight))
+            for name in self.priorities
+        }
+        self._sequence = itertools.count()
+        # When a timer will next re-dispatch for tickets held back by their quota
+        self._quota_wakeup: Optional[float] = None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    def queued(self, priority: Optional[str] = None) -> int:
+        """Return the number of waiting requests, in one class or in total."""
+        with self._lock:
+            if priority is not None:
+                return self._class(priority).queued
+            return sum(cls.queued for cls in self._classes.values())
+
+    def acquire(
+        self,
+        priority: str = "interactive",
+        client_id: Optional[str] = None,
+        quota: "Optional[ServerQuota]" = None,
+    ) -> None:
+        """Take a slot, blocking until the scheduler grants one.
+
+        With ``quota``, no slot is granted while the provider reports that
+        quota used up.
+        """
+        waiter = SyncWaiter()
+        with self._lock:
+            ticket = self._enqueue(priority, client_id, quota, waiter)
+            self._dispatch()
+        try:
+            waiter.event.wait()
+        except BaseException:
+            # e.g. KeyboardInterrupt; a slot granted meanwhile must be given back
+            self._abandon(ticket)
+            raise
+
+    async def acquire_async(
+        self,
+        priority: str = "interactive",
+        client_id: Optional[str] = None,
+        quota: "Optional[ServerQuota]" = None,
+    ) -> None:
+        """Take a slot, awaiting it without blocking the event loop; see ``acquire``."""
+        waiter = AsyncWaiter(asyncio.get_running_loop())
+        with self._lock:
+            ticket = self._enqueue(priority, client_id, quota, waiter)
+            self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        """Withdraw the ticket of a caller that stopped waiting."""
+        with self._lock:
+            if ticket.waiter.granted:
+                # The slot was handed over just before the interruption
+                self._release_locked(ticket.priority)
+            else:
+                ticket.abandoned = True
+                self._classes[ticket.priority].queued -= 1
+
+    def release(self, priority: str = "interactive") -> None:
+        """Give back a slot taken with ``acquire`` or ``acquire_async``."""
+        with self._lock:
+            self._release_locked(priority)
+
+    @contextmanager
+    def slot(
+        self,
+        priority: str = "interactive",
+        client_id: Optional[str] = None,
+        quota: "Optional[ServerQuota]" = None,
+    ) -> Iterator[None]:
+        """Hold a slot for the duration of the ``with`` block."""
+        self.acquire(priority, client_id, quota)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    @asynccontextmanager
+    async def slot_async(
+        self,
+        priority: str = "interactive",
+        client_id: Optional[str] = None,
+        quota: "Optional[ServerQuota]" = None,
+    ) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the ``async with`` block."""
+        await self.acquire_async(priority, client_id, quota)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def _class(self, priority: str) -> _PriorityClass:
+        try:
+            return self._classes[priority]
+        except KeyError:
+            raise ValueError(
+                f"Unknown priority {priority!r}; expected one of {list(self.priorities)}"
+            ) from None
+
+    def _enqueue(
+        self,
+        priority: str,
+        client_id: Optional[str],
+        quota: "Optional[ServerQuota]",
+        waiter: Waiter,
+    ) -> _Ticket:
+        cls = self._class(priority)
+        client_id = client_id or DEFAULT_CLIENT_ID
+        # Start-time fair queuing: each request costs 1 / weight of virtual time
+        start_tag = max(cls.virtual_time, cls.last_finish.get(client_id, 0.0))
+        finish_tag = start_tag + 1.0 / self.client_weights.get(client_id, 1.0)
+        cls.last_finish[client_id] = finish_tag
+        ticket = _Ticket(priority, start_tag, quota, waiter)
+        heapq.heappush(cls.heap, (finish_tag, next(self._sequence), ticket))
+        cls.queued += 1
+        return ticket
+
+    def _release_locked(self, priority: str) -> None:
+        self._in_flight -= 1
+        self._class(priority).in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.max_in_flight:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            cls = self._classes[ticket.priority]
+            cls.queued -= 1
+            cls.in_flight += 1
+            cls.virtual_time = ticket.start_tag
+            self._in_flight += 1
+            ticket.waiter.granted = True
+            ticket.waiter.wake()
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        for cls in self._classes.values():
+            while cls.heap and cls.heap[0][2].abandoned:
+                heapq.heappop(cls.heap)
+            if not cls.heap:
+                # Idle class: forget old tags so they cannot grow without bound
+                cls.virtual_time = 0.0
+                cls.last_finish.clear()
+                continue
+            if cls.in_flight < cls.limit:
+                ticket = self._pop_unthrottled(cls)
+                if ticket is not None:
+                    return ticket
+        return None
+
+    def _pop_unthrottled(self, cls: _PriorityClass) -> Optional[_Ticket]:
+        """Pop the first ticket of ``cls`` whose quota is not used up.
+
+        Tickets held back by their quota keep their place; a timer
+        dispatches again when the first of those quotas resets.
+        """
+        if self._blocked_for(cls.heap[0][2]) == 0:
+            return heapq.heappop(cls.heap)[2]
+        wakeup: Optional[float] = None
+        for entry in sorted(cls.heap):
+            ticket = entry[2]
+            if ticket.abandoned:
+                continue
+            blocked_for = self._blocked_for(ticket)
+            if blocked_for == 0:
+                cls.heap.remove(entry)
+                heapq.heapify(cls.heap)
+                return ticket
+            wakeup = blocked_for if wakeup is None else min(wakeup, blocked_for)
+        if wakeup is not None:
+            self._wake_after(wakeup)
+        return None
+
+    @staticmethod
+    def _blocked_for(ticket: _Ticket) -> float:
+        return ticket.quota.blocked_for() if ticket.quota is not None else 0.0
+
+    def _wake_after(self, delay: float) -> None:
+        """Dispatch again in ``delay`` seconds unless a timer already fires sooner."""
+        wakeup = time.monotonic() + delay
+        if self._quota_wakeup is not None and self._quota_wakeup <= wakeup:
+            return
+        self._quota_wakeup = wakeup
+        timer = threading.Timer(delay, self._on_quota_reset)
+        timer.daemon = True
+        timer.start()
+
+    def _on_quota_reset(self) -> None:
+        with self._lock:
+            if self._quota_wakeup is not None and self._quota_wakeup <= time.monotonic():
+                self._quota_wakeup = None
+            self._dispatch()
+
+
+_default_scheduler: Optional[RequestScheduler] = None
+
+
+def get_default_scheduler() -> Optional[RequestScheduler]:
+    """Return the process-wide scheduler, or None if none is installed."""
+    return _default_scheduler
+
+
+def set_default_scheduler(scheduler: Optional[RequestScheduler]) -> None:
+    """Install (or with None, remove) the scheduler used by clients without their own."""
+    global _default_scheduler
+    _default_scheduler = scheduler
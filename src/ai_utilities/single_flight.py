@@ -0,0 +1,123 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+When several callers ask for the same key at the same time, only the first
+one (the leader) runs the request; the others wait for its outcome and
+receive the same result or exception. Keys are released as soon as the call
+finishes, so later requests are served by the cache instead.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    """State of one in-flight synchronous call."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe request coalescing for synchronous callers.
+
+    Example:
+        flight = SingleFlight()
+        response = flight.do(cache_key, lambda: provider.ask(prompt))
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once per concurrent ``key`` and share its outcome.
+
+        Args:
+            key: Identity of the request (e.g. a cache key)
+            fn: Zero-argument callable performing the request
+
+        Returns:
+            The leader's result
+
+        Raises:
+            Exception: Whatever the leader's call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Request coalescing for asyncio callers.
+
+    The leader's coroutine runs in its own task, so cancelling any one caller
+    (the leader included) does not cancel the shared request for the others.
+
+    Example:
+        flight = AsyncSingleFlight()
+        response = await flight.do(cache_key, lambda: provider.ask(prompt))
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Task[Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()`` once per concurrent ``key`` and share its outcome.
+
+        Args:
+            key: Identity of the request (e.g. a cache key)
+            fn: Zero-argument callable returning an awaitable request
+
+        Returns:
+            The shared result
+
+        Raises:
+            Exception: Whatever the shared request raised
+        """
+        task = self._tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda finished: self._release(key, finished))
+        return await asyncio.shield(task)
+
+    def _release(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being fetched."""
+        return len(self._tasks)
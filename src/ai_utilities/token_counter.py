@@ -2,10 +2,16 @@
 token_counter.py
 
 Token counting utilities with single responsibility for token estimation.
+
+When a BPE rank file for the model's encoding is available (see
+``ai_utilities.tokenizer``), model token counts are exact; otherwise they are
+estimated from word and character ratios.
 """
 
 import logging
-from typing import List, Mapping, Any
+from typing import List, Mapping, Any, Sequence
+
+from .tokenizer import encoding_for_model, get_tokenizer
 
 logger = logging.getLogger(__name__)
 
@@ -139,6 +145,9 @@ class TokenCounter:
         """
         Count tokens with model-specific adjustments.
         
+        Uses the BPE tokenizer of the model's encoding when its rank file is
+        available, and a model-adjusted estimate otherwise.
+        
         Args:
             text: Text to count tokens for
             model: OpenAI model name for model-specific adjustments
@@ -146,6 +155,10 @@ class TokenCounter:
         Returns:
             Model-adjusted token count
         """
+        tokenizer = get_tokenizer(encoding_for_model(model))
+        if tokenizer is not None:
+            return tokenizer.count_tokens(text) if text else 0
+
         base_count = TokenCounter.count_tokens(text, "combined")
         
         # Model-specific adjustments (approximate)
@@ -161,3 +174,24 @@ class TokenCounter:
         
         logger.debug(f"Model {model}: {base_count} -> {adjusted_count} tokens")
         return adjusted_count
+
+    @staticmethod
+    def count_tokens_batch(texts: Sequence[str], model: str = "gpt-3.5-turbo") -> List[int]:
+        """
+        Count tokens of many texts for one model.
+        
+        With a BPE tokenizer the batch shares one pass of setup and repeated
+        pieces are encoded once, which is much faster than counting each text
+        separately.
+        
+        Args:
+            texts: Texts to count tokens for
+            model: OpenAI model name
+            
+        Returns:
+            Token count of each text, in order
+        """
+        tokenizer = get_tokenizer(encoding_for_model(model))
+        if tokenizer is not None:
+            return tokenizer.count_tokens_batch(texts)
+        return [TokenCounter.count_tokens_for_model(text, model) for text in texts]
@@ -0,0 +1,87 @@
+"""
+Token usage reported by providers.
+
+Providers parse the ``usage`` block of each API response into a
+``TokenUsage`` and hand it to ``report_usage``. Clients wrap provider calls
+in ``capture_usage()`` to collect what was reported, so usage tracking,
+rate limiting and metrics can use real token counts and fall back to an
+estimate only when a provider reports nothing.
+
+Reports go to every capture that is active in the current context,
+including captures opened by a caller further up the stack. Threads and
+tasks started with a copy of the context (as hedged requests are) report
+into the same captures.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class TokenUsage(BaseModel):
+    """Token counts of one or more provider calls."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+
+    @property
+    def total_tokens(self) -> int:
+        """Prompt plus completion tokens."""
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_response(cls, response: Any) -> Optional["TokenUsage"]:
+        """Read the ``usage`` block of a chat completion or embeddings response.
+
+        Returns:
+            The usage, or None if the response carries none
+        """
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return None
+        # Embeddings responses have no completion tokens
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        return cls(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens if isinstance(completion_tokens, int) else 0,
+            cached_tokens=cached_tokens if isinstance(cached_tokens, int) else 0,
+        )
+
+    @classmethod
+    def combine(cls, usages: Iterable["TokenUsage"]) -> Optional["TokenUsage"]:
+        """Sum several usages, or return None if there are none."""
+        usages = list(usages)
+        if not usages:
+            return None
+        return cls(
+            prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+            completion_tokens=sum(usage.completion_tokens for usage in usages),
+            cached_tokens=sum(usage.cached_tokens for usage in usages),
+        )
+
+
+_captures: ContextVar[Tuple[List[TokenUsage], ...]] = ContextVar("ai_utilities_token_usage", default=())
+
+
+@contextmanager
+def capture_usage() -> Iterator[List[TokenUsage]]:
+    """Collect the usage reported by provider calls made inside the block."""
+    captured: List[TokenUsage] = []
+    token = _captures.set(_captures.get() + (captured,))
+    try:
+        yield captured
+    finally:
+        _captures.reset(token)
+
+
+def report_usage(usage: Optional[TokenUsage]) -> None:
+    """Hand the usage of one provider call to the active captures."""
+    if usage is None:
+        return
+    for captured in _captures.get():
+        captured.append(usage)
@@ -0,0 +1,353 @@
+"""
+tokenizer.py
+
+Offline byte-pair-encoding (BPE) tokenizer for exact token counts.
+
+Loads tiktoken-format rank files (one ``<base64 token> <rank>`` pair per line,
+such as ``cl100k_base.tiktoken`` and ``o200k_base.tiktoken``) from a local
+directory, so counting needs no network access. Encoding is pure Python with
+an LRU cache of encoded pieces; when ``tiktoken`` is installed its compiled
+core is built from the same local ranks and used instead. Text is split with
+the encoding's exact pattern when the ``regex`` module is installed, and with
+a close stdlib ``re`` approximation otherwise.
+
+Example:
+    set_tokenizer_dir("~/.cache/ai_utilities/tokenizers")  # or AI_TOKENIZER_DIR
+    tokenizer = get_tokenizer(encoding_for_model("gpt-4o"))
+    if tokenizer is not None:
+        tokenizer.count_tokens_batch(chunks)
+"""
+
+import base64
+import heapq
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple, Union
+
+try:
+    import regex as _regex
+except ImportError:
+    _regex = None
+
+try:
+    import tiktoken as _tiktoken
+except ImportError:
+    _tiktoken = None
+
+TOKENIZER_DIR_ENV = "AI_TOKENIZER_DIR"
+
+_CONTRACTIONS = r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+
+# Split patterns as published with each encoding (need the ``regex`` module)
+_EXACT_PATTERNS = {
+    "cl100k_base": (
+        _CONTRACTIONS + r"|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]+[\r\n]*"
+        r"|\s*[\r\n]+|\s+(?!\S)|\s+"
+    ),
+    "o200k_base": "|".join([
+        r"[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+" + _CONTRACTIONS + "?",
+        r"[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*" + _CONTRACTIONS + "?",
+        r"\p{N}{1,3}",
+        r" ?[^\s\p{L}\p{N}]+[\r\n/]*",
+        r"\s*[\r\n]+",
+        r"\s+(?!\S)",
+        r"\s+",
+    ]),
+}
+
+# Stdlib approximations: letters are [^\W\d_], numbers \d, and letter case is
+# only distinguished for ASCII; combining marks split like punctuation
+_NOT_LETTER_OR_NUMBER = r"(?:[^\w\r\n]|_)"
+_SYMBOLS = r"(?:[^\w\s]|_)"
+_UPPER = r"[^\W\d_a-z]"
+_LOWER = r"[^\W\d_A-Z]"
+_STDLIB_PATTERNS = {
+    "cl100k_base": (
+        _CONTRACTIONS + "|" + _NOT_LETTER_OR_NUMBER + r"?[^\W\d_]+|\d{1,3}| ?" + _SYMBOLS + r"+[\r\n]*"
+        r"|\s*[\r\n]+|\s+(?!\S)|\s+"
+    ),
+    "o200k_base": "|".join([
+        _NOT_LETTER_OR_NUMBER + "?" + _UPPER + "*" + _LOWER + "+" + _CONTRACTIONS + "?",
+        _NOT_LETTER_OR_NUMBER + "?" + _UPPER + "+" + _LOWER + "*" + _CONTRACTIONS + "?",
+        r"\d{1,3}",
+        " ?" + _SYMBOLS + r"+[\r\n/]*",
+        r"\s*[\r\n]+",
+        r"\s+(?!\S)",
+        r"\s+",
+    ]),
+}
+
+# Model name prefixes of each encoding; longest match wins
+_MODEL_PREFIX_ENCODINGS = {
+    "gpt-4o": "o200k_base",
+    "chatgpt-4o": "o200k_base",
+    "gpt-4.1": "o200k_base",
+    "gpt-4.5": "o200k_base",
+    "gpt-5": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "o4": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5": "cl100k_base",
+    "text-embedding-3": "cl100k_base",
+    "text-embedding-ada-002": "cl100k_base",
+}
+
+# Pieces longer than this are merged with a heap instead of rescanning all pairs
+_LONG_PIECE_BYTES = 64
+
+
+def load_rank_file(path: Union[str, Path]) -> Dict[bytes, int]:
+    """
+    Read a tiktoken-format rank file.
+
+    Args:
+        path: File with one ``<base64 token> <rank>`` pair per line
+
+    Returns:
+        Mapping of token bytes to rank (the token id)
+
+    Raises:
+        ValueError: If a line is not a base64 token followed by an integer rank
+    """
+    ranks: Dict[bytes, int] = {}
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: expected '<base64 token> <rank>'") from e
+    return ranks
+
+
+def encoding_for_model(model: str) -> str:
+    """Return the encoding a model uses; models not known to use o200k get cl100k."""
+    model = (model or "").split("/")[-1].lower()
+    for prefix in sorted(_MODEL_PREFIX_ENCODINGS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return _MODEL_PREFIX_ENCODINGS[prefix]
+    return "cl100k_base"
+
+
+class BpeTokenizer:
+    """
+    Byte-pair-encoding tokenizer over a fixed rank table.
+
+    Counts are "ordinary": special tokens such as ``<|endoftext|>`` are
+    encoded as plain text.
+    """
+
+    def __init__(
+        self,
+        ranks: Dict[bytes, int],
+        encoding: str = "cl100k_base",
+        *,
+        cache_size: int = 65536,
+        accelerate: bool = True,
+    ) -> None:
+        """
+        Args:
+            ranks: Mapping of token bytes to rank, e.g. from ``load_rank_file``
+            encoding: ``cl100k_base`` or ``o200k_base``; selects the split pattern
+            cache_size: Number of encoded pieces kept in the LRU cache
+            accelerate: Use ``tiktoken``'s compiled core when it is installed
+
+        Raises:
+            ValueError: If the encoding has no known split pattern
+        """
+        if encoding not in _EXACT_PATTERNS:
+            raise ValueError(f"Unknown encoding {encoding!r}; expected one of {sorted(_EXACT_PATTERNS)}")
+        self.encoding = encoding
+        self._ranks = ranks
+        self._decoder: Optional[Dict[int, bytes]] = None
+        self._pattern: Pattern[str] = (
+            _regex.compile(_EXACT_PATTERNS[encoding])
+            if _regex is not None
+            else re.compile(_STDLIB_PATTERNS[encoding])
+        )
+        self._encode_piece = lru_cache(maxsize=cache_size)(self._bpe)
+        self._accelerated: Any = None
+        if accelerate and _tiktoken is not None:
+            self._accelerated = _tiktoken.Encoding(
+                name=encoding, pat_str=_EXACT_PATTERNS[encoding], mergeable_ranks=ranks, special_tokens={}
+            )
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], encoding: Optional[str] = None, **kwargs: Any) -> "BpeTokenizer":
+        """
+        Load a tokenizer from a rank file.
+
+        Args:
+            path: tiktoken-format rank file
+            encoding: Split pattern to use; by default ``o200k_base`` for files
+                whose name starts with ``o200k`` and ``cl100k_base`` otherwise
+            **kwargs: Passed to the constructor
+        """
+        path = Path(path)
+        if encoding is None:
+            encoding = "o200k_base" if path.name.startswith("o200k") else "cl100k_base"
+        return cls(load_rank_file(path), encoding, **kwargs)
+
+    def encode(self, text: str) -> List[int]:
+        """Encode text to token ids."""
+        if self._accelerated is not None:
+            return self._accelerated.encode_ordinary(text)
+        tokens: List[int] = []
+        for piece in self._pattern.findall(text):
+            tokens.extend(self._encode_piece(piece))
+        return tokens
+
+    def decode(self, tokens: Iterable[int]) -> str:
+        """Decode token ids; bytes that are not valid UTF-8 become U+FFFD."""
+        if self._decoder is None:
+            self._decoder = {rank: token for token, rank in self._ranks.items()}
+        return b"".join(self._decoder[token] for token in tokens).decode("utf-8", errors="replace")
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of ``text``."""
+        return self.count_tokens_batch([text])[0]
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> List[int]:
+        """
+        Count the tokens of each text.
+
+        Pieces repeated across the batch are looked up once; the split pattern
+        and the piece cache are bound once for the whole batch.
+        """
+        if self._accelerated is not None:
+            return [len(tokens) for tokens in self._accelerated.encode_ordinary_batch(list(texts))]
+        findall = self._pattern.findall
+        encode_piece = self._encode_piece
+        seen: Dict[str, int] = {}
+        counts = []
+        for text in texts:
+            total = 0
+            for piece in findall(text):
+                count = seen.get(piece)
+                if count is None:
+                    count = seen[piece] = len(encode_piece(piece))
+                total += count
+            counts.append(total)
+        return counts
+
+    def _bpe(self, piece: str) -> Tuple[int, ...]:
+        data = piece.encode("utf-8")
+        rank = self._ranks.get(data)
+        if rank is not None:
+            return (rank,)
+        if len(data) > _LONG_PIECE_BYTES:
+            parts = self._merge_with_heap(data)
+        else:
+            parts = self._merge(data)
+        return tuple(self._ranks[part] for part in parts)
+
+    def _merge(self, data: bytes) -> List[bytes]:
+        # Repeatedly merge the adjacent pair with the lowest rank (leftmost on ties)
+        ranks = self._ranks
+        parts = [data[i:i + 1] for i in range(len(data))]
+        while len(parts) > 1:
+            best_rank = None
+            best = 0
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best = i
+            if best_rank is None:
+                break
+            parts[best:best + 2] = [parts[best] + parts[best + 1]]
+        return parts
+
+    def _merge_with_heap(self, data: bytes) -> List[bytes]:
+        # Same merge order as _merge in O(n log n): parts are linked spans
+        # [start, following[start]); stale heap entries are skipped
+        ranks = self._ranks
+        size = len(data)
+        following = list(range(1, size + 1))
+        preceding = list(range(-1, size - 1))
+        alive = [True] * size
+        heap: List[Tuple[int, int, int]] = []
+
+        def push(start: int) -> None:
+            middle = following[start]
+            if middle < size:
+                rank = ranks.get(data[start:following[middle]])
+                if rank is not None:
+                    heap.append((rank, start, following[middle]))
+
+        for start in range(size - 1):
+            push(start)
+        heapq.heapify(heap)
+        while heap:
+            _, start, end = heapq.heappop(heap)
+            middle = following[start] if alive[start] else size
+            if middle >= size or following[middle] != end:
+                continue
+            alive[middle] = False
+            following[start] = end
+            if end < size:
+                preceding[end] = start
+            for neighbour in (preceding[start], start):
+                if neighbour >= 0:
+                    middle = following[neighbour]
+                    if middle < size:
+                        rank = ranks.get(data[neighbour:following[middle]])
+                        if rank is not None:
+                            heapq.heappush(heap, (rank, neighbour, following[middle]))
+
+        parts = []
+        start = 0
+        while start < size:
+            parts.append(data[start:following[start]])
+            start = following[start]
+        return parts
+
+
+_tokenizer_dir: Optional[Path] = None
+_tokenizers: Dict[Tuple[str, Path], BpeTokenizer] = {}
+_tokenizers_lock = threading.Lock()
+
+
+def set_tokenizer_dir(directory: Optional[Union[str, Path]]) -> None:
+    """Set the directory rank files are loaded from (overrides ``AI_TOKENIZER_DIR``); None unsets it."""
+    global _tokenizer_dir
+    _tokenizer_dir = Path(directory).expanduser() if directory is not None else None
+
+
+def get_tokenizer(encoding: str) -> Optional[BpeTokenizer]:
+    """
+    Return the shared tokenizer for ``encoding``, loading ``<dir>/<encoding>.tiktoken`` on first use.
+
+    The directory is the one passed to ``set_tokenizer_dir`` or, failing
+    that, ``AI_TOKENIZER_DIR``.
+
+    Only loaded tokenizers are cached, so a rank file added later is
+    picked up by the next call.
+
+    Returns:
+        The tokenizer, or None if no directory is configured or it has no rank file
+    """
+    directory = _tokenizer_dir
+    if directory is None:
+        env_dir = os.environ.get(TOKENIZER_DIR_ENV)
+        if not env_dir:
+            return None
+        directory = Path(env_dir).expanduser()
+    key = (encoding, directory)
+    try:
+        return _tokenizers[key]
+    except KeyError:
+        pass
+    path = directory / f"{encoding}.tiktoken"
+    if not path.is_file():
+        return None
+    with _tokenizers_lock:
+        if key not in _tokenizers:
+            _tokenizers[key] = BpeTokenizer.from_file(path, encoding)
+        return _tokenizers[key]
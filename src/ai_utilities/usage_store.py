@@ -0,0 +1,322 @@
+"""
+Append-only usage logs compacted into an indexed SQLite table.
+
+Every process appends usage records to its own JSONL segment file, which
+needs no locking beyond the process itself. ``compact()`` folds all segments
+into one ``usage`` table keyed by scope, client, day, model and source, so
+aggregation across thousands of clients is a single indexed query instead of
+a scan over one JSON file per client.
+
+Compaction reads each segment from the offset it stopped at last time and
+records the new offset in the same transaction as the rows it adds, so
+concurrent compactors in different processes never count a record twice.
+A writer seals its segment (renames it) once it is ``rotate_interval_s``
+old; sealed segments are deleted after they have been compacted.
+
+Example:
+    store = SqliteUsageStore(".ai_utilities/usage.sqlite")
+    tracker = create_usage_tracker(store=store)
+    ...
+    store.aggregate(group_by=("client_id", "model"), since="2025-01-01")
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+AGGREGATE_COLUMNS = ("scope", "client_id", "day", "model", "source")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS usage (
+        scope TEXT NOT NULL,
+        client_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        model TEXT NOT NULL,
+        source TEXT NOT NULL,
+        tokens INTEGER NOT NULL,
+        requests INTEGER NOT NULL,
+        PRIMARY KEY (scope, client_id, day, model, source)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS usage_day ON usage (day)",
+    "CREATE INDEX IF NOT EXISTS usage_client_day ON usage (client_id, day)",
+    "CREATE INDEX IF NOT EXISTS usage_model_day ON usage (model, day)",
+    "CREATE TABLE IF NOT EXISTS usage_segments (segment TEXT PRIMARY KEY, offset INTEGER NOT NULL)",
+)
+
+
+@dataclass(frozen=True)
+class UsageRecord:
+    """Usage of one scope, client, day and model, as appended to a segment."""
+
+    day: str
+    scope: str
+    client_id: str = ""
+    model: str = ""
+    source: str = ""  # Stats file of the tracker that recorded it
+    tokens: int = 0
+    requests: int = 0
+
+
+class SqliteUsageStore:
+    """Per-process append-only usage logs with compaction into SQLite."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        log_dir: Optional[Union[str, Path]] = None,
+        compact_interval_s: float = 60.0,
+        rotate_interval_s: float = 300.0,
+        busy_timeout_ms: int = 5000,
+    ) -> None:
+        """Open (and if needed create) the store.
+
+        Args:
+            db_path: Path of the SQLite database holding the compacted table
+            log_dir: Directory for segment files (default: ``<db_path>.logs``)
+            compact_interval_s: Minimum seconds between compactions started by ``maybe_compact``
+            rotate_interval_s: Age at which a writer seals its segment and starts a new one
+            busy_timeout_ms: How long to wait for another process's compaction
+        """
+        self.db_path = Path(db_path)
+        self.log_dir = Path(log_dir) if log_dir is not None else self.db_path.with_name(self.db_path.name + ".logs")
+        self.compact_interval_s = compact_interval_s
+        self.rotate_interval_s = rotate_interval_s
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._segment: Optional[Path] = None
+        self._segment_pid: Optional[int] = None
+        self._segment_started = 0.0
+        self._last_compaction = 0.0
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._connection()
+
+    def append(self, records: Iterable[UsageRecord]) -> None:
+        """Append records to this process's segment."""
+        lines = "".join(json.dumps(asdict(record), separators=(",", ":")) + "\n" for record in records)
+        if not lines:
+            return
+        with self._lock:
+            segment = self._current_segment()
+            # One write per batch, so a compactor sees whole batches or a partial last line
+            with open(segment, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def maybe_compact(self) -> None:
+        """Compact if ``compact_interval_s`` has passed since this process last did."""
+        if time.monotonic() - self._last_compaction >= self.compact_interval_s:
+            self.compact()
+
+    def compact(self) -> int:
+        """Fold every segment's new records into the ``usage`` table.
+
+        Returns:
+            Number of records compacted
+        """
+        with self._lock:
+            self._last_compaction = time.monotonic()
+            segments = sorted(self.log_dir.glob("*.jsonl")) + sorted(self.log_dir.glob("*.sealed"))
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                compacted = 0
+                finished: List[Path] = []
+                for segment in segments:
+                    count, complete = self._compact_segment(conn, segment)
+                    compacted += count
+                    if complete and segment.suffix == ".sealed":
+                        finished.append(segment)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            # Sealed segments never grow again; their offset rows guard against a
+            # second compaction until the file is gone
+            for segment in finished:
+                try:
+                    segment.unlink()
+                except OSError:
+                    continue
+                conn.execute("DELETE FROM usage_segments WHERE segment = ?", (segment.stem,))
+            return compacted
+
+    def aggregate(
+        self,
+        group_by: Sequence[str] = ("scope", "client_id"),
+        *,
+        scope: Optional[str] = None,
+        client_id: Optional[str] = None,
+        model: Optional[str] = None,
+        since: Optional[Union[str, date]] = None,
+        until: Optional[Union[str, date]] = None,
+        compact: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Sum tokens and requests, grouped by any of scope, client_id, day, model and source.
+
+        Args:
+            group_by: Columns to group by; an empty sequence returns one grand total
+            scope: Only count this scope (e.g. ``"per_client"``)
+            client_id: Only count this client
+            model: Only count this model
+            since: First day to count (inclusive)
+            until: Last day to count (inclusive)
+            compact: Compact pending segments first so the result is current
+
+        Returns:
+            One dict per group with the group columns plus ``tokens`` and ``requests``
+
+        Raises:
+            ValueError: If ``group_by`` names an unknown column
+        """
+        unknown = set(group_by) - set(AGGREGATE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot group usage by {sorted(unknown)}; expected {list(AGGREGATE_COLUMNS)}")
+        if compact:
+            self.compact()
+
+        conditions = []
+        params: List[Any] = []
+        for column, value in (("scope", scope), ("client_id", client_id), ("model", model)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("day >= ?")
+            params.append(str(since))
+        if until is not None:
+            conditions.append("day <= ?")
+            params.append(str(until))
+
+        columns = list(group_by)
+        sql = "SELECT " + "".join(f"{column}, " for column in columns)
+        sql += "COALESCE(SUM(tokens), 0), COALESCE(SUM(requests), 0) FROM usage"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if columns:
+            sql += " GROUP BY " + ", ".join(columns) + " ORDER BY " + ", ".join(columns)
+
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [
+            {**dict(zip(columns, row)), "tokens": row[-2], "requests": row[-1]}
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Seal this process's segment and close its connection."""
+        with self._lock:
+            self._seal_segment()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _current_segment(self) -> Path:
+        # Called with self._lock held
+        if self._segment is not None and (
+            self._segment_pid != os.getpid()
+            or time.monotonic() - self._segment_started >= self.rotate_interval_s
+        ):
+            if self._segment_pid == os.getpid():
+                self._seal_segment()
+            else:
+                # The parent process still owns the segment inherited across fork()
+                self._segment = None
+        if self._segment is None:
+            name = f"usage-{os.getpid()}-{uuid.uuid4().hex[:12]}.jsonl"
+            self._segment = self.log_dir / name
+            self._segment_started = time.monotonic()
+            self._segment_pid = os.getpid()
+        return self._segment
+
+    def _seal_segment(self) -> None:
+        # Called with self._lock held
+        segment, self._segment = self._segment, None
+        if segment is not None and self._segment_pid == os.getpid() and segment.exists():
+            try:
+                segment.replace(segment.with_suffix(".sealed"))
+            except OSError:
+                # Still open by a compactor on Windows; compacted again and sealed later
+                self._segment = segment
+
+    def _compact_segment(self, conn: sqlite3.Connection, segment: Path) -> Tuple[int, bool]:
+        row = conn.execute("SELECT offset FROM usage_segments WHERE segment = ?", (segment.stem,)).fetchone()
+        offset = row[0] if row else 0
+        try:
+            with open(segment, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            # Sealed or deleted since the directory was listed
+            return 0, False
+        # A writer may be mid-line; only whole lines are consumed
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return 0, not data
+
+        totals: Dict[Tuple[str, ...], List[int]] = {}
+        count = 0
+        for line in data[:end].splitlines():
+            try:
+                record = UsageRecord(**json.loads(line))
+            except (ValueError, TypeError):
+                continue
+            key = (record.scope, record.client_id, record.day, record.model, record.source)
+            sums = totals.setdefault(key, [0, 0])
+            sums[0] += record.tokens
+            sums[1] += record.requests
+            count += 1
+
+        conn.executemany(
+            """
+            INSERT INTO usage (scope, client_id, day, model, source, tokens, requests)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (scope, client_id, day, model, source) DO UPDATE SET
+                tokens = tokens + excluded.tokens,
+                requests = requests + excluded.requests
+            """,
+            [(*key, tokens, requests) for key, (tokens, requests) in totals.items()],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO usage_segments (segment, offset) VALUES (?, ?)",
+            (segment.stem, offset + end),
+        )
+        return count, end == len(data)
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection inherited across fork() must not be used by the child
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+            # Set first: switching to WAL needs a lock another process may hold
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+
+_stores: Dict[Path, SqliteUsageStore] = {}
+_stores_lock = threading.Lock()
+
+
+def shared_usage_store(db_path: Union[str, Path]) -> SqliteUsageStore:
+    """Return the process-wide store for ``db_path``, creating it on first use."""
+    path = Path(db_path).expanduser().resolve()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SqliteUsageStore(path)
+        return store
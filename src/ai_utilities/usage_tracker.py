@@ -1,17 +1,34 @@
-"""Thread-safe usage tracking for AI requests with configurable scoping."""
+"""Thread-safe usage tracking for AI requests with configurable scoping.
 
+Recorded usage is aggregated in memory and merged into the stats file by a
+background flusher, so recording a request costs no disk I/O. Trackers on the
+same file within a process share their pending usage, and ``get_stats()``
+includes it without reading the file.
+"""
+
+import atexit
 import json
+import logging
 import os
 import threading
 import time
+from contextlib import contextmanager
 from datetime import date
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
 
 import portalocker  # Cross-platform file locking
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from .usage_store import SqliteUsageStore, UsageRecord
+
+logger = logging.getLogger(__name__)
+
+# Usage owed to a usage store: (store, scope, client_id, day, model)
+_StoreKey = Tuple["SqliteUsageStore", str, str, str, str]
+
 
 class UsageScope(Enum):
     """Usage tracking scope options."""
@@ -31,21 +48,118 @@ class UsageStats(BaseModel):
     process_id: Optional[int] = None  # For process tracking
 
 
+class _PendingUsage:
+    """Usage recorded in this process but not yet written to a stats file."""
+
+    def __init__(self) -> None:
+        self.day = date.today().isoformat()
+        self.tokens_today = 0
+        self.requests_today = 0
+        self.tokens = 0
+        self.requests = 0
+        # Usage of trackers with a store, attributed to them: key -> [tokens, requests]
+        self.by_store: Dict[_StoreKey, List[int]] = {}
+
+    def add(self, tokens: int, model: Optional[str] = None, tracker: Optional["ThreadSafeUsageTracker"] = None) -> None:
+        """Add one request; with a ``tracker`` that has a store, it is also owed to that store."""
+        today = date.today().isoformat()
+        if self.day != today:
+            self.day = today
+            self.tokens_today = 0
+            self.requests_today = 0
+        self.tokens_today += tokens
+        self.requests_today += 1
+        self.tokens += tokens
+        self.requests += 1
+        if tracker is not None and tracker.store is not None:
+            key = (tracker.store, tracker.scope.value, tracker.client_id, today, model or "")
+            sums = self.by_store.setdefault(key, [0, 0])
+            sums[0] += tokens
+            sums[1] += 1
+
+    def absorb(self, other: "_PendingUsage") -> None:
+        """Add the usage of ``other``, e.g. a batch whose write failed."""
+        if other.day == self.day:
+            self.tokens_today += other.tokens_today
+            self.requests_today += other.requests_today
+        self.tokens += other.tokens
+        self.requests += other.requests
+        for key, (tokens, requests) in other.by_store.items():
+            sums = self.by_store.setdefault(key, [0, 0])
+            sums[0] += tokens
+            sums[1] += requests
+
+    def merge_into(self, stats: UsageStats) -> UsageStats:
+        """Add the usage to ``stats``, which must already be reset for today."""
+        if self.day == stats.last_reset:
+            stats.tokens_used_today += self.tokens_today
+            stats.requests_today += self.requests_today
+        stats.total_tokens += self.tokens
+        stats.total_requests += self.requests
+        return stats
+
+
+class _UsageBuffer:
+    """Pending usage and flush state shared by all trackers on one stats file."""
+
+    def __init__(self) -> None:
+        self.snapshot: Optional[UsageStats] = None  # File contents as of the last read or flush
+        self.pending = _PendingUsage()
+        # Usage a flush has taken from ``pending`` and is writing; still counted by get_stats
+        self.in_flight: Optional[_PendingUsage] = None
+        # Serializes flushes; record_usage and get_stats never wait for one
+        self.flush_lock = threading.Lock()
+        self.flush_requested = threading.Event()
+        self.flusher: Optional[threading.Thread] = None
+        # Tracker that flushes this buffer at exit; held only while usage is pending
+        self.writer: Optional[ThreadSafeUsageTracker] = None
+
+    def merge_into(self, stats: UsageStats) -> UsageStats:
+        """Add the pending and in-flight usage to ``stats``, which must already be reset for today."""
+        if self.in_flight is not None:
+            self.in_flight.merge_into(stats)
+        return self.pending.merge_into(stats)
+
+    def take(self) -> _PendingUsage:
+        """Move the pending usage in flight for a flush to write."""
+        self.in_flight, self.pending = self.pending, _PendingUsage()
+        return self.in_flight
+
+    def restore(self) -> None:
+        """Return the in-flight usage to the pending usage after a failed write."""
+        if self.in_flight is not None:
+            self.pending.absorb(self.in_flight)
+            self.in_flight = None
+
+    def clear(self) -> None:
+        self.pending = _PendingUsage()
+        self.in_flight = None
+        self.writer = None
+
+
 class ThreadSafeUsageTracker:
     """Thread-safe usage tracker with configurable scoping and concurrent access support."""
     
     _shared_locks: Dict[str, threading.RLock] = {}
+    _shared_buffers: Dict[str, _UsageBuffer] = {}
     
     def __init__(self, 
                  stats_file: Optional[Path] = None,
                  scope: UsageScope = UsageScope.PER_CLIENT,
-                 client_id: Optional[str] = None):
+                 client_id: Optional[str] = None,
+                 flush_interval_s: float = 5.0,
+                 flush_threshold: int = 100,
+                 store: Optional["SqliteUsageStore"] = None):
         """Initialize thread-safe usage tracker.
         
         Args:
             stats_file: Path to statistics file. If None, generates based on scope.
             scope: Tracking scope (per_client, per_process, global)
             client_id: Unique client identifier for per-client tracking
+            flush_interval_s: Seconds between background flushes of recorded usage
+            flush_threshold: Number of pending records that triggers an early flush
+            store: Optional usage log that flushed usage is also appended to, and
+                that ``get_aggregated_stats`` queries instead of scanning stats files
         """
         self.scope = scope
         self.client_id = client_id or self._generate_client_id()
@@ -58,15 +172,21 @@ class ThreadSafeUsageTracker:
         self.stats_file = stats_file
         # Use a shared lock based on the file path for proper synchronization
         self._file_lock = self._get_shared_file_lock(stats_file)
-        self._memory_cache: Optional[UsageStats] = None
-        self._cache_timestamp: float = 0
-        self._cache_ttl: float = 0.0  # Disable cache to ensure data sharing between instances
+        # Pending usage and the last known file contents, shared like the lock
+        self._buffer = self._get_shared_buffer(stats_file)
+        self.flush_interval_s = flush_interval_s
+        self.flush_threshold = flush_threshold
+        self.store = store
         
         # Ensure directory exists
         self.stats_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Initialize stats file if it doesn't exist
         self._ensure_stats_file_exists()
+        
+        # Pick up whatever other processes have written since this file was last read
+        with self._file_lock:
+            self._buffer.snapshot = self._read_stats_file()
     
     def _generate_client_id(self) -> str:
         """Generate a unique client identifier."""
@@ -90,6 +210,15 @@ class ThreadSafeUsageTracker:
         
         return ThreadSafeUsageTracker._shared_locks[file_key]
     
+    @staticmethod
+    def _get_shared_buffer(stats_file: Path) -> _UsageBuffer:
+        """Get the pending-usage buffer shared by all trackers on a stats file."""
+        file_key = str(stats_file.absolute())
+        with ThreadSafeUsageTracker._get_shared_file_lock(stats_file):
+            if file_key not in ThreadSafeUsageTracker._shared_buffers:
+                ThreadSafeUsageTracker._shared_buffers[file_key] = _UsageBuffer()
+            return ThreadSafeUsageTracker._shared_buffers[file_key]
+    
     def _generate_stats_file_path(self) -> Path:
         """Generate appropriate stats file path based on scope."""
         base_dir = Path.cwd() / ".ai_utilities" / "usage_stats"
@@ -101,51 +230,61 @@ class ThreadSafeUsageTracker:
         else:  # GLOBAL
             return base_dir / "usage_global.json"
     
+    def _new_stats(self) -> UsageStats:
+        return UsageStats(
+            client_id=self.client_id if self.scope == UsageScope.PER_CLIENT else None,
+            process_id=self.process_id if self.scope == UsageScope.PER_PROCESS else None
+        )
+    
     def _ensure_stats_file_exists(self):
         """Ensure stats file exists with proper structure."""
         with self._file_lock:
             if not self.stats_file.exists():
-                initial_stats = UsageStats(
-                    client_id=self.client_id if self.scope == UsageScope.PER_CLIENT else None,
-                    process_id=self.process_id if self.scope == UsageScope.PER_PROCESS else None
-                )
-                self._write_stats_atomic(initial_stats)
+                with self._exclusive_file_lock():
+                    if not self.stats_file.exists():
+                        self._buffer.snapshot = self._write_stats_atomic(self._new_stats())
     
-    def _load_stats(self) -> UsageStats:
-        """Load statistics with caching and thread safety."""
-        current_time = time.time()
-        
-        # Check cache first
-        if (self._memory_cache and 
-            current_time - self._cache_timestamp < self._cache_ttl):
-            return self._memory_cache
+    @contextmanager
+    def _exclusive_file_lock(self) -> Iterator[None]:
+        """Serialize read-modify-write cycles on the stats file across processes.
         
-        with self._file_lock:
+        The lock is taken on a sidecar file because the stats file itself is
+        replaced, not rewritten, on every write.
+        """
+        lock_file = self.stats_file.with_name(self.stats_file.name + ".lock")
+        with open(lock_file, 'a') as f:
+            portalocker.lock(f, portalocker.LOCK_EX)
             try:
-                # Use portalocker for cross-platform file locking
-                with open(self.stats_file) as f:
-                    portalocker.lock(f, portalocker.LOCK_SH)  # Shared lock for reading
-                    data = json.load(f)
-                    stats = UsageStats(**data)
-                    portalocker.unlock(f)
-                
-                # Update cache
-                self._memory_cache = stats
-                self._cache_timestamp = current_time
-                return stats
-                
-            except (json.JSONDecodeError, ValueError, FileNotFoundError):
-                # Fallback to fresh stats
-                stats = UsageStats(
-                    client_id=self.client_id if self.scope == UsageScope.PER_CLIENT else None,
-                    process_id=self.process_id if self.scope == UsageScope.PER_PROCESS else None
-                )
-                self._memory_cache = stats
-                self._cache_timestamp = current_time
-                return stats
+                yield
+            finally:
+                portalocker.unlock(f)
+    
+    def _read_stats_file(self) -> UsageStats:
+        """Read statistics from disk, falling back to fresh stats if unreadable."""
+        try:
+            # Use portalocker for cross-platform file locking
+            with open(self.stats_file) as f:
+                portalocker.lock(f, portalocker.LOCK_SH)  # Shared lock for reading
+                data = json.load(f)
+                stats = UsageStats(**data)
+                portalocker.unlock(f)
+            return stats
+        except (json.JSONDecodeError, ValueError, FileNotFoundError):
+            return self._new_stats()
+    
+    def _load_stats(self) -> UsageStats:
+        """Return the stats file contents as of the last read or flush, without pending usage."""
+        with self._file_lock:
+            if self._buffer.snapshot is None:
+                self._buffer.snapshot = self._read_stats_file()
+            return self._buffer.snapshot.model_copy()
     
-    def _write_stats_atomic(self, stats: UsageStats):
-        """Write statistics atomically with file locking."""
+    def _write_stats_atomic(self, stats: UsageStats) -> UsageStats:
+        """Write statistics atomically with file locking.
+        
+        Returns:
+            A copy of the written stats, for the caller to keep as the snapshot
+        """
         # Write to temporary file first, then move atomically
         temp_file = self.stats_file.with_suffix('.tmp')
         
@@ -159,10 +298,7 @@ class ThreadSafeUsageTracker:
             
             # Atomic move
             temp_file.replace(self.stats_file)
-            
-            # Update cache
-            self._memory_cache = stats
-            self._cache_timestamp = time.time()
+            return stats.model_copy()
             
         except Exception as e:
             # Clean up temp file if something went wrong
@@ -179,32 +315,110 @@ class ThreadSafeUsageTracker:
             stats.last_reset = today
         return stats
     
-    def record_usage(self, tokens_used: int = 0):
+    def record_usage(self, tokens_used: int = 0, model: Optional[str] = None):
         """Record usage from an AI request in a thread-safe manner.
         
+        Only the in-memory counters are updated; the background flusher merges
+        them into the stats file within ``flush_interval_s``, or sooner once
+        ``flush_threshold`` records are pending.
+        
         Args:
             tokens_used: Number of tokens used in the request
+            model: Model that served the request, kept in the usage store
         """
+        buffer = self._buffer
         with self._file_lock:
-            # Load current stats
-            stats = self._load_stats()
-            
-            # Reset if new day
-            stats = self._reset_if_new_day(stats)
-            
-            # Update stats
-            stats.tokens_used_today += tokens_used
-            stats.requests_today += 1
-            stats.total_tokens += tokens_used
-            stats.total_requests += 1
-            
-            # Write back atomically
-            self._write_stats_atomic(stats)
+            buffer.pending.add(tokens_used, model, self)
+            buffer.writer = self
+            if buffer.pending.requests >= self.flush_threshold:
+                buffer.flush_requested.set()
+            if buffer.flusher is None:
+                buffer.flusher = threading.Thread(
+                    target=self._flush_loop, name="ai_utilities-usage-flush", daemon=True
+                )
+                buffer.flusher.start()
+    
+    def flush(self):
+        """Merge usage recorded in this process into the stats file.
+        
+        The file is re-read under an exclusive lock before writing, so usage
+        flushed concurrently by other processes is added to, never overwritten.
+        Called by the background flusher and at interpreter exit; call it
+        directly when the file must be current, e.g. before reading it.
+        
+        The pending usage is taken under the in-memory lock, which is released
+        for the file I/O, so ``record_usage`` and ``get_stats`` never wait on
+        the disk. If the write fails, the usage is put back for the next flush.
+        """
+        buffer = self._buffer
+        with buffer.flush_lock:
+            with self._file_lock:
+                if not buffer.pending.requests:
+                    return
+                batch = buffer.take()
+            try:
+                with self._exclusive_file_lock():
+                    stats = self._reset_if_new_day(self._read_stats_file())
+                    written = self._write_stats_atomic(batch.merge_into(stats))
+            except BaseException:
+                with self._file_lock:
+                    buffer.restore()
+                raise
+            with self._file_lock:
+                buffer.snapshot = written
+                buffer.in_flight = None
+                if not buffer.pending.requests:
+                    buffer.writer = None
+        # Each tracker's usage goes to its own store, whichever tracker flushed it
+        for store, records in self._usage_records(batch).items():
+            store.append(records)
+            store.maybe_compact()
+    
+    def _usage_records(self, batch: _PendingUsage) -> Dict["SqliteUsageStore", List["UsageRecord"]]:
+        from .usage_store import UsageRecord
+        
+        records: Dict[SqliteUsageStore, List[UsageRecord]] = {}
+        for (store, scope, client_id, day, model), (tokens, requests) in batch.by_store.items():
+            records.setdefault(store, []).append(
+                UsageRecord(
+                    day=day,
+                    scope=scope,
+                    client_id=client_id,
+                    model=model,
+                    source=str(self.stats_file.absolute()),
+                    tokens=tokens,
+                    requests=requests,
+                )
+            )
+        return records
+    
+    def _flush_loop(self):
+        buffer = self._buffer
+        while True:
+            buffer.flush_requested.wait(self.flush_interval_s)
+            buffer.flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Keep the usage in memory; the next record_usage starts a new flusher
+                logger.warning("Failed to flush usage stats to %s: %s", self.stats_file, e)
+                with self._file_lock:
+                    buffer.flusher = None
+                return
+            with self._file_lock:
+                if not buffer.pending.requests:
+                    # Idle: exit rather than keep a thread per stats file alive
+                    buffer.flusher = None
+                    return
     
     def get_stats(self) -> UsageStats:
-        """Get current usage statistics in a thread-safe manner."""
-        stats = self._load_stats()
-        return self._reset_if_new_day(stats)
+        """Get current usage statistics in a thread-safe manner.
+        
+        Includes usage recorded in this process that has not been flushed yet.
+        """
+        with self._file_lock:
+            stats = self._reset_if_new_day(self._load_stats())
+            return self._buffer.merge_into(stats)
     
     def print_summary(self):
         """Print a usage summary."""
@@ -219,18 +433,27 @@ class ThreadSafeUsageTracker:
     def get_aggregated_stats(self, scope_filter: Optional[UsageScope] = None) -> Dict[str, UsageStats]:
         """Get aggregated statistics from multiple stats files.
         
+        With a usage ``store`` this is one query over the compacted usage
+        log, and ``scope_filter`` restricts it to one scope.
+        
         Args:
             scope_filter: Filter by specific scope, None for all
             
         Returns:
             Dictionary mapping file paths to UsageStats
         """
+        if self.store is not None:
+            return self._aggregated_stats_from_store(self.store, scope_filter)
+        
         stats_dir = self.stats_file.parent
         aggregated: Dict[str, UsageStats] = {}
         
         if not stats_dir.exists():
             return aggregated
         
+        # Include usage recorded by this process in the files being read
+        _flush_pending(stats_dir)
+        
         for stats_file in stats_dir.glob("usage_*.json"):
             try:
                 with open(stats_file) as f:
@@ -245,14 +468,53 @@ class ThreadSafeUsageTracker:
         
         return aggregated
     
+    @staticmethod
+    def _aggregated_stats_from_store(
+        store: "SqliteUsageStore", scope_filter: Optional[UsageScope]
+    ) -> Dict[str, UsageStats]:
+        _flush_pending()
+        today = date.today().isoformat()
+        rows = store.aggregate(
+            ("source", "scope", "client_id", "day"),
+            scope=scope_filter.value if scope_filter is not None else None,
+        )
+        aggregated: Dict[str, UsageStats] = {}
+        for row in rows:
+            stats = aggregated.get(row["source"])
+            if stats is None:
+                stats = aggregated[row["source"]] = UsageStats(
+                    last_reset=today,
+                    client_id=row["client_id"] if row["scope"] == UsageScope.PER_CLIENT.value else None,
+                )
+            stats.total_tokens += row["tokens"]
+            stats.total_requests += row["requests"]
+            if row["day"] == today:
+                stats.tokens_used_today += row["tokens"]
+                stats.requests_today += row["requests"]
+        return aggregated
+    
     def reset_stats(self):
         """Reset all statistics to zero in a thread-safe manner."""
-        with self._file_lock:
-            reset_stats = UsageStats(
-                client_id=self.client_id if self.scope == UsageScope.PER_CLIENT else None,
-                process_id=self.process_id if self.scope == UsageScope.PER_PROCESS else None
-            )
-            self._write_stats_atomic(reset_stats)
+        # Wait for a running flush so it cannot write its batch over the reset
+        with self._buffer.flush_lock, self._file_lock:
+            self._buffer.snapshot = self._write_stats_atomic(self._new_stats())
+            self._buffer.clear()
+
+
+def _flush_pending(stats_dir: Optional[Path] = None) -> None:
+    """Flush every buffer with pending usage, optionally only those in ``stats_dir``."""
+    for buffer in list(ThreadSafeUsageTracker._shared_buffers.values()):
+        writer = buffer.writer
+        if writer is None or (stats_dir is not None and writer.stats_file.parent != stats_dir):
+            continue
+        try:
+            writer.flush()
+        except Exception as e:
+            logger.warning("Failed to flush usage stats to %s: %s", writer.stats_file, e)
+
+
+# Recorded usage must survive a normal interpreter exit
+atexit.register(_flush_pending)
 
 
 # Backward compatibility
@@ -262,13 +524,15 @@ UsageTracker = ThreadSafeUsageTracker
 # Factory function for easy usage
 def create_usage_tracker(scope: Union[str, UsageScope] = UsageScope.PER_CLIENT,
                         stats_file: Optional[Path] = None,
-                        client_id: Optional[str] = None) -> ThreadSafeUsageTracker:
+                        client_id: Optional[str] = None,
+                        store: Optional["SqliteUsageStore"] = None) -> ThreadSafeUsageTracker:
     """Create a usage tracker with specified scope.
     
     Args:
         scope: Tracking scope ('per_client', 'per_process', 'global')
         stats_file: Custom stats file path
         client_id: Custom client ID for per-client tracking
+        store: Optional usage log for indexed aggregation
         
     Returns:
         ThreadSafeUsageTracker instance
@@ -279,5 +543,6 @@ def create_usage_tracker(scope: Union[str, UsageScope] = UsageScope.PER_CLIENT,
     return ThreadSafeUsageTracker(
         stats_file=stats_file,
         scope=scope,
-        client_id=client_id
+        client_id=client_id,
+        store=store
     )
@@ -2,14 +2,17 @@
 
 import asyncio
 import sys
-from collections.abc import Sequence
+import threading
+import time
+from collections.abc import Iterable, Sequence
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Union
+from typing import Any, Dict, List, Literal, Type, Union
 from unittest.mock import Mock
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from ai_utilities.config_models import AiSettings
 from ai_utilities.providers.base_provider import BaseProvider
 
 
@@ -167,6 +170,104 @@ class FakeAsyncProvider:
         return self.sync_provider.generate_image(*args, **kwargs)
 
 
+class RecordingProvider(FakeProvider):
+    """Provider that answers every prompt and records each request.
+    
+    Records the prompts in call order (``prompts``), the request params of
+    each call (``params``) and the peak number of concurrent calls (``peak``).
+    """
+    
+    def __init__(self, delay: Union[float, Sequence[float]] = 0.0, fail_on: Iterable[str] = (),
+                 error: Type[Exception] = ValueError, answer: str = "answer to {prompt}"):
+        """Initialize the recording provider.
+        
+        Args:
+            delay: Seconds every call takes, or per-call delays in call order
+                (calls beyond the list take no time)
+            fail_on: Prompts that raise ``error`` instead of being answered
+            error: Exception type raised for ``fail_on`` prompts
+            answer: Response template, formatted with the prompt
+        """
+        super().__init__()
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.error = error
+        self.answer = answer
+        self.prompts = []
+        self.params = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
+        """Record the request, wait the call's delay, then answer or fail."""
+        with self._lock:
+            delay = _call_delay(self.delay, len(self.prompts))
+            self.prompts.append(prompt)
+            self.params.append(kwargs)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(delay)
+            if prompt in self.fail_on:
+                raise self.error(f"failed: {prompt}")
+            return self.answer.format(prompt=prompt)
+        finally:
+            with self._lock:
+                self.active -= 1
+    
+    def ask_many(self, prompts: Sequence[str], *, return_format: Literal["text", "json"] = "text", **kwargs) -> List[Union[str, Dict[str, Any]]]:
+        """Ask each prompt in turn, recording each one."""
+        return [self.ask(p, return_format=return_format, **kwargs) for p in prompts]
+
+
+class AsyncRecordingProvider:
+    """Async ``RecordingProvider``; also counts calls cancelled mid-flight (``cancelled``)."""
+    
+    def __init__(self, delay: Union[float, Sequence[float]] = 0.0, fail_on: Iterable[str] = (),
+                 error: Type[Exception] = ValueError, answer: str = "answer to {prompt}"):
+        """Initialize the recording provider; see ``RecordingProvider``."""
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.error = error
+        self.answer = answer
+        self.prompts = []
+        self.params = []
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+    
+    async def ask(self, prompt: str, *, return_format: Literal["text", "json"] = "text", **kwargs) -> Union[str, Dict[str, Any]]:
+        """Record the request, wait the call's delay, then answer or fail."""
+        delay = _call_delay(self.delay, len(self.prompts))
+        self.prompts.append(prompt)
+        self.params.append(kwargs)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        if prompt in self.fail_on:
+            raise self.error(f"failed: {prompt}")
+        return self.answer.format(prompt=prompt)
+
+
+def offline_settings(**overrides: Any) -> AiSettings:
+    """Return settings for a client on a fake provider: test key and model, caching off."""
+    return AiSettings(**{"api_key": "test-key", "model": "test-model", "cache_enabled": False, **overrides})
+
+
+def _call_delay(delay: Union[float, Sequence[float]], call: int) -> float:
+    """Return the delay of the ``call``-th call (0-based)."""
+    if isinstance(delay, (int, float)):
+        return delay
+    return delay[call] if call < len(delay) else 0.0
+
+
 class FakeProviderError(Exception):
     """Fake provider error for testing error handling."""
     pass
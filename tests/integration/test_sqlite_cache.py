@@ -461,3 +461,336 @@ class TestSqliteCacheEdgeCases:
         with sqlite3.connect(db_path) as conn:
             cursor = conn.execute("SELECT COUNT(*) FROM ai_cache WHERE key = 'bad_key'")
             assert cursor.fetchone()[0] == 0
+
+
+class TestSqliteCacheConnectionPool:
+    """Test pooled connections of SqliteCache."""
+    
+    def _count_connects(self, monkeypatch):
+        import sqlite3
+        opened = []
+        real_connect = sqlite3.connect
+        
+        def connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+        
+        monkeypatch.setattr("ai_utilities.cache.sqlite3.connect", connect)
+        return opened
+    
+    def test_connections_are_reused_across_calls(self, tmp_path, monkeypatch):
+        """Repeated gets and sets open one reader and one writer."""
+        opened = self._count_connects(monkeypatch)
+        cache = SqliteCache(tmp_path / "cache.sqlite", namespace="test")
+        
+        for i in range(20):
+            cache.set(f"key{i}", i)
+            assert cache.get(f"key{i}") == i
+            assert cache.get("missing") is None
+        
+        assert len(opened) == 2
+    
+    def test_each_thread_reads_through_its_own_connection(self, tmp_path):
+        """Concurrent readers and writers see each other's committed data."""
+        import threading
+        cache = SqliteCache(tmp_path / "cache.sqlite", namespace="test")
+        errors = []
+        
+        def work(worker):
+            try:
+                for i in range(50):
+                    cache.set(f"{worker}-{i}", {"i": i})
+                    assert cache.get(f"{worker}-{i}") == {"i": i}
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+        
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert cache.get("3-49") == {"i": 49}
+        # Readers of threads that have exited are closed when the next one opens
+        assert len(cache._readers) == 1
+    
+    def test_readers_see_writes_from_other_connections(self, tmp_path):
+        """A pooled reader never keeps a stale snapshot between calls."""
+        db_path = tmp_path / "cache.sqlite"
+        reader = SqliteCache(db_path, namespace="test")
+        writer = SqliteCache(db_path, namespace="test")
+        
+        assert reader.get("key") is None
+        writer.set("key", "value")
+        assert reader.get("key") == "value"
+    
+    def test_close_releases_connections_and_cache_stays_usable(self, tmp_path):
+        """close() closes every pooled connection; later calls reopen."""
+        import sqlite3
+        cache = SqliteCache(tmp_path / "cache.sqlite", namespace="test", wal=False)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        pooled = [*cache._readers.values(), cache._writer]
+        
+        cache.close()
+        
+        for conn in pooled:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        assert cache.get("key") == "value"
+        cache.close()
+
+
+class TestSqliteCacheAccessStats:
+    """Test write-behind access statistics of SqliteCache."""
+    
+    def _access_row(self, db_path, key):
+        import sqlite3
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute(
+                "SELECT access_count, last_access_at FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+    
+    def test_hits_are_buffered_until_flushed(self, tmp_path):
+        """A hit does not write; flush() applies the buffered hits in one batch."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", access_flush_interval_s=60)
+        cache.set("key", "value")
+        count, set_at = self._access_row(db_path, "key")
+        
+        for _ in range(3):
+            assert cache.get("key") == "value"
+        assert self._access_row(db_path, "key") == (count, set_at)
+        
+        cache.flush()
+        count_after, last_access_at = self._access_row(db_path, "key")
+        assert count_after == count + 3
+        assert last_access_at > set_at
+    
+    def test_background_flusher_writes_hits(self, tmp_path):
+        """Buffered hits reach the table within the flush interval."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", access_flush_interval_s=0.05)
+        cache.set("key", "value")
+        cache.get("key")
+        
+        deadline = time.time() + 5
+        while self._access_row(db_path, "key")[0] != 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert self._access_row(db_path, "key")[0] == 2
+    
+    def test_flush_threshold_triggers_early_write(self, tmp_path):
+        """Enough distinct buffered keys wake the flusher before the interval."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", access_flush_interval_s=60, access_flush_threshold=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.get("b")
+        
+        deadline = time.time() + 5
+        while self._access_row(db_path, "b")[0] != 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert self._access_row(db_path, "a")[0] == 2
+        assert self._access_row(db_path, "b")[0] == 2
+    
+    def test_lru_pruning_counts_buffered_hits(self, tmp_path):
+        """A recently read entry survives pruning even before its hit is flushed."""
+        cache = SqliteCache(
+            tmp_path / "cache.sqlite", namespace="test", max_entries=3, prune_batch=10,
+            access_flush_interval_s=60,
+        )
+        for key in ("k0", "k1", "k2"):
+            cache.set(key, key)
+            time.sleep(0.01)
+        cache.get("k0")
+        
+        cache.set("k3", "k3")
+        
+        assert cache.get("k0") == "k0"
+        assert cache.get("k1") is None
+    
+    def test_close_writes_buffered_hits(self, tmp_path):
+        """close() flushes before closing its connections."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", access_flush_interval_s=60)
+        cache.set("key", "value")
+        cache.get("key")
+        
+        cache.close()
+        
+        assert self._access_row(db_path, "key")[0] == 2
+
+
+class TestSqliteCacheValueEncoding:
+    """Test compressed and float32 value storage of SqliteCache."""
+    
+    def _stored(self, db_path, key):
+        import sqlite3
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute(
+                "SELECT value_json, value_blob, value_codec FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+    
+    def test_values_above_threshold_are_compressed(self, tmp_path):
+        """Large values round-trip through a compressed BLOB; small ones stay JSON."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", compress_min_bytes=100)
+        large = {"text": "the quick brown fox " * 50, "n": [1, 2, 3]}
+        cache.set("large", large)
+        cache.set("small", "short")
+        
+        value_json, value_blob, value_codec = self._stored(db_path, "large")
+        assert (value_json, value_codec) in {("", "zlib"), ("", "zstd")}
+        assert len(value_blob) < len(json.dumps(large)) / 5
+        assert self._stored(db_path, "small") == ('"short"', None, None)
+        assert cache.get("large") == large
+        assert cache.get("small") == "short"
+    
+    def test_threshold_counts_encoded_json_bytes(self, tmp_path):
+        """Non-ASCII values are measured by the bytes of their stored JSON."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", compress_min_bytes=100)
+        value = "é" * 30
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        assert len(value) < 100 <= len(encoded)
+        
+        cache.set("accented", value)
+        
+        assert self._stored(db_path, "accented")[2] in {"zlib", "zstd"}
+        assert cache.get("accented") == value
+    
+    def test_compression_falls_back_to_zlib(self, tmp_path, monkeypatch):
+        """Without zstandard, values are compressed with zlib."""
+        import ai_utilities.cache as cache_module
+        monkeypatch.setattr(cache_module, "_zstandard", None)
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", compress_min_bytes=0)
+        cache.set("key", ["value"] * 10)
+        
+        assert self._stored(db_path, "key")[2] == "zlib"
+        assert cache.get("key") == ["value"] * 10
+    
+    def test_zstd_rows_without_zstandard_are_misses(self, tmp_path, monkeypatch):
+        """A zstd row is left in place when zstandard is not installed to read it."""
+        import sqlite3
+        import ai_utilities.cache as cache_module
+        monkeypatch.setattr(cache_module, "_zstandard", None)
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO ai_cache (namespace, key, value_json, value_blob, value_codec, created_at, last_access_at) "
+                "VALUES ('test', 'key', '', x'00', 'zstd', ?, ?)",
+                (time.time(), time.time()),
+            )
+        
+        assert cache.get("key") is None
+        assert self._stored(db_path, "key")[2] == "zstd"
+    
+    def test_float32_vectors_round_trip(self, tmp_path):
+        """Embeddings are stored as 4 bytes per float and read back as float32 values."""
+        from array import array
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", float32_vectors=True)
+        vector = [i / 7 - 100 for i in range(1536)]
+        matrix = [vector[:128], vector[128:256]]
+        cache.set("vector", vector)
+        cache.set("matrix", matrix)
+        
+        value_json, value_blob, value_codec = self._stored(db_path, "vector")
+        assert (value_json, value_codec, len(value_blob)) == ("", "f32", 4 + 4 * 1536)
+        assert cache.get("vector") == array("f", vector).tolist()
+        assert cache.get("vector") == pytest.approx(vector, rel=1e-6)
+        assert cache.get("matrix") == [array("f", row).tolist() for row in matrix]
+    
+    @pytest.mark.parametrize("value", [
+        [0.5] * 10,                    # Too short to be worth packing
+        [0.5] * 99 + [1],              # Not all floats
+        [0.5] * 99 + [1e300],          # Outside the float32 range
+        [[0.5] * 64, [0.5] * 63],      # Ragged rows
+        {"embedding": [0.5] * 100},
+    ])
+    def test_other_values_stay_json(self, tmp_path, value):
+        """Only float lists that float32 can hold are packed."""
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test", float32_vectors=True)
+        cache.set("key", value)
+        
+        assert self._stored(db_path, "key")[2] is None
+        assert cache.get("key") == value
+    
+    def test_json_rows_of_old_tables_stay_readable(self, tmp_path):
+        """Tables created before value_blob existed gain the columns and keep their rows."""
+        import sqlite3
+        db_path = tmp_path / "cache.sqlite"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE ai_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NULL,
+                    last_access_at REAL NOT NULL,
+                    access_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute(
+                "INSERT INTO ai_cache (namespace, key, value_json, created_at, last_access_at) VALUES (?, ?, ?, ?, ?)",
+                ("test", "old", json.dumps({"answer": 42}), time.time(), time.time()),
+            )
+        
+        cache = SqliteCache(db_path, namespace="test", compress_min_bytes=0, float32_vectors=True)
+        
+        assert cache.get("old") == {"answer": 42}
+        cache.set("new", {"answer": 43})
+        assert cache.get("new") == {"answer": 43}
+    
+    def test_corrupted_blob_is_removed(self, tmp_path):
+        """A BLOB that does not decompress is treated like corrupted JSON."""
+        import sqlite3
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO ai_cache (namespace, key, value_json, value_blob, value_codec, created_at, last_access_at) "
+                "VALUES ('test', 'bad', '', x'0102', 'zlib', ?, ?)",
+                (time.time(), time.time()),
+            )
+        
+        assert cache.get("bad") is None
+        assert self._stored(db_path, "bad") is None
+    
+    def test_encoded_row_without_blob_is_removed(self, tmp_path):
+        """A row whose codec names a BLOB that is missing is treated as corrupted."""
+        import sqlite3
+        db_path = tmp_path / "cache.sqlite"
+        cache = SqliteCache(db_path, namespace="test")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO ai_cache (namespace, key, value_json, value_blob, value_codec, created_at, last_access_at) "
+                "VALUES ('test', 'bad', '', NULL, 'f32', ?, ?)",
+                (time.time(), time.time()),
+            )
+        
+        assert cache.get("bad") is None
+        assert self._stored(db_path, "bad") is None
+    
+    def test_client_passes_encoding_settings(self, tmp_path):
+        """The settings-based SQLite cache uses the encoding settings."""
+        settings = AiSettings(
+            api_key="test-key",
+            cache_enabled=True,
+            cache_backend="sqlite",
+            cache_sqlite_path=tmp_path / "cache.sqlite",
+            cache_sqlite_compress_min_bytes=512,
+            cache_sqlite_float32_vectors=True,
+        )
+        client = AiClient(settings=settings, provider=FakeProvider(settings))
+        
+        assert client.cache.compress_min_bytes == 512
+        assert client.cache.float32_vectors is True
@@ -55,7 +55,12 @@ class TestProvidersInitImports:
             "BaseProvider", 
             "OpenAIProvider", 
             "OpenAICompatibleProvider",
+            "AsyncOpenAIProvider",
+            "AsyncOpenAICompatibleProvider",
             "create_provider",
+            "create_async_provider",
+            "ProviderPool",
+            "AsyncProviderPool",
             "provider_factory",
             "openai_compatible_provider",
             "ProviderCapabilities",
@@ -0,0 +1,266 @@
+"""Tests for the adaptive (AIMD) concurrency limiter."""
+
+import asyncio
+import threading
+
+import pytest
+
+from ai_utilities import AiClient, AsyncAiClient
+from ai_utilities._waiters import SyncWaiter
+from ai_utilities.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    is_overload_error,
+)
+from ai_utilities.metrics import MetricsRegistry
+from tests.fake_provider import (
+    AsyncRecordingProvider,
+    RecordingProvider,
+    offline_settings,
+)
+
+
+class RateLimitError(Exception):
+    """Stand-in for openai.RateLimitError."""
+
+    status_code = 429
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """AIMD bookkeeping."""
+
+    def test_successes_grow_limit_by_one_per_window(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=10)
+
+        for _ in range(4):
+            assert limiter.acquire(blocking=False)
+        for _ in range(4):
+            limiter.release(0.01)
+
+        assert limiter.limit == 4  # 4 + 1/4 + ... just under 5
+        limiter.acquire()
+        limiter.release(0.01)
+        assert limiter.limit == 5
+
+    def test_limit_is_capped_at_max(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release(0.01)
+
+        assert limiter.limit == 3
+
+    def test_slow_successes_do_not_grow_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_target_s=0.5)
+
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(1.0)
+
+        assert limiter.limit == 2
+
+    def test_overload_cuts_limit_multiplicatively(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2)
+
+        limiter.acquire()
+        limiter.release(0.0, RateLimitError())
+        assert limiter.limit == 8
+
+        limiter.acquire()
+        limiter.release(0.0, TimeoutError())
+        assert limiter.limit == 4
+
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(0.0, RateLimitError())
+        assert limiter.limit == 2
+
+    def test_burst_of_overloads_backs_off_once(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16)
+        for _ in range(8):
+            limiter.acquire()
+
+        # All eight requests were in flight before the first cut
+        for _ in range(8):
+            limiter.release(1.0, RateLimitError())
+
+        assert limiter.limit == 8
+
+    def test_other_errors_leave_limit_unchanged(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+        limiter.acquire()
+        limiter.release(0.0, ValueError("bad request"))
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    def test_acquire_blocks_until_release(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.05)
+
+        limiter.release(0.01)
+        assert acquired.wait(1.0)
+        thread.join()
+        assert limiter.in_flight == 1
+
+    def test_non_blocking_acquire_fails_when_full(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        assert limiter.acquire(blocking=False)
+        assert not limiter.acquire(blocking=False)
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_waits_for_release(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire_async()
+
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        limiter.release(0.01)
+        await asyncio.wait_for(waiter, 1.0)
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_async_waiter_gives_up_its_place(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire_async()
+
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+        assert limiter.acquire(blocking=False)
+
+    def test_interrupted_sync_waiter_gives_up_its_place(self, monkeypatch):
+        class InterruptedEvent(threading.Event):
+            def wait(self, timeout=None):
+                raise KeyboardInterrupt
+
+        original_init = SyncWaiter.__init__
+
+        def init(waiter):
+            original_init(waiter)
+            waiter.event = InterruptedEvent()
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        limiter.acquire()
+        monkeypatch.setattr(SyncWaiter, "__init__", init)
+
+        with pytest.raises(KeyboardInterrupt):
+            limiter.acquire()
+
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+        assert limiter.acquire(blocking=False)
+
+    def test_limit_is_published_as_gauge(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, name="test-gauge")
+
+        limiter.acquire()
+        limiter.release(0.0, RateLimitError())
+
+        gauges = MetricsRegistry().collector.gauges
+        assert gauges["concurrency_limit|limiter=test-gauge"] == 4
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"initial_limit": 0},
+            {"initial_limit": 2, "min_limit": 3},
+            {"initial_limit": 8, "max_limit": 4},
+            {"decrease_factor": 1.0},
+            {"increase": 0},
+        ],
+    )
+    def test_invalid_configuration_is_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(**kwargs)
+
+    def test_is_overload_error(self):
+        assert is_overload_error(RateLimitError())
+        assert is_overload_error(TimeoutError())
+        assert is_overload_error(type("APITimeoutError", (Exception,), {})())
+        assert not is_overload_error(ValueError("bad request"))
+
+
+class TestAskManyWithLimiter:
+    """Integration with the sync and async ask_many."""
+
+    def test_sync_ask_many_stays_within_limit(self):
+        provider = RecordingProvider(delay=0.02)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+
+        results = client.ask_many([f"q{i}" for i in range(12)], limiter=limiter)
+
+        assert [r.response for r in results] == [f"answer to q{i}" for i in range(12)]
+        assert provider.peak == 2
+        assert limiter.in_flight == 0
+
+    def test_sync_ask_many_backs_off_on_rate_limit(self):
+        provider = RecordingProvider(delay=0.02, fail_on={"q0"}, error=RateLimitError)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+
+        results = client.ask_many(["q0"], limiter=limiter)
+
+        assert results[0].error == "failed: q0"
+        assert limiter.limit == 4
+
+    def test_sync_ask_many_grows_limit_when_healthy(self):
+        provider = RecordingProvider()
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=16)
+
+        client.ask_many([f"q{i}" for i in range(40)], limiter=limiter)
+
+        assert limiter.limit > 1
+
+    def test_sync_ask_many_fail_fast_with_limiter(self):
+        provider = RecordingProvider(delay=0.02, fail_on={"q0"}, error=RateLimitError)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+
+        results = client.ask_many(["q0", "q1", "q2"], limiter=limiter, fail_fast=True)
+
+        assert results[0].error is not None
+        assert results[2].error == "Cancelled due to fail_fast mode"
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_async_ask_many_stays_within_limit(self):
+        provider = AsyncRecordingProvider(delay=0.01)
+        client = AsyncAiClient(offline_settings(), provider=provider, show_progress=False)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+
+        results = await client.ask_many([f"q{i}" for i in range(12)], limiter=limiter)
+
+        assert all(r.error is None for r in results)
+        assert provider.peak == 3
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_limiter_shared_between_sync_and_async(self):
+        sync_provider = RecordingProvider(delay=0.02, fail_on={"q0"}, error=RateLimitError)
+        sync_client = AiClient(offline_settings(), provider=sync_provider, show_progress=False)
+        async_client = AsyncAiClient(
+            offline_settings(), provider=AsyncRecordingProvider(delay=0.01), show_progress=False
+        )
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+
+        sync_client.ask_many(["q0"], limiter=limiter)
+        assert limiter.limit == 2
+
+        await async_client.ask_many(["a", "b"], limiter=limiter)
+        assert limiter.in_flight == 0
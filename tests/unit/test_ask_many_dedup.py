@@ -0,0 +1,107 @@
+"""Tests for folding duplicate prompts in ask_many."""
+
+import pytest
+
+from ai_utilities import AiClient, AsyncAiClient
+from tests.fake_provider import AsyncRecordingProvider, RecordingProvider, offline_settings
+
+
+class TestAskManyDeduplication:
+    """Identical prompts within a batch are sent once."""
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_duplicates_are_sent_once_and_fanned_out(self, concurrency):
+        provider = RecordingProvider()
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+        prompts = ["a", "b", "a ", "a", "c", "b"]
+
+        results = client.ask_many(prompts, concurrency=concurrency)
+
+        assert sorted(provider.prompts) == ["a", "b", "c"]
+        assert [r.prompt for r in results] == prompts
+        assert [r.response for r in results] == [
+            "answer to a", "answer to b", "answer to a", "answer to a", "answer to c", "answer to b"
+        ]
+        assert [r.deduplicated for r in results] == [False, False, True, True, False, True]
+
+    def test_duplicates_share_errors(self):
+        provider = RecordingProvider(fail_on=["bad"])
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+
+        results = client.ask_many(["bad", "ok", "bad"])
+
+        assert provider.prompts == ["bad", "ok"]
+        assert results[2].error == "failed: bad"
+        assert results[2].deduplicated
+
+    def test_fail_fast_cancels_duplicates_of_undispatched_prompts(self):
+        provider = RecordingProvider(fail_on=["bad"])
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+
+        results = client.ask_many(["bad", "later", "later"], fail_fast=True)
+
+        assert provider.prompts == ["bad"]
+        assert [r.error for r in results[1:]] == ["Cancelled due to fail_fast mode"] * 2
+
+    def test_duplicate_tokens_are_tracked_once(self, tmp_path):
+        client = AiClient(
+            offline_settings(),
+            provider=RecordingProvider(),
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+        )
+
+        client.ask_many(["same"] * 5)
+
+        assert client.get_usage_stats().total_requests == 1
+
+    def test_deduplicate_false_sends_every_prompt(self):
+        provider = RecordingProvider()
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+
+        results = client.ask_many(["a", "a", "a"], deduplicate=False)
+
+        assert provider.prompts == ["a", "a", "a"]
+        assert not any(r.deduplicated for r in results)
+
+    def test_non_deterministic_requests_are_not_folded(self):
+        provider = RecordingProvider()
+        client = AiClient(offline_settings(temperature=1.2), provider=provider, show_progress=False)
+
+        client.ask_many(["a", "a"])
+        client.ask_many(["b", "b"], temperature=0.0)
+
+        assert provider.prompts == ["a", "a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_async_duplicates_are_sent_once_and_fanned_out(self):
+        provider = AsyncRecordingProvider()
+        client = AsyncAiClient(offline_settings(), provider=provider, show_progress=False)
+        prompts = ["x", "y", "x", "x\n"]
+
+        results = await client.ask_many(prompts, concurrency=2)
+
+        assert sorted(provider.prompts) == ["x", "y"]
+        assert [r.prompt for r in results] == prompts
+        assert [r.response for r in results] == ["answer to x", "answer to y", "answer to x", "answer to x"]
+        assert [r.deduplicated for r in results] == [False, False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_async_deduplicate_false_sends_every_prompt(self):
+        provider = AsyncRecordingProvider()
+        client = AsyncAiClient(offline_settings(), provider=provider, show_progress=False)
+
+        await client.ask_many(["x", "x"], deduplicate=False)
+
+        assert provider.prompts == ["x", "x"]
+
+    @pytest.mark.asyncio
+    async def test_async_progress_counts_folded_duplicates(self):
+        client = AsyncAiClient(offline_settings(), provider=AsyncRecordingProvider(), show_progress=False)
+        progress = []
+
+        await client.ask_many(["x", "y", "x", "x"], on_progress=lambda done, total: progress.append((done, total)))
+
+        # "x" also answers its two duplicates
+        assert progress in ([(3, 4), (4, 4)], [(1, 4), (4, 4)])
@@ -0,0 +1,272 @@
+"""Tests for token streaming via ask_stream."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ai_utilities import AiClient, AiSettings, AsyncAiClient
+from ai_utilities.cache import MemoryCache
+from ai_utilities.config_models import ModelConfig
+from ai_utilities.rate_limiter import TokenBucketRateLimiter
+from ai_utilities.providers.async_openai_provider import AsyncOpenAIProvider
+from ai_utilities.providers.openai_compatible_provider import OpenAICompatibleProvider
+from ai_utilities.providers.openai_provider import OpenAIProvider
+from ai_utilities.token_usage import TokenUsage, capture_usage, report_usage
+from tests.fake_provider import FakeProvider
+
+
+def _chunk(content):
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = content
+    return chunk
+
+
+def _stream_chunks():
+    # A role-only first chunk and a usage-only final chunk carry no text
+    usage_chunk = MagicMock()
+    usage_chunk.choices = []
+    usage_chunk.usage.prompt_tokens = 9
+    usage_chunk.usage.completion_tokens = 3
+    usage_chunk.usage.prompt_tokens_details = None
+    return [_chunk(None), _chunk("Hel"), _chunk("lo"), _chunk(" world"), usage_chunk]
+
+
+class AsyncChunkStream:
+    """Minimal async iterator standing in for openai.AsyncStream."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class StreamingFakeProvider(FakeProvider):
+    """Fake provider that streams its answer in fixed-size pieces."""
+
+    def __init__(self, text="Hello world", piece=3):
+        super().__init__()
+        self.text = text
+        self.piece = piece
+        self.stream_calls = 0
+
+    def ask_stream(self, prompt, **kwargs):
+        self.stream_calls += 1
+        for i in range(0, len(self.text), self.piece):
+            yield self.text[i:i + self.piece]
+
+
+class UsageStreamingFakeProvider(StreamingFakeProvider):
+    """Streaming fake provider whose stream ends by reporting its token usage."""
+
+    def ask_stream(self, prompt, **kwargs):
+        yield from super().ask_stream(prompt, **kwargs)
+        report_usage(TokenUsage(prompt_tokens=40, completion_tokens=2))
+
+
+class AsyncStreamingFakeProvider:
+    """Async provider that streams its answer in fixed-size pieces."""
+
+    def __init__(self, text="Hello world", piece=3):
+        self.text = text
+        self.piece = piece
+        self.stream_calls = 0
+
+    async def ask(self, prompt, *, return_format="text", **kwargs):
+        return self.text
+
+    async def ask_stream(self, prompt, **kwargs):
+        self.stream_calls += 1
+        for i in range(0, len(self.text), self.piece):
+            yield self.text[i:i + self.piece]
+
+
+class TestProviderStreaming:
+    """Providers request stream=True and yield only text deltas."""
+
+    def test_openai_provider_streams_deltas(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = iter(_stream_chunks())
+        provider = OpenAIProvider(AiSettings(api_key="k", model="gpt-4o-mini"), client=client)
+
+        with capture_usage() as reported:
+            assert list(provider.ask_stream("Hi", temperature=0.2)) == ["Hel", "lo", " world"]
+
+        call_kwargs = client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["stream_options"] == {"include_usage": True}
+        assert reported == [TokenUsage(prompt_tokens=9, completion_tokens=3)]
+        assert call_kwargs["temperature"] == 0.2
+        assert call_kwargs["messages"] == [{"role": "user", "content": "Hi"}]
+
+    def test_openai_compatible_provider_streams_deltas(self, monkeypatch):
+        client = MagicMock()
+        client.chat.completions.create.return_value = iter(_stream_chunks())
+        # Patch the globals the class was defined with; other tests may have
+        # reloaded or replaced the module in sys.modules
+        monkeypatch.setitem(
+            OpenAICompatibleProvider.__init__.__globals__,
+            "_create_openai_sdk_client",
+            lambda **kwargs: client,
+        )
+        provider = OpenAICompatibleProvider(base_url="http://localhost:11434/v1")
+
+        assert "".join(provider.ask_stream("Hi", model="llama3")) == "Hello world"
+        call_kwargs = client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["model"] == "llama3"
+
+    @pytest.mark.asyncio
+    async def test_async_openai_provider_streams_deltas(self):
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=AsyncChunkStream(_stream_chunks()))
+        provider = AsyncOpenAIProvider(AiSettings(api_key="k", model="gpt-4o-mini"), client=client)
+
+        with capture_usage() as reported:
+            deltas = [delta async for delta in provider.ask_stream("Hi")]
+
+        assert deltas == ["Hel", "lo", " world"]
+        assert client.chat.completions.create.await_args.kwargs["stream"] is True
+        assert client.chat.completions.create.await_args.kwargs["stream_options"] == {"include_usage": True}
+        assert reported == [TokenUsage(prompt_tokens=9, completion_tokens=3)]
+
+    def test_base_provider_falls_back_to_single_chunk(self):
+        provider = FakeProvider(responses=["complete answer"])
+
+        assert list(provider.ask_stream("Hi")) == ["complete answer"]
+
+
+class TestAiClientAskStream:
+    """Cache and usage integration for the sync client."""
+
+    def _client(self, provider, tmp_path, **settings_kwargs):
+        settings = AiSettings(api_key="k", model="test-model", **settings_kwargs)
+        return AiClient(
+            settings,
+            provider=provider,
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+            cache=MemoryCache(),
+        )
+
+    def test_yields_deltas_then_caches_and_records_usage(self, tmp_path):
+        provider = StreamingFakeProvider()
+        client = self._client(provider, tmp_path, cache_enabled=True, temperature=0.0)
+
+        deltas = list(client.ask_stream("Hi"))
+
+        assert deltas == ["Hel", "lo ", "wor", "ld"]
+        assert client.get_usage_stats().total_requests == 1
+        # Streamed answers share cache entries with ask()
+        assert client.ask("Hi") == "Hello world"
+        assert provider.call_count == 0
+
+    def test_cache_hit_yields_single_chunk_without_provider_call(self, tmp_path):
+        provider = StreamingFakeProvider()
+        client = self._client(provider, tmp_path, cache_enabled=True, temperature=0.0)
+        list(client.ask_stream("Hi"))
+
+        assert list(client.ask_stream("Hi")) == ["Hello world"]
+        assert provider.stream_calls == 1
+
+    def test_abandoned_stream_is_not_cached(self, tmp_path):
+        provider = StreamingFakeProvider()
+        client = self._client(provider, tmp_path, cache_enabled=True, temperature=0.0)
+
+        stream = client.ask_stream("Hi")
+        next(stream)
+        stream.close()
+
+        assert list(client.ask_stream("Hi")) == ["Hel", "lo ", "wor", "ld"]
+        assert provider.stream_calls == 2
+
+    def test_reported_usage_is_tracked_and_charged_to_the_rate_limiter(self, tmp_path, monkeypatch):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+        acquired, charges = [], []
+        monkeypatch.setattr(limiter, "acquire", lambda tokens, **kwargs: acquired.append(tokens) or True)
+        monkeypatch.setattr(limiter, "record", charges.append)
+        client = self._client(
+            UsageStreamingFakeProvider(),
+            tmp_path,
+            rate_limit_enabled=True,
+            model_rate_limits={"test-model": ModelConfig()},
+        )
+        monkeypatch.setattr(client, "_rate_limiter_for", lambda model: limiter)
+
+        assert "".join(client.ask_stream("Hi")) == "Hello world"
+
+        # The prompt estimate is charged before streaming, the rest of the reported 42 after
+        assert len(acquired) == 1
+        assert charges == [42 - acquired[0]]
+        assert client.get_usage_stats().total_tokens == 42
+
+
+class TestAsyncAiClientAskStream:
+    """Cache and usage integration for the async client."""
+
+    @pytest.mark.asyncio
+    async def test_yields_deltas_then_caches_and_records_usage(self, tmp_path):
+        provider = AsyncStreamingFakeProvider()
+        settings = AiSettings(api_key="k", model="test-model", cache_enabled=True, temperature=0.0)
+        client = AsyncAiClient(
+            settings,
+            provider=provider,
+            track_usage=True,
+            usage_file=str(tmp_path / "usage.json"),
+            cache=MemoryCache(),
+        )
+
+        deltas = [delta async for delta in client.ask_stream("Hi")]
+        cached = [delta async for delta in client.ask_stream("Hi")]
+
+        assert deltas == ["Hel", "lo ", "wor", "ld"]
+        assert cached == ["Hello world"]
+        assert provider.stream_calls == 1
+        assert client.get_usage_stats().total_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_provider_without_stream_support_yields_full_answer(self):
+        class AskOnlyProvider:
+            async def ask(self, prompt, *, return_format="text", **kwargs):
+                return "whole answer"
+
+        client = AsyncAiClient(AiSettings(api_key="k", model="m"), provider=AskOnlyProvider())
+
+        assert [delta async for delta in client.ask_stream("Hi")] == ["whole answer"]
+
+    @pytest.mark.asyncio
+    async def test_reported_usage_is_tracked_and_charged_to_the_rate_limiter(self, tmp_path, monkeypatch):
+        class UsageProvider(AsyncStreamingFakeProvider):
+            async def ask_stream(self, prompt, **kwargs):
+                async for delta in super().ask_stream(prompt, **kwargs):
+                    yield delta
+                report_usage(TokenUsage(prompt_tokens=40, completion_tokens=2))
+
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+        acquired, charges = [], []
+
+        async def acquire_async(tokens, **kwargs):
+            acquired.append(tokens)
+            return True
+
+        monkeypatch.setattr(limiter, "acquire_async", acquire_async)
+        monkeypatch.setattr(limiter, "record", charges.append)
+        settings = AiSettings(api_key="k", model="test-model", rate_limit_enabled=True)
+        client = AsyncAiClient(
+            settings, provider=UsageProvider(), track_usage=True, usage_file=str(tmp_path / "usage.json")
+        )
+        monkeypatch.setattr(client, "_rate_limiter_for", lambda model: limiter)
+
+        assert "".join([delta async for delta in client.ask_stream("Hi")]) == "Hello world"
+
+        assert len(acquired) == 1
+        assert charges == [42 - acquired[0]]
+        assert client.get_usage_stats().total_tokens == 42
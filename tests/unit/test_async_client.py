@@ -21,7 +21,7 @@ from ai_utilities.providers.provider_exceptions import (
 
 
 class TestAsyncOpenAIProvider:
-    """Test the AsyncOpenAIProvider class."""
+    """Test the native AsyncOpenAIProvider class."""
 
     @pytest.fixture
     def mock_settings(self):
@@ -30,113 +30,137 @@ class TestAsyncOpenAIProvider:
 
     @pytest.fixture
     def async_provider(self, mock_settings):
-        """Create AsyncOpenAIProvider instance."""
-        # Mock OpenAIProvider class to avoid import dependency
-        mock_sync_instance = MagicMock()
-        mock_sync_instance.ask.return_value = "Test response"
-        mock_sync_instance.ask_many.return_value = ["Response 1", "Response 2"]
-        
-        # Patch both the _get_openai function and the OpenAI global variable
-        with patch('ai_utilities.providers.openai_provider._get_openai'), \
-             patch('ai_utilities.providers.openai_provider.OpenAI', MagicMock()):
+        """Create AsyncOpenAIProvider instance backed by a mocked AsyncOpenAI client."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=_chat_completion("Test response")
+        )
+        mock_client.files.create = AsyncMock()
+        mock_client.files.content = AsyncMock()
+        mock_client.images.generate = AsyncMock()
+        provider = AsyncOpenAIProvider(mock_settings, client=mock_client)
+        return provider, mock_client
+
+    def test_default_client_is_async_sdk_client(self, mock_settings):
+        """Without an explicit client the AsyncOpenAI boundary is used."""
+        with patch(
+            "ai_utilities.providers.async_openai_provider._create_async_openai_sdk_client"
+        ) as mock_create:
             provider = AsyncOpenAIProvider(mock_settings)
-            # Replace the internal sync provider with our mock
-            provider._sync_provider = mock_sync_instance
-            return provider, mock_sync_instance
+
+        assert provider.client is mock_create.return_value
+        mock_create.assert_called_once_with(
+            api_key="test_key", base_url=mock_settings.base_url, timeout=mock_settings.timeout
+        )
+        assert not hasattr(provider, "_sync_provider")
 
     @pytest.mark.asyncio
     async def test_async_provider_ask(self, async_provider):
-        """Test async ask method."""
-        provider, mock_sync = async_provider
+        """Test async ask method awaits the SDK directly."""
+        provider, mock_client = async_provider
 
-        # Mock sync provider response
-        mock_sync.ask.return_value = "Test response"
+        expected = mock_client.chat.completions.create.return_value.choices[0].message.content
 
-        # Test async ask
-        result = await provider.ask("Test prompt")
+        with patch("asyncio.to_thread") as mock_to_thread:
+            result = await provider.ask("Test prompt")
 
-        assert isinstance(result, str)  # Contract: result is string type
-        assert len(result) > 0  # Contract: non-empty response
-        mock_sync.ask.assert_called_once_with("Test prompt", return_format="text")
+        assert result == expected
+        mock_to_thread.assert_not_called()
+        call_kwargs = mock_client.chat.completions.create.await_args.kwargs
+        assert call_kwargs["messages"] == [{"role": "user", "content": "Test prompt"}]
+        assert call_kwargs["model"] == "gpt-3.5-turbo"
+        assert "response_format" not in call_kwargs
 
     @pytest.mark.asyncio
     async def test_async_provider_ask_json(self, async_provider):
         """Test async ask method with JSON format."""
-        provider, mock_sync = async_provider
-
-        # Mock sync provider response
-        mock_sync.ask.return_value = {"key": "value"}
+        provider, mock_client = async_provider
+        mock_client.chat.completions.create.return_value = _chat_completion('{"key": "value"}')
 
-        # Test async ask with JSON
         result = await provider.ask("Test prompt", return_format="json")
 
         assert result == {"key": "value"}
-        mock_sync.ask.assert_called_once_with("Test prompt", return_format="json")
+        call_kwargs = mock_client.chat.completions.create.await_args.kwargs
+        assert call_kwargs["response_format"] == {"type": "json_object"}
 
     @pytest.mark.asyncio
     async def test_async_provider_ask_many(self, async_provider):
         """Test async ask_many method."""
-        provider, mock_sync = async_provider
+        provider, mock_client = async_provider
+        mock_client.chat.completions.create.side_effect = [
+            _chat_completion("Response 1"),
+            _chat_completion("Response 2"),
+        ]
 
-        # Mock sync provider response
-        mock_sync.ask_many.return_value = ["Response 1", "Response 2"]
-
-        # Test async ask_many
-        prompts = ["Prompt 1", "Prompt 2"]
-        result = await provider.ask_many(prompts)
+        result = await provider.ask_many(["Prompt 1", "Prompt 2"])
 
         assert result == ["Response 1", "Response 2"]
-        mock_sync.ask_many.assert_called_once_with(prompts, return_format="text")
+        assert mock_client.chat.completions.create.await_count == 2
 
     @pytest.mark.asyncio
-    async def test_async_provider_upload_file(self, async_provider):
+    async def test_async_provider_upload_file(self, async_provider, tmp_path):
         """Test async upload_file method."""
-        provider, mock_sync = async_provider
-
-        # Mock sync provider response
-        mock_file = UploadedFile(file_id="file_123", filename="test.txt", bytes=100, provider="test_provider")
-        mock_sync.upload_file.return_value = mock_file
+        provider, mock_client = async_provider
+        test_path = tmp_path / "test.txt"
+        test_path.write_text("hello")
+        mock_client.files.create.return_value = MagicMock(
+            id="file_123", filename="test.txt", bytes=5, purpose="assistants", created_at=1640995200
+        )
 
-        # Test async upload
-        test_path = Path("test.txt")
         result = await provider.upload_file(test_path)
 
-        assert result == mock_file
-        mock_sync.upload_file.assert_called_once_with(
-            test_path, purpose="assistants", filename=None, mime_type=None
-        )
+        assert result.file_id == "file_123"
+        assert result.provider == "openai"
+        call_kwargs = mock_client.files.create.await_args.kwargs
+        assert call_kwargs["purpose"] == "assistants"
+        assert call_kwargs["file"] == ("test.txt", b"hello", "text/plain")
+
+    @pytest.mark.asyncio
+    async def test_async_provider_upload_file_error_is_wrapped(self, async_provider, tmp_path):
+        """SDK failures surface as FileTransferError."""
+        provider, mock_client = async_provider
+        test_path = tmp_path / "test.txt"
+        test_path.write_text("hello")
+        mock_client.files.create.side_effect = RuntimeError("boom")
+
+        with pytest.raises(FileTransferError):
+            await provider.upload_file(test_path)
 
     @pytest.mark.asyncio
     async def test_async_provider_download_file(self, async_provider):
         """Test async download_file method."""
-        provider, mock_sync = async_provider
+        provider, mock_client = async_provider
+        mock_client.files.content.return_value = MagicMock(content=b"file content")
 
-        # Mock sync provider response
-        mock_sync.download_file.return_value = b"file content"
-
-        # Test async download
         result = await provider.download_file("file_123")
 
         assert result == b"file content"
-        mock_sync.download_file.assert_called_once_with("file_123")
+        mock_client.files.content.assert_awaited_once_with("file_123")
 
     @pytest.mark.asyncio
     async def test_async_provider_generate_image(self, async_provider):
         """Test async generate_image method."""
-        provider, mock_sync = async_provider
-
-        # Mock sync provider response
-        mock_sync.generate_image.return_value = ["url1", "url2"]
+        provider, mock_client = async_provider
+        mock_client.images.generate.return_value = MagicMock(
+            data=[MagicMock(url="url1"), MagicMock(url="url2")]
+        )
 
-        # Test async image generation
         result = await provider.generate_image("Test prompt", n=2)
 
         assert result == ["url1", "url2"]
-        mock_sync.generate_image.assert_called_once_with(
-            "Test prompt", size="1024x1024", quality="standard", n=2
+        mock_client.images.generate.assert_awaited_once_with(
+            model="dall-e-3", prompt="Test prompt", size="1024x1024", quality="standard", n=2
         )
 
 
+def _chat_completion(content):
+    """Build a minimal chat completion response object."""
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
 class TestAsyncAiClient:
     """Test the AsyncAiClient class."""
 
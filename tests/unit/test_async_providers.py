@@ -0,0 +1,167 @@
+"""Tests for the native async provider layer and create_async_provider."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ai_utilities import AiSettings, AsyncAiClient
+from ai_utilities.providers import (
+    AsyncOpenAICompatibleProvider,
+    AsyncOpenAIProvider,
+    ProviderCapabilityError,
+    ProviderConfigurationError,
+    create_async_provider,
+)
+
+
+CANNED_CONTENT = "canned content"
+
+
+def _chat_completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+class ConcurrentCompletions:
+    """Stand-in for ``AsyncOpenAI.chat.completions`` that tracks overlap."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.threads = set()
+
+    async def create(self, *, messages, **kwargs):
+        self.threads.add(threading.get_ident())
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return _chat_completion(f"answer to {messages[0]['content']}")
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def mock_async_sdk():
+    """Patch the AsyncOpenAI client boundary used by both async providers."""
+    with patch(
+        "ai_utilities.providers.async_openai_provider._create_async_openai_sdk_client"
+    ) as mock_create:
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=_chat_completion(CANNED_CONTENT))
+        mock_create.return_value = client
+        yield mock_create
+
+
+class TestCreateAsyncProvider:
+    """Provider selection mirrors create_provider."""
+
+    def test_openai_settings_give_native_async_provider(self, mock_async_sdk):
+        settings = AiSettings(provider="openai", api_key="test-key", model="gpt-4o-mini")
+
+        provider = create_async_provider(settings)
+
+        assert isinstance(provider, AsyncOpenAIProvider)
+        assert provider.settings.api_key == "test-key"
+        assert mock_async_sdk.call_args.kwargs["api_key"] == "test-key"
+
+    def test_local_provider_gives_async_compatible_provider(self, mock_async_sdk):
+        settings = AiSettings(
+            provider="openai_compatible",
+            base_url="http://localhost:11434/v1",
+            api_key="dummy-key",
+            model="llama3",
+            timeout=60,
+        )
+
+        provider = create_async_provider(settings)
+
+        assert isinstance(provider, AsyncOpenAICompatibleProvider)
+        assert provider.base_url == "http://localhost:11434/v1"
+        mock_async_sdk.assert_called_once_with(
+            api_key="dummy-key", base_url="http://localhost:11434/v1", timeout=60
+        )
+
+    def test_explicit_provider_is_returned_unchanged(self):
+        explicit = AsyncMock()
+
+        assert create_async_provider(AiSettings(), explicit) is explicit
+
+    def test_missing_base_url_raises_configuration_error(self):
+        settings = AiSettings(provider="openai_compatible", api_key="dummy-key", model="m")
+
+        with pytest.raises(ProviderConfigurationError):
+            create_async_provider(settings)
+
+    def test_async_client_uses_factory(self, mock_async_sdk):
+        settings = AiSettings(provider="openai", api_key="test-key", model="gpt-4o-mini")
+
+        client = AsyncAiClient(settings=settings)
+
+        assert isinstance(client.provider, AsyncOpenAIProvider)
+
+
+class TestAsyncOpenAICompatibleProvider:
+    """Async compatible provider behaviour."""
+
+    @pytest.fixture
+    def provider(self, mock_async_sdk):
+        return AsyncOpenAICompatibleProvider(base_url="http://localhost:1234/v1/", model="m")
+
+    def test_requires_base_url(self, mock_async_sdk):
+        with pytest.raises(ProviderConfigurationError):
+            AsyncOpenAICompatibleProvider(base_url=None)
+
+    @pytest.mark.asyncio
+    async def test_ask_awaits_sdk_with_filtered_params(self, provider):
+        result = await provider.ask("Hello", model="m", temperature=0.1, max_tokens=5)
+
+        assert result == CANNED_CONTENT
+        provider.client.chat.completions.create.assert_awaited_once_with(
+            model="m",
+            messages=[{"role": "user", "content": "Hello"}],
+            temperature=0.1,
+            max_tokens=5,
+        )
+
+    @pytest.mark.asyncio
+    async def test_ask_json_parses_content(self, provider):
+        provider.client.chat.completions.create.return_value = _chat_completion('{"a": 1}')
+
+        result = await provider.ask("Hello", return_format="json")
+
+        assert result == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_files_api_is_unsupported(self, provider, tmp_path):
+        with pytest.raises(ProviderCapabilityError):
+            await provider.upload_file(tmp_path / "x.txt")
+        with pytest.raises(ProviderCapabilityError):
+            await provider.download_file("file-1")
+        with pytest.raises(ProviderCapabilityError):
+            await provider.generate_image("cat")
+
+
+class TestNativeAsyncAskMany:
+    """AsyncAiClient.ask_many on the native provider runs on the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_high_concurrency_without_worker_threads(self):
+        completions = ConcurrentCompletions(delay=0.05)
+        sdk_client = MagicMock()
+        sdk_client.chat.completions = completions
+        settings = AiSettings(api_key="test-key", model="gpt-4o-mini")
+        provider = AsyncOpenAIProvider(settings, client=sdk_client)
+        client = AsyncAiClient(settings=settings, provider=provider, show_progress=False)
+        prompts = [f"p{i}" for i in range(500)]
+
+        results = await client.ask_many(prompts, concurrency=500)
+
+        assert [r.response for r in results] == [f"answer to {p}" for p in prompts]
+        assert completions.peak_in_flight == 500
+        assert completions.threads == {threading.get_ident()}
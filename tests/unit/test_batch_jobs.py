@@ -0,0 +1,196 @@
+"""Tests for Batch API job mode (AiClient.submit_batch / BatchJob)."""
+
+import itertools
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from ai_utilities import AiClient, AiSettings
+from ai_utilities.batch import RETURN_FORMAT_METADATA_KEY
+from ai_utilities.providers.openai_provider import OpenAIProvider
+from ai_utilities.providers.provider_exceptions import ProviderCapabilityError
+from tests.fake_provider import FakeProvider
+
+
+class FakeBatchAPI:
+    """In-process stand-in for the OpenAI Files and Batches endpoints.
+
+    Jobs move validating -> in_progress -> completed on successive retrieve
+    calls. Prompts containing "fail" produce a per-request error line.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.stored = {}
+        self.jobs = {}
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve_batch, cancel=self._cancel_batch
+        )
+
+    def _create_file(self, *, file, purpose):
+        filename, handle, _mime = file
+        file_id = f"file-{next(self._ids)}"
+        data = handle.read()
+        self.stored[file_id] = data
+        return SimpleNamespace(
+            id=file_id, filename=filename, bytes=len(data), purpose=purpose, created_at=1700000000
+        )
+
+    def _file_content(self, file_id):
+        return SimpleNamespace(content=self.stored[file_id])
+
+    def _create_batch(self, *, input_file_id, endpoint, completion_window, metadata):
+        job = SimpleNamespace(
+            id=f"batch-{next(self._ids)}",
+            status="validating",
+            input_file_id=input_file_id,
+            output_file_id=None,
+            error_file_id=None,
+            metadata=metadata,
+            request_counts=None,
+            endpoint=endpoint,
+        )
+        self.jobs[job.id] = job
+        return job
+
+    def _retrieve_batch(self, batch_id):
+        job = self.jobs[batch_id]
+        if job.status == "validating":
+            job.status = "in_progress"
+        elif job.status == "in_progress":
+            self._complete(job)
+        return job
+
+    def _cancel_batch(self, batch_id):
+        job = self.jobs[batch_id]
+        job.status = "cancelled"
+        return job
+
+    def _complete(self, job):
+        outputs, errors = [], []
+        lines = [json.loads(line) for line in self.stored[job.input_file_id].decode().splitlines()]
+        for line in reversed(lines):  # output order is not guaranteed
+            prompt = line["body"]["messages"][0]["content"]
+            if "fail" in prompt:
+                errors.append({
+                    "custom_id": line["custom_id"],
+                    "response": {"status_code": 400, "body": {"error": {"message": "bad request"}}},
+                    "error": None,
+                })
+                continue
+            content = json.dumps({"echo": prompt}) if "response_format" in line["body"] else f"re: {prompt}"
+            outputs.append({
+                "custom_id": line["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "model": line["body"]["model"],
+                        "choices": [{"message": {"role": "assistant", "content": content}}],
+                        "usage": {"total_tokens": 7},
+                    },
+                },
+                "error": None,
+            })
+        job.output_file_id = self._store_jsonl(outputs)
+        job.error_file_id = self._store_jsonl(errors) if errors else None
+        job.request_counts = SimpleNamespace(
+            total=len(lines), completed=len(outputs), failed=len(errors)
+        )
+        job.status = "completed"
+
+    def _store_jsonl(self, rows):
+        file_id = f"file-{next(self._ids)}"
+        self.stored[file_id] = "".join(json.dumps(row) + "\n" for row in rows).encode()
+        return file_id
+
+
+@pytest.fixture
+def batch_api():
+    return FakeBatchAPI()
+
+
+@pytest.fixture
+def client(batch_api):
+    settings = AiSettings(api_key="test-key", model="gpt-4o-mini", temperature=0.2)
+    provider = OpenAIProvider(settings, client=batch_api)
+    return AiClient(settings, provider=provider, show_progress=False)
+
+
+class TestSubmitBatch:
+    """End-to-end batch flow against the stand-in."""
+
+    def test_uploads_jsonl_and_creates_job(self, client, batch_api):
+        job = client.submit_batch(["a", "b"], max_tokens=50)
+
+        created = batch_api.jobs[job.job_id]
+        assert created.endpoint == "/v1/chat/completions"
+        lines = [json.loads(l) for l in batch_api.stored[created.input_file_id].decode().splitlines()]
+        assert [l["custom_id"] for l in lines] == ["request-0", "request-1"]
+        assert lines[0]["body"] == {
+            "model": "gpt-4o-mini",
+            "temperature": 0.2,
+            "max_tokens": 50,
+            "messages": [{"role": "user", "content": "a"}],
+        }
+        assert job.status == "validating"
+        assert created.metadata[RETURN_FORMAT_METADATA_KEY] == "text"
+
+    def test_wait_and_results_map_back_in_order(self, client):
+        prompts = ["first", "please fail", "third"]
+
+        results = client.submit_batch(prompts).wait(poll_interval_s=0).results()
+
+        assert [r.prompt for r in results] == prompts
+        assert [r.response for r in results] == ["re: first", None, "re: third"]
+        assert results[1].error == "bad request"
+        assert results[0].tokens_used == 7
+        assert results[0].model == "gpt-4o-mini"
+
+    def test_json_format_parses_responses(self, client):
+        results = client.submit_batch(["x"], return_format="json").wait(poll_interval_s=0).results()
+
+        assert results[0].response == {"echo": "x"}
+
+    def test_resume_from_saved_job_id(self, client, batch_api):
+        job_id = client.submit_batch(["one", "two"], return_format="json").job_id
+
+        resumed = client.resume_batch(job_id)
+        results = resumed.wait(poll_interval_s=0).results()
+
+        # Prompts and return format are recovered from the job itself
+        assert [r.prompt for r in results] == ["one", "two"]
+        assert [r.response for r in results] == [{"echo": "one"}, {"echo": "two"}]
+
+    def test_results_before_completion_raise(self, client):
+        job = client.submit_batch(["a"])
+
+        with pytest.raises(ValueError, match="has not finished"):
+            job.results()
+
+    def test_wait_timeout(self, client):
+        job = client.submit_batch(["a"])
+
+        with pytest.raises(TimeoutError):
+            job.wait(poll_interval_s=10, timeout_s=0)
+
+    def test_cancelled_job_reports_missing_results(self, client):
+        job = client.submit_batch(["a", "b"])
+        job.cancel()
+
+        results = job.results()
+
+        assert all(r.response is None for r in results)
+        assert all("cancelled" in r.error for r in results)
+
+    def test_empty_prompts_rejected(self, client):
+        with pytest.raises(ValueError):
+            client.submit_batch([])
+
+
+def test_providers_without_batch_support_raise_capability_error():
+    client = AiClient(AiSettings(api_key="k", model="m"), provider=FakeProvider(), show_progress=False)
+
+    with pytest.raises(ProviderCapabilityError):
+        client.provider.create_batch("file-1")
@@ -153,10 +153,9 @@ class TestCacheBehavior:
         assert provider.call_count == 3
         assert len(results1) == 3
 
-        # Second call currently doesn't use cache (ask_many not cached yet)
-        # This documents current behavior - caching not implemented for ask_many
+        # Second call is served per item from the cache
         results2 = client.ask_many(prompts)
-        assert provider.call_count == 6  # Will call provider again
+        assert provider.call_count == 3  # No new provider calls
         assert len(results2) == 3
 
         # Results should be identical in content
@@ -8,7 +8,7 @@ from unittest.mock import Mock, patch
 
 from ai_utilities import AiSettings, AiClient
 from ai_utilities.cache import (
-    CacheBackend, NullCache, MemoryCache, SqliteCache,
+    CacheBackend, NullCache, MemoryCache, SqliteCache, TieredCache,
     stable_hash, normalize_prompt
 )
 from tests.fake_provider import FakeProvider
@@ -128,6 +128,75 @@ class TestCacheBackends:
         # All results should be valid strings
         assert all(isinstance(r, str) for r in results)
     
+    def test_memory_cache_evicts_least_recently_used_entries(self):
+        """Test MemoryCache max_entries evicts in LRU order."""
+        cache = MemoryCache(max_entries=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        
+        assert cache.get("a") == "a"  # "b" is now least recently used
+        cache.set("d", "d")
+        
+        assert cache.get("b") is None
+        assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+        assert cache.stats().evictions == 1
+    
+    def test_memory_cache_max_bytes(self):
+        """Test MemoryCache max_bytes bounds the approximate size."""
+        cache = MemoryCache(max_bytes=2000)
+        
+        for i in range(20):
+            cache.set(f"key{i}", "x" * 200)
+        
+        stats = cache.stats()
+        assert 0 < stats.bytes <= 2000
+        assert stats.entries < 20
+        assert stats.evictions == 20 - stats.entries
+        assert cache.get("key19") == "x" * 200
+        
+        # A value that could never fit is not admitted and evicts nothing
+        cache.set("huge", {"text": "x" * 5000})
+        assert cache.get("huge") is None
+        assert cache.stats().entries == stats.entries
+    
+    def test_memory_cache_replacing_a_key_updates_bytes(self):
+        """Test MemoryCache byte accounting when values are replaced or removed."""
+        cache = MemoryCache()
+        cache.set("key", "x" * 1000)
+        large = cache.stats().bytes
+        
+        cache.set("key", "x")
+        assert cache.stats().bytes < large - 900
+        
+        cache.clear()
+        assert cache.stats().bytes == 0
+    
+    def test_memory_cache_sweeps_expired_entries_on_writes(self):
+        """Test MemoryCache drops expired entries without reading them."""
+        cache = MemoryCache()
+        for i in range(10):
+            cache.set(f"short{i}", i, ttl_s=1)
+        
+        with patch("ai_utilities.cache.time.time", return_value=time.time() + 2):
+            for i in range(10):
+                cache.set(f"long{i}", i)
+            stats = cache.stats()
+        
+        assert stats.entries == 10
+        assert stats.expirations == 10
+    
+    def test_memory_cache_stats_count_hits_and_misses(self):
+        """Test MemoryCache hit and miss counters."""
+        cache = MemoryCache()
+        cache.set("key", "value")
+        
+        cache.get("key")
+        cache.get("key")
+        cache.get("missing")
+        
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+    
     def test_sqlite_cache_basic_operations(self, tmp_workdir):
         """Test SqliteCache basic operations."""
         db_path = tmp_workdir / "test_cache.db"
@@ -189,6 +258,99 @@ class TestCacheBackends:
         assert cache2.get("persistent_key") == "persistent_value"
 
 
+class TestTieredCache:
+    """Test TieredCache read-through and write-through behavior."""
+    
+    def test_hits_read_through_to_l2_and_stay_in_l1(self, tmp_workdir):
+        """Test an L2 hit is copied into L1 and then served from memory."""
+        l2 = SqliteCache(db_path=tmp_workdir / "tiered.db", namespace="test")
+        l2.set("key", {"answer": 42})
+        cache = TieredCache(l2)
+        
+        assert cache.get("key") == {"answer": 42}
+        l2.clear()
+        assert cache.get("key") == {"answer": 42}
+        assert cache.l1.stats().hits == 1
+    
+    def test_writes_reach_both_tiers(self, tmp_workdir):
+        """Test set() writes through, so a new process sees the entry in L2."""
+        db_path = tmp_workdir / "tiered.db"
+        cache = TieredCache(SqliteCache(db_path=db_path, namespace="test"))
+        
+        cache.set("key", "value")
+        
+        assert cache.l1.get("key") == "value"
+        restarted = TieredCache(SqliteCache(db_path=db_path, namespace="test"))
+        assert restarted.get("key") == "value"
+    
+    def test_each_tier_has_its_own_ttl(self):
+        """Test L1 keeps entries for the shorter of the entry TTL and l1_ttl_s."""
+        l2 = MemoryCache()
+        cache = TieredCache(l2, l1_ttl_s=10)
+        cache.set("short", "a", ttl_s=5)
+        cache.set("long", "b", ttl_s=100)
+        cache.set("forever", "c")
+        now = time.time()
+        
+        with patch("ai_utilities.cache.time.time", return_value=now + 20):
+            assert cache.l1.get("short") is None
+            assert cache.l1.get("long") is None
+            assert cache.l1.get("forever") is None
+            assert l2.get("long") == "b"
+            assert l2.get("forever") == "c"
+            # Read through again: the copy in L1 is bounded by l1_ttl_s
+            assert cache.get("long") == "b"
+        with patch("ai_utilities.cache.time.time", return_value=now + 35):
+            assert cache.l1.get("long") is None
+    
+    def test_l1_copy_never_outlives_the_l2_entry(self, tmp_workdir):
+        """Test an entry read through from L2 leaves L1 when it expires in L2."""
+        l2 = SqliteCache(db_path=tmp_workdir / "tiered.db", namespace="test")
+        l2.set("key", "value", ttl_s=30)
+        cache = TieredCache(l2)
+        now = time.time()
+
+        assert cache.get("key") == "value"
+        with patch("ai_utilities.cache.time.time", return_value=now + 40):
+            assert cache.l1.get("key") is None
+            assert cache.get("key") is None
+
+    def test_l1_hits_keep_hot_keys_in_l2(self, tmp_workdir):
+        """Test hits served from L1 count toward L2's LRU eviction."""
+        l2 = SqliteCache(db_path=tmp_workdir / "tiered.db", namespace="test", max_entries=2)
+        cache = TieredCache(l2)
+        cache.set("hot", "a")
+        cache.set("cold", "b")
+
+        assert cache.get("hot") == "a"
+        cache.set("new", "c")
+
+        assert l2.get("hot") == "a"
+        assert l2.get("cold") is None
+
+    def test_l1_is_bounded(self):
+        """Test the default L1 evicts instead of mirroring all of L2."""
+        cache = TieredCache(MemoryCache(), l1_max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        
+        assert cache.l1.stats().entries == 2
+        assert cache.get("a") == "a"
+    
+    def test_clear_and_close(self, tmp_workdir):
+        """Test clear() empties both tiers and close() closes L2."""
+        l2 = SqliteCache(db_path=tmp_workdir / "tiered.db", namespace="test")
+        cache = TieredCache(l2)
+        cache.set("key", "value")
+        
+        cache.clear()
+        assert cache.l1.get("key") is None
+        assert l2.get("key") is None
+        
+        cache.close()
+        assert l2._writer is None
+
+
 class TestCacheUtilities:
     """Test cache utility functions."""
     
@@ -266,6 +428,8 @@ class TestCacheConfiguration:
         assert settings.cache_backend == "null"
         assert settings.cache_ttl_s is None
         assert settings.cache_max_temperature == 0.7
+        assert settings.cache_memory_max_entries is None
+        assert settings.cache_memory_max_bytes is None
         assert settings.cache_sqlite_path is None
         assert settings.cache_sqlite_table == "ai_cache"
         assert settings.cache_sqlite_wal is True
@@ -338,6 +502,40 @@ class TestCacheIntegration:
         assert isinstance(client.cache, MemoryCache)
         assert client.cache._default_ttl_s == 3600
     
+    def test_client_memory_cache_limits(self, isolated_env):
+        """Test cache_memory_* settings bound the memory cache."""
+        settings = AiSettings(
+            api_key="test-key",
+            cache_enabled=True,
+            cache_backend="memory",
+            cache_memory_max_entries=100,
+            cache_memory_max_bytes=4096,
+            _env_file=None,
+        )
+        client = AiClient(settings=settings, provider=FakeProvider())
+        
+        assert (client.cache.max_entries, client.cache.max_bytes) == (100, 4096)
+    
+    def test_client_tiered_cache(self, isolated_env, tmp_workdir):
+        """Test cache_backend="tiered" puts a memory tier in front of SQLite."""
+        settings = AiSettings(
+            api_key="test-key",
+            cache_enabled=True,
+            cache_backend="tiered",
+            cache_sqlite_path=tmp_workdir / "tiered.db",
+            cache_ttl_s=3600,
+            cache_memory_ttl_s=60,
+            cache_memory_max_entries=50,
+            _env_file=None,
+        )
+        client = AiClient(settings=settings, provider=FakeProvider())
+        
+        assert isinstance(client.cache, TieredCache)
+        assert isinstance(client.cache.l2, SqliteCache)
+        assert client.cache.l2.default_ttl_s == 3600
+        assert client.cache.l1_ttl_s == 60
+        assert client.cache.l1.max_entries == 50
+    
     def test_client_sqlite_cache_isolated_in_pytest(self, fake_settings):
         """Test SQLite cache is disabled in pytest unless explicit path."""
         fake_settings.cache_enabled = True
@@ -0,0 +1,115 @@
+"""Tests for thread-pool concurrency in AiClient.ask_many."""
+
+import time
+
+from ai_utilities import AiClient, AiSettings
+from ai_utilities.cache import MemoryCache
+from tests.fake_provider import RecordingProvider
+
+
+def _client(provider, **settings_kwargs) -> AiClient:
+    settings = AiSettings(api_key="test-key", model="test-model", **settings_kwargs)
+    return AiClient(settings, provider=provider, show_progress=False)
+
+
+class TestAskManyConcurrency:
+    """Bounded worker pool behaviour of ask_many."""
+
+    def test_runs_up_to_concurrency_calls_at_once(self):
+        """Provider calls overlap but never exceed the concurrency limit."""
+        provider = RecordingProvider(delay=0.05)
+        client = _client(provider)
+
+        results = client.ask_many([f"p{i}" for i in range(12)], concurrency=4)
+
+        assert len(results) == 12
+        assert provider.peak == 4
+
+    def test_concurrent_batch_is_faster_than_sequential(self):
+        """Wall time scales with batches of `concurrency`, not with prompt count."""
+        provider = RecordingProvider(delay=0.05)
+        client = _client(provider)
+
+        start = time.time()
+        client.ask_many([f"p{i}" for i in range(8)], concurrency=8)
+        elapsed = time.time() - start
+
+        assert elapsed < 0.05 * 8 / 2
+
+    def test_results_keep_input_order(self):
+        """Results are returned in prompt order regardless of completion order."""
+        provider = RecordingProvider(delay=0.01)
+        client = _client(provider)
+        prompts = [f"p{i}" for i in range(20)]
+
+        results = client.ask_many(prompts, concurrency=5)
+
+        assert [r.prompt for r in results] == prompts
+        assert [r.response for r in results] == [f"answer to {p}" for p in prompts]
+
+    def test_concurrency_is_capped_by_prompt_count(self):
+        """A large concurrency value with few prompts still works."""
+        provider = RecordingProvider(delay=0.0)
+        client = _client(provider)
+
+        results = client.ask_many(["a", "b"], concurrency=100)
+
+        assert [r.response for r in results] == ["answer to a", "answer to b"]
+
+    def test_fail_fast_cancels_queued_work(self):
+        """After a failure no further prompts are dispatched."""
+        provider = RecordingProvider(delay=0.02, fail_on=["p0"])
+        client = _client(provider)
+        prompts = [f"p{i}" for i in range(10)]
+
+        results = client.ask_many(prompts, concurrency=2, fail_fast=True)
+
+        assert len(results) == 10
+        assert results[0].error == "failed: p0"
+        # Only the initial window (plus at most one refill) was ever started
+        assert len(provider.prompts) <= 3
+        cancelled = [r for r in results if r.error == "Cancelled due to fail_fast mode"]
+        assert len(cancelled) == 10 - len(provider.prompts)
+        assert all(r.prompt not in provider.prompts for r in cancelled)
+
+    def test_errors_without_fail_fast_do_not_stop_batch(self):
+        """Without fail_fast every prompt is attempted."""
+        provider = RecordingProvider(delay=0.0, fail_on=["p2"])
+        client = _client(provider)
+        prompts = [f"p{i}" for i in range(6)]
+
+        results = client.ask_many(prompts, concurrency=3)
+
+        assert sorted(provider.prompts) == sorted(prompts)
+        assert results[2].error == "failed: p2"
+        assert all(r.error is None for i, r in enumerate(results) if i != 2)
+
+    def test_cache_is_used_per_item(self):
+        """Each prompt is cached individually and served from cache on rerun."""
+        provider = RecordingProvider(delay=0.0)
+        client = _client(provider, cache_enabled=True, temperature=0.0)
+        client.cache = MemoryCache()
+        prompts = [f"p{i}" for i in range(5)]
+
+        client.ask_many(prompts, concurrency=3)
+        assert len(provider.prompts) == 5
+
+        results = client.ask_many(prompts, concurrency=3)
+        assert len(provider.prompts) == 5
+        assert [r.response for r in results] == [f"answer to {p}" for p in prompts]
+
+    def test_usage_is_tracked_per_item(self, tmp_path):
+        """Every successful prompt is recorded with the usage tracker."""
+        provider = RecordingProvider(delay=0.0)
+        settings = AiSettings(api_key="test-key", model="test-model")
+        client = AiClient(
+            settings,
+            provider=provider,
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+        )
+
+        client.ask_many([f"p{i}" for i in range(6)], concurrency=3)
+
+        assert client.get_usage_stats().total_requests == 6
@@ -0,0 +1,283 @@
+"""Tests for hedged requests."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai_utilities import AiClient, AsyncAiClient
+from ai_utilities.hedging import RequestHedger
+from ai_utilities.scheduling import RequestScheduler
+from tests.fake_provider import (
+    AsyncRecordingProvider,
+    RecordingProvider,
+    offline_settings,
+)
+
+
+class TestRequestHedger:
+    """Delay selection, budget and racing."""
+
+    def test_learned_delay_waits_for_min_samples(self):
+        hedger = RequestHedger(min_samples=5)
+
+        for i in range(4):
+            hedger.do(lambda: i, lambda: None)
+        assert hedger.current_delay() is None
+
+        hedger.do(lambda: 0, lambda: None)
+        assert hedger.current_delay() is not None
+
+    def test_learned_delay_tracks_percentile(self):
+        hedger = RequestHedger(percentile=50.0, min_samples=3)
+        hedger._latencies.extend([0.1, 0.2, 0.3, 0.4, 5.0])
+
+        assert hedger.current_delay() == 0.3
+
+    def test_budget_caps_fraction_of_hedged_requests(self):
+        hedger = RequestHedger(delay_s=0.0, max_hedge_fraction=0.25)
+
+        for _ in range(20):
+            hedger.do(lambda: time.sleep(0.01) or "primary", lambda: "hedge")
+
+        assert hedger.requests == 20
+        assert hedger.hedges == 5
+
+    def test_budget_applies_to_recent_requests_only(self):
+        hedger = RequestHedger(delay_s=1.0, max_hedge_fraction=0.5, min_samples=1, window=10)
+        for _ in range(100):
+            hedger.do(lambda: "primary", lambda: "hedge")
+
+        # A quiet stretch does not bank hedges for a later outage
+        hedger.delay_s = 0.0
+        for _ in range(10):
+            hedger.do(lambda: time.sleep(0.01) or "primary", lambda: "hedge")
+
+        assert hedger.hedges == 5
+
+    def test_primaries_do_not_queue_behind_worker_pool(self):
+        hedger = RequestHedger(delay_s=0.2, max_hedge_fraction=1.0, max_workers=1)
+        threads = [
+            threading.Thread(target=hedger.do, args=(lambda: time.sleep(0.05), lambda: None))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2.0)
+
+        assert hedger.hedges == 0
+        assert max(hedger._latencies) < 0.2
+
+    def test_queued_hedge_is_dropped_when_primary_answers(self):
+        hedger = RequestHedger(delay_s=0.01, max_hedge_fraction=1.0, max_workers=1)
+        hedged = []
+
+        def slow_hedge(label):
+            def hedge():
+                time.sleep(0.3)
+                hedged.append(label)
+            return hedge
+
+        # The first request's hedge occupies the only worker
+        busy = threading.Thread(
+            target=hedger.do, args=(lambda: time.sleep(0.3), slow_hedge("first"))
+        )
+        busy.start()
+        time.sleep(0.05)
+
+        assert hedger.do(lambda: time.sleep(0.1) or "primary", slow_hedge("second")) == "primary"
+        busy.join(2.0)
+        time.sleep(0.1)
+
+        assert hedger.hedges == 2
+        assert hedged == ["first"]
+
+    def test_closed_hedger_stops_hedging(self):
+        hedger = RequestHedger(delay_s=0.0, max_hedge_fraction=1.0)
+        hedger.do(lambda: time.sleep(0.01) or "primary", lambda: "hedge")
+        assert hedger.hedges == 1
+
+        hedger.close()
+
+        assert hedger.do(lambda: time.sleep(0.01) or "primary", lambda: "hedge") == "primary"
+        assert hedger.hedges == 1
+        assert hedger._executor is None
+
+    def test_fast_primary_is_not_hedged(self):
+        hedger = RequestHedger(delay_s=1.0, max_hedge_fraction=1.0)
+        hedge_calls = []
+
+        assert hedger.do(lambda: "primary", lambda: hedge_calls.append(1)) == "primary"
+        assert hedge_calls == []
+        assert hedger.hedges == 0
+
+    def test_failed_hedge_falls_back_to_primary(self):
+        hedger = RequestHedger(delay_s=0.01, max_hedge_fraction=1.0)
+
+        def failing_hedge():
+            raise RuntimeError("hedge failed")
+
+        assert hedger.do(lambda: time.sleep(0.05) or "primary", failing_hedge) == "primary"
+
+    def test_primary_error_raised_when_all_attempts_fail(self):
+        hedger = RequestHedger(delay_s=0.01, max_hedge_fraction=1.0)
+
+        def failing(message):
+            def call():
+                time.sleep(0.03)
+                raise RuntimeError(message)
+            return call
+
+        with pytest.raises(RuntimeError, match="primary failed"):
+            hedger.do(failing("primary failed"), failing("hedge failed"))
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"delay_s": -1}, {"percentile": 0}, {"max_hedge_fraction": 1.5}, {"min_samples": 10, "window": 5}],
+    )
+    def test_invalid_configuration_is_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            RequestHedger(**kwargs)
+
+
+class TestAiClientHedging:
+    """Hedging in AiClient.ask."""
+
+    def test_stalled_request_is_answered_by_hedge(self):
+        provider = RecordingProvider([1.0, 0.0], answer="primary: {prompt}")
+        hedger = RequestHedger(delay_s=0.05, max_hedge_fraction=1.0)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False, hedger=hedger)
+
+        start = time.monotonic()
+        answer = client.ask("hello")
+
+        assert answer == "primary: hello"
+        assert time.monotonic() - start < 0.5
+        assert hedger.hedges == 1
+
+    def test_hedge_goes_to_secondary_provider_with_its_model(self):
+        primary = RecordingProvider([1.0], answer="primary: {prompt}")
+        secondary = RecordingProvider([0.0], answer="secondary: {prompt}")
+        hedger = RequestHedger(delay_s=0.05, max_hedge_fraction=1.0)
+        client = AiClient(
+            offline_settings(),
+            provider=primary,
+            show_progress=False,
+            hedger=hedger,
+            hedge_settings=offline_settings(model="backup-model"),
+            hedge_provider=secondary,
+        )
+
+        assert client.ask("hello") == "secondary: hello"
+        assert [params.get("model") for params in secondary.params] == ["backup-model"]
+
+    def test_hedge_is_charged_to_the_rate_limiter(self, monkeypatch):
+        provider = RecordingProvider([0.3, 0.0], answer="primary: {prompt}")
+        hedger = RequestHedger(delay_s=0.05, max_hedge_fraction=1.0)
+        client = AiClient(
+            offline_settings(rate_limit_enabled=True), provider=provider, show_progress=False, hedger=hedger
+        )
+        limiter = client._rate_limiter_for("test-model")
+        acquired = []
+        acquire = limiter.acquire
+        monkeypatch.setattr(
+            limiter, "acquire", lambda *args, **kwargs: acquired.append(1) or acquire(*args, **kwargs)
+        )
+
+        assert client.ask("hello") == "primary: hello"
+        assert len(acquired) == 2
+
+    def test_hedge_waits_for_a_scheduler_slot(self):
+        provider = RecordingProvider([0.3, 0.0], answer="primary: {prompt}")
+        hedger = RequestHedger(delay_s=0.05, max_hedge_fraction=1.0)
+        scheduler = RequestScheduler(1)
+        client = AiClient(
+            offline_settings(), provider=provider, show_progress=False, hedger=hedger, scheduler=scheduler
+        )
+
+        assert client.ask("hello") == "primary: hello"
+        time.sleep(0.05)
+
+        # The hedge got the slot only after the primary answered, and gave up
+        assert hedger.hedges == 1
+        assert len(provider.prompts) == 1
+        assert scheduler.in_flight == 0
+
+    def test_hedge_takes_the_slot_of_a_failed_primary(self):
+        secondary = RecordingProvider([0.0], answer="secondary: {prompt}")
+        hedger = RequestHedger(delay_s=0.05, max_hedge_fraction=1.0)
+        client = AiClient(
+            offline_settings(),
+            provider=RecordingProvider(0.1, fail_on=["hello"]),
+            show_progress=False,
+            hedger=hedger,
+            hedge_provider=secondary,
+            scheduler=RequestScheduler(1),
+        )
+
+        assert client.ask("hello") == "secondary: hello"
+
+    def test_without_hedger_requests_are_sent_once(self):
+        provider = RecordingProvider([0.0], answer="primary: {prompt}")
+        client = AiClient(offline_settings(), provider=provider, show_progress=False)
+
+        assert client.ask("hello") == "primary: hello"
+        assert len(provider.prompts) == 1
+
+
+class TestAsyncAiClientHedging:
+    """Hedging in AsyncAiClient.ask."""
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_cancelled_when_hedge_wins(self):
+        primary = AsyncRecordingProvider([5.0], answer="primary: {prompt}")
+        secondary = AsyncRecordingProvider([0.0], answer="secondary: {prompt}")
+        hedger = RequestHedger(delay_s=0.02, max_hedge_fraction=1.0)
+        client = AsyncAiClient(
+            offline_settings(), provider=primary, show_progress=False, hedger=hedger, hedge_provider=secondary
+        )
+
+        answer = await asyncio.wait_for(client.ask("hello"), 1.0)
+        await asyncio.sleep(0)
+
+        assert answer == "secondary: hello"
+        assert primary.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_is_charged_to_the_rate_limiter(self, monkeypatch):
+        primary = AsyncRecordingProvider([5.0], answer="primary: {prompt}")
+        secondary = AsyncRecordingProvider([0.0], answer="secondary: {prompt}")
+        hedger = RequestHedger(delay_s=0.02, max_hedge_fraction=1.0)
+        client = AsyncAiClient(
+            offline_settings(rate_limit_enabled=True),
+            provider=primary,
+            show_progress=False,
+            hedger=hedger,
+            hedge_provider=secondary,
+        )
+        limiter = client._rate_limiter_for("test-model")
+        acquired = []
+        acquire_async = limiter.acquire_async
+
+        async def counting_acquire(*args, **kwargs):
+            acquired.append(1)
+            return await acquire_async(*args, **kwargs)
+
+        monkeypatch.setattr(limiter, "acquire_async", counting_acquire)
+
+        assert await asyncio.wait_for(client.ask("hello"), 1.0) == "secondary: hello"
+        assert len(acquired) == 2
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_sends_no_duplicate(self):
+        primary = AsyncRecordingProvider([0.0], answer="primary: {prompt}")
+        secondary = AsyncRecordingProvider([0.0], answer="secondary: {prompt}")
+        hedger = RequestHedger(delay_s=0.5, max_hedge_fraction=1.0)
+        client = AsyncAiClient(
+            offline_settings(), provider=primary, show_progress=False, hedger=hedger, hedge_provider=secondary
+        )
+
+        assert await client.ask("hello") == "primary: hello"
+        assert secondary.prompts == []
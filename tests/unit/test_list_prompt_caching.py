@@ -0,0 +1,83 @@
+"""Tests for per-item caching of list prompts in ask() and ask_many()."""
+
+import pytest
+
+from ai_utilities import AiClient
+from ai_utilities.cache import MemoryCache
+from tests.fake_provider import RecordingProvider, offline_settings
+
+
+def _client(provider):
+    settings = offline_settings(cache_enabled=True, temperature=0.0)
+    return AiClient(settings, provider=provider, show_progress=False, cache=MemoryCache())
+
+
+@pytest.fixture
+def prompts():
+    return [f"prompt {i}" for i in range(100)]
+
+
+def _rerun_with_changes(prompts):
+    return [p if i % 20 else f"{p} (edited)" for i, p in enumerate(prompts)]
+
+
+def test_ask_list_sends_only_misses(prompts):
+    provider = RecordingProvider()
+    client = _client(provider)
+    client.ask(prompts)
+    provider.prompts.clear()
+
+    rerun = _rerun_with_changes(prompts)
+    answers = client.ask(rerun)
+
+    assert answers == [f"answer to {p}" for p in rerun]
+    assert provider.prompts == [p for p in rerun if p.endswith("(edited)")]
+
+
+def test_ask_list_fully_cached_skips_provider(prompts):
+    provider = RecordingProvider()
+    client = _client(provider)
+    client.ask(prompts)
+    provider.prompts.clear()
+
+    client.ask(prompts)
+
+    assert provider.prompts == []
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_ask_many_sends_only_misses(prompts, concurrency):
+    provider = RecordingProvider()
+    client = _client(provider)
+    client.ask_many(prompts, concurrency=concurrency)
+    provider.prompts.clear()
+
+    rerun = _rerun_with_changes(prompts)
+    results = client.ask_many(rerun, concurrency=concurrency)
+
+    assert [r.response for r in results] == [f"answer to {p}" for p in rerun]
+    assert sorted(provider.prompts) == sorted(p for p in rerun if p.endswith("(edited)"))
+
+
+def test_ask_many_shares_cache_with_ask():
+    provider = RecordingProvider()
+    client = _client(provider)
+    client.ask(["a", "b"])
+    provider.prompts.clear()
+
+    results = client.ask_many(["a", "b", "c"])
+
+    assert provider.prompts == ["c"]
+    assert all(r.error is None for r in results)
+
+
+def test_fail_fast_keeps_cached_results():
+    provider = RecordingProvider(fail_on={"bad"})
+    client = _client(provider)
+    client.ask_many(["cached"])
+
+    results = client.ask_many(["bad", "new", "cached"], fail_fast=True)
+
+    assert results[0].error is not None
+    assert results[1].error == "Cancelled due to fail_fast mode"
+    assert results[2].response == "answer to cached"
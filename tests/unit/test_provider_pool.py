@@ -0,0 +1,257 @@
+"""Tests for ProviderPool load balancing and failover."""
+
+import threading
+import time
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_utilities import AiClient, AiSettings, AsyncAiClient
+from ai_utilities.providers import (
+    AsyncProviderPool,
+    ProviderConfigurationError,
+    ProviderPool,
+    create_async_provider,
+    create_provider,
+)
+from ai_utilities.providers.provider_pool import is_failover_error, parse_pool_spec
+from tests.fake_provider import FakeProvider
+
+
+class ServerError(Exception):
+    """Stand-in for an SDK error carrying an HTTP status code."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class NamedProvider(FakeProvider):
+    """Provider that answers with its name, or raises a configured error."""
+
+    def __init__(self, name, error=None, delay=0.0):
+        super().__init__()
+        self.name = name
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+        self.models = []
+
+    def ask(self, prompt, *, return_format="text", **kwargs):
+        self.calls += 1
+        self.models.append(kwargs.get("model"))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"{self.name}: {prompt}"
+
+
+class AsyncNamedProvider:
+    """Async provider that answers with its name, or raises a configured error."""
+
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.calls = 0
+
+    async def ask(self, prompt, *, return_format="text", **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return f"{self.name}: {prompt}"
+
+
+def _routed(pool, count):
+    return Counter(pool.ask("q").split(":")[0] for _ in range(count))
+
+
+class TestRouting:
+    """Strategy selection."""
+
+    def test_weighted_round_robin_follows_weights(self):
+        pool = ProviderPool([NamedProvider("a"), NamedProvider("b")], [3, 1])
+
+        assert _routed(pool, 8) == {"a": 6, "b": 2}
+
+    def test_least_outstanding_avoids_busy_provider(self):
+        slow = NamedProvider("slow", delay=0.2)
+        fast = NamedProvider("fast")
+        pool = ProviderPool([slow, fast], strategy="least_outstanding")
+
+        thread = threading.Thread(target=pool.ask, args=("busy",))
+        thread.start()
+        time.sleep(0.05)
+        try:
+            assert pool.ask("q") == "fast: q"
+        finally:
+            thread.join()
+
+    def test_latency_prefers_fastest_provider(self):
+        slow = NamedProvider("slow", delay=0.05)
+        fast = NamedProvider("fast")
+        pool = ProviderPool([slow, fast], strategy="latency")
+
+        # Both are tried once, then the faster one wins
+        pool.ask("q")
+        pool.ask("q")
+
+        assert _routed(pool, 4) == {"fast": 4}
+
+    def test_ask_many_routes_each_prompt(self):
+        pool = ProviderPool([NamedProvider("a"), NamedProvider("b")])
+
+        assert pool.ask_many(["1", "2"]) == ["a: 1", "b: 2"]
+
+
+class TestFailover:
+    """Failover and health tracking."""
+
+    @pytest.mark.parametrize("error", [ConnectionError("refused"), ServerError(503)])
+    def test_fails_over_and_marks_provider_unhealthy(self, error):
+        broken = NamedProvider("broken", error=error)
+        pool = ProviderPool([broken, NamedProvider("ok")], [10, 1], names=["broken", "ok"])
+
+        assert pool.ask("q") == "ok: q"
+        assert pool.ask("q") == "ok: q"
+        assert broken.calls == 1
+
+        health = {h["name"]: h for h in pool.health()}
+        assert health["broken"]["healthy"] is False
+        assert health["broken"]["failures"] == 1
+        assert health["ok"]["healthy"] is True
+
+    def test_client_errors_are_not_retried(self):
+        pool = ProviderPool([NamedProvider("a", error=ServerError(400)), NamedProvider("b")], [10, 1])
+
+        with pytest.raises(ServerError):
+            pool.ask("q")
+
+    def test_provider_recovers_after_cooldown(self):
+        flaky = NamedProvider("flaky", error=ConnectionError("refused"))
+        pool = ProviderPool([flaky, NamedProvider("ok")], [10, 1], cooldown_s=0.05)
+
+        pool.ask("q")
+        flaky.error = None
+        time.sleep(0.06)
+
+        assert pool.ask("q") == "flaky: q"
+        assert pool.health()[0]["healthy"] is True
+
+    def test_all_providers_down_raises_last_error(self):
+        pool = ProviderPool([
+            NamedProvider("a", error=ConnectionError("a down")),
+            NamedProvider("b", error=ConnectionError("b down")),
+        ])
+
+        with pytest.raises(ConnectionError, match="b down"):
+            pool.ask("q")
+
+    def test_unhealthy_providers_are_last_resort(self):
+        a = NamedProvider("a", error=ConnectionError("down"))
+        pool = ProviderPool([a], cooldown_s=60)
+        with pytest.raises(ConnectionError):
+            pool.ask("q")
+
+        a.error = None
+        assert pool.ask("q") == "a: q"
+
+    def test_is_failover_error(self):
+        assert is_failover_error(ConnectionError())
+        assert is_failover_error(ServerError(502))
+        assert is_failover_error(type("APIConnectionError", (Exception,), {})())
+        assert not is_failover_error(ServerError(429))
+        assert not is_failover_error(ValueError())
+
+
+class TestConfiguration:
+    """Settings-driven construction."""
+
+    def test_parse_pool_spec(self):
+        assert parse_pool_spec("openai:3, groq:1,ollama") == [("openai", 3.0), ("groq", 1.0), ("ollama", 1.0)]
+
+    @pytest.mark.parametrize("spec", ["openai:x", "openai:0", "openai,,groq"])
+    def test_invalid_pool_spec(self, spec):
+        with pytest.raises(ProviderConfigurationError):
+            parse_pool_spec(spec)
+
+    def test_create_provider_builds_pool_from_settings(self):
+        settings = AiSettings(
+            provider_pool="ollama:2,lmstudio",
+            provider_pool_strategy="latency",
+            ollama_base_url="http://localhost:11434/v1",
+            lmstudio_base_url="http://localhost:1234/v1",
+            model="shared-model",
+            lmstudio_model="local-model",
+        )
+
+        pool = create_provider(settings)
+
+        assert isinstance(pool, ProviderPool)
+        assert pool.strategy == "latency"
+        assert [h["name"] for h in pool.health()] == ["ollama", "lmstudio"]
+        assert pool.providers[0].base_url == "http://localhost:11434/v1"
+        assert pool.providers[1].base_url == "http://localhost:1234/v1"
+
+    def test_vendor_model_is_pinned_on_requests(self):
+        a, b = NamedProvider("a"), NamedProvider("b")
+        pool = ProviderPool([a, b], names=["a", "b"], models=[None, "b-model"])
+
+        pool.ask("1", model="shared")
+        pool.ask("2", model="shared")
+
+        assert a.models == ["shared"]
+        assert b.models == ["b-model"]
+
+    def test_ai_client_uses_pool(self):
+        pool = ProviderPool([NamedProvider("a"), NamedProvider("b")])
+        settings = AiSettings(api_key="test-key", model="test-model", provider_pool="a,b")
+        client = AiClient(settings, provider=pool, show_progress=False)
+
+        assert [client.ask("q") for _ in range(2)] == ["a: q", "b: q"]
+        assert "provider_pool" not in client._ask_request_params({})
+
+    def test_empty_pool_is_rejected(self):
+        with pytest.raises(ProviderConfigurationError):
+            ProviderPool([])
+
+
+class TestAsyncProviderPool:
+    """The async pool routes, fails over and is built for async clients."""
+
+    @pytest.mark.asyncio
+    async def test_weighted_routing_and_failover(self):
+        down = AsyncNamedProvider("down", error=ConnectionError("refused"))
+        pool = AsyncProviderPool([AsyncNamedProvider("a"), down, AsyncNamedProvider("b")], [2, 1, 1])
+
+        answers = [await pool.ask("q") for _ in range(4)]
+
+        assert Counter(answer.split(":")[0] for answer in answers) == {"a": 3, "b": 1}
+        assert down.calls == 1
+        assert [h["healthy"] for h in pool.health()] == [True, False, True]
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_to_ask(self):
+        pool = AsyncProviderPool([AsyncNamedProvider("a")])
+
+        assert [delta async for delta in pool.ask_stream("q")] == ["a: q"]
+
+    @pytest.mark.asyncio
+    @patch(
+        "ai_utilities.providers.async_openai_provider._create_async_openai_sdk_client",
+        return_value=MagicMock(),
+    )
+    async def test_async_client_uses_pool_from_settings(self, _mock_create):
+        settings = AiSettings(
+            provider_pool="ollama,lmstudio",
+            ollama_base_url="http://localhost:11434/v1",
+            lmstudio_base_url="http://localhost:1234/v1",
+            model="shared-model",
+        )
+
+        client = AsyncAiClient(settings)
+
+        assert isinstance(client.provider, AsyncProviderPool)
+        assert [h["name"] for h in client.provider.health()] == ["ollama", "lmstudio"]
+        assert client.provider.providers[1].base_url == "http://localhost:1234/v1"
+        assert isinstance(create_async_provider(settings), AsyncProviderPool)
@@ -20,7 +20,8 @@ class TestProvidersInitCompleteIntegration:
         # Verify all expected attributes exist
         expected_attributes = [
             'BaseProvider', 'OpenAIProvider', 'OpenAICompatibleProvider',
-            'create_provider', 'provider_factory', 'openai_compatible_provider',
+            'AsyncOpenAIProvider', 'AsyncOpenAICompatibleProvider',
+            'create_provider', 'create_async_provider', 'ProviderPool', 'AsyncProviderPool', 'provider_factory', 'openai_compatible_provider',
             'ProviderCapabilities', 'ProviderCapabilityError',
             'ProviderConfigurationError', 'FileTransferError', 
             'MissingOptionalDependencyError'
@@ -41,7 +41,12 @@ def test_all_exports():
         "BaseProvider", 
         "OpenAIProvider", 
         "OpenAICompatibleProvider",
+        "AsyncOpenAIProvider",
+        "AsyncOpenAICompatibleProvider",
         "create_provider",
+        "create_async_provider",
+        "ProviderPool",
+        "AsyncProviderPool",
         "provider_factory",
         "openai_compatible_provider",
         "ProviderCapabilities",
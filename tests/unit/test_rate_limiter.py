@@ -432,3 +432,98 @@ class TestRateLimiterEdgeCases:
         assert len(results) == 20
         assert any(results)  # At least some should succeed
         assert not all(results)  # Not all should succeed due to limits
+
+
+class TestRateLimiterPersistence:
+    """Test debounced, atomic persistence of recorded usage."""
+
+    @pytest.fixture
+    def temp_config_dir(self):
+        """Create temporary config directory."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield temp_dir
+
+    def _limiter(self, temp_config_dir, **kwargs):
+        return RateLimiter(
+            module_name="test-model",
+            rpm=1000,
+            tpm=100000,
+            tpd=1000000,
+            config_path=str(Path(temp_config_dir) / "config.json"),
+            **kwargs
+        )
+
+    def _saved_tokens(self, temp_config_dir):
+        with open(Path(temp_config_dir) / "ai_statistics.json") as f:
+            return json.load(f)["tokens_used_today"]
+
+    def _wait_for_saved_tokens(self, temp_config_dir, expected):
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
+            if self._saved_tokens(temp_config_dir) == expected:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_record_usage_does_no_file_io(self, temp_config_dir):
+        """record_usage only updates memory."""
+        limiter = self._limiter(temp_config_dir, flush_interval_s=60)
+
+        with patch('builtins.open', side_effect=AssertionError("I/O on hot path")):
+            for _ in range(50):
+                limiter.record_usage(10)
+
+        assert limiter.tokens_used_today == 500
+        limiter.close()
+
+    def test_flush_persists_usage_across_restarts(self, temp_config_dir):
+        """Flushed usage is loaded by a new instance."""
+        limiter = self._limiter(temp_config_dir, flush_interval_s=60)
+        limiter.record_usage(150)
+        limiter.record_usage(50)
+        assert self._saved_tokens(temp_config_dir) == 0
+
+        limiter.flush()
+
+        assert self._saved_tokens(temp_config_dir) == 200
+        assert self._limiter(temp_config_dir).tokens_used_today == 200
+        limiter.close()
+
+    def test_threshold_triggers_background_flush(self, temp_config_dir):
+        """Reaching flush_threshold flushes without waiting for the interval."""
+        limiter = self._limiter(temp_config_dir, flush_interval_s=60, flush_threshold=3)
+
+        for _ in range(3):
+            limiter.record_usage(10)
+
+        assert self._wait_for_saved_tokens(temp_config_dir, 30)
+        limiter.close()
+
+    def test_interval_triggers_background_flush(self, temp_config_dir):
+        """Pending usage is flushed after flush_interval_s."""
+        limiter = self._limiter(temp_config_dir, flush_interval_s=0.05)
+
+        limiter.record_usage(25)
+
+        assert self._wait_for_saved_tokens(temp_config_dir, 25)
+        limiter.close()
+
+    def test_close_flushes_and_stops_flusher(self, temp_config_dir):
+        """close() writes pending usage and ends the background thread."""
+        limiter = self._limiter(temp_config_dir, flush_interval_s=60)
+        limiter.record_usage(40)
+        flusher = limiter._flusher
+
+        limiter.close()
+
+        assert self._saved_tokens(temp_config_dir) == 40
+        assert not flusher.is_alive()
+
+    def test_save_stats_leaves_no_temp_files(self, temp_config_dir):
+        """Stats are written to a temp file and renamed into place."""
+        limiter = self._limiter(temp_config_dir)
+        limiter.record_usage(10)
+        limiter.close()
+
+        assert sorted(p.name for p in Path(temp_config_dir).iterdir()) == ["ai_statistics.json"]
@@ -0,0 +1,94 @@
+"""Tests for the precomputed request-parameter template on AiClient."""
+
+from unittest.mock import patch
+
+import pytest
+
+from ai_utilities import AiClient, AiSettings
+from ai_utilities.cache import MemoryCache
+from tests.fake_provider import RecordingProvider
+
+
+@pytest.fixture
+def provider():
+    return RecordingProvider()
+
+
+@pytest.fixture
+def settings():
+    return AiSettings(api_key="test-key", model="test-model", temperature=0.2)
+
+
+def test_settings_are_dumped_once_across_requests(settings, provider):
+    client = AiClient(settings, provider=provider, show_progress=False)
+
+    with patch.object(AiSettings, "model_dump", autospec=True, side_effect=AiSettings.model_dump) as dump:
+        for i in range(5):
+            client.ask(f"q{i}")
+
+    assert dump.call_count == 1
+    assert len(provider.params) == 5
+
+
+def test_kwargs_override_template_without_mutating_it(settings, provider):
+    client = AiClient(settings, provider=provider, show_progress=False)
+
+    client.ask("q", temperature=0.9, max_tokens=10)
+    client.ask("q")
+
+    assert provider.params[0]["temperature"] == 0.9
+    assert provider.params[0]["max_tokens"] == 10
+    assert provider.params[1]["temperature"] == 0.2
+    assert "max_tokens" not in provider.params[1]
+
+
+def test_template_is_read_only(settings, provider):
+    client = AiClient(settings, provider=provider, show_progress=False)
+    client.ask("q")
+
+    template = next(iter(client._templates.values()))
+
+    with pytest.raises(TypeError):
+        template["model"] = "other"
+
+
+def test_template_excludes_non_request_settings(settings, provider):
+    client = AiClient(settings, provider=provider, show_progress=False)
+
+    client.ask("q")
+
+    for field in ("api_key", "base_url", "timeout", "cache_enabled", "knowledge_enabled"):
+        assert field not in provider.params[0]
+
+
+def test_field_assignment_refreshes_template(settings, provider):
+    client = AiClient(settings, provider=provider, show_progress=False)
+    client.ask("q")
+
+    client.settings.temperature = 0.5
+    client.ask("q")
+
+    assert provider.params[1]["temperature"] == 0.5
+
+
+def test_replacing_settings_refreshes_template(settings, provider):
+    client = AiClient(settings, provider=provider, show_progress=False)
+    client.ask("q")
+
+    client.settings = AiSettings(api_key="test-key", model="other-model", temperature=0.2)
+    client.ask("q")
+
+    assert provider.params[1]["model"] == "other-model"
+
+
+def test_cached_hit_skips_settings_dump(provider):
+    settings = AiSettings(api_key="test-key", model="test-model", temperature=0.0, cache_enabled=True)
+    client = AiClient(settings, provider=provider, show_progress=False, cache=MemoryCache())
+    first = client.ask("q")
+
+    with patch.object(AiSettings, "model_dump", autospec=True) as dump:
+        second = client.ask("q")
+
+    assert second == first
+    dump.assert_not_called()
+    assert len(provider.params) == 1
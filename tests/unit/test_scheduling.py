@@ -0,0 +1,327 @@
+"""Tests for the priority-aware request scheduler."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai_utilities import AiClient, AsyncAiClient
+from ai_utilities._waiters import SyncWaiter
+from ai_utilities.rate_limiter import ServerQuota
+from ai_utilities.scheduling import (
+    RequestScheduler,
+    get_default_scheduler,
+    set_default_scheduler,
+)
+from tests.fake_provider import (
+    AsyncRecordingProvider,
+    FakeProvider,
+    RecordingProvider,
+    offline_settings,
+)
+
+
+def _queue(scheduler, granted, label, priority, client_id=None, quota=None):
+    """Start a thread that waits for a slot, then records ``label`` and releases it."""
+    queued = scheduler.queued()
+
+    def run():
+        scheduler.acquire(priority, client_id, quota)
+        granted.append(label)
+        scheduler.release(priority)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    while scheduler.queued() == queued:
+        time.sleep(0.001)
+    return thread
+
+
+def _drain(scheduler, threads, priority="interactive"):
+    """Release the held slot and wait for every queued thread to run."""
+    scheduler.release(priority)
+    for thread in threads:
+        thread.join(1.0)
+
+
+class TestRequestScheduler:
+    """Slot accounting and ordering."""
+
+    def test_interactive_requests_go_before_queued_batch(self):
+        scheduler = RequestScheduler(1)
+        scheduler.acquire("batch")
+        granted = []
+
+        threads = [
+            _queue(scheduler, granted, "b1", "batch"),
+            _queue(scheduler, granted, "b2", "batch"),
+            _queue(scheduler, granted, "i1", "interactive"),
+        ]
+        _drain(scheduler, threads, "batch")
+
+        assert granted == ["i1", "b1", "b2"]
+
+    def test_class_limit_keeps_slots_for_higher_classes(self):
+        scheduler = RequestScheduler(2, class_limits={"batch": 1})
+        scheduler.acquire("batch")
+        granted = []
+
+        thread = _queue(scheduler, granted, "b2", "batch")
+        assert scheduler.in_flight == 1
+
+        scheduler.acquire("interactive")
+        assert scheduler.in_flight == 2
+        scheduler.release("interactive")
+
+        _drain(scheduler, [thread], "batch")
+        assert granted == ["b2"]
+
+    def test_clients_are_served_fairly_within_a_class(self):
+        scheduler = RequestScheduler(1)
+        scheduler.acquire()
+        granted = []
+
+        threads = [_queue(scheduler, granted, f"a{i}", "batch", "tenant-a") for i in range(3)]
+        threads += [_queue(scheduler, granted, f"b{i}", "batch", "tenant-b") for i in range(2)]
+        _drain(scheduler, threads)
+
+        assert granted == ["a0", "b0", "a1", "b1", "a2"]
+
+    def test_client_weights_share_slots_proportionally(self):
+        scheduler = RequestScheduler(1, client_weights={"heavy": 2.0})
+        scheduler.acquire()
+        granted = []
+
+        threads = [_queue(scheduler, granted, f"h{i}", "batch", "heavy") for i in range(4)]
+        threads += [_queue(scheduler, granted, f"l{i}", "batch", "light") for i in range(2)]
+        _drain(scheduler, threads)
+
+        assert granted == ["h0", "h1", "l0", "h2", "h3", "l1"]
+
+    def test_in_flight_never_exceeds_cap(self):
+        scheduler = RequestScheduler(3)
+        provider = RecordingProvider(delay=0.01)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False, scheduler=scheduler)
+
+        client.ask_many([f"q{i}" for i in range(12)], concurrency=8)
+
+        assert provider.peak == 3
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_async_waiter_gives_up_its_place(self):
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire_async()
+
+        waiter = asyncio.ensure_future(scheduler.acquire_async("batch"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        scheduler.release()
+        assert scheduler.in_flight == 0
+        assert scheduler.queued() == 0
+
+    @pytest.mark.parametrize("slot_free", [True, False])
+    def test_interrupted_sync_waiter_does_not_leak_its_slot(self, monkeypatch, slot_free):
+        class InterruptedEvent(threading.Event):
+            def wait(self, timeout=None):
+                raise KeyboardInterrupt
+
+        original_init = SyncWaiter.__init__
+
+        def init(waiter):
+            original_init(waiter)
+            waiter.event = InterruptedEvent()
+
+        scheduler = RequestScheduler(1)
+        if not slot_free:
+            scheduler.acquire()
+        monkeypatch.setattr(SyncWaiter, "__init__", init)
+
+        with pytest.raises(KeyboardInterrupt):
+            scheduler.acquire("batch")
+
+        if not slot_free:
+            scheduler.release()
+        assert scheduler.in_flight == 0
+        assert scheduler.queued() == 0
+
+    def test_requests_on_a_used_up_quota_wait_for_its_reset(self):
+        quota = ServerQuota("openai:test-model")
+        quota.observe(remaining_requests=0, reset_requests_s=0.2)
+        scheduler = RequestScheduler(2)
+        granted = []
+
+        thread = _queue(scheduler, granted, "throttled", "interactive", quota=quota)
+        # Requests on other quotas still get the free slots
+        scheduler.acquire("batch")
+        assert (granted, scheduler.in_flight) == ([], 1)
+
+        thread.join(2.0)
+        assert granted == ["throttled"]
+        scheduler.release("batch")
+
+    def test_quota_reset_is_handed_out_by_priority(self):
+        quota = ServerQuota("openai:test-model")
+        quota.observe(remaining_requests=0, reset_requests_s=0.2)
+        scheduler = RequestScheduler(1)
+        granted = []
+
+        threads = [
+            _queue(scheduler, granted, "b1", "batch", quota=quota),
+            _queue(scheduler, granted, "i1", "interactive", quota=quota),
+        ]
+        for thread in threads:
+            thread.join(2.0)
+
+        assert granted == ["i1", "b1"]
+
+    def test_unknown_priority_is_rejected(self):
+        scheduler = RequestScheduler()
+
+        with pytest.raises(ValueError, match="Unknown priority"):
+            scheduler.acquire("urgent")
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"max_in_flight": 0},
+            {"priorities": ()},
+            {"priorities": ("a", "a")},
+            {"class_limits": {"bulk": 2}},
+            {"class_limits": {"batch": 0}},
+            {"client_weights": {"x": 0}},
+        ],
+    )
+    def test_invalid_configuration_is_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            RequestScheduler(**kwargs)
+
+
+class TestClientScheduling:
+    """AiClient and AsyncAiClient submitting through a scheduler."""
+
+    def test_default_scheduler_is_shared_by_clients(self):
+        scheduler = RequestScheduler(1)
+        set_default_scheduler(scheduler)
+        provider = RecordingProvider()
+        try:
+            client = AiClient(offline_settings(), provider=provider, show_progress=False)
+            scheduler.acquire("batch")
+            granted = []
+            batch = threading.Thread(target=lambda: granted.append(client.ask_many(["batch"])))
+            batch.start()
+            while scheduler.queued() == 0:
+                time.sleep(0.001)
+            interactive = threading.Thread(target=lambda: granted.append(client.ask("interactive")))
+            interactive.start()
+            while scheduler.queued() == 1:
+                time.sleep(0.001)
+
+            scheduler.release("batch")
+            batch.join(1.0)
+            interactive.join(1.0)
+
+            assert provider.prompts == ["interactive", "batch"]
+        finally:
+            set_default_scheduler(None)
+        assert get_default_scheduler() is None
+
+    def test_explicit_priority_is_not_sent_to_provider(self):
+        provider = RecordingProvider()
+        scheduler = RequestScheduler(2)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False, scheduler=scheduler)
+
+        assert client.ask("q", priority="batch") == "answer to q"
+        assert "priority" not in provider.params[0]
+        assert scheduler.in_flight == 0
+
+    def test_list_prompts_hold_one_slot(self):
+        provider = RecordingProvider()
+        scheduler = RequestScheduler(1)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False, scheduler=scheduler)
+
+        assert client.ask(["a", "b"]) == ["answer to a", "answer to b"]
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_async_ask_many_respects_cap(self):
+        provider = AsyncRecordingProvider(delay=0.01)
+        scheduler = RequestScheduler(2)
+        client = AsyncAiClient(offline_settings(), provider=provider, show_progress=False, scheduler=scheduler)
+
+        results = await client.ask_many([f"q{i}" for i in range(8)], concurrency=8)
+
+        assert all(r.error is None for r in results)
+        assert provider.peak == 2
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_sync_and_async_clients_share_one_cap(self):
+        scheduler = RequestScheduler(1)
+        async_client = AsyncAiClient(
+            offline_settings(), provider=AsyncRecordingProvider(), show_progress=False, scheduler=scheduler
+        )
+        scheduler.acquire("batch", "other")
+
+        task = asyncio.ensure_future(async_client.ask("q"))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        scheduler.release("batch")
+        assert await asyncio.wait_for(task, 1.0) == "answer to q"
+
+    def test_stream_holds_a_slot_until_consumed(self):
+        provider = RecordingProvider()
+        scheduler = RequestScheduler(1)
+        client = AiClient(offline_settings(), provider=provider, show_progress=False, scheduler=scheduler)
+
+        stream = client.ask_stream("q", priority="batch")
+        assert next(stream) == "answer to q"
+        assert scheduler.in_flight == 1
+        assert list(stream) == []
+
+        assert scheduler.in_flight == 0
+        assert "priority" not in provider.params[0]
+
+    def test_ask_json_attempts_take_slots(self):
+        class JsonProvider(FakeProvider):
+            def __init__(self):
+                super().__init__()
+                self.answers = iter(["not json", '{"ok": true}'])
+
+            def ask(self, prompt, *, return_format="text", **kwargs):
+                return next(self.answers)
+
+        class CountingScheduler(RequestScheduler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.acquired = []
+
+            def acquire(self, priority="interactive", client_id=None, quota=None):
+                self.acquired.append(priority)
+                super().acquire(priority, client_id, quota)
+
+        scheduler = CountingScheduler(1)
+        client = AiClient(offline_settings(), provider=JsonProvider(), show_progress=False, scheduler=scheduler)
+
+        assert client.ask_json("q", priority="batch") == {"ok": True}
+        assert scheduler.acquired == ["batch", "batch"]
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_async_stream_holds_a_slot_until_consumed(self):
+        scheduler = RequestScheduler(1)
+        client = AsyncAiClient(
+            offline_settings(), provider=AsyncRecordingProvider(), show_progress=False, scheduler=scheduler
+        )
+
+        stream = client.ask_stream("q", priority="batch")
+        assert await stream.__anext__() == "answer to q"
+        assert scheduler.in_flight == 1
+        assert [delta async for delta in stream] == []
+
+        assert scheduler.in_flight == 0
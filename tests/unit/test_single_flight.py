@@ -0,0 +1,191 @@
+"""Tests for single-flight coalescing of identical in-flight requests."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_utilities import AiClient, AsyncAiClient
+from ai_utilities.cache import MemoryCache
+from ai_utilities.single_flight import AsyncSingleFlight, SingleFlight
+from tests.fake_provider import (
+    AsyncRecordingProvider,
+    RecordingProvider,
+    offline_settings,
+)
+
+
+def _cached_settings():
+    return offline_settings(cache_enabled=True, temperature=0.0)
+
+
+class TestSingleFlight:
+    """Thread-based coalescing."""
+
+    def test_concurrent_duplicates_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        def worker():
+            barrier.wait()
+            return flight.do("key", fetch)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: worker(), range(8)))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert flight.in_flight() == 0
+
+    def test_leader_exception_is_shared(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("upstream failed")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "key", failing)
+            started.wait()
+            follower = pool.submit(flight.do, "key", lambda: "unused")
+
+            with pytest.raises(ValueError, match="upstream failed"):
+                leader.result()
+            with pytest.raises(ValueError, match="upstream failed"):
+                follower.result()
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+        calls = []
+
+        flight.do("key", lambda: calls.append(1))
+        flight.do("key", lambda: calls.append(1))
+
+        assert len(calls) == 2
+
+    def test_different_keys_run_independently(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch(key):
+            calls.append(key)
+            time.sleep(0.05)
+            return key
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda k: flight.do(k, lambda: fetch(k)), ["a", "b"]))
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+
+class TestAsyncSingleFlight:
+    """asyncio-based coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_call(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return object()
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        flight = AsyncSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelling_leader_does_not_cancel_followers(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "shared"
+
+        leader = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "shared"
+        assert len(calls) == 1
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+class TestClientCoalescing:
+    """AiClient and AsyncAiClient route cacheable requests through single-flight."""
+
+    def test_concurrent_identical_asks_make_one_provider_call(self):
+        provider = RecordingProvider(delay=0.1)
+        client = AiClient(_cached_settings(), provider=provider, show_progress=False, cache=MemoryCache())
+        barrier = threading.Barrier(6)
+
+        def ask():
+            barrier.wait()
+            return client.ask("What are your opening hours?")
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            responses = list(pool.map(lambda _: ask(), range(6)))
+
+        assert provider.prompts == ["What are your opening hours?"]
+        assert len(set(responses)) == 1
+
+    def test_ask_many_duplicates_make_one_provider_call(self):
+        provider = RecordingProvider(delay=0.05)
+        client = AiClient(_cached_settings(), provider=provider, show_progress=False, cache=MemoryCache())
+
+        results = client.ask_many(["same"] * 5 + ["other"], concurrency=6)
+
+        assert sorted(provider.prompts) == ["other", "same"]
+        assert all(r.error is None for r in results)
+
+    def test_uncacheable_requests_are_not_coalesced(self):
+        provider = RecordingProvider(delay=0.05)
+        settings = offline_settings(cache_enabled=True, temperature=1.0)
+        client = AiClient(settings, provider=provider, show_progress=False, cache=MemoryCache())
+
+        client.ask_many(["same"] * 3, concurrency=3)
+
+        assert provider.prompts == ["same"] * 3
+
+    @pytest.mark.asyncio
+    async def test_async_concurrent_identical_asks_make_one_provider_call(self):
+        provider = AsyncRecordingProvider(delay=0.05)
+        client = AsyncAiClient(_cached_settings(), provider=provider, cache=MemoryCache())
+
+        responses = await asyncio.gather(*(client.ask("same") for _ in range(10)))
+
+        assert provider.prompts == ["same"]
+        assert len(set(responses)) == 1
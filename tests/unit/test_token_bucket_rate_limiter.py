@@ -0,0 +1,523 @@
+"""Tests for TokenBucketRateLimiter and its use by the clients."""
+
+import asyncio
+import subprocess
+import sys
+import textwrap
+from types import SimpleNamespace
+
+import pytest
+
+from ai_utilities import AiClient, AiSettings, AsyncAiClient
+from ai_utilities import rate_limiter as rate_limiter_module
+from ai_utilities.config_models import ModelConfig
+from ai_utilities.exceptions import RateLimitExceededError
+from ai_utilities.providers.openai_provider import _with_rate_limit_observer
+from ai_utilities.rate_limiter import (
+    MemoryRateLimitStore,
+    ServerQuota,
+    SqliteRateLimitStore,
+    TokenBucketRateLimiter,
+    observe_rate_limit_headers,
+    observing,
+    shared_rate_limiter,
+    shared_server_quota,
+)
+from tests.fake_provider import AsyncRecordingProvider, FakeProvider, offline_settings
+
+
+class FakeClock:
+    """Stand-in for the ``time`` module whose sleeps advance a virtual clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+class ExhaustedQuotaProvider(FakeProvider):
+    """Provider whose responses report that no requests are left this minute."""
+
+    def ask(self, prompt, *, return_format="text", **kwargs):
+        observe_rate_limit_headers({"x-ratelimit-remaining-requests": "0"})
+        return super().ask(prompt, return_format=return_format, **kwargs)
+
+
+def _settings(**overrides):
+    return offline_settings(rate_limit_enabled=True, **overrides)
+
+
+class TestTokenBucketRateLimiter:
+    """Bucket arithmetic."""
+
+    def test_burst_up_to_rpm_does_not_wait(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=3, tpm=1000, tpd=10000)
+
+        for _ in range(3):
+            assert limiter.acquire()
+
+        assert clock.slept == []
+
+    def test_waits_exactly_for_next_request_slot(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=60, tpm=100000, tpd=1000000)
+        for _ in range(60):
+            limiter.acquire()
+
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.slept == pytest.approx([1.0, 1.0])
+
+    def test_waits_for_tokens_per_minute(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=600, tpd=100000)
+
+        limiter.acquire(600)
+        limiter.acquire(60)
+
+        assert clock.slept == pytest.approx([6.0])
+
+    def test_refill_over_time_avoids_waiting(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=60, tpm=1000, tpd=10000)
+        for _ in range(60):
+            limiter.acquire()
+
+        clock.now += 2.0
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.slept == []
+
+    def test_timeout_returns_false_without_reserving(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=1, tpm=1000, tpd=10000)
+        limiter.acquire()
+
+        assert limiter.acquire(timeout=1.0) is False
+        clock.now += 60.0
+        assert limiter.acquire(timeout=0) is True
+
+    def test_request_larger_than_bucket_waits_for_full_bucket(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=600, tpd=100000)
+        limiter.acquire(300)
+
+        limiter.acquire(5000)
+
+        assert clock.slept == pytest.approx([30.0])
+
+    def test_record_charges_response_tokens(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=600, tpd=100000)
+        limiter.acquire(100)
+        limiter.record(500)
+
+        limiter.acquire(60)
+
+        assert clock.slept == pytest.approx([6.0])
+
+    def test_daily_tokens_limit_long_running_usage(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=1440)
+
+        limiter.acquire(1000)
+        clock.now += 60.0
+        limiter.acquire(1000)
+
+        # 559 tokens short of the day bucket, which refills at 1 token / minute
+        assert clock.slept == pytest.approx([559 * 60.0])
+
+    def test_from_model_config(self):
+        config = ModelConfig(requests_per_minute=100, tokens_per_minute=5000, tokens_per_day=50000)
+
+        limiter = TokenBucketRateLimiter.from_model_config(config)
+
+        assert (limiter.rpm, limiter.tpm, limiter.tpd) == (100, 5000, 50000)
+
+    def test_shared_limiter_is_reused_per_name_and_limits(self):
+        config = ModelConfig()
+
+        assert shared_rate_limiter("openai:m", config) is shared_rate_limiter("openai:m", config)
+        assert shared_rate_limiter("openai:m", config) is not shared_rate_limiter("groq:m", config)
+
+    def test_invalid_limits_are_rejected(self):
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rpm=0, tpm=1000, tpd=10000)
+
+    @pytest.mark.asyncio
+    async def test_acquire_async_waits_without_blocking(self):
+        limiter = TokenBucketRateLimiter(rpm=600, tpm=100000, tpd=1000000)
+        for _ in range(600):
+            await limiter.acquire_async()
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        await limiter.acquire_async()
+        task.cancel()
+
+        assert loop.time() - start >= 0.09
+        assert ticks >= 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_async_acquire_returns_its_reservation(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=1, tpm=1000, tpd=10000)
+        await limiter.acquire_async()
+
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # Only the first request's debt remains: 60s, not 120s
+        limiter.acquire()
+        assert clock.slept == pytest.approx([60.0])
+
+
+class TestRateLimitHeaders:
+    """Quota reported in response headers lowering the buckets."""
+
+    def test_observe_lowers_buckets_to_reported_quota(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+
+        limiter.observe(remaining_requests=0, remaining_tokens=400, reset_requests_s=0.5, reset_tokens_s=2.0)
+        limiter.acquire(500)
+
+        # The server's windows reset sooner, but the buckets refill one request in 0.6s
+        # and the 100 missing tokens in 6s
+        assert clock.slept == pytest.approx([6.0])
+
+    def test_observe_never_raises_buckets(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+        limiter.acquire(1000)
+
+        limiter.observe(remaining_requests=99, remaining_tokens=900)
+        limiter.acquire(60)
+
+        assert clock.slept == pytest.approx([3.6])
+
+    def test_headers_reach_only_the_observed_limiter(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+        observe_rate_limit_headers({"x-ratelimit-remaining-tokens": "0"})
+        assert limiter.acquire(1000, timeout=0)
+
+        with observing(limiter):
+            observe_rate_limit_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "6s"})
+
+        assert not limiter.acquire(timeout=0.1)
+
+    def test_malformed_headers_are_ignored(self):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+
+        with observing(limiter):
+            observe_rate_limit_headers({"x-ratelimit-remaining-requests": "many"})
+
+        assert limiter.acquire(timeout=0)
+
+    def test_sqlite_store_persists_observed_quota(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+        first = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000, store=SqliteRateLimitStore(path))
+        second = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000, store=SqliteRateLimitStore(path))
+
+        first.observe(remaining_tokens=0)
+
+        assert not second.acquire(500, timeout=1.0)
+
+    def test_sdk_http_clients_report_response_headers(self):
+        fake_sdk = SimpleNamespace(DefaultHttpxClient=lambda **kwargs: kwargs)
+        http_client = _with_rate_limit_observer(fake_sdk, {"api_key": "k"})["http_client"]
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+
+        with observing(limiter):
+            for hook in http_client["event_hooks"]["response"]:
+                hook(SimpleNamespace(headers={"x-ratelimit-remaining-requests": "0"}))
+
+        assert not limiter.acquire(timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_async_sdk_http_clients_report_response_headers(self):
+        fake_sdk = SimpleNamespace(DefaultAsyncHttpxClient=lambda **kwargs: kwargs)
+        http_client = _with_rate_limit_observer(fake_sdk, {}, asynchronous=True)["http_client"]
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+
+        with observing(limiter):
+            for hook in http_client["event_hooks"]["response"]:
+                await hook(SimpleNamespace(headers={"x-ratelimit-remaining-tokens": "0"}))
+
+        assert not limiter.acquire(500, timeout=0.1)
+
+    def test_explicit_http_client_and_old_sdks_are_left_alone(self):
+        fake_sdk = SimpleNamespace(DefaultHttpxClient=lambda **kwargs: kwargs)
+        http_client = object()
+
+        assert _with_rate_limit_observer(fake_sdk, {"http_client": http_client}) == {"http_client": http_client}
+        assert _with_rate_limit_observer(SimpleNamespace(), {"api_key": "k"}) == {"api_key": "k"}
+
+    def test_client_waits_on_reported_quota(self):
+        limits = ModelConfig(requests_per_minute=100, tokens_per_minute=1000, tokens_per_day=10000)
+        client = AiClient(
+            _settings(model_rate_limits={"test-model": limits}, rate_limit_max_wait_s=0.1),
+            provider=ExhaustedQuotaProvider(),
+            show_progress=False,
+        )
+        client.ask("first")
+
+        # 100 RPM would allow the next request at once; the server said none are left
+        with pytest.raises(RateLimitExceededError):
+            client.ask("second")
+
+
+class TestServerQuota:
+    """The live quota model fed by x-ratelimit-remaining-* and -reset-* headers."""
+
+    def test_limiter_waits_for_the_reported_reset(self, clock):
+        limiter = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+
+        with observing(limiter):
+            observe_rate_limit_headers(
+                {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "20s"}
+            )
+        limiter.acquire()
+
+        # The bucket refills a request in 0.6s, but the server's window resets in 20s
+        assert clock.slept == pytest.approx([20.0])
+
+    def test_requests_since_the_report_count_against_it(self, clock):
+        quota = ServerQuota()
+        quota.observe(remaining_requests=2, remaining_tokens=1000, reset_requests_s=30.0, reset_tokens_s=5.0)
+
+        assert quota.acquire(400) and quota.acquire(400)
+        assert clock.slept == []
+        quota.acquire(100)
+
+        assert clock.slept == pytest.approx([30.0])
+
+    def test_tokens_beyond_the_reported_quota_wait_for_its_reset(self, clock):
+        quota = ServerQuota()
+        quota.observe(remaining_tokens=300, reset_tokens_s=1.5)
+
+        assert not quota.acquire(500, timeout=1.0)
+        assert quota.acquire(500)
+        assert clock.slept == pytest.approx([1.5])
+
+    def test_report_is_forgotten_after_its_reset(self, clock):
+        quota = ServerQuota()
+        quota.observe(remaining_requests=0, reset_requests_s=5.0)
+        assert quota.reported() and quota.blocked_for() == pytest.approx(5.0)
+
+        clock.now += 6.0
+
+        assert not quota.reported() and quota.blocked_for() == 0
+        assert quota.acquire(timeout=0)
+
+    def test_missing_reset_assumes_a_one_minute_window(self, clock):
+        quota = ServerQuota()
+        quota.observe(remaining_requests=0)
+
+        assert quota.blocked_for() == pytest.approx(60.0)
+
+    @pytest.mark.parametrize(
+        "value, seconds",
+        [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m3.5s", 3723.5), ("0.25", 0.25), ("soon", None)],
+    )
+    def test_reset_header_durations(self, clock, value, seconds):
+        quota = ServerQuota()
+
+        with observing(quota):
+            observe_rate_limit_headers({"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": value})
+
+        assert quota.blocked_for() == pytest.approx(seconds if seconds is not None else 60.0)
+
+    def test_shared_limiters_use_the_shared_quota(self):
+        limiter = shared_rate_limiter("openai:quota-model", ModelConfig())
+
+        assert limiter.quota is shared_server_quota("openai:quota-model")
+
+    def test_client_without_rate_limiting_waits_on_reported_quota(self):
+        client = AiClient(
+            offline_settings(rate_limit_max_wait_s=0.1),
+            provider=ExhaustedQuotaProvider(),
+            show_progress=False,
+        )
+        client.ask("first")
+
+        assert client._rate_limiter_for("test-model") is None
+        with pytest.raises(RateLimitExceededError):
+            client.ask("second")
+
+    @pytest.mark.asyncio
+    async def test_async_client_without_rate_limiting_waits_on_reported_quota(self):
+        client = AsyncAiClient(
+            offline_settings(rate_limit_max_wait_s=0.1),
+            provider=AsyncRecordingProvider(),
+        )
+        client._server_quota_for("test-model").observe(remaining_requests=0, reset_requests_s=30.0)
+
+        with pytest.raises(RateLimitExceededError):
+            await client.ask("hello")
+
+
+class TestRateLimitStores:
+    """Budgets shared through a store."""
+
+    def test_limiters_on_one_store_and_key_share_a_budget(self):
+        store = MemoryRateLimitStore()
+        first = TokenBucketRateLimiter(rpm=2, tpm=1000, tpd=10000, store=store, key="k")
+        second = TokenBucketRateLimiter(rpm=2, tpm=1000, tpd=10000, store=store, key="k")
+        other = TokenBucketRateLimiter(rpm=2, tpm=1000, tpd=10000, store=store, key="other")
+
+        assert first.acquire(timeout=0)
+        assert second.acquire(timeout=0)
+        assert not first.acquire(timeout=0)
+        assert other.acquire(timeout=0)
+
+    def test_sqlite_store_shares_budget_between_store_instances(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+        first = TokenBucketRateLimiter(
+            rpm=3, tpm=1000, tpd=10000, store=SqliteRateLimitStore(path), key="openai:m"
+        )
+        second = TokenBucketRateLimiter(
+            rpm=3, tpm=1000, tpd=10000, store=SqliteRateLimitStore(path), key="openai:m"
+        )
+
+        granted = [limiter.acquire(timeout=0) for limiter in (first, second, first, second)]
+
+        assert granted == [True, True, True, False]
+
+    def test_sqlite_store_record_is_visible_to_other_instances(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+        first = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000, store=SqliteRateLimitStore(path))
+        second = TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000, store=SqliteRateLimitStore(path))
+
+        first.record(1000)
+
+        assert not second.acquire(500, timeout=1.0)
+
+    def test_sqlite_store_shares_budget_across_processes(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+        script = textwrap.dedent(
+            f"""
+            from ai_utilities.rate_limiter import SqliteRateLimitStore, TokenBucketRateLimiter
+            limiter = TokenBucketRateLimiter(
+                rpm=10, tpm=1000, tpd=10000, store=SqliteRateLimitStore({str(path)!r}), key="shared"
+            )
+            print(sum(limiter.acquire(timeout=0) for _ in range(10)))
+            """
+        )
+        workers = [
+            subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+            for _ in range(4)
+        ]
+
+        granted = sum(int(worker.communicate(timeout=60)[0]) for worker in workers)
+
+        assert granted == 10
+
+    def test_shared_rate_limiter_uses_one_sqlite_store_per_path(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+
+        first = shared_rate_limiter("openai:a", ModelConfig(), path)
+        second = shared_rate_limiter("openai:b", ModelConfig(), path)
+
+        assert isinstance(first.store, SqliteRateLimitStore)
+        assert first.store is second.store
+        assert first.key == "openai:a"
+
+
+class TestClientRateLimiting:
+    """AiClient and AsyncAiClient waiting on the per-model limiter."""
+
+    def test_disabled_by_default(self):
+        client = AiClient(
+            AiSettings(api_key="test-key", model="test-model"), provider=FakeProvider(), show_progress=False
+        )
+
+        assert client._rate_limiter_for("test-model") is None
+
+    def test_client_uses_model_config_limits(self, clock):
+        limits = ModelConfig(requests_per_minute=1, tokens_per_minute=1000, tokens_per_day=10000)
+        client = AiClient(
+            _settings(model_rate_limits={"test-model": limits}),
+            provider=FakeProvider(),
+            show_progress=False,
+        )
+
+        client.ask("first")
+        client.ask("second")
+
+        assert clock.slept == pytest.approx([60.0])
+        assert client._rate_limiter_for("test-model").rpm == 1
+
+    def test_max_wait_raises_instead_of_waiting(self):
+        limits = ModelConfig(requests_per_minute=1, tokens_per_minute=1000, tokens_per_day=10000)
+        client = AiClient(
+            _settings(model_rate_limits={"test-model": limits}, rate_limit_max_wait_s=0.1),
+            provider=FakeProvider(),
+            show_progress=False,
+        )
+        client.ask("first")
+
+        with pytest.raises(RateLimitExceededError, match="test-model"):
+            client.ask("second")
+
+    def test_clients_share_one_limiter_per_model(self):
+        settings = _settings()
+        first = AiClient(settings, provider=FakeProvider(), show_progress=False)
+        second = AiClient(settings, provider=FakeProvider(), show_progress=False)
+
+        assert first._rate_limiter_for("test-model") is second._rate_limiter_for("test-model")
+        assert first._rate_limiter_for("test-model") is not first._rate_limiter_for("other-model")
+
+    def test_client_shares_limits_through_sqlite_path(self, tmp_path):
+        limits = ModelConfig(requests_per_minute=1, tokens_per_minute=1000, tokens_per_day=10000)
+        settings = _settings(
+            model_rate_limits={"test-model": limits},
+            rate_limit_max_wait_s=0.1,
+            rate_limit_sqlite_path=tmp_path / "limits.sqlite",
+        )
+        client = AiClient(settings, provider=FakeProvider(), show_progress=False)
+        client.ask("first")
+
+        # A separate store on the same file stands in for another worker process
+        other_worker = TokenBucketRateLimiter.from_model_config(
+            limits, store=SqliteRateLimitStore(tmp_path / "limits.sqlite"), key="auto:test-model"
+        )
+        assert not other_worker.acquire(timeout=0)
+
+    def test_rate_limit_settings_are_not_sent_to_provider(self):
+        client = AiClient(_settings(), provider=FakeProvider(), show_progress=False)
+
+        params = client._ask_request_params({})
+
+        assert "rate_limit_enabled" not in params
+        assert "model_rate_limits" not in params
+
+    @pytest.mark.asyncio
+    async def test_async_client_waits_on_shared_limiter(self):
+        limits = ModelConfig(requests_per_minute=1, tokens_per_minute=1000, tokens_per_day=10000)
+        client = AsyncAiClient(
+            _settings(model_rate_limits={"test-model": limits}, rate_limit_max_wait_s=0.1),
+            provider=AsyncRecordingProvider(),
+            show_progress=False,
+        )
+
+        assert await client.ask("first") == "answer to first"
+        with pytest.raises(RateLimitExceededError):
+            await client.ask("second")
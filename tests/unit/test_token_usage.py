@@ -0,0 +1,219 @@
+"""Tests for provider-reported token usage and its use by the clients."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from ai_utilities import AiClient, AsyncAiClient
+from ai_utilities import rate_limiter as rate_limiter_module
+from ai_utilities.config_models import ModelConfig
+from ai_utilities.metrics import MetricsRegistry
+from ai_utilities.providers.openai_provider import OpenAIProvider
+from ai_utilities.token_usage import TokenUsage, capture_usage, report_usage
+from tests.fake_provider import AsyncRecordingProvider, FakeProvider, offline_settings
+
+
+def _completion(content, prompt_tokens=11, completion_tokens=7, cached_tokens=3):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+        ),
+    )
+
+
+class FakeSdkClient:
+    """OpenAI SDK stand-in whose completions carry a usage block."""
+
+    def __init__(self, **usage):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.usage = usage
+
+    def _create(self, messages, **kwargs):
+        return _completion(f"answer to {messages[0]['content']}", **self.usage)
+
+
+class ReportingProvider(FakeProvider):
+    """Provider that reports a fixed usage for every call."""
+
+    def ask(self, prompt, *, return_format="text", **kwargs):
+        report_usage(TokenUsage(prompt_tokens=100, completion_tokens=20, cached_tokens=50))
+        return super().ask(prompt, return_format=return_format, **kwargs)
+
+
+class AsyncReportingProvider(AsyncRecordingProvider):
+    """Async provider that reports a fixed usage for every call."""
+
+    async def ask(self, prompt, *, return_format="text", **kwargs):
+        report_usage(TokenUsage(prompt_tokens=30, completion_tokens=5))
+        return await super().ask(prompt, return_format=return_format, **kwargs)
+
+
+def _counter(name, model):
+    collector = MetricsRegistry().collector
+    return collector.counters[collector._make_key(name, {"model": model})]
+
+
+class TestTokenUsage:
+    """Parsing and capturing usage."""
+
+    def test_from_response_reads_chat_usage(self):
+        usage = TokenUsage.from_response(_completion("hi"))
+
+        assert usage == TokenUsage(prompt_tokens=11, completion_tokens=7, cached_tokens=3)
+        assert usage.total_tokens == 18
+
+    def test_from_response_reads_embeddings_usage(self):
+        response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=9, total_tokens=9))
+
+        assert TokenUsage.from_response(response) == TokenUsage(prompt_tokens=9)
+
+    @pytest.mark.parametrize("response", [SimpleNamespace(), SimpleNamespace(usage=None), MagicMock()])
+    def test_from_response_without_usage_is_none(self, response):
+        assert TokenUsage.from_response(response) is None
+
+    def test_reports_reach_every_active_capture(self):
+        with capture_usage() as outer:
+            report_usage(TokenUsage(prompt_tokens=1))
+            with capture_usage() as inner:
+                report_usage(TokenUsage(prompt_tokens=2))
+            report_usage(None)
+
+        report_usage(TokenUsage(prompt_tokens=4))
+        assert [usage.prompt_tokens for usage in outer] == [1, 2]
+        assert [usage.prompt_tokens for usage in inner] == [2]
+
+    def test_openai_provider_reports_response_usage(self):
+        provider = OpenAIProvider(offline_settings(), client=FakeSdkClient())
+
+        with capture_usage() as reported:
+            assert provider.ask("hi") == "answer to hi"
+
+        assert reported == [TokenUsage(prompt_tokens=11, completion_tokens=7, cached_tokens=3)]
+
+
+class TestClientUsage:
+    """Reported usage flowing into results, tracking, rate limits and metrics."""
+
+    def test_ask_many_results_carry_reported_usage(self):
+        client = AiClient(
+            offline_settings(),
+            provider=OpenAIProvider(offline_settings(), client=FakeSdkClient()),
+            show_progress=False,
+        )
+
+        results = client.ask_many(["a", "b"])
+
+        assert [r.tokens_used for r in results] == [18, 18]
+        assert results[0].usage.cached_tokens == 3
+
+    def test_tracker_records_reported_tokens(self, tmp_path):
+        client = AiClient(
+            offline_settings(),
+            provider=ReportingProvider(responses=['{"a": 1}']),
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+        )
+
+        client.ask("hello")
+        client.ask_json("give me json")
+
+        assert client.get_usage_stats().tokens_used_today == 240
+
+    def test_ask_json_records_every_attempt_in_tracker_and_metrics(self, tmp_path):
+        client = AiClient(
+            offline_settings(model="json-model"),
+            provider=ReportingProvider(responses=["not json", '{"a": 1}']),
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+        )
+        requests_before = MetricsRegistry().collector.counters.get("ai_requests_total", 0)
+        prompt_before = MetricsRegistry().collector.counters.get(
+            MetricsRegistry().collector._make_key("prompt_tokens_total", {"model": "json-model"}), 0
+        )
+
+        # The first answer needs one repair attempt
+        assert client.ask_json("give me json", max_repairs=1) == {"a": 1}
+
+        stats = client.get_usage_stats()
+        assert (stats.requests_today, stats.tokens_used_today) == (2, 240)
+        assert MetricsRegistry().collector.counters["ai_requests_total"] - requests_before == 2
+        assert _counter("prompt_tokens_total", "json-model") - prompt_before == 200
+
+    def test_ask_json_without_reported_usage_records_estimates(self, tmp_path):
+        client = AiClient(
+            offline_settings(),
+            provider=FakeProvider(responses=['{"key": "value...."}']),
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+        )
+
+        client.ask_json("give me json")
+
+        # The 20 character answer is estimated at 5 tokens
+        stats = client.get_usage_stats()
+        assert (stats.requests_today, stats.tokens_used_today) == (1, 5)
+
+    def test_providers_without_usage_fall_back_to_estimates(self, tmp_path):
+        client = AiClient(
+            offline_settings(),
+            provider=FakeProvider(responses=["x" * 40]),
+            track_usage=True,
+            usage_file=tmp_path / "usage.json",
+            show_progress=False,
+        )
+
+        result = client.ask_many(["hello"])[0]
+
+        assert (result.tokens_used, result.usage) == (None, None)
+        assert client.get_usage_stats().tokens_used_today == 10
+
+    def test_rate_limiter_is_charged_reported_tokens(self, monkeypatch):
+        limiter = rate_limiter_module.TokenBucketRateLimiter(rpm=100, tpm=1000, tpd=10000)
+        charges = []
+        monkeypatch.setattr(limiter, "record", charges.append)
+        client = AiClient(
+            offline_settings(rate_limit_enabled=True, model_rate_limits={"test-model": ModelConfig()}),
+            provider=ReportingProvider(),
+            show_progress=False,
+        )
+        monkeypatch.setattr(client, "_rate_limiter_for", lambda model: limiter)
+
+        client.ask("hello")
+
+        # The prompt estimate was charged up front; the rest of the 120 reported tokens follows
+        _, charged = client._wait_for_rate_limit(["hello"], client._ask_request_params({}))
+        assert charges == [120 - charged]
+
+    def test_metrics_count_reported_tokens_per_model(self):
+        client = AiClient(
+            offline_settings(model="metered-model"), provider=ReportingProvider(), show_progress=False
+        )
+        before = _counter("cached_tokens_total", "metered-model")
+
+        client.ask("hello")
+
+        assert _counter("cached_tokens_total", "metered-model") - before == 50
+        assert _counter("prompt_tokens_total", "metered-model") >= 100
+
+    @pytest.mark.asyncio
+    async def test_async_ask_many_results_carry_reported_usage(self, tmp_path):
+        client = AsyncAiClient(
+            offline_settings(),
+            provider=AsyncReportingProvider(),
+            track_usage=True,
+            usage_file=str(tmp_path / "usage.json"),
+            show_progress=False,
+        )
+
+        results = await client.ask_many(["a", "b"])
+
+        assert [r.tokens_used for r in results] == [35, 35]
+        assert client.get_usage_stats().tokens_used_today == 70
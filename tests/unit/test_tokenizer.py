@@ -0,0 +1,183 @@
+"""Tests for the offline BPE tokenizer and its use by TokenCounter."""
+
+import base64
+import random
+from collections import Counter
+
+import pytest
+
+from ai_utilities.token_counter import TokenCounter
+from ai_utilities.tokenizer import (
+    BpeTokenizer,
+    encoding_for_model,
+    get_tokenizer,
+    load_rank_file,
+    set_tokenizer_dir,
+)
+
+BYTE_RANKS = {bytes([i]): i for i in range(256)}
+
+
+def _with_merges(*tokens):
+    ranks = dict(BYTE_RANKS)
+    for token in tokens:
+        ranks[token] = len(ranks)
+    return ranks
+
+
+def _train(corpus: bytes, merges: int):
+    """Learn BPE merges from ``corpus`` the textbook way."""
+    ranks = dict(BYTE_RANKS)
+    words = [[bytes([b]) for b in word] for word in corpus.split(b" ")]
+    for _ in range(merges):
+        pairs = Counter(a + b for word in words for a, b in zip(word, word[1:]))
+        if not pairs:
+            break
+        best = max(pairs, key=pairs.get)
+        ranks[best] = len(ranks)
+        merged = []
+        for word in words:
+            out, i = [], 0
+            while i < len(word):
+                if i + 1 < len(word) and word[i] + word[i + 1] == best:
+                    out.append(best)
+                    i += 2
+                else:
+                    out.append(word[i])
+                    i += 1
+            merged.append(out)
+        words = merged
+    return ranks
+
+
+def _write_ranks(path, ranks):
+    path.write_text("".join(f"{base64.b64encode(token).decode()} {rank}\n" for token, rank in ranks.items()))
+    return path
+
+
+@pytest.fixture
+def trained_ranks():
+    rng = random.Random(7)
+    corpus = "".join(rng.choice("aaabbbcdeeeefg hij") for _ in range(20000)).encode()
+    return _train(corpus, 200)
+
+
+class TestBpeTokenizer:
+    """Encoding with a rank table."""
+
+    def test_lowest_rank_merges_first(self):
+        tokenizer = BpeTokenizer(_with_merges(b"bc", b"ab", b"abcd"), accelerate=False)
+
+        # "bc" outranks "ab", so "a" stays alone
+        assert tokenizer.encode("abc") == [ord("a"), 256]
+        assert tokenizer.encode("ab") == [257]
+        # A piece that is itself a token needs no merging
+        assert tokenizer.encode("abcd") == [258]
+
+    def test_heap_merge_matches_pairwise_merge(self, trained_ranks):
+        tokenizer = BpeTokenizer(trained_ranks, accelerate=False)
+        rng = random.Random(3)
+
+        for _ in range(500):
+            data = "".join(rng.choice("aabbceeefg") for _ in range(rng.randint(1, 150))).encode()
+            assert tokenizer._merge_with_heap(data) == tokenizer._merge(data)
+
+    def test_encode_round_trips_any_text(self, trained_ranks):
+        tokenizer = BpeTokenizer(trained_ranks, accelerate=False)
+        rng = random.Random(5)
+        alphabet = "ab ce\n\t_!?'s1234567890éüß東京ДЖ👍 \r\n/#"
+
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+            assert tokenizer.decode(tokenizer.encode(text)) == text
+
+    def test_batch_counts_match_single_counts(self, trained_ranks):
+        tokenizer = BpeTokenizer(trained_ranks, accelerate=False)
+        texts = ["abc def", "", "aaa bbb aaa", "x" * 500, "def f(a): return a**2"]
+
+        assert tokenizer.count_tokens_batch(texts) == [len(tokenizer.encode(text)) for text in texts]
+        assert tokenizer.count_tokens("") == 0
+
+    def test_o200k_splits_camel_case_words(self):
+        ranks = _with_merges(b"He", b"ll", b"llo", b"Hello", b"Wo", b"rl", b"rld", b"World", b"HelloWorld")
+
+        cl100k = BpeTokenizer(ranks, "cl100k_base", accelerate=False)
+        o200k = BpeTokenizer(ranks, "o200k_base", accelerate=False)
+
+        assert cl100k.count_tokens("HelloWorld") == 1
+        assert o200k.count_tokens("HelloWorld") == 2
+
+    def test_unknown_encoding_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown encoding"):
+            BpeTokenizer(BYTE_RANKS, "p50k_base")
+
+
+class TestRankFiles:
+    """Loading rank files and shared tokenizers."""
+
+    def test_load_rank_file(self, tmp_path):
+        ranks = _with_merges(b"ab", b" the")
+
+        assert load_rank_file(_write_ranks(tmp_path / "cl100k_base.tiktoken", ranks)) == ranks
+
+    def test_malformed_rank_file_is_rejected(self, tmp_path):
+        path = tmp_path / "bad.tiktoken"
+        path.write_text("YQ== 0\nnot-a-rank\n")
+
+        with pytest.raises(ValueError, match="bad.tiktoken:2"):
+            load_rank_file(path)
+
+    def test_encoding_is_chosen_from_file_name(self, tmp_path):
+        path = _write_ranks(tmp_path / "o200k_base.tiktoken", BYTE_RANKS)
+
+        assert BpeTokenizer.from_file(path, accelerate=False).encoding == "o200k_base"
+
+    @pytest.mark.parametrize(
+        "model, encoding",
+        [
+            ("gpt-4o-mini", "o200k_base"),
+            ("o3-mini", "o200k_base"),
+            ("openai/gpt-4.1", "o200k_base"),
+            ("gpt-4-turbo", "cl100k_base"),
+            ("gpt-3.5-turbo", "cl100k_base"),
+            ("llama3", "cl100k_base"),
+        ],
+    )
+    def test_encoding_for_model(self, model, encoding):
+        assert encoding_for_model(model) == encoding
+
+    def test_get_tokenizer_needs_a_directory_with_the_rank_file(self, tmp_path, monkeypatch):
+        assert get_tokenizer("cl100k_base") is None
+
+        monkeypatch.setenv("AI_TOKENIZER_DIR", str(tmp_path))
+        assert get_tokenizer("cl100k_base") is None
+
+        _write_ranks(tmp_path / "o200k_base.tiktoken", BYTE_RANKS)
+        tokenizer = get_tokenizer("o200k_base")
+        assert tokenizer is not None
+        assert get_tokenizer("o200k_base") is tokenizer
+
+    def test_rank_file_added_after_a_miss_is_loaded(self, tmp_path):
+        set_tokenizer_dir(tmp_path)
+        assert get_tokenizer("cl100k_base") is None
+
+        _write_ranks(tmp_path / "cl100k_base.tiktoken", BYTE_RANKS)
+
+        assert get_tokenizer("cl100k_base") is not None
+
+    def test_token_counter_counts_exactly_with_a_tokenizer(self, tmp_path):
+        _write_ranks(tmp_path / "cl100k_base.tiktoken", _with_merges(b"hello", b" hello", b" world"))
+        text = "hello world hello world hello"
+        estimate = TokenCounter.count_tokens_for_model(text, "gpt-4")
+
+        set_tokenizer_dir(tmp_path)
+
+        assert TokenCounter.count_tokens_for_model(text, "gpt-4") == 5 != estimate
+        assert TokenCounter.count_tokens_batch([text, "", "hello"], "gpt-4") == [5, 0, 1]
+
+    def test_token_counter_batch_falls_back_to_estimates(self):
+        texts = ["one two three four", "x" * 40]
+
+        assert TokenCounter.count_tokens_batch(texts, "gpt-4") == [
+            TokenCounter.count_tokens_for_model(text, "gpt-4") for text in texts
+        ]
@@ -0,0 +1,217 @@
+"""Tests for the append-only usage log and its compaction into SQLite."""
+
+import json
+import subprocess
+import sys
+import textwrap
+from datetime import date, timedelta
+
+import pytest
+
+from ai_utilities import AiClient, AiSettings, AsyncAiClient
+from ai_utilities.usage_store import SqliteUsageStore, UsageRecord, shared_usage_store
+from ai_utilities.usage_tracker import ThreadSafeUsageTracker, UsageScope
+from tests.fake_provider import AsyncRecordingProvider, FakeProvider
+
+TODAY = date.today().isoformat()
+YESTERDAY = (date.today() - timedelta(days=1)).isoformat()
+
+
+def _record(client_id="a", model="m", day=TODAY, tokens=10, requests=1, scope="per_client"):
+    return UsageRecord(day=day, scope=scope, client_id=client_id, model=model, tokens=tokens, requests=requests)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteUsageStore(tmp_path / "usage.sqlite")
+    yield store
+    store.close()
+
+
+class TestSqliteUsageStore:
+    """Appending, compaction and aggregation."""
+
+    def test_appends_go_to_a_per_process_segment(self, store):
+        store.append([_record(), _record(client_id="b")])
+
+        segments = list(store.log_dir.glob("*.jsonl"))
+        assert len(segments) == 1
+        assert len(segments[0].read_text().splitlines()) == 2
+
+    def test_aggregate_groups_by_any_columns(self, store):
+        store.append([
+            _record("a", "m1", tokens=10),
+            _record("a", "m2", tokens=20),
+            _record("b", "m1", tokens=5),
+            _record("a", "m1", day=YESTERDAY, tokens=1),
+        ])
+
+        assert store.aggregate(("client_id",)) == [
+            {"client_id": "a", "tokens": 31, "requests": 3},
+            {"client_id": "b", "tokens": 5, "requests": 1},
+        ]
+        assert store.aggregate(("model",), since=TODAY) == [
+            {"model": "m1", "tokens": 15, "requests": 2},
+            {"model": "m2", "tokens": 20, "requests": 1},
+        ]
+        assert store.aggregate((), client_id="a", model="m1") == [{"tokens": 11, "requests": 2}]
+
+    def test_compaction_never_counts_a_record_twice(self, store):
+        store.append([_record(tokens=10)])
+        assert store.compact() == 1
+        store.append([_record(tokens=5)])
+
+        assert store.compact() == 1
+        assert store.compact() == 0
+        assert store.aggregate((), compact=False) == [{"tokens": 15, "requests": 2}]
+
+    def test_partial_last_line_is_left_for_the_next_compaction(self, store):
+        store.append([_record(tokens=10)])
+        segment = next(store.log_dir.glob("*.jsonl"))
+        line = json.dumps(_record(tokens=7).__dict__)
+        with open(segment, "a") as f:
+            f.write(line[:10])
+
+        assert store.compact() == 1
+        with open(segment, "a") as f:
+            f.write(line[10:] + "\n")
+        assert store.compact() == 1
+        assert store.aggregate(()) == [{"tokens": 17, "requests": 2}]
+
+    def test_sealed_segments_are_deleted_once_compacted(self, tmp_path):
+        store = SqliteUsageStore(tmp_path / "usage.sqlite", rotate_interval_s=0)
+        store.append([_record(tokens=1)])
+        store.append([_record(tokens=2)])
+
+        assert len(list(store.log_dir.glob("*.sealed"))) == 1
+        store.compact()
+
+        assert list(store.log_dir.glob("*.sealed")) == []
+        assert store.aggregate(()) == [{"tokens": 3, "requests": 2}]
+        store.close()
+
+    def test_stores_on_one_database_share_the_table(self, tmp_path):
+        first = SqliteUsageStore(tmp_path / "usage.sqlite")
+        second = SqliteUsageStore(tmp_path / "usage.sqlite")
+        first.append([_record(tokens=4)])
+        second.append([_record(tokens=6)])
+
+        assert first.aggregate(()) == [{"tokens": 10, "requests": 2}]
+        assert second.aggregate((), compact=False) == [{"tokens": 10, "requests": 2}]
+
+    def test_concurrent_processes_append_and_compact(self, tmp_path):
+        db_path = tmp_path / "usage.sqlite"
+        script = textwrap.dedent(
+            f"""
+            from ai_utilities.usage_store import SqliteUsageStore, UsageRecord
+            store = SqliteUsageStore({str(db_path)!r}, compact_interval_s=0)
+            for _ in range(20):
+                store.append([UsageRecord(day="2025-01-01", scope="global", tokens=3, requests=1)])
+                store.maybe_compact()
+            """
+        )
+        workers = [subprocess.Popen([sys.executable, "-c", script]) for _ in range(4)]
+        for worker in workers:
+            assert worker.wait(timeout=60) == 0
+
+        store = SqliteUsageStore(db_path)
+        assert store.aggregate(()) == [{"tokens": 240, "requests": 80}]
+        store.close()
+
+    def test_unknown_group_column_is_rejected(self, store):
+        with pytest.raises(ValueError, match="Cannot group usage"):
+            store.aggregate(("tenant",))
+
+    def test_shared_store_is_reused_per_path(self, tmp_path):
+        path = tmp_path / "usage.sqlite"
+
+        assert shared_usage_store(path) is shared_usage_store(str(path))
+
+
+class TestTrackerWithStore:
+    """ThreadSafeUsageTracker appending to and aggregating from a store."""
+
+    def test_flushed_usage_is_appended_per_model(self, tmp_path, store):
+        tracker = ThreadSafeUsageTracker(
+            stats_file=tmp_path / "usage_a.json", client_id="a", flush_interval_s=60, store=store
+        )
+        tracker.record_usage(10, model="m1")
+        tracker.record_usage(20, model="m2")
+        tracker.record_usage(5, model="m1")
+
+        tracker.flush()
+
+        assert store.aggregate(("scope", "client_id", "day", "model")) == [
+            {"scope": "per_client", "client_id": "a", "day": TODAY, "model": "m1", "tokens": 15, "requests": 2},
+            {"scope": "per_client", "client_id": "a", "day": TODAY, "model": "m2", "tokens": 20, "requests": 1},
+        ]
+
+    def test_usage_reaches_its_own_store_whichever_tracker_flushes(self, tmp_path, store):
+        stats_file = tmp_path / "usage_shared.json"
+        with_store = ThreadSafeUsageTracker(stats_file=stats_file, client_id="a", flush_interval_s=60, store=store)
+        without_store = ThreadSafeUsageTracker(stats_file=stats_file, client_id="b", flush_interval_s=60)
+        with_store.record_usage(100)
+        without_store.record_usage(1)
+
+        without_store.flush()
+
+        assert store.aggregate(("client_id",)) == [{"client_id": "a", "tokens": 100, "requests": 1}]
+        assert without_store.get_stats().total_tokens == 101
+
+    def test_aggregated_stats_come_from_the_store(self, tmp_path, store):
+        trackers = [
+            ThreadSafeUsageTracker(
+                stats_file=tmp_path / f"usage_{name}.json", client_id=name, flush_interval_s=60, store=store
+            )
+            for name in ("a", "b")
+        ]
+        trackers[0].record_usage(100)
+        trackers[1].record_usage(50)
+        global_tracker = ThreadSafeUsageTracker(
+            stats_file=tmp_path / "usage_global.json", scope=UsageScope.GLOBAL, store=store
+        )
+        global_tracker.record_usage(7)
+
+        aggregated = trackers[0].get_aggregated_stats()
+        per_client = trackers[0].get_aggregated_stats(UsageScope.PER_CLIENT)
+
+        stats_a = aggregated[str((tmp_path / "usage_a.json").absolute())]
+        assert (stats_a.tokens_used_today, stats_a.total_tokens, stats_a.client_id) == (100, 100, "a")
+        assert sum(stats.total_tokens for stats in aggregated.values()) == 157
+        assert sum(stats.total_tokens for stats in per_client.values()) == 150
+
+    def test_client_uses_store_from_settings(self, tmp_path):
+        settings = AiSettings(
+            api_key="test-key",
+            model="test-model",
+            cache_enabled=False,
+            usage_store_path=tmp_path / "usage.sqlite",
+        )
+        client = AiClient(
+            settings, provider=FakeProvider(), track_usage=True, usage_file=tmp_path / "usage_c.json"
+        )
+
+        client.ask("hello")
+        client.usage_tracker.flush()
+
+        rows = shared_usage_store(tmp_path / "usage.sqlite").aggregate(("model",))
+        assert [(row["model"], row["requests"]) for row in rows] == [("test-model", 1)]
+        assert "usage_store_path" not in client._ask_request_params({})
+
+    @pytest.mark.asyncio
+    async def test_async_client_records_the_requested_model(self, tmp_path):
+        settings = AiSettings(
+            api_key="test-key",
+            model="test-model",
+            cache_enabled=False,
+            usage_store_path=tmp_path / "usage.sqlite",
+        )
+        client = AsyncAiClient(
+            settings, provider=AsyncRecordingProvider(), track_usage=True, usage_file=str(tmp_path / "usage_c.json")
+        )
+
+        await client.ask("hello", model="other-model")
+        client.usage_tracker.flush()
+
+        rows = shared_usage_store(tmp_path / "usage.sqlite").aggregate(("model",))
+        assert [row["model"] for row in rows] == ["other-model"]
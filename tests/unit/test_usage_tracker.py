@@ -13,6 +13,10 @@ from datetime import date
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+import subprocess
+import sys
+import textwrap
+
 import pytest
 
 from ai_utilities.usage_tracker import (
@@ -471,6 +475,7 @@ class TestThreadSafeUsageTracker:
             tracker.record_usage(tokens_used=100)
             stats = tracker.get_stats()
             assert stats.tokens_used_today == 100
+            tracker.flush()
             
             # Reload module and patch date to tomorrow
             importlib.reload(ut_module)
@@ -515,6 +520,184 @@ class TestThreadSafeUsageTracker:
             assert stats.tokens_used_today == 50
 
 
+class TestBatchedFlush:
+    """In-memory aggregation and batched writes to the stats file."""
+    
+    @staticmethod
+    def _file_stats(stats_file):
+        with open(stats_file) as f:
+            return json.load(f)
+    
+    def test_record_usage_does_not_write_until_flush(self, tmp_path):
+        stats_file = tmp_path / "usage_batched.json"
+        tracker = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60)
+        
+        tracker.record_usage(tokens_used=10)
+        tracker.record_usage(tokens_used=20)
+        
+        assert self._file_stats(stats_file)["total_requests"] == 0
+        stats = tracker.get_stats()
+        assert (stats.tokens_used_today, stats.requests_today) == (30, 2)
+        
+        tracker.flush()
+        data = self._file_stats(stats_file)
+        assert (data["tokens_used_today"], data["total_tokens"], data["total_requests"]) == (30, 30, 2)
+        assert tracker.get_stats().total_tokens == 30
+    
+    def test_get_stats_does_not_read_the_file(self, tmp_path):
+        tracker = ThreadSafeUsageTracker(stats_file=tmp_path / "usage_batched.json", flush_interval_s=60)
+        tracker.record_usage(tokens_used=5)
+        
+        with patch("builtins.open", side_effect=AssertionError("disk access")):
+            assert tracker.get_stats().total_tokens == 5
+    
+    def test_threshold_triggers_background_flush(self, tmp_path):
+        stats_file = tmp_path / "usage_batched.json"
+        tracker = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60, flush_threshold=3)
+        
+        for _ in range(3):
+            tracker.record_usage(tokens_used=1)
+        
+        deadline = time.monotonic() + 5
+        while self._file_stats(stats_file)["total_requests"] != 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self._file_stats(stats_file)["total_requests"] == 3
+    
+    def test_interval_triggers_background_flush(self, tmp_path):
+        stats_file = tmp_path / "usage_batched.json"
+        tracker = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=0.05)
+        
+        tracker.record_usage(tokens_used=7)
+        
+        deadline = time.monotonic() + 5
+        while self._file_stats(stats_file)["total_tokens"] != 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self._file_stats(stats_file)["total_tokens"] == 7
+    
+    def test_flush_merges_with_writes_from_other_processes(self, tmp_path):
+        stats_file = tmp_path / "usage_batched.json"
+        tracker = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60)
+        tracker.record_usage(tokens_used=100)
+        
+        # Another process flushed its own usage in the meantime
+        data = self._file_stats(stats_file)
+        data.update(tokens_used_today=40, requests_today=2, total_tokens=540, total_requests=12)
+        stats_file.write_text(json.dumps(data))
+        
+        tracker.flush()
+        
+        data = self._file_stats(stats_file)
+        assert (data["tokens_used_today"], data["requests_today"]) == (140, 3)
+        assert (data["total_tokens"], data["total_requests"]) == (640, 13)
+    
+    def test_concurrent_processes_do_not_lose_usage(self, tmp_path):
+        stats_file = tmp_path / "usage_shared.json"
+        script = textwrap.dedent(
+            f"""
+            from pathlib import Path
+            from ai_utilities.usage_tracker import ThreadSafeUsageTracker
+            tracker = ThreadSafeUsageTracker(stats_file=Path({str(stats_file)!r}), flush_threshold=7)
+            for _ in range(50):
+                tracker.record_usage(tokens_used=2)
+            tracker.flush()
+            """
+        )
+        workers = [subprocess.Popen([sys.executable, "-c", script]) for _ in range(4)]
+        for worker in workers:
+            assert worker.wait(timeout=60) == 0
+        
+        data = self._file_stats(stats_file)
+        assert (data["total_requests"], data["total_tokens"]) == (200, 400)
+    
+    def test_trackers_on_one_file_share_pending_usage(self, tmp_path):
+        stats_file = tmp_path / "usage_batched.json"
+        first = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60)
+        second = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60)
+        
+        first.record_usage(tokens_used=10)
+        second.record_usage(tokens_used=5)
+        
+        assert first.get_stats().total_tokens == 15
+        second.flush()
+        assert self._file_stats(stats_file)["total_tokens"] == 15
+        assert first.get_stats().total_tokens == 15
+    
+    def test_pending_usage_from_previous_day_only_counts_toward_totals(self, tmp_path):
+        import ai_utilities.usage_tracker as ut_module
+        from datetime import timedelta
+        
+        stats_file = tmp_path / "usage_batched.json"
+        today = date.today()
+        with patch.object(ut_module, "date") as mock_date:
+            mock_date.today.return_value = today - timedelta(days=1)
+            tracker = ut_module.ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60)
+            tracker.record_usage(tokens_used=50)
+            mock_date.today.return_value = today
+            
+            tracker.flush()
+        
+        data = self._file_stats(stats_file)
+        assert (data["tokens_used_today"], data["total_tokens"]) == (0, 50)
+        assert data["last_reset"] == today.isoformat()
+    
+    def test_record_usage_and_get_stats_do_not_wait_for_flush_io(self, tmp_path):
+        tracker = ThreadSafeUsageTracker(stats_file=tmp_path / "usage_batched.json", flush_interval_s=60)
+        tracker.record_usage(tokens_used=10)
+        write_stats = tracker._write_stats_atomic
+        seen = []
+        
+        def slow_write(stats):
+            # Another thread records and reads while this flush is writing
+            worker = threading.Thread(
+                target=lambda: (tracker.record_usage(tokens_used=5), seen.append(tracker.get_stats()))
+            )
+            worker.start()
+            worker.join(timeout=5)
+            assert not worker.is_alive()
+            return write_stats(stats)
+        
+        with patch.object(tracker, "_write_stats_atomic", side_effect=slow_write):
+            tracker.flush()
+        
+        # The in-flight batch stays counted while it is being written
+        assert seen[0].total_tokens == 15
+        assert self._file_stats(tracker.stats_file)["total_tokens"] == 10
+        assert tracker.get_stats().total_tokens == 15
+    
+    def test_failed_flush_keeps_usage_for_the_next_flush(self, tmp_path):
+        tracker = ThreadSafeUsageTracker(stats_file=tmp_path / "usage_batched.json", flush_interval_s=60)
+        tracker.record_usage(tokens_used=10)
+        
+        with patch.object(tracker, "_write_stats_atomic", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                tracker.flush()
+        tracker.record_usage(tokens_used=5)
+        
+        assert tracker.get_stats().total_tokens == 15
+        tracker.flush()
+        data = self._file_stats(tracker.stats_file)
+        assert (data["tokens_used_today"], data["total_tokens"], data["total_requests"]) == (15, 15, 2)
+    
+    def test_reset_stats_discards_pending_usage(self, tmp_path):
+        stats_file = tmp_path / "usage_batched.json"
+        tracker = ThreadSafeUsageTracker(stats_file=stats_file, flush_interval_s=60)
+        tracker.record_usage(tokens_used=10)
+        
+        tracker.reset_stats()
+        tracker.flush()
+        
+        assert tracker.get_stats().total_requests == 0
+        assert self._file_stats(stats_file)["total_requests"] == 0
+    
+    def test_aggregated_stats_include_pending_usage(self, tmp_path):
+        tracker = ThreadSafeUsageTracker(stats_file=tmp_path / "usage_a.json", flush_interval_s=60)
+        tracker.record_usage(tokens_used=25)
+        
+        aggregated = tracker.get_aggregated_stats()
+        
+        assert aggregated[str(tmp_path / "usage_a.json")].total_tokens == 25
+
+
 class TestCreateUsageTracker:
     """Test the factory function."""
     
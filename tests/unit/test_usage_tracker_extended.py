@@ -331,6 +331,7 @@ class TestUsageTrackerExtended:
         
         # Track some usage using actual method
         tracker.record_usage(tokens_used=100)
+        tracker.flush()
         
         # Mock date change (yesterday)
         yesterday = date.today() - timedelta(days=1)
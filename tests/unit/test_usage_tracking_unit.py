@@ -32,7 +32,8 @@ def test_usage_tracker_basic():
         # Check file was created
         assert stats_file.exists()
         
-        # Load and verify file contents
+        # Load and verify file contents once pending usage is flushed
+        tracker.flush()
         with open(stats_file) as f:
             data = json.load(f)
             assert data['tokens_used_today'] == 150
@@ -110,6 +111,7 @@ def test_usage_tracker_daily_reset():
         yesterday = (date.today() - timedelta(days=1)).isoformat()
         
         # Read, modify, and write stats file directly
+        tracker.flush()
         import json
         with open(stats_file) as f:
             data = json.load(f)
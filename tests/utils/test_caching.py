@@ -245,19 +245,24 @@ class TestAiClientCaching:
         client.ask("hello", temperature=0.1)
         assert provider.ask_count == 2  # No additional call
     
-    def test_ask_does_not_cache_list_prompts(self):
-        """Test that list prompts are not cached in Phase 1."""
+    def test_ask_caches_list_prompts_per_item(self):
+        """Test that list prompts are cached per item and only misses are sent."""
         settings = AiSettings(cache_enabled=True, cache_backend="memory")
         provider = FakeProvider(settings)
         client = AiClient(settings=settings, provider=provider)
         
         # Call with list prompt
-        client.ask(["hello", "world"])
+        first = client.ask(["hello", "world"])
         assert provider.ask_many_count == 1
         
-        # Second call should not hit cache
-        client.ask(["hello", "world"])
+        # Second call is served entirely from cache
+        assert client.ask(["hello", "world"]) == first
+        assert provider.ask_many_count == 1
+        
+        # Only the new prompt reaches the provider
+        client.ask(["hello", "again"])
         assert provider.ask_many_count == 2
+        assert provider.ask_count == 3
     
     def test_ask_json_caches_parsed_result(self):
         """Test that ask_json() caches the parsed Python object."""